@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List
+
+from SpinExplorer.SpinConverter.FindingParameters.parameters import detect_nmr_files
+from SpinExplorer.SpinConverter.FindingParameters.errors import ConversionError
+from SpinExplorer.SpinConverter.Conversion.headless import convert_headless
+
+
+def find_datasets(root: str) -> List[str]:
+    """
+    Walk a tree of experiment directories and return (sorted) every
+    directory containing a Bruker or Varian parameter file. Directories
+    whose raw data is missing or ambiguous are included so that they are
+    reported as failed (see dataset_problem) rather than silently skipped.
+    """
+    datasets = []
+    for directory, subdirectories, files in os.walk(root):
+        # Processed data directories never contain raw data
+        subdirectories[:] = [name for name in subdirectories if name != "pdata"]
+        spectrometer, parameter_file, data_files = detect_nmr_files(directory)
+        if spectrometer != "":
+            datasets.append(directory)
+    datasets.sort(key=natural_sort_key)
+    return datasets
+
+
+def dataset_problem(spectrometer: str, data_files: List[str]) -> str:
+    """
+    The reason a directory with a parameter file cannot be converted, or ""
+    if it has a raw data file to convert
+    """
+    if len(data_files) == 0:
+        if spectrometer == "Bruker":
+            return "No Bruker data file (fid or ser) found"
+        return "No Varian data file (fid) found"
+    if spectrometer == "Bruker" and len(data_files) > 1:
+        return "Found more than one Bruker data file ({}), expected a single fid or ser".format(
+            ", ".join(sorted(data_files))
+        )
+    return ""
+
+
+def natural_sort_key(directory: str) -> List:
+    """
+    Sort numbered experiment directories numerically (2 before 10)
+    """
+    key = []
+    for part in re.split(r"(\d+)", directory):
+        if part.isdigit():
+            key.append(int(part))
+        else:
+            key.append(part)
+    return key
+
+
+def convert_dataset(
+    directory: str, output_file: str = "test.fid", force: bool = False
+) -> Dict[str, Any]:
+    """
+    Convert a single dataset, returning a report dictionary with the
+    directory, spectrometer, status (converted/skipped/failed), the time
+    taken and a message
+    """
+    start = time.perf_counter()
+    spectrometer, parameter_file, data_files = detect_nmr_files(directory)
+    report = {
+        "directory": directory,
+        "spectrometer": spectrometer,
+        "status": "converted",
+        "time": 0.0,
+        "message": "",
+    }
+    problem = dataset_problem(spectrometer, data_files)
+    if problem != "":
+        report["status"] = "failed"
+        report["message"] = problem
+        report["time"] = time.perf_counter() - start
+        return report
+    try:
+        output_path, converted = convert_headless(
+            directory, output_file=output_file, force=force
+        )
+        report["message"] = output_path
+        if converted == False:
+            report["status"] = "skipped"
+            report["message"] = "{} is up to date".format(output_file)
+    except ConversionError as error:
+        report["status"] = "failed"
+        report["message"] = str(error)
+    except Exception as error:
+        report["status"] = "failed"
+        report["message"] = "{}: {}".format(type(error).__name__, error)
+    report["time"] = time.perf_counter() - start
+    return report
+
+
+def convert_batch(
+    root: str,
+    workers: int = 1,
+    output_file: str = "test.fid",
+    force: bool = False,
+    verbose: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Convert every dataset found below root using a pool of worker
+    processes. Datasets already converted from the same raw data with the
+    same parameters (see cache.py) are skipped unless force is True.
+    Returns the report for each dataset in directory order.
+    """
+    datasets = find_datasets(root)
+    if verbose == True:
+        print("Found {} datasets in {}".format(len(datasets), root))
+
+    reports = {}
+    if workers <= 1 or len(datasets) <= 1:
+        for directory in datasets:
+            reports[directory] = convert_dataset(directory, output_file, force)
+            if verbose == True:
+                print_report(reports[directory])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    convert_dataset, directory, output_file, force
+                ): directory
+                for directory in datasets
+            }
+            for future in as_completed(futures):
+                directory = futures[future]
+                try:
+                    reports[directory] = future.result()
+                except Exception as error:
+                    # The worker process itself failed
+                    reports[directory] = {
+                        "directory": directory,
+                        "spectrometer": "",
+                        "status": "failed",
+                        "time": 0.0,
+                        "message": "{}: {}".format(type(error).__name__, error),
+                    }
+                if verbose == True:
+                    print_report(reports[directory])
+
+    return [reports[directory] for directory in datasets]
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        "{:<10} {} ({:.1f} s) {}".format(
+            report["status"], report["directory"], report["time"], report["message"]
+        )
+    )
+
+
+def write_report(reports: List[Dict[str, Any]], file_name: str) -> None:
+    """
+    Write a tab separated table with a row for each converted dataset
+    followed by a summary of the number converted, skipped and failed
+    """
+    with open(file_name, "w") as file:
+        file.write("Directory\tSpectrometer\tStatus\tTime (s)\tMessage\n")
+        for report in reports:
+            file.write(
+                "{}\t{}\t{}\t{:.2f}\t{}\n".format(
+                    report["directory"],
+                    report["spectrometer"],
+                    report["status"],
+                    report["time"],
+                    report["message"].replace("\n", " "),
+                )
+            )
+        file.write("\n" + summary(reports) + "\n")
+
+
+def summary(reports: List[Dict[str, Any]]) -> str:
+    counts = {"converted": 0, "skipped": 0, "failed": 0}
+    for report in reports:
+        counts[report["status"]] += 1
+    return "{} datasets: {} converted, {} skipped, {} failed".format(
+        len(reports), counts["converted"], counts["skipped"], counts["failed"]
+    )
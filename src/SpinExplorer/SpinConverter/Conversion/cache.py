@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import re
+import glob
+import json
+import hashlib
+import datetime
+from typing import Dict, Any, List, Tuple
+
+from SpinExplorer.SpinConverter.FindingParameters.parameters import detect_nmr_files
+from SpinExplorer.SpinConverter.StoringParameters.conversion_parameters import (
+    ConversionParameters,
+)
+
+
+# Each data directory keeps a record of the conversions made in it
+cache_file_name = "conversion_cache.json"
+
+# Number and size of the blocks of a file hashed for its fingerprint
+sample_count = 16
+sample_size = 64 * 1024
+
+
+def sampled_hash(path: str) -> str:
+    """
+    Hash the size of a file and sample_count evenly spaced blocks of it
+    (the whole file if it is small), so large ser files can be
+    fingerprinted without reading them completely
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as file:
+        if size <= sample_count * sample_size:
+            digest.update(file.read())
+        else:
+            step = (size - sample_size) // (sample_count - 1)
+            for i in range(sample_count):
+                file.seek(i * step)
+                digest.update(file.read(sample_size))
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    status = os.stat(path)
+    return {
+        "size": status.st_size,
+        "mtime": status.st_mtime_ns,
+        "hash": sampled_hash(path),
+    }
+
+
+def fingerprint_matches(path: str, fingerprint: Dict[str, Any]) -> bool:
+    """
+    True if the file still matches its fingerprint. The sampled hash is
+    only recomputed if the modification time has changed (e.g. the data
+    has been copied)
+    """
+    if os.path.exists(path) == False:
+        return False
+    status = os.stat(path)
+    if status.st_size != fingerprint["size"]:
+        return False
+    if status.st_mtime_ns == fingerprint["mtime"]:
+        return True
+    return sampled_hash(path) == fingerprint["hash"]
+
+
+def input_files(directory: str = ".", nus_file: str = "") -> List[str]:
+    """
+    The spectrometer files a conversion of directory depends on, including
+    the NUS schedule named in the conversion parameters (the parameters
+    themselves are hashed separately)
+    """
+    spectrometer, parameter_file, data_files = detect_nmr_files(directory)
+    names = [parameter_file] + data_files
+    for name in ["acqu2s", "acqu3s", "acqu4s", "nuslist"]:
+        names.append(name)
+    if nus_file != "" and nus_file not in names:
+        names.append(nus_file)
+    return [
+        name for name in names if os.path.exists(os.path.join(directory, name))
+    ]
+
+
+def output_files(output_file: str, directory: str = ".") -> List[str]:
+    """
+    The files written for output_file, expanding the plane number in a
+    3D plane series (e.g. fids/test%03d.fid)
+    """
+    if "%" not in output_file:
+        if os.path.exists(os.path.join(directory, output_file)) == True:
+            return [output_file]
+        return []
+    pattern = re.sub(r"%0?\d*d", "*", output_file)
+    return sorted(
+        os.path.relpath(path, directory)
+        for path in glob.glob(os.path.join(directory, pattern))
+    )
+
+
+def parameter_hash(parameters: ConversionParameters) -> str:
+    """
+    Hash of the conversion parameters in the parameters.json layout
+    """
+    text = json.dumps(parameters.to_dictionary(), sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def read_cache(directory: str = ".") -> Dict[str, Any]:
+    try:
+        with open(os.path.join(directory, cache_file_name), "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_cache(cache: Dict[str, Any], directory: str = ".") -> None:
+    path = os.path.join(directory, cache_file_name)
+    if cache == {}:
+        if os.path.exists(path) == True:
+            os.remove(path)
+        return
+    # Write to a temporary file first so an interrupted write never leaves
+    # a corrupt cache
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(cache, file, indent=4)
+    os.replace(temporary_path, path)
+
+
+def entry_is_current(entry: Dict[str, Any], directory: str = ".") -> bool:
+    """
+    True if the input files are unchanged and the output files have not
+    been modified since the conversion was recorded
+    """
+    try:
+        # A new raw data file (e.g. ser next to fid) also invalidates the entry
+        for name in input_files(directory):
+            if name not in entry["inputs"]:
+                return False
+        for name, fingerprint in entry["inputs"].items():
+            if fingerprint_matches(os.path.join(directory, name), fingerprint) == False:
+                return False
+        if entry["outputs"] == {}:
+            return False
+        for name, output in entry["outputs"].items():
+            path = os.path.join(directory, name)
+            if os.path.exists(path) == False:
+                return False
+            status = os.stat(path)
+            if status.st_size != output["size"]:
+                return False
+            if status.st_mtime_ns != output["mtime"]:
+                return False
+    except (KeyError, TypeError, OSError):
+        return False
+    return True
+
+
+def is_cached(
+    output_file: str,
+    parameters: ConversionParameters,
+    method: str = "nmrglue",
+    directory: str = ".",
+) -> bool:
+    """
+    True if output_file was converted with method from the current raw
+    data using the same conversion parameters, so it does not need to be
+    converted again
+    """
+    entry = read_cache(directory).get(output_file)
+    if entry is None:
+        return False
+    if entry.get("method") != method:
+        return False
+    if entry.get("parameters") != parameter_hash(parameters):
+        return False
+    return entry_is_current(entry, directory)
+
+
+def record_conversion(
+    output_file: str,
+    parameters: ConversionParameters,
+    method: str = "nmrglue",
+    directory: str = ".",
+) -> None:
+    """
+    Record the fingerprints of the inputs and outputs of a finished
+    conversion in the directory's conversion cache
+    """
+    outputs = {}
+    for name in output_files(output_file, directory):
+        status = os.stat(os.path.join(directory, name))
+        outputs[name] = {"size": status.st_size, "mtime": status.st_mtime_ns}
+    cache = read_cache(directory)
+    cache[output_file] = {
+        "method": method,
+        "parameters": parameter_hash(parameters),
+        "inputs": {
+            name: file_fingerprint(os.path.join(directory, name))
+            for name in input_files(directory, parameters.nus_file)
+        },
+        "outputs": outputs,
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    write_cache(cache, directory)
+
+
+def find_caches(root: str = ".") -> List[str]:
+    """
+    Return (sorted) every directory below root with a conversion cache
+    """
+    directories = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [name for name in subdirectories if name != "pdata"]
+        if cache_file_name in files:
+            directories.append(directory)
+    directories.sort()
+    return directories
+
+
+def list_cache(root: str = ".") -> List[Tuple[str, str, Dict[str, Any], bool]]:
+    """
+    Return (directory, output file, entry, current) for every conversion
+    recorded below root
+    """
+    entries = []
+    for directory in find_caches(root):
+        for output_file, entry in read_cache(directory).items():
+            entries.append(
+                (directory, output_file, entry, entry_is_current(entry, directory))
+            )
+    return entries
+
+
+def clear_cache(root: str = ".") -> int:
+    """
+    Remove every conversion cache below root (the converted data is
+    kept). Returns the number of caches removed
+    """
+    directories = find_caches(root)
+    for directory in directories:
+        os.remove(os.path.join(directory, cache_file_name))
+    return len(directories)
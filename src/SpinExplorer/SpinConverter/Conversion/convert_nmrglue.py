@@ -22,72 +22,253 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE."""
 
+import os
+import datetime
+import itertools
 import numpy as np
 import nmrglue as ng
 
+from SpinExplorer.SpinConverter.FindingParameters.parameters import detect_nmr_files
+from SpinExplorer.SpinConverter.FindingParameters.parameter_index import (
+    get_parameter_index,
+)
+from SpinExplorer.SpinConverter.FindingParameters.raw_data import RawData
+
+
+# nmrglue encodings for each indirect dimension acquisition mode
+indirect_encodings = {
+    "Real": "real",
+    "Complex": "complex",
+    "States": "states",
+    "TPPI": "tppi",
+    "States-TPPI": "states-tppi",
+    "Echo-Antiecho": "complex",
+    "Echo-AntiEcho": "complex",
+    "Rance-Kay": "complex",
+}
+rance_kay_modes = ["Echo-Antiecho", "Echo-AntiEcho", "Rance-Kay"]
+
+# Approximate size (bytes) of each block of FIDs held in memory during conversion
+block_memory = 64 * 1024 * 1024
+
 
 class Convert_nmrglue:
-    def __init__(self, app, params, nmrdata) -> None:
+    def __init__(self, parameters, output_file: str = "test.fid") -> None:
         """
-        This class will perform the conversion of the NMR data
-        to nmrPipe format using nmrglue.
+        This class will perform the conversion of the NMR data in the
+        current directory to nmrPipe format using nmrglue. All settings
+        are taken from a ConversionParameters instance so the conversion
+        can run with or without the SpinConverter GUI. The data is
+        streamed from the ser/fid file in blocks of FIDs so memory use does
+        not depend on the size of the dataset (NUS data is expanded onto
+        the full grid block by block). If output_file contains a % (e.g.
+        fids/test%03d.fid), 3D data is written as a series of planes.
         """
-        self.app = app
-        self.params = params
-        self.nmrdata = nmrdata
-
-        C = ng.convert.converter()
-        # Obtain first guesses of dictionary values
-        if self.nmrdata.spectrometer == "Bruker":
-            dic, data = ng.fileio.bruker.read("./")
-        else:
-            dic, data = ng.fileio.varian.read("./")
+        self.parameters = parameters
+        self.output_file = output_file
 
         u = self.create_conversion_dictionary()
 
-        self.perform_conversion(C, u, dic, data)
+        self.stream_conversion(u)
 
-    def perform_conversion(self, C, u, dic, data):
+    def open_raw_data(self) -> RawData:
         """
-        Performing any necessary data reshuffling and then
-        performing the data conversion to nmrPipe format before
-        saving as test.fid
+        Open the ser/fid file in the current directory without reading it,
+        splitting a 2D dataset that has been read as 1D into its FIDs
         """
+        spectrometer, parameter_file, files = detect_nmr_files("./")
+        if self.parameters.spectrometer == "Bruker":
+            raw_data = RawData.from_bruker("./", files[0])
+        else:
+            raw_data = RawData.from_varian("./", files[0])
+        if self.parameters.ndim == 2 and raw_data.ndim == 1:
+            raw_data.split_fids(int(self.parameters.real_sizes[-1]))
+        return raw_data
+
+    def fid_order(self, raw_data: RawData) -> np.ndarray:
+        """
+        Return the index of the FID in the file for each FID of the data in
+        nmrPipe (C) order. Varian 3D/4D data can be stored in a different
+        trace order (see ng.varian.find_torder).
+        """
+        if self.parameters.spectrometer == "Varian" and raw_data.ndim >= 3:
+            shape = raw_data.shape
+            torder = ng.varian.find_torder(raw_data.dic["procpar"], shape)
+            if torder not in ("flat", "f"):
+                index_to_trace = ng.varian.torder2i2t(torder)
+                return np.array(
+                    [
+                        index_to_trace(shape[:-1], index)
+                        for index in np.ndindex(*shape[:-1])
+                    ]
+                )
+        return np.arange(raw_data.number_of_fids)
 
-        if len(self.app.format.N_real_boxes) == 2:
-            # If have 2D data but nmrglue has read it in as a 1D, need to split it up
-            if len(data.shape) == 1:
-                data = np.array(
-                    np.split(data, int(self.app.format.N_real_boxes[-1].GetValue()))
+    def nus_fid_order(self, raw_data: RawData):
+        """
+        Return the shape of the fully sampled NUS data and the index of the
+        FID in the file for each of its FIDs (-1 for FIDs not sampled)
+        """
+        shape = [int(size) for size in self.parameters.complex_sizes[1:]]
+        shape.reverse()
+        shape = tuple(shape) + (raw_data.points_per_fid,)
+
+        schedule = get_parameter_index().nuslist(self.parameters.nus_file)
+        fids = nus_fid_indexes(
+            schedule,
+            shape[:-1],
+            int(self.parameters.nus_sample_count),
+            int(self.parameters.nus_offset),
+            self.parameters.reverse_nus_schedule,
+        )
+        if fids.max() >= raw_data.number_of_fids:
+            raise ValueError(
+                "The NUS schedule has more points than the data ({} FIDs)".format(
+                    raw_data.number_of_fids
                 )
+            )
+        return shape, fids
 
-        if len(self.app.format.N_complex_boxes) > 1:
-            # Check to see if the NUS flag is ticked
-            if self.app.shared_format.NUS_tickbox.GetValue() == True:
-                data = self.reshape_nus_data(data)
+    def read_block(self, raw_data: RawData, fids):
+        """
+        Read a block of FIDs from the file. FIDs with an index of -1 (not
+        sampled in NUS data) are left as zeros.
+        """
+        sampled = fids >= 0
+        if np.all(sampled) == True:
+            return raw_data.read_fids(fids)
+        if raw_data.complex_data == True:
+            data = np.zeros((len(fids), raw_data.points_per_fid), dtype=np.complex128)
+        else:
+            data = np.zeros((len(fids), raw_data.points_per_fid), dtype=np.float64)
+        data[sampled] = raw_data.read_fids(fids[sampled])
+        return data
 
-        # Rance-Kay/Echo-Antiecho reshuffling
+    def stream_conversion(self, u):
+        """
+        Converting the data to nmrPipe format one block of FIDs at a time.
+        Each block is read from a memory map of the ser/fid file, reshuffled
+        (Rance-Kay), corrected (digital filter, Varian sign conventions) and
+        scaled before being appended to the output file(s). For NUS data each
+        block of the fully sampled grid is filled from the sampled FIDs.
+        """
+        raw_data = self.open_raw_data()
+        if self.parameters.ndim > 1 and self.parameters.nus == True:
+            shape, fids = self.nus_fid_order(raw_data)
+        else:
+            shape = raw_data.shape
+            fids = self.fid_order(raw_data)
+        pdic = self.pipe_dictionary(u)
+
+        # Each block holds an even number of steps along the outermost dimension
+        # so Rance-Kay pairs and sign alternation never straddle two blocks
+        if len(shape) == 1:
+            steps, fids_per_step, step_size = 1, 1, 1
+        else:
+            steps = shape[0]
+            fids_per_step = int(np.prod(shape[1:-1]))
+            step_size = max(
+                2, block_memory // (16 * fids_per_step * shape[-1]) // 2 * 2
+            )
+
+        plane_series = "%" in self.output_file
+        if plane_series == True and len(shape) != 3:
+            raise ValueError("Only 3D data can be written as a series of planes")
+        if plane_series == True:
+            # Each plane is a 2D file of a multi-file 3D set (as written by
+            # pipe2xyz and ng.pipe.write), not a data stream
+            pdic["FDPIPEFLAG"] = 0.0
+            pdic["FDFILECOUNT"] = float(shape[0])
+        fdata = ng.pipe.dic2fdata(pdic)
+        directory = os.path.dirname(self.output_file)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+        # Files written so far, removed if the conversion fails so a partial
+        # output is never mistaken for a converted FID
+        written = []
+        file = None
+        try:
+            if plane_series == False:
+                file = open(self.output_file, "wb")
+                written.append(self.output_file)
+                ng.pipe.put_fdata(file, fdata)
+
+            for start in range(0, steps, step_size):
+                stop = min(start + step_size, steps)
+                data = self.read_block(
+                    raw_data, fids[start * fids_per_step : stop * fids_per_step]
+                )
+                if len(shape) == 1:
+                    data = data[0]
+                else:
+                    data = data.reshape((stop - start,) + tuple(shape[1:]))
+
+                pdata = self.convert_block(u, data)
+
+                if pdata.dtype == "complex64":
+                    pdata = ng.pipe.append_data(pdata)
+                if plane_series == True:
+                    for i, plane in enumerate(pdata):
+                        plane_name = self.output_file % (start + i + 1)
+                        written.append(plane_name)
+                        with open(plane_name, "wb") as plane_file:
+                            ng.pipe.put_fdata(plane_file, fdata)
+                            plane_file.write(plane.tobytes())
+                else:
+                    file.write(pdata.tobytes())
+        except:
+            if file is not None:
+                file.close()
+            for name in written:
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+            raise
+
+        if file is not None:
+            file.close()
+
+    def convert_block(self, u, data):
+        """
+        Apply the Rance-Kay reshuffling, digital filter removal, Varian sign
+        conventions and intensity scaling to a block of FIDs, returning it in
+        the nmrPipe data type.
+        """
         if self.rance_kay == True:
-            dic, data = self.rancekay_shuffling(dic, data, u)
+            dic, data = self.rancekay_shuffling({}, data, u)
 
-        if self.nmrdata.spectrometer == "Bruker":
-            if self.app.format.digital_filter_checkbox.GetValue() == True:
-                if self.app.format.digital_filter_radio_box.GetSelection() == 0:
-                    # Removing Bruker digital filter pre-processing
-                    # i.e. before Fourier transform
+        if self.parameters.spectrometer == "Bruker":
+            if self.parameters.remove_digital_filter == True:
+                if self.parameters.remove_before_ft == True:
                     data = self.remove_digital_filter_fid(data)
-
-            C.from_bruker(dic, data, u)
         else:
-            C.from_varian(dic, data, u)
-        pdic, pdata = C.to_pipe()
+            # Same as ng.convert.converter.from_varian: sign alternation of the
+            # indirect dimensions (unless TPPI) and negating the imaginary part
+            if data.ndim >= 2 and u[0]["encoding"].lower() != "tppi":
+                s = [slice(None, None, None)] * data.ndim
+                for i in range(data.ndim - 1):
+                    s[i] = slice(1, None, 2)
+                    data[tuple(s)] = -data[tuple(s)]
+                    s[i] = slice(None, None, None)
+            data.imag = -data.imag
+
+        if u[u["ndim"] - 1]["complex"] == True:
+            pdata = data.astype("complex64")
+        else:
+            pdata = data.real.astype("float32")
 
-        pdata = self.add_intensity_scaling(pdata)
+        return self.add_intensity_scaling(pdata)
 
+    def pipe_dictionary(self, u):
+        """
+        Create the nmrPipe header from the universal dictionary
+        """
+        pdic = ng.pipe.create_dic(u, datetime.datetime.now())
         pdic["FDPIPEFLAG"] = 1.0  # Setting the pipe flag to true
 
         # For pseudo2D spectra it is necessary to update the dictionary accordingly
-        if u[0]["encoding"] == "real" and len(self.app.format.N_complex_boxes) == 2:
+        if u[0]["encoding"] == "real" and self.parameters.ndim == 2:
             pdic["FDF1TDSIZE"] = u[0]["size"]
             pdic["FDF1FTSIZE"] = u[0]["size"]
             pdic["FDF1APOD"] = u[0]["size"]
@@ -97,316 +278,65 @@ class Convert_nmrglue:
             pdic["FDF1ORIG"] = 1.0
             pdic["FD2DPHASE"] = 0
 
-        ng.pipe.write("test.fid", pdic, pdata, overwrite=True)
+        return pdic
 
     def add_intensity_scaling(self, pdata):
         """
-        If the intensity scaling box is not equal to 1 then the FID data
-        needs to be scaled by the scaling box number
+        If the intensity scaling number is not equal to 1 then the FID data
+        needs to be scaled by the scaling number
         """
         try:
-            scaling_number = float(self.app.shared_format.scaling_number.GetValue())
+            scaling_number = float(self.parameters.scaling_number)
             pdata = scaling_number * pdata
             return pdata
         except:
             # Multiplication by scaling number did not work
             return pdata
 
-    def reshape_nus_data(self, data):
-        """
-        Reshaping the NUS FID to the correct order and inserting
-        zeros into the missing gaps.
-        """
-        # Need to reshape the data
-        shape = []
-        for k, value in enumerate(self.app.format.N_complex_boxes):
-            if k == 0:
-                # Taking the real size for the direct dimension
-                shape.append(int(self.app.format.N_real_boxes[0].GetValue()))
-            else:
-                shape.append(int(value.GetValue()))
-        shape.reverse()
-        shape = tuple(shape)
-        nuslist_tuple = ng.bruker.read_nuslist(
-            fname=self.app.shared_format.nusfile_input.GetValue()
-        )
-        data = ng.proc_base.expand_nus(data, shape, nuslist_tuple)
-        return data
-
     def remove_digital_filter_fid(self, data):
         """
         Removing the Bruker digital filter before Fourier transform
         (post_proc=False). This amounts to a circular shift of the
         data to account for the group delay.
         """
-        decim = float(self.app.format.decim_textbox.GetValue())
-        dspfvs = int(self.app.format.dspfvs_textbox.GetValue())
-        grpdly = float(self.app.format.grpdly_textbox.GetValue())
+        decim = float(self.parameters.decim)
+        dspfvs = int(self.parameters.dspfvs)
+        grpdly = float(self.parameters.grpdly)
         data = ng.bruker.rm_dig_filter(data, decim, dspfvs, grpdly, post_proc=False)
+        return data
 
     def create_conversion_dictionary(self):
+        """
+        Creating the nmrglue universal dictionary. The conversion parameters
+        are ordered direct dimension first, the universal dictionary has the
+        direct dimension last.
+        """
         self.rance_kay = False
-        if len(self.app.format.N_complex_boxes) == 1:
-            u = {
-                "ndim": 1,
-                0: {
-                    "sw": 0,
-                    "complex": True,
-                    "obs": 0,
-                    "car": 0,
-                    "size": 0,
-                    "label": "",
-                    "encoding": "direct",
-                    "time": True,
-                    "freq": False,
-                },
-            }
-            u["ndim"] = 1
-            u[0]["size"] = int(
-                int(self.app.format.N_complex_boxes[0].GetValue().strip()) / 2
-            )
-            if self.app.format.acqusition_combo_boxes[0].GetValue().strip() == "Real":
-                u[0]["complex"] = False
-            else:
-                u[0]["complex"] = True
-            u[0]["encoding"] = "direct"
-            u[0]["sw"] = float(self.app.format.sweep_width_boxes[0].GetValue().strip())
-            u[0]["obs"] = float(
-                self.app.format.nuclei_frequency_boxes[0].GetValue().strip()
-            )
-            u[0]["car"] = (
-                float(self.app.format.carrier_frequency_boxes[0].GetValue().strip())
-                * u[0]["obs"]
-            )
-            u[0]["label"] = self.app.format.nucleus_type_boxes[0].GetValue().strip()
-
-        elif len(self.app.format.N_complex_boxes) == 2:
-            u = {
-                "ndim": 2,
-                0: {
-                    "sw": 0,
-                    "complex": True,
-                    "obs": 0,
-                    "car": 0,
-                    "size": 0,
-                    "label": "",
-                    "encoding": "direct",
-                    "time": True,
-                    "freq": False,
-                },
-                1: {
-                    "sw": 0,
-                    "complex": True,
-                    "obs": 0,
-                    "car": 0,
-                    "size": 0,
-                    "label": "",
-                    "encoding": "direct",
-                    "time": True,
-                    "freq": False,
-                },
+        ndim = self.parameters.ndim
+        u = {"ndim": ndim}
+        for i in range(ndim):
+            mode = self.parameters.acquisition_modes[i].strip()
+            axis = {
+                "sw": float(self.parameters.sweep_widths[i]),
+                "complex": True,
+                "obs": float(self.parameters.nuclei_frequencies[i]),
+                "car": 0,
+                "size": int(self.parameters.complex_sizes[i]),
+                "label": self.parameters.labels[i].strip(),
+                "encoding": "direct",
+                "time": True,
+                "freq": False,
             }
-            u[1]["size"] = int(
-                int(self.app.format.N_complex_boxes[0].GetValue().strip()) / 2
-            )
-            if self.app.format.acqusition_combo_boxes[0].GetValue().strip() == "Real":
-                u[1]["complex"] = False
-            else:
-                u[1]["complex"] = True
-            u[1]["encoding"] = "direct"
-            u[1]["sw"] = float(self.app.format.sweep_width_boxes[0].GetValue().strip())
-            u[1]["obs"] = float(
-                self.app.format.nuclei_frequency_boxes[0].GetValue().strip()
-            )
-            u[1]["car"] = (
-                float(self.app.format.carrier_frequency_boxes[0].GetValue().strip())
-                * u[1]["obs"]
-            )
-            u[1]["label"] = self.app.format.nucleus_type_boxes[0].GetValue().strip()
-
-            u[0]["size"] = int(self.app.format.N_complex_boxes[1].GetValue().strip())
-            if self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "Real":
-                u[0]["complex"] = False
+            axis["car"] = float(self.parameters.carrier_frequencies[i]) * axis["obs"]
+            if mode == "Real":
+                axis["complex"] = False
+            if i == 0:
+                axis["size"] = int(int(self.parameters.complex_sizes[0]) / 2)
             else:
-                u[0]["complex"] = True
-            if self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "Real":
-                u[0]["encoding"] = "real"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Complex"
-            ):
-                u[0]["encoding"] = "complex"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "States"
-            ):
-                u[0]["encoding"] = "states"
-            elif self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "TPPI":
-                u[0]["encoding"] = "tppi"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "States-TPPI"
-            ):
-                u[0]["encoding"] = "states-tppi"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Echo-Antiecho"
-                or self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Echo-AntiEcho"
-                or self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Rance-Kay"
-            ):
-                u[0]["encoding"] = "complex"
-                self.rance_kay = True
-            u[0]["sw"] = float(self.app.format.sweep_width_boxes[1].GetValue().strip())
-            u[0]["obs"] = float(
-                self.app.format.nuclei_frequency_boxes[1].GetValue().strip()
-            )
-            u[0]["car"] = (
-                float(self.app.format.carrier_frequency_boxes[1].GetValue().strip())
-                * u[0]["obs"]
-            )
-            u[0]["label"] = self.app.format.nucleus_type_boxes[1].GetValue().strip()
-
-        else:
-            u = {
-                "ndim": 3,
-                0: {
-                    "sw": 0,
-                    "complex": True,
-                    "obs": 0,
-                    "car": 0,
-                    "size": 0,
-                    "label": "",
-                    "encoding": "direct",
-                    "time": True,
-                    "freq": False,
-                },
-                1: {
-                    "sw": 0,
-                    "complex": True,
-                    "obs": 0,
-                    "car": 0,
-                    "size": 0,
-                    "label": "",
-                    "encoding": "direct",
-                    "time": True,
-                    "freq": False,
-                },
-                2: {
-                    "sw": 0,
-                    "complex": True,
-                    "obs": 0,
-                    "car": 0,
-                    "size": 0,
-                    "label": "",
-                    "encoding": "direct",
-                    "time": True,
-                    "freq": False,
-                },
-            }
-            u[2]["size"] = int(
-                int(self.app.format.N_complex_boxes[0].GetValue().strip()) / 2
-            )
-            if self.app.format.acqusition_combo_boxes[0].GetValue().strip() == "Real":
-                u[2]["complex"] = False
-            else:
-                u[2]["complex"] = True
-            u[2]["encoding"] = "direct"
-            u[2]["sw"] = float(self.app.format.sweep_width_boxes[0].GetValue().strip())
-            u[2]["obs"] = float(
-                self.app.format.nuclei_frequency_boxes[0].GetValue().strip()
-            )
-            u[2]["car"] = (
-                float(self.app.format.carrier_frequency_boxes[0].GetValue().strip())
-                * u[2]["obs"]
-            )
-            u[2]["label"] = self.app.format.nucleus_type_boxes[0].GetValue().strip()
-
-            u[1]["size"] = int(self.app.format.N_complex_boxes[1].GetValue().strip())
-            if self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "Real":
-                u[1]["complex"] = False
-            else:
-                u[1]["complex"] = True
-            if self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "Real":
-                u[1]["encoding"] = "real"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Complex"
-            ):
-                u[1]["encoding"] = "complex"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "States"
-            ):
-                u[1]["encoding"] = "states"
-            elif self.app.format.acqusition_combo_boxes[1].GetValue().strip() == "TPPI":
-                u[1]["encoding"] = "tppi"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "States-TPPI"
-            ):
-                u[1]["encoding"] = "states-tppi"
-            elif (
-                self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Echo-Antiecho"
-                or self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Echo-AntiEcho"
-                or self.app.format.acqusition_combo_boxes[1].GetValue().strip()
-                == "Rance-Kay"
-            ):
-                u[1]["encoding"] = "complex"
-                self.rance_kay = True
-            u[1]["sw"] = float(self.app.format.sweep_width_boxes[1].GetValue().strip())
-            u[1]["obs"] = float(
-                self.app.format.nuclei_frequency_boxes[1].GetValue().strip()
-            )
-            u[1]["car"] = (
-                float(self.app.format.carrier_frequency_boxes[1].GetValue().strip())
-                * u[1]["obs"]
-            )
-            u[1]["label"] = self.app.format.nucleus_type_boxes[1].GetValue().strip()
-
-            u[0]["size"] = int(self.app.format.N_complex_boxes[2].GetValue().strip())
-            if self.app.format.acqusition_combo_boxes[2].GetValue().strip() == "Real":
-                u[0]["complex"] = False
-            else:
-                u[0]["complex"] = True
-            if self.app.format.acqusition_combo_boxes[2].GetValue().strip() == "Real":
-                u[0]["encoding"] = "real"
-            elif (
-                self.app.format.acqusition_combo_boxes[2].GetValue().strip()
-                == "Complex"
-            ):
-                u[0]["encoding"] = "complex"
-            elif (
-                self.app.format.acqusition_combo_boxes[2].GetValue().strip() == "States"
-            ):
-                u[0]["encoding"] = "states"
-            elif self.app.format.acqusition_combo_boxes[2].GetValue().strip() == "TPPI":
-                u[0]["encoding"] = "tppi"
-            elif (
-                self.app.format.acqusition_combo_boxes[2].GetValue().strip()
-                == "States-TPPI"
-            ):
-                u[0]["encoding"] = "states-tppi"
-            elif (
-                self.app.format.acqusition_combo_boxes[2].GetValue().strip()
-                == "Echo-Antiecho"
-                or self.app.format.acqusition_combo_boxes[2].GetValue().strip()
-                == "Echo-AntiEcho"
-                or self.app.format.acqusition_combo_boxes[2].GetValue().strip()
-                == "Rance-Kay"
-            ):
-                u[0]["encoding"] = "complex"
-                self.rance_kay = True
-            u[0]["sw"] = float(self.app.format.sweep_width_boxes[2].GetValue().strip())
-            u[0]["obs"] = float(
-                self.app.format.nuclei_frequency_boxes[2].GetValue().strip()
-            )
-            u[0]["car"] = (
-                float(self.app.format.carrier_frequency_boxes[2].GetValue().strip())
-                * u[0]["obs"]
-            )
-            u[0]["label"] = self.app.format.nucleus_type_boxes[2].GetValue().strip()
+                axis["encoding"] = indirect_encodings.get(mode, "direct")
+                if mode in rance_kay_modes:
+                    self.rance_kay = True
+            u[ndim - 1 - i] = axis
 
         return u
 
@@ -422,7 +352,7 @@ class Convert_nmrglue:
         dic : dict
             Dictionary of NMRPipe parameters
         data : ndarray
-            Array of NMR data.
+            Array of NMR data (modified in place).
         rotate_phase : bool, optional
             Remove the requirement for a 90 degree zero-order phase correction
 
@@ -436,51 +366,76 @@ class Convert_nmrglue:
 
         """
 
-        # Finding which dimensions in udic are Rance-Kay
-        rance_kay_dimensions = []
-        for i, box in enumerate(self.app.format.acqusition_combo_boxes):
-            box = box.GetValue().strip()
-            if box == "Echo-AntiEcho" or box == "Rance-Kay":
-                rance_kay_dimensions.append((len(data.shape) - 1) - i)
-
-        # Creating an empty array to store the reshuffled data
-        shuffled_data = np.empty(data.shape, data.dtype)
-
-        # If final dimension is Rance-Kay/Echo-AntiEcho
-        if rance_kay_dimensions == [0]:
-            for i in range(0, data.shape[0], 2):
-                shuffled_data[i] = (
-                    1.0 * (data[i].real - data[i + 1].real)
-                    + 1.0 * (data[i].imag - data[i + 1].imag) * 1j
-                )
-                if rotate_phase is True:
-                    shuffled_data[i + 1] = (
-                        -1.0 * (data[i].imag + data[i + 1].imag)
-                        + 1.0 * (data[i].real + data[i + 1].real) * 1j
-                    )
-                else:
-                    shuffled_data[i + 1] = (
-                        1.0 * (data[i].real + data[i + 1].real)
-                        + 1.0 * (data[i].imag + data[i + 1].imag) * 1j
-                    )
-
-        # If second to last dimension is Rance-Kay/Echo-AntiEcho
-        elif rance_kay_dimensions == [1]:
-            if len(data.shape) == 3:
-                for i in range(0, data.shape[1], 2):
-                    shuffled_data[:, i, :] = (
-                        1.0 * (data[:, i, :].real - data[:, i + 1, :].real)
-                        + 1.0 * (data[:, i, :].imag - data[:, i + 1, :].imag) * 1j
-                    )
-                    if rotate_phase is True:
-                        shuffled_data[:, i + 1, :] = (
-                            -1.0 * (data[:, i, :].imag + data[:, i + 1, :].imag)
-                            + 1.0 * (data[:, i, :].real + data[:, i + 1, :].real) * 1j
-                        )
-                    else:
-                        shuffled_data[:, i + 1, :] = (
-                            1.0 * (data[:, i, :].real + data[:, i + 1, :].real)
-                            + 1.0 * (data[:, i, :].imag + data[:, i + 1, :].imag) * 1j
-                        )
-
-        return dic, shuffled_data
+        # Finding which axes of the data are Rance-Kay
+        for i, mode in enumerate(self.parameters.acquisition_modes):
+            if mode.strip() in rance_kay_modes:
+                axis = (data.ndim - 1) - i
+                data = rance_kay_recombination(data, axis, rotate_phase)
+
+        return dic, data
+
+
+def rance_kay_recombination(data, axis: int, rotate_phase: bool = True):
+    """
+    Recombine the echo/antiecho pairs (a, b) along one axis of the data into
+    (a - b, i(a + b)), or (a - b, a + b) if rotate_phase is False. The axis
+    is viewed as (n/2, 2) so all pairs are combined at once, in place when
+    the data is contiguous.
+    """
+    if data.shape[axis] % 2 != 0:
+        raise ValueError(
+            "Rance-Kay dimension has an odd number of points ({})".format(
+                data.shape[axis]
+            )
+        )
+    pairs = data.reshape(
+        data.shape[:axis] + (data.shape[axis] // 2, 2) + data.shape[axis + 1 :]
+    )
+    index = [slice(None, None, None)] * pairs.ndim
+    index[axis + 1] = 0
+    echo = pairs[tuple(index)]
+    index[axis + 1] = 1
+    antiecho = pairs[tuple(index)]
+
+    difference = echo - antiecho
+    antiecho += echo
+    if rotate_phase is True:
+        antiecho *= 1j
+    echo[...] = difference
+
+    return pairs.reshape(data.shape)
+
+
+def nus_fid_indexes(
+    schedule, grid_shape, sample_count: int = 0, offset: int = 0, reverse=False
+):
+    """
+    Scatter the FIDs of a NUS dataset onto the fully sampled grid. The
+    schedule (nuslist) has one row per sampled point, each with 2**n FIDs in
+    the file for the quadrature components (in the same order as
+    ng.proc_base.expand_nus). Returns the index of the FID in the file for
+    each FID of the grid (C order), or -1 if that FID was not sampled.
+    """
+    schedule = np.asarray(schedule, dtype=int)
+    if sample_count > 0:
+        schedule = schedule[:sample_count]
+    schedule = schedule - offset
+    # nuslist columns run from the innermost indirect dimension outwards
+    if reverse == False:
+        schedule = schedule[:, ::-1]
+
+    dimensions = schedule.shape[1]
+    if dimensions != len(grid_shape):
+        raise ValueError(
+            "The NUS schedule has {} columns but the data has {} indirect "
+            "dimensions".format(dimensions, len(grid_shape))
+        )
+    quadrature = np.array(list(itertools.product((0, 1), repeat=dimensions)))
+    positions = 2 * schedule[:, np.newaxis, :] + quadrature[np.newaxis, :, :]
+    targets = np.ravel_multi_index(
+        positions.reshape(-1, dimensions).T, tuple(grid_shape)
+    )
+
+    fids = np.full(int(np.prod(grid_shape)), -1)
+    fids[targets] = np.arange(len(targets))
+    return fids
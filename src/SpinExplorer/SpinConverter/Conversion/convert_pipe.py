@@ -25,7 +25,19 @@ SOFTWARE."""
 
 import wx
 import os
-import subprocess
+
+from SpinExplorer.SpinConverter.StoringParameters.conversion_parameters import (
+    ConversionParameters,
+)
+from SpinExplorer.SpinConverter.Conversion.cache import (
+    is_cached,
+    record_conversion,
+    output_files,
+)
+from SpinExplorer.SpinConverter.FindingParameters.parameter_index import (
+    get_parameter_index,
+)
+from SpinExplorer.SpinConverter.FormattingGUI.job_monitor import JobMonitor
 
 
 class Convert_pipe:
@@ -105,14 +117,48 @@ class Convert_pipe:
         working correctly.
         """
 
+    def script_output_file(self) -> str:
+        """
+        The output of fid.com (its last -out), e.g. test.fid or
+        fids/test%03d.fid if the script writes a 3D plane series
+        """
+        try:
+            output_file = get_parameter_index().fid_com().get("out", "test.fid")
+        except FileNotFoundError:
+            output_file = "test.fid"
+        return os.path.normpath(output_file)
+
     def run_conversion_script(self):
         """
-        Trying to run NMRPipe conversion script
+        Trying to run NMRPipe conversion script, unless its output has
+        already been converted by nmrPipe from the same data with the same
+        parameters
         """
-        if "test.fid" in os.listdir():
+        parameters = ConversionParameters.from_app(self.app)
+        output_file = self.script_output_file()
+        if is_cached(output_file, parameters, method="nmrPipe") == True:
             dlg = wx.MessageDialog(
                 self.app,
-                "The test.fid file already exists. Do you want to overwrite it?",
+                "{} has already been converted from this data with the current parameters. Do you want to convert it again?".format(
+                    output_file
+                ),
+                "Conversion up to date",
+                wx.YES_NO | wx.ICON_INFORMATION,
+            )
+            self.app.Raise()
+            self.app.SetFocus()
+            if dlg.ShowModal() == wx.ID_NO:
+                dlg.Destroy()
+                if self.app.file_parser == True:
+                    os.chdir(self.app.cwd)
+                return
+            dlg.Destroy()
+        elif output_files(output_file) != []:
+            dlg = wx.MessageDialog(
+                self.app,
+                "The {} file already exists. Do you want to overwrite it?".format(
+                    output_file
+                ),
                 "Warning",
                 wx.YES_NO | wx.ICON_WARNING,
             )
@@ -121,17 +167,38 @@ class Convert_pipe:
             if dlg.ShowModal() == wx.ID_NO:
                 dlg.Destroy()
                 if self.app.file_parser == True:
-                    os.chdir(self.cwd)
+                    os.chdir(self.app.cwd)
                 return
             dlg.Destroy()
 
         print("converting nmrPipe")
         # Add the necessary permissions to the fid.com file
         os.system("chmod +x fid.com")
-        # Run the fid.com file
-        command = "csh fid.com"
-        p = subprocess.Popen(command, shell=True)
-        p.wait()
+        # Run the fid.com file in the background, showing its progress
+        self.parameters = parameters
+        self.output_file = output_file
+        self.monitor = JobMonitor(
+            self.app,
+            "csh fid.com",
+            cwd=os.getcwd(),
+            title="nmrPipe conversion",
+            on_finished=self.conversion_finished,
+        )
+
+    def conversion_finished(self, job) -> None:
+        """
+        Record a successful conversion in the conversion cache
+        """
+        if job.status == "finished":
+            try:
+                record_conversion(
+                    self.output_file,
+                    self.parameters,
+                    method="nmrPipe",
+                    directory=job.cwd,
+                )
+            except OSError:
+                pass
 
 
 class WritePipe:
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+from typing import Union, Tuple
+
+from SpinExplorer.SpinConverter.FindingParameters.parameters import FindingParameters
+from SpinExplorer.SpinConverter.FindingParameters.errors import (
+    ConversionError,
+    show_error,
+)
+from SpinExplorer.SpinConverter.StoringParameters.conversion_parameters import (
+    ConversionParameters,
+)
+from SpinExplorer.SpinConverter.Conversion.convert_nmrglue import Convert_nmrglue
+from SpinExplorer.SpinConverter.Conversion.cache import is_cached, record_conversion
+
+
+def find_conversion_parameters() -> ConversionParameters:
+    """
+    Search the spectrometer files in the current directory and return the
+    default conversion parameters (the values the GUI starts with)
+    """
+    nmrdata = FindingParameters(headless=True)
+    return ConversionParameters.from_nmrdata(nmrdata)
+
+
+def convert_headless(
+    directory: str = ".",
+    parameter_file: Union[str, None] = None,
+    output_file: str = "test.fid",
+    save_parameters: bool = False,
+    force: bool = False,
+) -> Tuple[str, bool]:
+    """
+    Convert the Bruker/Varian data in directory to nmrPipe format using
+    nmrglue, without the SpinConverter GUI.
+
+    The conversion parameters are read from parameter_file if given,
+    otherwise from parameters.json in the data directory (as saved by the
+    GUI) and otherwise found from the spectrometer files. If
+    save_parameters is True the parameters used are written to
+    parameters.json. The output file is relative to the data directory.
+
+    If the conversion cache shows the output was already converted from
+    the same raw data with the same parameters it is not converted again
+    unless force is True. Returns the path of the converted FID and
+    whether it was converted; errors raise ConversionError.
+    """
+    if parameter_file is not None:
+        parameter_file = os.path.abspath(parameter_file)
+
+    cwd = os.getcwd()
+    try:
+        os.chdir(directory)
+    except OSError as error:
+        raise ConversionError("Unable to open {}: {}".format(directory, error))
+
+    try:
+        parameters = None
+        if parameter_file is not None:
+            try:
+                parameters = ConversionParameters.from_json(parameter_file)
+            except Exception as error:
+                raise ConversionError(
+                    "Unable to read conversion parameters from {}: {}".format(
+                        parameter_file, error
+                    )
+                )
+        elif os.path.exists("parameters.json"):
+            try:
+                parameters = ConversionParameters.from_json("parameters.json")
+            except Exception:
+                show_error(
+                    None,
+                    "Unable to read the conversion parameters in parameters.json. Continuing with default parameters.",
+                    headless=True,
+                    fatal=False,
+                )
+        if parameters is None:
+            try:
+                parameters = find_conversion_parameters()
+            except ConversionError:
+                raise
+            except Exception as error:
+                raise ConversionError(
+                    "Unable to find the conversion parameters in {}: {}".format(
+                        os.getcwd(), error
+                    )
+                )
+
+        if save_parameters == True:
+            parameters.write_json("parameters.json")
+
+        if force == False and is_cached(output_file, parameters) == True:
+            return os.path.abspath(output_file), False
+
+        try:
+            Convert_nmrglue(parameters, output_file)
+        except Exception as error:
+            raise ConversionError(
+                "Unable to convert the data in {}: {}".format(os.getcwd(), error)
+            )
+        try:
+            record_conversion(output_file, parameters)
+        except OSError as error:
+            show_error(
+                None,
+                "Unable to update the conversion cache: {}".format(error),
+                headless=True,
+                fatal=False,
+            )
+        return os.path.abspath(output_file), True
+    finally:
+        os.chdir(cwd)
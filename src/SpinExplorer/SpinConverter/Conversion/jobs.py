@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import re
+import signal
+import threading
+import subprocess
+from typing import Callable, List, Tuple, Union
+
+
+# nmrPipe and its tools report progress as e.g. "XYZ2Pipe Partition: Plane 12 of 128"
+progress_pattern = re.compile(r"(\d+)\s+of\s+(\d+)")
+
+
+def parse_progress(line: str) -> Union[float, None]:
+    """
+    Return the fraction complete reported by a line of nmrPipe output, or
+    None if the line is not a progress report
+    """
+    match = progress_pattern.search(line)
+    if match is None:
+        return None
+    current, total = int(match.group(1)), int(match.group(2))
+    if total == 0 or current > total:
+        return None
+    return current / total
+
+
+class Job:
+    def __init__(
+        self,
+        command: str,
+        cwd: str = ".",
+        name: str = "",
+        on_output: Union[Callable, None] = None,
+        on_progress: Union[Callable, None] = None,
+        on_finished: Union[Callable, None] = None,
+    ) -> None:
+        """
+        An external command (e.g. csh fid.com) run by the JobManager in
+        the directory cwd. Its stdout/stderr are kept line by line in
+        output and passed to on_output(job, stream, line) as they arrive,
+        except progress reports, which update progress (0-1) and are passed
+        to on_progress(job, progress). on_finished(job) is called once the
+        job has finished, failed or been cancelled. The callbacks are called
+        from the job's thread.
+        """
+        self.command = command
+        self.cwd = os.path.abspath(cwd)
+        self.name = name if name != "" else command
+        self.on_output = on_output
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+
+        # queued, running, finished, failed or cancelled
+        self.status = "queued"
+        self.returncode = None
+        self.progress = None
+        self.output: List[Tuple[str, str]] = []
+        self.process = None
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        with self.lock:
+            if self.status == "cancelled":
+                self.finish()
+                return
+            try:
+                self.process = subprocess.Popen(
+                    self.command,
+                    shell=True,
+                    cwd=self.cwd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    # Run the script in its own process group so cancelling it
+                    # also stops the nmrPipe commands it started
+                    start_new_session=(os.name == "posix"),
+                )
+            except OSError as error:
+                self.status = "failed"
+                self.output.append(("stderr", str(error)))
+                self.finish()
+                return
+            self.status = "running"
+
+        readers = [
+            threading.Thread(target=self.read_stream, args=(stream, name))
+            for stream, name in [
+                (self.process.stdout, "stdout"),
+                (self.process.stderr, "stderr"),
+            ]
+        ]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        self.returncode = self.process.wait()
+
+        with self.lock:
+            if self.status == "running":
+                if self.returncode == 0:
+                    self.status = "finished"
+                else:
+                    self.status = "failed"
+        self.finish()
+
+    def finish(self) -> None:
+        if self.on_finished is not None:
+            self.on_finished(self)
+        self.done.set()
+
+    def read_stream(self, stream, name: str) -> None:
+        """
+        Read a pipe as it is written, splitting lines on carriage returns
+        as well as newlines since nmrPipe redraws its progress with \\r
+        """
+        buffer = b""
+        while True:
+            chunk = stream.read1(4096)
+            if chunk == b"":
+                break
+            buffer += chunk
+            *lines, buffer = re.split(rb"[\r\n]", buffer)
+            for line in lines:
+                self.add_line(name, line.decode(errors="replace"))
+        self.add_line(name, buffer.decode(errors="replace"))
+        stream.close()
+
+    def add_line(self, stream: str, line: str) -> None:
+        if line.strip() == "":
+            return
+        self.output.append((stream, line))
+        progress = parse_progress(line)
+        if progress is not None:
+            self.progress = progress
+            if self.on_progress is not None:
+                self.on_progress(self, progress)
+        elif self.on_output is not None:
+            self.on_output(self, stream, line)
+
+    def cancel(self) -> None:
+        """
+        Stop the job if it is running, or stop it from starting if it is
+        still queued
+        """
+        with self.lock:
+            if self.status not in ["queued", "running"]:
+                return
+            self.status = "cancelled"
+            if self.process is None or self.process.poll() is not None:
+                return
+            try:
+                if os.name == "posix":
+                    os.killpg(self.process.pid, signal.SIGTERM)
+                else:
+                    self.process.terminate()
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def wait(self, timeout: Union[float, None] = None) -> bool:
+        """
+        Wait for the job to end, returning False if timeout (s) was reached
+        """
+        return self.done.wait(timeout)
+
+    def stdout(self) -> List[str]:
+        return [line for stream, line in self.output if stream == "stdout"]
+
+    def stderr(self) -> List[str]:
+        return [line for stream, line in self.output if stream == "stderr"]
+
+
+class JobManager:
+    def __init__(self, max_jobs: int = 1) -> None:
+        """
+        Runs external commands (nmrPipe conversion/processing scripts,
+        showhdr) in background threads so the GUI stays responsive. At most
+        max_jobs commands run at once; further jobs are queued and started
+        in the order they were submitted.
+        """
+        self.max_jobs = max(1, max_jobs)
+        self.jobs: List[Job] = []
+        self.queue: List[Job] = []
+        self.running = 0
+        self.lock = threading.Lock()
+
+    def submit(self, command: str, cwd: str = ".", name: str = "", **callbacks) -> Job:
+        """
+        Queue a command to run in cwd, returning its Job. The callbacks
+        (on_output, on_progress, on_finished) are passed to the Job
+        """
+        job = Job(command, cwd, name, **callbacks)
+        with self.lock:
+            self.jobs.append(job)
+            self.queue.append(job)
+        self.start_jobs()
+        return job
+
+    def set_max_jobs(self, max_jobs: int) -> None:
+        self.max_jobs = max(1, max_jobs)
+        self.start_jobs()
+
+    def start_jobs(self) -> None:
+        with self.lock:
+            while self.queue != [] and self.running < self.max_jobs:
+                job = self.queue.pop(0)
+                self.running += 1
+                threading.Thread(
+                    target=self.run_job, args=(job,), name=job.name, daemon=True
+                ).start()
+
+    def run_job(self, job: Job) -> None:
+        try:
+            job.run()
+        finally:
+            with self.lock:
+                self.running -= 1
+            self.start_jobs()
+
+    def active_jobs(self, cwd: Union[str, None] = None) -> List[Job]:
+        # Queued or running jobs, only those run in cwd if it is given
+        jobs = [job for job in self.jobs if job.status in ["queued", "running"]]
+        if cwd is not None:
+            jobs = [job for job in jobs if job.cwd == os.path.abspath(cwd)]
+        return jobs
+
+    def cancel_all(self) -> None:
+        for job in self.active_jobs():
+            job.cancel()
+
+
+def default_max_jobs() -> int:
+    """
+    The number of scripts run at once, set by the SPINEXPLORER_MAX_JOBS
+    environment variable (default: the number of CPUs)
+    """
+    try:
+        return int(os.environ["SPINEXPLORER_MAX_JOBS"])
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+# One job manager shared by all the windows in the session
+job_manager = None
+
+
+def get_job_manager() -> JobManager:
+    global job_manager
+    if job_manager is None:
+        job_manager = JobManager(default_max_jobs())
+    return job_manager
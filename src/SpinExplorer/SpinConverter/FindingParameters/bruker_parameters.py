@@ -23,14 +23,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE."""
 
 
-import wx
-import nmrglue as ng
-import os
 import warnings
 
 warnings.simplefilter("ignore", UserWarning)
 from typing import List
 
+from SpinExplorer.SpinConverter.FindingParameters.parameter_index import (
+    get_parameter_index,
+)
+from SpinExplorer.SpinConverter.FindingParameters.errors import show_error
+
 
 class ParameterExtractorBruker:
     def __init__(self, nmrdata) -> None:
@@ -39,15 +41,21 @@ class ParameterExtractorBruker:
         to find relevant parameters needed for conversion to nmrPipe format.
         """
         self.nmrdata = nmrdata
+        self.headless = self.nmrdata.headless
+
+        if self.headless == False:
+            import wx
 
-        # Creating a hidden frame to be used as a parent for popout messages
-        self.tempframe = wx.Frame(None, title="Temporary Parent", size=(1, 1))
-        self.tempframe.Hide()  # Hide the frame since we don't need it to be visible
+            # Creating a hidden frame to be used as a parent for popout messages
+            self.tempframe = wx.Frame(None, title="Temporary Parent", size=(1, 1))
+            self.tempframe.Hide()  # Hide the frame since we don't need it to be visible
+        else:
+            self.tempframe = None
 
-        self.acqus_file = open(self.nmrdata.parameter_file, "r")
-        self.acqus_file_lines = self.acqus_file.readlines()
-        self.acqus_file.close()
-        self.udic = ng.bruker.guess_udic(self.nmrdata.nmr_dic, self.nmrdata.nmr_data)
+        # All acqus/acqu2s/acqu3s lookups go through the shared parameter index,
+        # which parses each file once into a dictionary
+        self.parameter_index = get_parameter_index()
+        self.acqus = self.parameter_index.jcamp(self.nmrdata.parameter_file)
 
     def find_size_bruker(self) -> None:
         """
@@ -67,15 +75,10 @@ class ParameterExtractorBruker:
 
     def find_direct_bruker(self) -> List[int]:
         """
-        Reading through Bruker acqus file lines to find the TD entry for
-        direct dimension size.
+        Reading the TD entry of the Bruker acqus file for direct dimension size.
         """
-        for i in range(len(self.acqus_file_lines)):
-            if "##$TD=" in self.acqus_file_lines[i]:
-                line = self.acqus_file_lines[i].split()
-                size_direct = int(line[1])
-                size_direct_complex = int(size_direct)
-                break
+        size_direct = int(self.acqus["TD"])
+        size_direct_complex = int(size_direct)
 
         return size_direct, size_direct_complex
 
@@ -99,36 +102,20 @@ class ParameterExtractorBruker:
                 self.size_direct = self.size_1 * 2
 
         except:
-            dlg = wx.MessageDialog(
+            show_error(
                 self.tempframe,
                 "Error in finding data dimension sizes. Please check the acqus file and try again.",
-                "Error",
-                wx.OK | wx.ICON_ERROR,
+                self.headless,
             )
-            self.tempframe.Raise()
-            self.tempframe.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
-            exit()
 
     def find_indirect_bruker(self) -> List:
         """
         Looking for initial guesses for the size of the Bruker indirect dimensions
         """
         size_indirect = []
-        found_indirect_sizes = False
-        for i in range(len(self.acqus_file_lines)):
-            if "##$TD_INDIRECT" in self.acqus_file_lines[i]:
-                found_indirect_sizes = True
-                continue
-            if found_indirect_sizes == True:
-                line = self.acqus_file_lines[i].split()
-                for j in range(len(line)):
-                    if line[j] == "0":
-                        pass
-                    else:
-                        size_indirect.append(int(line[j]))
-                break
+        for size in self.acqus.get("TD_INDIRECT", []):
+            if int(size) != 0:
+                size_indirect.append(int(size))
 
         return size_indirect
 
@@ -141,64 +128,15 @@ class ParameterExtractorBruker:
         # Look to see if there is an acqu2s/acqu3s file
         if len(self.size_indirect) == 0:
             # Checking other spectrometer files if TD_INDIRECT is empty
-            if "acqu2s" in os.listdir("./"):
-                self.sizes_dim2 = []
-                self.sizes_dim2_nus = []
-                # Look for TD in the acqu2s file
-                with open("acqu2s", "r") as file:
-                    file_lines = file.readlines()
-                    for i in range(len(file_lines)):
-                        if "##$NUSTD=" in file_lines[i]:
-                            line = file_lines[i].split("\n")[0].split()
-                            self.sizes_dim2_nus = int(line[1])
-                            break
-                        if "##$TD=" in file_lines[i]:
-                            line = file_lines[i].split()
-                            self.sizes_dim2 = int(line[1])
-                            break
-
-                if self.sizes_dim2_nus != []:
-                    self.size_indirect.append(self.sizes_dim2_nus)
-                else:
-                    self.size_indirect.append(self.sizes_dim2)
-
-            if "acqu3s" in os.listdir("./"):
-                self.sizes_dim3 = []
-                self.sizes_dim3_nus = []
-                # Look for TD in the acqu3s file
-                with open("acqu3s", "r") as file:
-                    file_lines = file.readlines()
-                    for i in range(len(file_lines)):
-                        if "##$NUSTD=" in file_lines[i]:
-                            line = file_lines[i].split("\n")[0].split()
-                            self.sizes_dim3_nus = int(line[1])
-                            break
-                        if "##$TD=" in file_lines[i]:
-                            line = file_lines[i].split()
-                            self.sizes_dim3 = int(line[1])
-                            break
-
-                if self.sizes_dim3_nus != []:
-                    self.size_indirect.append(self.sizes_dim3_nus)
-                else:
-                    self.size_indirect.append(self.sizes_dim3)
-
-        try:
-            self.size_indirect
-        except:
-            dlg = wx.MessageDialog(
-                self.tempframe,
-                "Error: TD_INDIRECT not found in acqus file. Unable to determine size of data for indirect dimension. Unable to convert data to NMRPipe format. Please check the acqus file and try again.",
-                "Error",
-                wx.OK | wx.ICON_ERROR,
-            )
-            self.tempframe.Raise()
-            self.tempframe.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
-            exit()
+            for dimension in [2, 3]:
+                if self.parameter_index.exists("acqu{}s".format(dimension)):
+                    # Use NUSTD (number of sampled points) if present, otherwise TD
+                    acqus = self.parameter_index.acqus(dimension)
+                    self.size_indirect.append(
+                        int(acqus.get("NUSTD", acqus.get("TD", 0)))
+                    )
 
-        if self.size_indirect != [] and "acqu2s" not in os.listdir("./"):
+        if self.size_indirect != [] and not self.parameter_index.exists("acqu2s"):
             self.size_indirect = []
 
         # Remove values from size indirect if they are equal to 1
@@ -211,190 +149,73 @@ class ParameterExtractorBruker:
 
         # Try to go through acqu2s and acqu3s and find the nucleus labels and corresponding TD values
         self.indirect_sizes_dict = {}
-        if "acqu2s" in os.listdir("./"):
-            # Look for TD in the acqu2s file
-            nus = False
-            with open("acqu2s", "r") as file:
-                file_lines = file.readlines()
-
-                for i in range(len(file_lines)):
-                    if "##$NUSTD=" in file_lines[i] or "##$NusTD=" in file_lines[i]:
-                        nus = True
-                        line = file_lines[i].split("\n")[0].split()
-                        self.sizes_dim2_nus = int(line[1])
-                    if "##$TD=" in file_lines[i]:
-                        line = file_lines[i].split()
-                        self.sizes_dim2 = int(line[1])
-                    if "##$NUC1=" in file_lines[i]:
-                        line = file_lines[i].split("\n")[0]
-                        nuc = line.split("<")[1].split(">")[0]
-
+        for dimension in [2, 3]:
+            if not self.parameter_index.exists("acqu{}s".format(dimension)):
+                continue
             try:
-                if nus == False:
-                    self.indirect_sizes_dict[nuc] = self.sizes_dim2
+                acqus = self.parameter_index.acqus(dimension)
+                nuc = str(acqus["NUC1"])
+                if "NUSTD" in acqus:
+                    size = int(acqus["NUSTD"])
+                elif "NusTD" in acqus:
+                    size = int(acqus["NusTD"])
                 else:
-                    self.indirect_sizes_dict[nuc] = self.sizes_dim2_nus
-            except:
-                pass
-
-        if "acqu3s" in os.listdir("./"):
-            # Look for TD in the acqu2s file
-            nus = False
-            with open("acqu3s", "r") as file:
-                file_lines = file.readlines()
-                for i in range(len(file_lines)):
-                    if "##$NUSTD=" in file_lines[i] or "##$NusTD=" in file_lines[i]:
-                        nus = True
-                        line = file_lines[i].split("\n")[0].split()
-                        self.sizes_dim3_nus = int(line[1])
-                    if "##$TD=" in file_lines[i]:
-                        line = file_lines[i].split()
-                        self.sizes_dim3 = int(line[1])
-                    if "##$NUC1=" in file_lines[i]:
-                        line = file_lines[i].split("\n")[0]
-                        nuc = line.split("<")[1].split(">")[0]
-
-            try:
-                if nus == False:
-                    if nuc not in self.indirect_sizes_dict.keys():
-                        self.indirect_sizes_dict[nuc] = self.sizes_dim3
-                    else:
-                        self.indirect_sizes_dict[nuc + "_1"] = self.sizes_dim3
+                    size = int(acqus["TD"])
+                if nuc not in self.indirect_sizes_dict.keys():
+                    self.indirect_sizes_dict[nuc] = size
                 else:
-                    if nuc not in self.indirect_sizes_dict.keys():
-                        self.indirect_sizes_dict[nuc] = self.sizes_dim3_nus
-                    else:
-                        self.indirect_sizes_dict[nuc + "_1"] = self.sizes_dim3_nus
+                    self.indirect_sizes_dict[nuc + "_1"] = size
             except:
                 pass
 
     def find_sw_bruker(self) -> None:
         """
-        Reading through the Bruker acqus file to find the sweep widths
-        for each spectrum dimension.
+        Reading the sweep widths (SW_h) for each spectrum dimension from the
+        Bruker acqus, acqu2s, acqu3s and acqu4s files.
         """
-        for i in range(len(self.size_indirect) + 1):
-            if i == 0:
-                for j in range(len(self.acqus_file_lines)):
-                    if "##$SW_h=" in self.acqus_file_lines[j]:
-                        line = self.acqus_file_lines[j].split()
-                        self.sw_direct = float(line[1])
-                        break
-            if i == 1:
-                try:
-                    self.sw_indirect = []
-                    file = open("acqu2s", "r")
-                    file_lines = file.readlines()
-                    file.close()
-                    for j in range(len(file_lines)):
-                        if "##$SW_h=" in file_lines[j]:
-                            line = file_lines[j].split()
-                            self.sw_indirect.append(float(line[1]))
-                            break
-                except:
-                    self.sw_indirect.append(0)
-            if i == 2:
-                try:
-                    file = open("acqu3s", "r")
-                    file_lines = file.readlines()
-                    file.close()
-                    for j in range(len(file_lines)):
-                        if "##$SW_h=" in file_lines[j]:
-                            line = file_lines[j].split()
-                            self.sw_indirect.append(float(line[1]))
-                            break
-                except:
-                    self.sw_indirect.append(0)
-            if i == 3:
-                try:
-                    file = open("acqu4s", "r")
-                    file_lines = file.readlines()
-                    file.close()
-                    for j in range(len(file_lines)):
-                        if "##$SW_h=" in file_lines[j]:
-                            line = file_lines[j].split()
-                            self.sw_indirect.append(float(line[1]))
-                            break
-                except:
-                    self.sw_indirect.append(0)
-
-            if i > 3:
-                dlg = wx.MessageDialog(
-                    self.tempframe,
-                    "Error: Only able to convert data with up to 4 indirect dimensions. Unable to convert data to NMRPipe format. Please check the acqus file and try again.",
-                    "Error",
-                    wx.OK | wx.ICON_ERROR,
+        if len(self.size_indirect) > 3:
+            show_error(
+                self.tempframe,
+                "Error: Only able to convert data with up to 4 indirect dimensions. Unable to convert data to NMRPipe format. Please check the acqus file and try again.",
+                self.headless,
+            )
+        self.sw_direct = float(self.acqus["SW_h"])
+        self.sw_indirect = []
+        for i in range(len(self.size_indirect)):
+            try:
+                self.sw_indirect.append(
+                    float(self.parameter_index.bruker_parameter("SW_h", i + 2))
                 )
-                self.tempframe.Raise()
-                self.tempframe.SetFocus()
-                dlg.ShowModal()
-                dlg.Destroy()
-                exit()
+            except:
+                self.sw_indirect.append(0)
 
     def find_nucleus_frequencies_bruker(self) -> None:
         """
-        Searching through the Bruker acqus file for the Larmor frequency
-        of each nucleus recorded.
+        Reading the Larmor frequency (SFO1) of each nucleus recorded from the
+        Bruker acqus, acqu2s, acqu3s and acqu4s files.
         """
-        self.nucleus_frequencies = []
-        for i in range(len(self.size_indirect) + 1):
-            if i == 0:
-                for j in range(len(self.acqus_file_lines)):
-                    if "##$SFO1=" in self.acqus_file_lines[j]:
-                        line = self.acqus_file_lines[j].split()
-                        self.nucleus_frequencies.append(float(line[1]))
-                        break
-            if i == 1:
-                try:
-                    file = open("acqu2s", "r")
-                    file_lines = file.readlines()
-                    file.close()
-                    for j in range(len(file_lines)):
-                        if "##$SFO1=" in file_lines[j]:
-                            line = file_lines[j].split()
-                            self.nucleus_frequencies.append(float(line[1]))
-                            break
-                except:
-                    self.nucleus_frequencies.append(0)
-            if i == 2:
-                try:
-                    file = open("acqu3s", "r")
-                    file_lines = file.readlines()
-                    file.close()
-                    for j in range(len(file_lines)):
-                        if "##$SFO1=" in file_lines[j]:
-                            line = file_lines[j].split()
-                            self.nucleus_frequencies.append(float(line[1]))
-                            break
-                except:
-                    self.nucleus_frequencies.append(0)
-            if i == 3:
-                try:
-                    file = open("acqu4s", "r")
-                    file_lines = file.readlines()
-                    file.close()
-                    for j in range(len(file_lines)):
-                        if "##$SFO1=" in file_lines[j]:
-                            line = file_lines[j].split()
-                            self.nucleus_frequencies.append(float(line[1]))
-                            break
-                except:
-                    self.nucleus_frequencies.append(0)
+        self.nucleus_frequencies = [float(self.acqus["SFO1"])]
+        for i in range(min(len(self.size_indirect), 3)):
+            try:
+                self.nucleus_frequencies.append(
+                    float(self.parameter_index.bruker_parameter("SFO1", i + 2))
+                )
+            except:
+                self.nucleus_frequencies.append(0)
 
     def find_labels_bruker(self) -> None:
         """
         Search through the Bruker acqus file to find the labels for each
         dimension.
         """
+        # The channels are stored as NUC1, NUC2, ... (not NUCLEUS/NUCLEI)
+        channels = []
+        for key in self.acqus:
+            if key.startswith("NUC") and key[3:].isdigit():
+                channels.append(int(key[3:]))
         self.labels = []
-        for j in range(len(self.acqus_file_lines)):
-            if (
-                "##$NUC" in self.acqus_file_lines[j]
-                and "##$NUCLEUS" not in self.acqus_file_lines[j]
-                and "##$NUCLEI" not in self.acqus_file_lines[j]
-            ):
-                line = self.acqus_file_lines[j].split()
-                self.labels.append(line[1].split("<")[1].split(">")[0])
+        for channel in sorted(channels):
+            self.labels.append(str(self.acqus["NUC{}".format(channel)]))
 
         # If the labels are off, then change them to ID
         for i in range(len(self.labels)):
@@ -512,16 +333,12 @@ class ParameterExtractorBruker:
                     self.pulseprogram_file_lines = self.pulseprogram_file.readlines()
                     self.pulseprogram_file.close()
                 except:
-                    dlg = wx.MessageDialog(
+                    show_error(
                         self.tempframe,
                         "Error: TD not found in acqus file. Unable to determine size of data for direct dimension. Unable to convert data to NMRPipe format. Please check the acqus file and try again.",
-                        "Error",
-                        wx.OK | wx.ICON_ERROR,
+                        self.headless,
+                        fatal=False,
                     )
-                    self.tempframe.Raise()
-                    self.tempframe.SetFocus()
-                    dlg.ShowModal()
-                    dlg.Destroy()
 
             count = 0
             try:
@@ -615,61 +432,13 @@ class ParameterExtractorBruker:
                         self.pseudo_flag += 1
                         self.acqusition_modes[-1] = "QF"
 
-            # If there is a pseudo axis, then the number of real points in that dimension is the same as the number of complex points
-            if self.pseudo_flag == 1:
-                sizes = []
-                keys = []
-                for key in self.udic:
-                    if key == "ndim":
-                        continue
-                    else:
-                        keys.append(key)
-                        sizes.append(self.udic[key]["size"])
-
-                # Find the index of the minimum size (this is default set to the pseudo axis)
-                index = sizes.index(min(sizes))
-                self.udic[keys[index]]["complex"] = False
-                self.udic[keys[index]]["encoding"] = "Real"
-                self.udic[keys[index]]["obs"] = 0
-                self.udic[keys[index]]["sw"] = 0
-                self.udic[keys[index]]["car"] = 0
-
-            elif self.pseudo_flag == 2:
-                sizes = []
-                keys = []
-                for key in self.udic:
-                    if key == "ndim":
-                        continue
-                    else:
-                        keys.append(key)
-                        sizes.append(self.udic[key]["size"])
-
-                # Find the index of the minimum size (this is default set to the pseudo axis)
-                index = sizes.index(min(sizes))
-                self.udic[keys[index]]["encoding"] = "Real"
-                self.udic[keys[index]]["complex"] = False
-                self.udic[keys[index]]["obs"] = 1
-                self.udic[keys[index]]["sw"] = 1
-                self.udic[keys[index]]["car"] = 1
-                # Then find the next smallest size and set this to the pseudo axis
-                sizes[index] = max(sizes)
-                index = sizes.index(min(sizes))
-                self.udic[keys[index]]["encoding"] = "Real"
-                self.udic[keys[index]]["complex"] = False
-                self.udic[keys[index]]["obs"] = 1
-                self.udic[keys[index]]["sw"] = 1
-                self.udic[keys[index]]["car"] = 1
-
     def find_temperature_bruker(self) -> None:
         """
         Find the temperature the spectrum was recorded at
         """
         self.temperature = 298.15  # Default temperature is 298.15K
-        for i in range(len(self.acqus_file_lines)):
-            if "##$TE=" in self.acqus_file_lines[i]:
-                line = self.acqus_file_lines[i].split()
-                self.temperature = float(line[1])
-                break
+        if "TE" in self.acqus:
+            self.temperature = float(self.acqus["TE"])
 
     def calculate_carrier_frequency_bruker(self) -> None:
         """
@@ -688,32 +457,16 @@ class ParameterExtractorBruker:
                 self.water_ppm = 7.83 - self.temperature / 96.9
 
                 # Use O1/BF1 to calculate a second carrier frequency in case not centred on water
-                for j in range(len(self.acqus_file_lines)):
-                    if "##$O1=" in self.acqus_file_lines[j]:
-                        line = self.acqus_file_lines[j].split()
-                        self.O1 = float(line[1])
-                        break
-                for j in range(len(self.acqus_file_lines)):
-                    if "##$BF1=" in self.acqus_file_lines[j]:
-                        line = self.acqus_file_lines[j].split()
-                        self.BF1 = float(line[1])
-                        break
+                self.O1 = float(self.acqus["O1"])
+                self.BF1 = float(self.acqus["BF1"])
                 self.carrier_frequency_1 = self.O1 / self.BF1
 
                 self.references_proton = [self.water_ppm, self.carrier_frequency_1]
                 self.references_proton_labels = ["H2O", "O1/BF1"]
             else:
                 # Use O1/BF1 to calculate a second carrier frequency in case not centred on water
-                for j in range(len(self.acqus_file_lines)):
-                    if "##$O1=" in self.acqus_file_lines[j]:
-                        line = self.acqus_file_lines[j].split()
-                        self.O1 = float(line[1])
-                        break
-                for j in range(len(self.acqus_file_lines)):
-                    if "##$BF1=" in self.acqus_file_lines[j]:
-                        line = self.acqus_file_lines[j].split()
-                        self.BF1 = float(line[1])
-                        break
+                self.O1 = float(self.acqus["O1"])
+                self.BF1 = float(self.acqus["BF1"])
                 self.carrier_frequency_1 = self.O1 / self.BF1
 
                 self.references_proton = [self.carrier_frequency_1]
@@ -729,40 +482,16 @@ class ParameterExtractorBruker:
                 self.water_ppm = 7.83 - self.temperature / 96.9
 
             # Use O1/BF1 to calculate a second carrier frequency in case not centred on water
-            for j in range(len(self.acqus_file_lines)):
-                if "##$O1=" in self.acqus_file_lines[j]:
-                    line = self.acqus_file_lines[j].split()
-                    self.O1 = float(line[1])
-                    break
-            for j in range(len(self.acqus_file_lines)):
-                if "##$BF1=" in self.acqus_file_lines[j]:
-                    line = self.acqus_file_lines[j].split()
-                    self.BF1 = float(line[1])
-                    break
+            self.O1 = float(self.acqus["O1"])
+            self.BF1 = float(self.acqus["BF1"])
             self.carrier_frequency_1 = self.O1 / self.BF1
 
             # Calculate carrier frequencies based on O2/BF2, O3/BF3
 
-            for j in range(len(self.acqus_file_lines)):
-                if "##$O2=" in self.acqus_file_lines[j]:
-                    line = self.acqus_file_lines[j].split()
-                    self.O2 = float(line[1])
-                    break
-            for j in range(len(self.acqus_file_lines)):
-                if "##$O3=" in self.acqus_file_lines[j]:
-                    line = self.acqus_file_lines[j].split()
-                    self.O3 = float(line[1])
-                    break
-            for j in range(len(self.acqus_file_lines)):
-                if "##$BF2=" in self.acqus_file_lines[j]:
-                    line = self.acqus_file_lines[j].split()
-                    self.BF2 = float(line[1])
-                    break
-            for j in range(len(self.acqus_file_lines)):
-                if "##$BF3=" in self.acqus_file_lines[j]:
-                    line = self.acqus_file_lines[j].split()
-                    self.BF3 = float(line[1])
-                    break
+            self.O2 = float(self.acqus["O2"])
+            self.O3 = float(self.acqus["O3"])
+            self.BF2 = float(self.acqus["BF2"])
+            self.BF3 = float(self.acqus["BF3"])
             # Calculate the carrier frequency
             self.carrier_frequency_2 = self.O2 / self.BF2
             self.carrier_frequency_3 = self.O3 / self.BF3
@@ -856,24 +585,15 @@ class ParameterExtractorBruker:
             self.references_other_labels.append("O3/BF3")
 
     def find_bruker_digital_filter_parameters(self):
-        # Search through the acqus file to find the parameters
-        acqus_file_lines = open(self.nmrdata.parameter_file, "r").readlines()
-
-        # Find the decim, dspfvs and grpdly parameters
+        # Find the decim, dspfvs and grpdly parameters in the acqus file
         self.decim = 0
         self.dspfvs = 0
         self.grpdly = 0
         try:
-            for i in range(len(acqus_file_lines)):
-                if "##$DECIM=" in acqus_file_lines[i]:
-                    line = acqus_file_lines[i].split()
-                    self.decim = float(line[1])
-                if "##$DSPFVS=" in acqus_file_lines[i]:
-                    line = acqus_file_lines[i].split()
-                    self.dspfvs = int(line[1])
-                if "##$GRPDLY=" in acqus_file_lines[i]:
-                    line = acqus_file_lines[i].split()
-                    self.grpdly = float(line[1])
+            acqus = self.parameter_index.jcamp(self.nmrdata.parameter_file)
+            self.decim = float(acqus.get("DECIM", 0))
+            self.dspfvs = int(acqus.get("DSPFVS", 0))
+            self.grpdly = float(acqus.get("GRPDLY", 0))
             self.include_digital_filter = True
 
         except:
@@ -883,18 +603,11 @@ class ParameterExtractorBruker:
             self.include_digital_filter = False
 
     def find_bruker_scaling_parameters(self):
-        # Search through the acqus file to find the NS and NC parameters
-        acqus_file_lines = open(self.nmrdata.parameter_file, "r").readlines()
-
-        # Find the NS and NC parameters
+        # Find the NS and NC parameters in the acqus file
         try:
-            for i in range(len(acqus_file_lines)):
-                if "##$NS=" in acqus_file_lines[i]:
-                    line = acqus_file_lines[i].split()
-                    self.NS = int(line[1])
-                if "##$NC=" in acqus_file_lines[i]:
-                    line = acqus_file_lines[i].split()
-                    self.NC = int(line[1])
+            acqus = self.parameter_index.jcamp(self.nmrdata.parameter_file)
+            self.NS = int(acqus["NS"])
+            self.NC = int(acqus["NC"])
             self.include_scaling = True
         except:
             self.NS = 0
@@ -903,22 +616,14 @@ class ParameterExtractorBruker:
 
     def determine_byte_order(self):
         try:
-            with open(self.nmrdata.parameter_file) as file:
-                lines = file.readlines()
-                for line in lines:
-                    if ("##$BYTORDA") in line:
-                        self.byte_order = line.split("\n")[0].split()[-1]
-                        break
+            acqus = self.parameter_index.jcamp(self.nmrdata.parameter_file)
+            self.byte_order = str(acqus["BYTORDA"])
         except:
             self.byte_order = 0
 
     def determine_byte_size(self):
         try:
-            with open(self.nmrdata.parameter_file) as file:
-                lines = file.readlines()
-                for line in lines:
-                    if ("##$DTYPA") in line:
-                        self.d_type = line.split("\n")[0].split()[-1]
-                        break
+            acqus = self.parameter_index.jcamp(self.nmrdata.parameter_file)
+            self.d_type = str(acqus["DTYPA"])
         except:
             self.d_type = 0
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import sys
+
+
+class ConversionError(Exception):
+    """
+    Raised by the headless SpinConverter pipeline wherever the GUI would
+    show an error message and exit.
+    """
+
+
+def show_error(
+    parent, message: str, headless: bool = False, fatal: bool = True
+) -> None:
+    """
+    Report a problem found while reading the spectrometer files. In the GUI
+    this is a popout message (exiting SpinConverter if the error is fatal).
+    When running headless, fatal errors raise a ConversionError and anything
+    else is printed as a warning so the conversion can carry on.
+    """
+    if headless == True:
+        if fatal == True:
+            raise ConversionError(message)
+        print("Warning: " + message, file=sys.stderr)
+        return
+
+    # wx is only imported for the GUI so headless conversions run without it
+    import wx
+
+    dlg = wx.MessageDialog(parent, message, "Error", wx.OK | wx.ICON_ERROR)
+    parent.Raise()
+    parent.SetFocus()
+    dlg.ShowModal()
+    dlg.Destroy()
+    if fatal == True:
+        exit()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import numpy as np
+import nmrglue as ng
+import warnings
+
+warnings.simplefilter("ignore", UserWarning)
+from typing import Dict, List
+
+
+class ParameterIndex:
+    def __init__(self, directory: str = ".") -> None:
+        """
+        This class holds the parsed parameter files of a single experiment
+        directory (Bruker acqus/acqu2s/acqu3s/acqu4s, Varian procpar, the
+        Bruker Difframp gradient list and the fid.com conversion script).
+        Each file is parsed once and only parsed again if its modification
+        time changes, so parameter lookups never need to read the NMR data.
+        """
+        self.directory = directory
+        self.parsed_files = {}
+
+    def parse_file(self, file_name: str, parser):
+        """
+        Return the parsed contents of a file in the experiment directory,
+        reparsing it only if it has been modified since it was last read.
+        Returns None if the file does not exist.
+        """
+        path = os.path.join(self.directory, file_name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self.parsed_files.pop(file_name, None)
+            return None
+        cached = self.parsed_files.get(file_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        parsed = parser(path)
+        self.parsed_files[file_name] = (mtime, parsed)
+        return parsed
+
+    def exists(self, file_name: str) -> bool:
+        return os.path.exists(os.path.join(self.directory, file_name))
+
+    # Bruker JCAMP parameter files
+
+    def jcamp(self, file_name: str) -> Dict:
+        """
+        Return the dictionary of a Bruker JCAMP-DX parameter file
+        (parameter names without the $ prefix).
+        """
+        dic = self.parse_file(file_name, ng.bruker.read_jcamp)
+        if dic is None:
+            raise FileNotFoundError(
+                "Unable to find {}".format(os.path.join(self.directory, file_name))
+            )
+        return dic
+
+    def acqus_file_name(self, dimension: int = 1) -> str:
+        # acqus for the direct dimension, acqu2s, acqu3s... for indirect dimensions
+        if dimension == 1:
+            if not self.exists("acqus") and self.exists("acqu"):
+                return "acqu"
+            return "acqus"
+        return "acqu{}s".format(dimension)
+
+    def acqus(self, dimension: int = 1) -> Dict:
+        return self.jcamp(self.acqus_file_name(dimension))
+
+    def bruker_parameter(self, name: str, dimension: int = 1, index: int = None):
+        """
+        Return a parameter from the acqus file of the chosen dimension. If the
+        parameter is an array (e.g. D, P, PL) index selects a single element.
+        """
+        value = self.acqus(dimension)[name]
+        if index is not None:
+            return value[index]
+        return value
+
+    # Varian procpar file
+
+    def procpar(self) -> Dict:
+        """
+        Return the Varian procpar dictionary in the same format as
+        dic["procpar"] from ng.varian.read.
+        """
+        dic = self.parse_file("procpar", ng.varian.read_procpar)
+        if dic is None:
+            raise FileNotFoundError(
+                "Unable to find {}".format(os.path.join(self.directory, "procpar"))
+            )
+        return dic
+
+    def varian_values(self, name: str) -> List[str]:
+        return self.procpar()[name]["values"]
+
+    def varian_parameter(self, name: str, index: int = 0) -> float:
+        return float(self.varian_values(name)[index])
+
+    # NUS sampling schedule
+
+    def nuslist(self, file_name: str = "nuslist") -> np.ndarray:
+        """
+        Return the NUS sampling schedule as an integer array with one row per
+        sampled point and one column per indirect dimension.
+        """
+        schedule = self.parse_file(file_name, self.read_nuslist)
+        if schedule is None:
+            raise FileNotFoundError(
+                "Unable to find {}".format(os.path.join(self.directory, file_name))
+            )
+        return schedule
+
+    @staticmethod
+    def read_nuslist(path: str) -> np.ndarray:
+        return np.loadtxt(path, dtype=int, ndmin=2)
+
+    # Bruker diffusion gradient list
+
+    def difframp(self) -> List[float]:
+        """
+        Return the gradient fractions (0-1) in the Bruker Difframp file,
+        searching ./lists/gp/Difframp and then ./Difframp (older versions
+        of Topspin save the file here).
+        """
+        for file_name in [os.path.join("lists", "gp", "Difframp"), "Difframp"]:
+            gradients = self.parse_file(file_name, self.read_xydata)
+            if gradients:
+                return gradients
+        raise FileNotFoundError("Unable to find gradient percentages in Difframp")
+
+    @staticmethod
+    def read_xydata(path: str) -> List[float]:
+        # Values are listed one per line between ##XYDATA= (X++(Y..Y)) and ##END=
+        values = []
+        with open(path, "r") as file:
+            for line in file:
+                if "##XYDATA= (X++(Y..Y))" in line:
+                    break
+            for line in file:
+                if "##END=" in line:
+                    break
+                if line.strip() != "":
+                    values.append(float(line.split()[0]))
+        return values
+
+    # fid.com conversion script
+
+    def fid_com(self) -> Dict[str, str]:
+        """
+        Return a dictionary of the -option value pairs in fid.com (e.g.
+        "xCAR", "yLAB"). If an option appears more than once the last value
+        is kept.
+        """
+        dic = self.parse_file("fid.com", self.read_fid_com)
+        if dic is None:
+            raise FileNotFoundError(
+                "Unable to find {}".format(os.path.join(self.directory, "fid.com"))
+            )
+        return dic
+
+    def carrier(self, axis: str = "x") -> float:
+        return float(self.fid_com()[axis + "CAR"])
+
+    @staticmethod
+    def read_fid_com(path: str) -> Dict[str, str]:
+        options = {}
+        with open(path, "r") as file:
+            for line in file:
+                words = line.split()
+                for i, word in enumerate(words[:-1]):
+                    value = words[i + 1]
+                    if word.startswith("-") and len(word) > 1 and value != "\\":
+                        if value.startswith("-") and not is_number(value):
+                            continue
+                        options[word[1:]] = value
+        return options
+
+
+def is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+# One index per experiment directory, shared by all the programs in the session
+parameter_indexes = {}
+
+
+def get_parameter_index(directory: str = ".") -> ParameterIndex:
+    """
+    Return the cached ParameterIndex for an experiment directory (by default
+    the current working directory).
+    """
+    path = os.path.abspath(directory)
+    if path not in parameter_indexes:
+        parameter_indexes[path] = ParameterIndex(path)
+    return parameter_indexes[path]
@@ -24,32 +24,71 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE."""
 
 
-import wx
-import nmrglue as ng
 import os
 import warnings
+from typing import List, Tuple
 from SpinExplorer.SpinConverter.FindingParameters.varian_parameters import (
     ParameterExtractorVarian,
 )
 from SpinExplorer.SpinConverter.FindingParameters.bruker_parameters import (
     ParameterExtractorBruker,
 )
+from SpinExplorer.SpinConverter.FindingParameters.errors import show_error
+from SpinExplorer.SpinConverter.FindingParameters.raw_data import RawData
 
 warnings.simplefilter("ignore", UserWarning)
 
 
+def detect_nmr_files(directory: str = ".") -> Tuple[str, str, List[str]]:
+    """
+    Find the spectrometer type, parameter file and raw data files in a
+    directory without reading any data. Bruker data has an acqus (or
+    acqu) file with ser/fid data, Varian data has a procpar file with
+    fid/origfid data. Returns ("", "", []) if there is no parameter file.
+    """
+    files_in_directory = os.listdir(directory)
+    if "acqus" in files_in_directory:
+        spectrometer = "Bruker"
+        parameter_file = "acqus"
+    elif "procpar" in files_in_directory:
+        spectrometer = "Varian"
+        parameter_file = "procpar"
+    elif "acqu" in files_in_directory:
+        spectrometer = "Bruker"
+        parameter_file = "acqu"
+    else:
+        return "", "", []
+
+    files = []
+    for file in files_in_directory:
+        if spectrometer == "Bruker":
+            if file.endswith("ser") or file == "fid":
+                files.append(file)
+        else:
+            if file == "fid" or file == "origfid":
+                files.append(file)
+    return spectrometer, parameter_file, files
+
+
 class FindingParameters:
 
-    def __init__(self) -> None:
+    def __init__(self, headless: bool = False) -> None:
         """
         Initialising the converter class. The class reads the spectrometer
         parameter files to obtain relevant spectra for nmrpipe conversion
-        scripts.
+        scripts. If headless is True no wx frames or dialogs are created,
+        errors raise a ConversionError instead.
         """
+        self.headless = headless
+
+        if self.headless == False:
+            import wx
 
-        # Creating a hidden frame to be used as a parent for popout messages
-        self.tempframe = wx.Frame(None, title="Temporary Parent", size=(1, 1))
-        self.tempframe.Hide()  # Hide the frame since we don't need it to be visible
+            # Creating a hidden frame to be used as a parent for popout messages
+            self.tempframe = wx.Frame(None, title="Temporary Parent", size=(1, 1))
+            self.tempframe.Hide()  # Hide the frame since we don't need it to be visible
+        else:
+            self.tempframe = None
 
         # Get the NMR data and parameters
         self.find_nmr_files()
@@ -61,19 +100,19 @@ class FindingParameters:
         Finding the relevant NMR parameter and data files in the current
         directory.
         """
-        self.parameter_file = ""
-        if "acqus" in os.listdir("."):
-            self.spectrometer = "Bruker"
-            self.parameter_file = "acqus"
-        elif "procpar" in os.listdir("."):
-            self.spectrometer = "Varian"
-            self.parameter_file = "procpar"
-        else:
-            # Try to find acqu file
-            if "acqu" in os.listdir("."):
-                self.spectrometer = "Bruker"
-                self.parameter_file = "acqu"
-                # Inform the user that an acqu parameter file but not an acqus parameter file has been found, would you like to continue?
+        self.spectrometer, self.parameter_file, self.files = detect_nmr_files(".")
+        if self.parameter_file == "acqu":
+            # Inform the user that an acqu parameter file but not an acqus parameter file has been found, would you like to continue?
+            if self.headless == True:
+                show_error(
+                    self.tempframe,
+                    "An acqu parameter file but not an acqus parameter file has been found, continuing with acqu.",
+                    self.headless,
+                    fatal=False,
+                )
+            else:
+                import wx
+
                 dlg = wx.MessageDialog(
                     self.tempframe,
                     "An acqu parameter file but not an acqus parameter file has been found, would you like to continue?",
@@ -87,60 +126,42 @@ class FindingParameters:
                 else:
                     dlg.Destroy()
                     exit()
-            else:
-                # Give a popout error message saying that there are no bruker NMR files in the current directory, but found an acqus file
-                dlg = wx.MessageDialog(
-                    self.tempframe,
-                    "No Bruker (acqus) or Varian (procpar) NMR files found in the current directory. Please check the current directory and try again.",
-                    "Error",
-                    wx.OK | wx.ICON_ERROR,
-                )
-                self.tempframe.Raise()
-                self.tempframe.SetFocus()
-                dlg.ShowModal()
-                dlg.Destroy()
-                exit()
+        elif self.spectrometer == "":
+            # Give a popout error message saying that there are no bruker NMR files in the current directory, but found an acqus file
+            show_error(
+                self.tempframe,
+                "No Bruker (acqus) or Varian (procpar) NMR files found in the current directory. Please check the current directory and try again.",
+                self.headless,
+            )
         if self.spectrometer == "Bruker":
-            self.files = []
-            for file in os.listdir("."):
-                if file.endswith("ser") or file == "fid":
-                    self.files.append(file)
             if len(self.files) == 0:
                 # Give a popout error message saying that there are no bruker NMR files in the current directory, but found an acqus file
-                dlg = wx.MessageDialog(
+                show_error(
                     self.tempframe,
                     "No Bruker NMR files found in the current directory."
                     "Please check the current directory and try again.",
-                    "Error",
-                    wx.OK | wx.ICON_ERROR,
+                    self.headless,
                 )
-                self.tempframe.Raise()
-                self.tempframe.SetFocus()
-                dlg.ShowModal()
-                dlg.Destroy()
-                exit()
 
             elif len(self.files) == 2:
                 # Give a popout error message saying that there are two NMR files in the current directory
-                dlg = wx.MessageDialog(
+                show_error(
                     self.tempframe,
                     "An acqus file was found and two NMR files (fid and ser)"
                     "found in the current directory. Please check the current"
                     "directory and try again.",
-                    "Error",
-                    wx.OK | wx.ICON_ERROR,
+                    self.headless,
                 )
-                self.tempframe.Raise()
-                self.tempframe.SetFocus()
-                dlg.ShowModal()
-                dlg.Destroy()
-                exit()
         elif self.spectrometer == "Varian":
-            self.files = []
-            for file in os.listdir("."):
-                if file == "fid" or file == "origfid":
-                    self.files.append(file)
             if len(self.files) == 0:
+                if self.headless == True:
+                    show_error(
+                        self.tempframe,
+                        "No Varian NMR files found in the current directory, but a procpar file was found.",
+                        self.headless,
+                    )
+                import wx
+
                 # Give a popout error message saying that there are no bruker NMR files in the current directory, but found a procpar file
                 dlg = wx.MessageDialog(
                     self.tempframe,
@@ -169,7 +190,9 @@ class FindingParameters:
 
     def read_nmr_data(self) -> None:
         """
-        Reading the NMR data file to obtain data dimensions
+        Reading the NMR data file header to obtain data dimensions. Only the
+        parameter files, file header and file size are read (see RawData),
+        the data itself is memory mapped on demand.
         """
         if self.spectrometer == "Bruker":
             # if pdata directory exists, if it is empty then change its name to pdata_original
@@ -177,40 +200,25 @@ class FindingParameters:
                 if os.listdir("pdata") == []:
                     os.rename("pdata", "pdata_original")
             try:
-                self.nmr_dic, self.nmr_data = ng.bruker.read(
-                    dir="./", bin_file=self.files[0]
-                )
+                self.nmr_data = RawData.from_bruker("./", self.files[0])
             except:
-                dlg = wx.MessageDialog(
+                show_error(
                     self.tempframe,
                     "Error: Unable to read the Bruker NMR data. Please check the current directory and try again.",
-                    "Error",
-                    wx.OK | wx.ICON_ERROR,
+                    self.headless,
                 )
-                self.tempframe.Raise()
-                self.tempframe.SetFocus()
-                dlg.ShowModal()
-                dlg.Destroy()
-                exit()
         if self.spectrometer == "Varian":
             try:
-                self.nmr_dic, self.nmr_data = ng.varian.read(
-                    dir="./", fid_file=self.files[0]
-                )
+                self.nmr_data = RawData.from_varian("./", self.files[0])
             except:
-                dlg = wx.MessageDialog(
+                show_error(
                     self.tempframe,
                     "Error: Unable to read the Varian NMR data. Please check the current directory and try again.",
-                    "Error",
-                    wx.OK | wx.ICON_ERROR,
+                    self.headless,
                 )
-                self.tempframe.Raise()
-                self.tempframe.SetFocus()
-                dlg.ShowModal()
-                dlg.Destroy()
-                exit()
 
-        self.data_dimensions = len(self.nmr_data.shape)
+        self.nmr_dic = self.nmr_data.dic
+        self.data_dimensions = self.nmr_data.ndim
 
     def find_parameters(self) -> None:
         """
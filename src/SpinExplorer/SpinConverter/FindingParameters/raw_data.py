@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import numpy as np
+import nmrglue as ng
+import warnings
+
+warnings.simplefilter("ignore", UserWarning)
+from typing import Dict, Tuple
+
+from SpinExplorer.SpinConverter.FindingParameters.parameter_index import (
+    get_parameter_index,
+)
+
+
+class RawData:
+    def __init__(
+        self,
+        file_name: str,
+        dic: Dict,
+        shape: Tuple[int, ...],
+        dtype: np.dtype,
+        number_of_fids: int,
+        fid_size: int,
+        offset: int = 0,
+        block_header_bytes: int = 0,
+        fids_per_block: int = 1,
+        complex_data: bool = True,
+    ) -> None:
+        """
+        This class describes a Bruker ser/fid or Varian fid file from its
+        parameter files, file header and file size alone. shape is the shape
+        of the data as nmrglue would return it from ng.bruker.read or
+        ng.varian.read (if the parameters do not agree with the file size,
+        e.g. NUS data, the shape is (FID, point) or flat), but no data is
+        read until memmap()/read_fids() is called.
+        """
+        self.file_name = file_name
+        self.dic = dic
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.number_of_fids = number_of_fids
+        self.fid_size = fid_size
+        self.offset = offset
+        self.block_header_bytes = block_header_bytes
+        self.fids_per_block = fids_per_block
+        self.complex_data = complex_data
+        # Varian files are a series of blocks, each with a block header
+        self.number_of_blocks = number_of_fids // fids_per_block
+        self.block_size = fids_per_block * fid_size
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def points_per_fid(self) -> int:
+        return self.fid_size // 2 if self.complex_data == True else self.fid_size
+
+    @classmethod
+    def from_bruker(cls, directory: str = ".", bin_file: str = "ser") -> "RawData":
+        """
+        Determine the data shape in the same way as ng.bruker.read (acqus
+        files, pulse program and file size) without reading the binary file.
+        """
+        parameter_index = get_parameter_index(directory)
+        dic = {}
+        for dimension in [1, 2, 3, 4]:
+            file_name = parameter_index.acqus_file_name(dimension)
+            if parameter_index.exists(file_name):
+                # Older data only has an acqu file for the direct dimension
+                key = "acqus" if dimension == 1 else file_name
+                dic[key] = parameter_index.jcamp(file_name)
+        try:
+            pulseprogram = os.path.join(directory, "pulseprogram")
+            dic["pprog"] = ng.bruker.read_pprog(pulseprogram)
+        except:
+            pass
+        file_name = os.path.join(directory, bin_file)
+        dic["FILE_SIZE"] = os.stat(file_name).st_size
+
+        # Data is little-endian int32 unless BYTORDA is 1 (big) or DTYPA is 2 (float64)
+        acqus = dic.get("acqus", {})
+        dtype = np.dtype("f8") if acqus.get("DTYPA", 0) == 2 else np.dtype("i4")
+        dtype = dtype.newbyteorder(">" if acqus.get("BYTORDA", 0) == 1 else "<")
+
+        if dic["FILE_SIZE"] % dtype.itemsize != 0:
+            raise ValueError(
+                "{} is not a whole number of data points".format(file_name)
+            )
+        words = dic["FILE_SIZE"] // dtype.itemsize
+        complex_data = acqus.get("AQ_mod", 0) in (1, 3)
+        words_per_point = 2 if complex_data == True else 1
+
+        try:
+            shape = list(ng.bruker.guess_shape(dic)[0])
+            shape[-1] = shape[-1] // words_per_point
+        except ZeroDivisionError:
+            # NUS ser files hold fewer FIDs than TD of the indirect dimensions
+            shape = [0]
+
+        if int(np.prod(shape)) * words_per_point != words:
+            # Each FID starts on a 1024 byte boundary, so use the FID length
+            # (TD rounded up) to split the file into FIDs if possible
+            block = 1024 // dtype.itemsize
+            fid_words = int(np.ceil(acqus.get("TD", 0) / block) * block)
+            if fid_words != 0 and words % fid_words == 0 and words > fid_words:
+                shape = [words // fid_words, fid_words // words_per_point]
+            else:
+                shape = [words // words_per_point]
+
+        return cls(
+            file_name,
+            dic,
+            shape,
+            dtype,
+            number_of_fids=int(np.prod(shape[:-1])),
+            fid_size=shape[-1] * words_per_point,
+            complex_data=complex_data,
+        )
+
+    @classmethod
+    def from_varian(cls, directory: str = ".", fid_file: str = "fid") -> "RawData":
+        """
+        Determine the data shape in the same way as ng.varian.read (procpar
+        and the 32 byte fid file header) without reading the data blocks.
+        """
+        procpar = get_parameter_index(directory).procpar()
+        file_name = os.path.join(directory, fid_file)
+        with open(file_name, "rb") as file:
+            dic = ng.varian.fileheader2dic(ng.varian.get_fileheader(file))
+        dic["procpar"] = procpar
+
+        number_of_fids = dic["nblocks"] * dic["ntraces"]
+        points = dic["np"] // 2
+        if number_of_fids == 1:
+            shape = [points]
+        else:
+            shape = ng.varian.find_shape(procpar)
+            if shape is None or int(np.prod(shape)) != number_of_fids * points:
+                # ng.varian.read returns the raw 2D (fid, point) array in this case
+                shape = [number_of_fids, points]
+
+        return cls(
+            file_name,
+            dic,
+            shape,
+            ng.varian.find_dtype(dic),
+            number_of_fids=number_of_fids,
+            fid_size=dic["np"],
+            offset=32,
+            block_header_bytes=dic["bbytes"] - dic["ntraces"] * dic["tbytes"],
+            fids_per_block=dic["ntraces"],
+        )
+
+    def split_fids(self, number_of_fids: int) -> None:
+        """
+        Treat data that was acquired as a single FID (e.g. a pseudo 2D read as
+        1D) as number_of_fids equal length FIDs.
+        """
+        if (self.number_of_fids * self.fid_size) % number_of_fids != 0:
+            raise ValueError(
+                "Unable to split {} into {} FIDs".format(self.file_name, number_of_fids)
+            )
+        self.fid_size = self.number_of_fids * self.fid_size // number_of_fids
+        self.number_of_fids = number_of_fids
+        if self.block_header_bytes == 0:
+            self.number_of_blocks = number_of_fids
+            self.fids_per_block = 1
+            self.block_size = self.fid_size
+        else:
+            self.fids_per_block = number_of_fids // self.number_of_blocks
+        self.shape = (number_of_fids, self.points_per_fid)
+
+    def memmap(self) -> np.ndarray:
+        """
+        Memory map the raw (interleaved real/imaginary) words of the file as
+        a (block, fid, word) array, skipping any Varian block headers. Bruker
+        files have one FID per block.
+        """
+        if self.block_header_bytes == 0:
+            words = np.memmap(
+                self.file_name,
+                dtype=self.dtype,
+                mode="r",
+                offset=self.offset,
+                shape=(self.number_of_blocks, self.block_size),
+            )
+        else:
+            block = np.dtype(
+                [
+                    ("header", "V{}".format(self.block_header_bytes)),
+                    ("data", self.dtype, (self.block_size,)),
+                ]
+            )
+            words = np.memmap(
+                self.file_name,
+                dtype=block,
+                mode="r",
+                offset=self.offset,
+                shape=(self.number_of_blocks,),
+            )["data"]
+        return words.reshape(self.number_of_blocks, self.fids_per_block, -1)
+
+    def read_fids(self, fids=slice(None)) -> np.ndarray:
+        """
+        Read the chosen FIDs (a slice or an array of FID indexes) from the
+        file as complex (or real) data in native byte order. Only these FIDs
+        are read from disk.
+        """
+        fids = np.arange(self.number_of_fids)[fids]
+        words = self.memmap()[fids // self.fids_per_block, fids % self.fids_per_block]
+        words = words.astype(np.float64)
+        if self.complex_data == False:
+            return words
+        return words[..., ::2] + 1j * words[..., 1::2]
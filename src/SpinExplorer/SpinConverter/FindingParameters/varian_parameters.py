@@ -23,12 +23,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE."""
 
 
-import wx
 import numpy as np
-import nmrglue as ng
 import warnings
 
 warnings.simplefilter("ignore", UserWarning)
+from typing import List
+
+from SpinExplorer.SpinConverter.FindingParameters.parameter_index import (
+    get_parameter_index,
+)
+from SpinExplorer.SpinConverter.FindingParameters.errors import show_error
 
 
 class ParameterExtractorVarian:
@@ -39,16 +43,12 @@ class ParameterExtractorVarian:
         to nmrPipe format.
         """
         self.converter = converter
+        self.headless = self.converter.headless
+        # The procpar file is parsed once into a dictionary by the shared
+        # parameter index and all parameters are looked up from there
+        self.parameter_index = get_parameter_index()
+        self.procpar = self.parameter_index.procpar()
 
-        # Reading the Varian parameter file
-        self.procpar_file = open("procpar", "r")
-        self.procpar_file_lines = self.procpar_file.readlines()
-        self.procpar_file.close()
-
-        # Getting nmrglue to guess the intial parameter files
-        self.udic = ng.varian.guess_udic(
-            self.converter.nmr_dic, self.converter.nmr_data
-        )
         self.find_size_varian()
         self.find_axes_pseudo_varian()
         self.find_sw_varian()
@@ -57,54 +57,33 @@ class ParameterExtractorVarian:
         self.find_temperature_varian()
         self.calculate_carrier_frequency_varian()
 
+    def procpar_values(self, name: str) -> List[str]:
+        # Values of a procpar parameter, or an empty list if it is not present
+        if name not in self.procpar:
+            return []
+        return self.procpar[name]["values"]
+
     def find_size_varian(self):
         """
         Finding the np, ni, ni2 values to get spectrum dimensions
         """
         # Look for np in the procpar file
-        include_np_value = False
-        include_ni_value = False
-        include_ni2_value = False
-        include_ni3_value = False
         self.size_direct = 0
         self.size_indirect = []
-        for i in range(len(self.procpar_file_lines)):
-            line = self.procpar_file_lines[i].split()
-            if include_np_value == True:
-                self.size_direct = int(line[1])
-                include_np_value = False
-            elif line[0] == "np":
-                include_np_value = True
-            elif include_ni_value == True:
-                self.size_indirect.append(int(line[1]))
-                include_ni_value = False
-            elif line[0] == "ni":
-                include_ni_value = True
-            elif include_ni2_value == True:
-                self.size_indirect.append(int(line[1]))
-                include_ni2_value = False
-            elif line[0] == "ni2":
-                include_ni2_value = True
-            elif include_ni3_value == True:
-                self.size_indirect.append(int(line[1]))
-                include_ni3_value = False
-            elif line[0] == "ni3":
-                include_ni3_value = True
+        for value in self.procpar_values("np"):
+            self.size_direct = int(value)
+        for name in ["ni", "ni2", "ni3"]:
+            for value in self.procpar_values(name):
+                self.size_indirect.append(int(value))
 
         if self.size_direct == 0:
-            dlg = wx.MessageDialog(
+            show_error(
                 self.converter.tempframe,
                 "Error: np not found in procpar file. Unable to determine size"
                 " of data for direct dimension. Unable to convert data to NMRPipe"
                 " format. Please check the procpar file and try again.",
-                "Error",
-                wx.OK | wx.ICON_ERROR,
+                self.headless,
             )
-            self.converter.tempframe.Raise()
-            self.converter.tempframe.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
-            exit()
 
         return self.size_direct, self.size_indirect
 
@@ -112,28 +91,13 @@ class ParameterExtractorVarian:
         """
         Looking for sw, sw1, sw2 in the procpar file
         """
-        include_sw_value = False
-        include_sw1_value = False
-        include_sw2_value = False
         self.sw_direct = 0
         self.sw_indirect = {}
-        for i in range(len(self.procpar_file_lines)):
-            line = self.procpar_file_lines[i].split()
-            if include_sw_value == True:
-                self.sw_direct = float(line[1])
-                include_sw_value = False
-            elif line[0] == "sw":
-                include_sw_value = True
-            elif include_sw1_value == True:
-                self.sw_indirect["sw1"] = float(line[1])
-                include_sw1_value = False
-            elif line[0] == "sw1":
-                include_sw1_value = True
-            elif include_sw2_value == True:
-                self.sw_indirect["sw2"] = float(line[1])
-                include_sw2_value = False
-            elif line[0] == "sw2":
-                include_sw2_value = True
+        for value in self.procpar_values("sw"):
+            self.sw_direct = float(value)
+        for name in ["sw1", "sw2"]:
+            for value in self.procpar_values(name):
+                self.sw_indirect[name] = float(value)
 
         return self.sw_direct, self.sw_indirect
 
@@ -141,82 +105,57 @@ class ParameterExtractorVarian:
         """
         Looking for sfrq, dfrq2, dfrq3 in the procpar file
         """
-        include_sfrq_value = False
-        include_dfrq_value = False
-        include_dfrq2_value = False
-        include_dfrq3_value = False
         self.nucleus_frequency_direct = 0
         self.nucleus_frequencies_indirect = []
         self.nucleus_frequencies_indirect_order = []
         include_zero = False
-        for i in range(len(self.procpar_file_lines)):
-            line = self.procpar_file_lines[i].split()
-            if include_sfrq_value == True:
-                self.nucleus_frequency_direct = float(line[1])
-                include_sfrq_value = False
-            elif line[0] == "sfrq":
-                include_sfrq_value = True
-            elif include_dfrq_value == True:
-                if line[1] != "0":
-                    self.nucleus_frequencies_indirect.append(float(line[1]))
-                    self.nucleus_frequencies_indirect_order.append("dfrq")
-                else:
-                    include_zero = True
-                include_dfrq_value = False
-            elif line[0] == "dfrq":
-                include_dfrq_value = True
-            elif include_dfrq2_value == True:
-                if line[1] != "0":
-                    self.nucleus_frequencies_indirect.append(float(line[1]))
-                    self.nucleus_frequencies_indirect_order.append("dfrq2")
-                else:
-                    include_zero = True
-                include_dfrq2_value = False
-            elif line[0] == "dfrq2":
-                include_dfrq2_value = True
-            elif include_dfrq3_value == True:
-                if line[1] != "0":
-                    self.nucleus_frequencies_indirect.append(float(line[1]))
-                    self.nucleus_frequencies_indirect_order.append("dfrq3")
+        for value in self.procpar_values("sfrq"):
+            self.nucleus_frequency_direct = float(value)
+        for name in ["dfrq", "dfrq2", "dfrq3"]:
+            for value in self.procpar_values(name):
+                if value != "0":
+                    self.nucleus_frequencies_indirect.append(float(value))
+                    self.nucleus_frequencies_indirect_order.append(name)
                 else:
                     include_zero = True
-                include_dfrq3_value = False
-            elif line[0] == "dfrq3":
-                include_dfrq3_value = True
 
         if self.nucleus_frequency_direct == 0:
-            dlg = wx.MessageDialog(
+            show_error(
                 self.converter.tempframe,
                 "Error: sfrq not found in procpar file. Unable to determine"
                 " nucleus frequency for direct dimension. Unable to convert "
                 "data to NMRPipe format. Please check the procpar file and "
                 "try again.",
-                "Error",
-                wx.OK | wx.ICON_ERROR,
+                self.headless,
             )
-            self.converter.tempframe.Raise()
-            self.converter.tempframe.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
-            exit()
 
         if self.nucleus_frequencies_indirect == []:
-            dlg = wx.MessageDialog(
-                self.converter.tempframe,
-                "Error: dfrq/dfrq2/dfrq3 not found in procpar file. Would you"
-                " like to continue anyway?",
-                "Error",
-                wx.YES_NO | wx.ICON_ERROR,
-            )
-            self.converter.tempframe.Raise()
-            self.converter.tempframe.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
-            if dlg.GetReturnCode() == wx.ID_NO:
-                exit()
+            if self.headless == True:
+                show_error(
+                    self.converter.tempframe,
+                    "Error: dfrq/dfrq2/dfrq3 not found in procpar file. Setting"
+                    " the indirect nucleus frequencies to 0.",
+                    self.headless,
+                    fatal=False,
+                )
             else:
-                self.nucleus_frequencies_indirect = [0.0, 0.0, 0.0]
-                self.nucleus_frequencies_indirect_order = ["dfrq", "dfrq2", "dfrq3"]
+                import wx
+
+                dlg = wx.MessageDialog(
+                    self.converter.tempframe,
+                    "Error: dfrq/dfrq2/dfrq3 not found in procpar file. Would you"
+                    " like to continue anyway?",
+                    "Error",
+                    wx.YES_NO | wx.ICON_ERROR,
+                )
+                self.converter.tempframe.Raise()
+                self.converter.tempframe.SetFocus()
+                dlg.ShowModal()
+                dlg.Destroy()
+                if dlg.GetReturnCode() == wx.ID_NO:
+                    exit()
+            self.nucleus_frequencies_indirect = [0.0, 0.0, 0.0]
+            self.nucleus_frequencies_indirect_order = ["dfrq", "dfrq2", "dfrq3"]
 
         self.nucleus_frequencies_indirect.reverse()
         if include_zero == True:
@@ -238,65 +177,36 @@ class ParameterExtractorVarian:
         # tn, dn, dn2, dn3 in the procpar file
         """
 
-        include_tn_value = False
-        include_dn_value = False
-        include_dn2_value = False
-        include_dn3_value = False
         self.label_direct = ""
         self.labels_indirect = []
-        for i in range(len(self.procpar_file_lines)):
-            line = self.procpar_file_lines[i].split()
-            if include_tn_value == True:
-                self.label_direct = line[1].split('"')[1]
-                include_tn_value = False
-            elif line[0] == "tn":
-                include_tn_value = True
-            elif include_dn_value == True:
-                self.labels_indirect.append(line[1].split('"')[1])
-                include_dn_value = False
-            elif line[0] == "dn":
-                include_dn_value = True
-            elif include_dn2_value == True:
-                self.labels_indirect.append(line[1].split('"')[1])
-                include_dn2_value = False
-            elif line[0] == "dn2":
-                include_dn2_value = True
-            elif include_dn3_value == True:
-                self.labels_indirect.append(line[1].split('"')[1])
-                include_dn3_value = False
-            elif line[0] == "dn3":
-                include_dn3_value = True
+        for value in self.procpar_values("tn"):
+            self.label_direct = value
+        for name in ["dn", "dn2", "dn3"]:
+            for value in self.procpar_values(name):
+                self.labels_indirect.append(value)
 
         if self.label_direct == "":
-            dlg = wx.MessageDialog(
+            show_error(
                 self.converter.tempframe,
                 "Error: Label for direct dimension (tn) not found in procpar file. Setting label as 1.",
-                "Error",
-                wx.OK | wx.ICON_ERROR,
+                self.headless,
+                fatal=False,
             )
-            self.converter.tempframe.Raise()
-            self.converter.tempframe.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
             self.label_direct = "1"
 
         if self.labels_indirect == []:
-            dlg = wx.MessageDialog(
-                self.tempframe,
+            show_error(
+                self.converter.tempframe,
                 "Error: Labels for indirect dimensions (dn/dn2/dn3) not found in procpar file. Setting labels as 2, 3, 4.",
-                "Error",
-                wx.OK | wx.ICON_ERROR,
+                self.headless,
+                fatal=False,
             )
-            self.converter.tempframe.Raise()
-            self.converter.tempframe.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
             self.labels_indirect = ["2", "3", "4"]
 
-        if self.converter.other_params == True:
+        if self.other_params == True:
             self.labels_correct_order = (
                 [self.labels_indirect[0]]
-                + [self.converter.arrayed_parameter]
+                + [self.arrayed_parameter]
                 + self.labels_indirect[1:]
             )
         else:
@@ -309,14 +219,8 @@ class ParameterExtractorVarian:
         Finding the temperature the spectrum was recorded at
         """
         self.temperature = 298.15  # Default temperature is 298.15K
-        include_temp_value = False
-        for i in range(len(self.procpar_file_lines)):
-            line = self.procpar_file_lines[i].split()
-            if include_temp_value == True:
-                self.temperature = float(line[1]) + 273.15
-                include_temp_value = False
-            elif line[0] == "temp":
-                include_temp_value = True
+        for value in self.procpar_values("temp"):
+            self.temperature = float(value) + 273.15
 
     def calculate_carrier_frequency_varian(self) -> None:
         """
@@ -405,15 +309,7 @@ class ParameterExtractorVarian:
         self.phase2 = False
         self.other_params = False
 
-        self.found_array = False
-        for i, line in enumerate(self.procpar_file_lines):
-            if self.found_array == True:
-                array = line.split()[1]
-                self.found_array = False
-            if line.split()[0] == "array":
-                self.found_array = True
-
-        array = array.split('"')[1].split(",")
+        array = ",".join(self.procpar_values("array")).split(",")
         if array == [""]:
             array = []
 
@@ -429,7 +325,6 @@ class ParameterExtractorVarian:
             self.other_params = True
 
         # Delete phase and phase2 from array
-        self.found_arrayed_parameter = False
         self.number_of_arrayed_parameters = 0
         self.phases = []
         if self.other_params == True:
@@ -441,23 +336,12 @@ class ParameterExtractorVarian:
                 self.phases.append("phase2")
             self.arrayed_parameter = array[0]
 
-            # Search through procpar file to find the number of values of the arrayed parameter
-
-            for i, line in enumerate(self.procpar_file_lines):
-                if self.found_arrayed_parameter == True:
-                    self.number_of_arrayed_parameters = int(line.split()[0])
-                    self.found_arrayed_parameter = False
-                if line.split()[0] == self.arrayed_parameter:
-                    self.found_arrayed_parameter = True
-
-        for i, line in enumerate(self.procpar_file_lines):
-            if self.found_array == True:
-                array = line.split()[1]
-                self.found_array = False
-            if line.split()[0] == "array":
-                self.found_array = True
+            # Find the number of values of the arrayed parameter in procpar
+            self.number_of_arrayed_parameters = len(
+                self.procpar_values(self.arrayed_parameter)
+            )
 
-        array = array.split('"')[1].split(",")
+        array = ",".join(self.procpar_values("array")).split(",")
         if array == [""]:
             array = []
 
@@ -493,13 +377,9 @@ class ParameterExtractorVarian:
             self.size_indirect.append(0)
 
     def find_varian_scaling_parameters(self):
-        found_nt = False
-        self.include_scaling = False
-        for i, line in enumerate(self.nmrdata.procpar_file_lines):
-            if found_nt == True:
-                self.NS = int(line.split()[1])
-                self.include_scaling = True
-                break
-            elif line.split()[0] == "nt":
-                self.NS = int(line.split()[1])
-                found_nt = True
+        # Find the number of transients (nt) in the procpar file
+        try:
+            self.NS = int(self.parameter_index.varian_parameter("nt"))
+            self.include_scaling = True
+        except:
+            self.include_scaling = False
@@ -26,6 +26,12 @@ SOFTWARE."""
 import wx
 import warnings
 
+from SpinExplorer.SpinConverter.StoringParameters.conversion_parameters import (
+    ConversionParameters,
+    acquisition_mode_options_direct,
+    acquisition_mode_options_indirect,
+)
+
 warnings.simplefilter("ignore", UserWarning)
 
 
@@ -39,6 +45,10 @@ class FormatParametersBruker:
         self.params = params
         self.nmrdata = nmrdata
 
+        # The values the boxes start with are the default conversion
+        # parameters, the same as used by headless conversions
+        self.defaults = ConversionParameters.from_bruker(nmrdata)
+
     def input_sizes_bruker(self) -> None:
         """
         Creating and inputting boxes for the complex and real dimension sizes
@@ -55,26 +65,13 @@ class FormatParametersBruker:
                 wx.StaticText(self.app, label="Dimension " + str(i + 1))
             )
             self.title_sizer.AddSpacer(145)
-            if i == 0:
-                self.N_complex_boxes.append(
-                    wx.TextCtrl(
-                        self.app,
-                        value=str(self.params.size_direct_complex),
-                        size=(200, 20),
-                    )
-                )
-            else:
-                try:
-                    if self.params.labels_correct_order[i] == "ID":
-                        labelval = "off"
-                    else:
-                        labelval = self.params.labels_correct_order[i]
-                    size = str(self.params.indirect_sizes_dict[labelval])
-                except:
-                    size = str(self.params.size_indirect[i - 1])
-                self.N_complex_boxes.append(
-                    wx.TextCtrl(self.app, value=size, size=(200, 20))
+            self.N_complex_boxes.append(
+                wx.TextCtrl(
+                    self.app,
+                    value=str(self.defaults.complex_sizes[i]),
+                    size=(200, 20),
                 )
+            )
         self.N_complex_sizer.AddSpacer(20)
         self.N_complex_sizer.Add(self.N_complex_txt)
         self.N_complex_sizer.AddSpacer(20)
@@ -90,79 +87,10 @@ class FormatParametersBruker:
         self.N_real_sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.N_real_txt = wx.StaticText(self.app, label="Number real points:        ")
         self.N_real_boxes = []
-
-        if self.params.pseudo_flag == 0:
-            for i in range(len(self.params.size_indirect) + 1):
-                if i == 0:
-                    self.N_real_boxes.append(
-                        wx.TextCtrl(
-                            self.app,
-                            value=str(int(self.params.size_direct / 2)),
-                            size=(200, 20),
-                        )
-                    )
-                else:
-
-                    try:
-                        if self.params.labels_correct_order[i] == "ID":
-                            labelval = "off"
-                            size = str(int(self.params.indirect_sizes_dict[labelval]))
-                        else:
-                            labelval = self.params.labels_correct_order[i]
-                            size = str(
-                                int(self.params.indirect_sizes_dict[labelval] / 2)
-                            )
-
-                    except:
-                        size = str(int(self.params.size_indirect[i - 1] / 2))
-                    self.N_real_boxes.append(
-                        wx.TextCtrl(self.app, value=size, size=(200, 20))
-                    )
-
-        else:
-            for i in range(self.nmrdata.data_dimensions):
-                if i == 0:
-                    self.N_real_boxes.append(
-                        wx.TextCtrl(
-                            self.app, value=str(self.params.size_direct), size=(200, 20)
-                        )
-                    )
-                else:
-                    if i in self.params.pseudo_flag:
-                        try:
-                            if self.params.labels_correct_order[i] == "ID":
-                                labelval = "off"
-                            else:
-                                labelval = self.params.labels_correct_order[i]
-                            size = str(self.params.indirect_sizes_dict[labelval])
-                        except:
-                            size = str(self.params.size_indirect[i - 1])
-                        self.N_real_boxes.append(
-                            wx.TextCtrl(self.app, value=size), size=(200, 20)
-                        )
-                    else:
-                        try:
-                            if self.params.labels_correct_order[i] == "ID":
-                                labelval = "off"
-                            else:
-                                labelval = self.params.labels_correct_order[i]
-                            size = str(self.params.indirect_sizes_dict[labelval])
-                        except:
-                            size = str(int(self.params.size_indirect[i - 1] / 2))
-                        self.N_real_boxes.append(
-                            wx.TextCtrl(
-                                self.app,
-                                value=str(
-                                    int(
-                                        self.nmrdata.nmr_data.shape[
-                                            self.nmrdata.data_dimensions - 1 - i
-                                        ]
-                                        / 2
-                                    )
-                                ),
-                                size=(200, 20),
-                            )
-                        )
+        for size in self.defaults.real_sizes:
+            self.N_real_boxes.append(
+                wx.TextCtrl(self.app, value=str(size), size=(200, 20))
+            )
 
         self.N_real_sizer.AddSpacer(20)
         self.N_real_sizer.Add(self.N_real_txt)
@@ -184,87 +112,35 @@ class FormatParametersBruker:
         self.acquisition_mode_txt = wx.StaticText(
             self.app, label="Acquisition mode:           "
         )
-        self.acquisition_mode_options_direct = ["DQD", "Complex", "Sequential", "Real"]
-        self.acquisition_mode_options_indirect = [
-            "Complex",
-            "States-TPPI",
-            "Echo-AntiEcho",
-            "TPPI",
-            "States",
-            "Real",
-        ]
+        self.acquisition_mode_options_direct = list(
+            acquisition_mode_options_direct["Bruker"]
+        )
+        self.acquisition_mode_options_indirect = list(
+            acquisition_mode_options_indirect["Bruker"]
+        )
 
         self.acqusition_combo_boxes = []
         for i in range(len(self.params.size_indirect) + 1):
             if i == 0:
-                self.acqusition_combo_boxes.append(
-                    wx.ComboBox(
-                        self.app,
-                        value=self.acquisition_mode_options_direct[0],
-                        choices=self.acquisition_mode_options_direct,
-                        size=(200, 20),
-                        style=wx.CB_READONLY,
-                    )
-                )
-                self.acqusition_combo_boxes[i].Bind(
-                    wx.EVT_COMBOBOX, self.app.shared_format.on_acquisition_mode_change
-                )
+                options = self.acquisition_mode_options_direct
             else:
+                options = self.acquisition_mode_options_indirect
                 if self.params.acqusition_modes[i - 1] == "QF":
-                    self.acqusition_combo_boxes.append(
-                        wx.ComboBox(
-                            self.app,
-                            value=self.acquisition_mode_options_indirect[5],
-                            choices=self.acquisition_mode_options_indirect,
-                            size=(200, 20),
-                            style=wx.CB_READONLY,
-                        )
-                    )
-                    self.N_real_boxes[i].SetValue(
-                        str(self.N_complex_boxes[i].GetValue())
-                    )
+                    # QF dimensions are converted as real dimensions without
+                    # a sweep width
                     self.params.sw_indirect[i - 1] = 0
-                    self.acqusition_combo_boxes[i].Bind(
-                        wx.EVT_COMBOBOX, self.shared_format.on_acquisition_mode_change
-                    )
-                else:
-                    determined_value = self.params.acqusition_modes[i - 1]
-                    detected_value = ""
-                    for j in range(len(self.acquisition_mode_options_indirect)):
-                        if (
-                            self.acquisition_mode_options_indirect[j].upper()
-                            == determined_value.upper()
-                        ):
-                            detected_value = self.acquisition_mode_options_indirect[j]
-                            break
-                    if detected_value == "":
-                        self.acqusition_combo_boxes.append(
-                            wx.ComboBox(
-                                self.app,
-                                value=self.acquisition_mode_options_indirect[0],
-                                choices=self.acquisition_mode_options_indirect,
-                                size=(200, 20),
-                                style=wx.CB_READONLY,
-                            )
-                        )
-                        self.acqusition_combo_boxes[i].Bind(
-                            wx.EVT_COMBOBOX,
-                            self.app.shared_format.on_acquisition_mode_change,
-                        )
-                    else:
-                        self.acqusition_combo_boxes.append(
-                            wx.ComboBox(
-                                self.app,
-                                value=detected_value,
-                                choices=self.acquisition_mode_options_indirect,
-                                size=(200, 20),
-                                style=wx.CB_READONLY,
-                            )
-                        )
-                        self.acqusition_combo_boxes[i].Bind(
-                            wx.EVT_COMBOBOX,
-                            self.app.shared_format.on_acquisition_mode_change,
-                        )
+            self.acqusition_combo_boxes.append(
+                wx.ComboBox(
+                    self.app,
+                    value=self.defaults.acquisition_modes[i],
+                    choices=options,
+                    size=(200, 20),
+                    style=wx.CB_READONLY,
+                )
+            )
+            self.acqusition_combo_boxes[i].Bind(
+                wx.EVT_COMBOBOX, self.app.shared_format.on_acquisition_mode_change
+            )
 
         self.acquisition_mode_sizer.AddSpacer(20)
         self.acquisition_mode_sizer.Add(self.acquisition_mode_txt)
@@ -286,28 +162,16 @@ class FormatParametersBruker:
             self.app, label="Sweep width (Hz):          "
         )
         self.sweep_width_boxes = []
-        choices = [str(self.params.sw_direct)]
-        for j in range(len(self.params.size_indirect)):
-            choices.append(str(self.params.sw_indirect[j]))
+        choices = [str(sweep_width) for sweep_width in self.defaults.sweep_widths]
         for i in range(len(self.params.size_indirect) + 1):
-            if i == 0:
-                self.sweep_width_boxes.append(
-                    wx.ComboBox(
-                        self.app,
-                        value=str(self.params.sw_direct),
-                        choices=choices,
-                        size=(200, 20),
-                    )
-                )
-            else:
-                self.sweep_width_boxes.append(
-                    wx.ComboBox(
-                        self.app,
-                        value=str(self.params.sw_indirect[i - 1]),
-                        choices=choices,
-                        size=(200, 20),
-                    )
+            self.sweep_width_boxes.append(
+                wx.ComboBox(
+                    self.app,
+                    value=str(self.defaults.sweep_widths[i]),
+                    choices=choices,
+                    size=(200, 20),
                 )
+            )
         self.sweep_width_sizer.AddSpacer(20)
         self.sweep_width_sizer.Add(self.sweep_width_txt)
         self.sweep_width_sizer.AddSpacer(20)
@@ -329,27 +193,15 @@ class FormatParametersBruker:
         )
         self.nuclei_frequency_boxes = []
         for i in range(len(self.params.size_indirect) + 1):
-            if i == 0:
-                self.nuclei_frequency_boxes.append(
-                    wx.TextCtrl(
-                        self.app,
-                        value=str(self.params.nucleus_frequencies[0]),
-                        size=(200, 20),
-                    )
-                )
-            elif self.acqusition_combo_boxes[i].GetValue() == "Real":
-                self.nuclei_frequency_boxes.append(
-                    wx.TextCtrl(self.app, value=str(1), size=(200, 20))
-                )
+            if i != 0 and self.acqusition_combo_boxes[i].GetValue() == "Real":
                 self.params.labels_correct_order[i] = "ID"
-            else:
-                self.nuclei_frequency_boxes.append(
-                    wx.TextCtrl(
-                        self.app,
-                        value=str(self.params.nucleus_frequencies[i]),
-                        size=(200, 20),
-                    )
+            self.nuclei_frequency_boxes.append(
+                wx.TextCtrl(
+                    self.app,
+                    value=str(self.defaults.nuclei_frequencies[i]),
+                    size=(200, 20),
                 )
+            )
 
         self.nuclei_frequency_sizer.AddSpacer(20)
         self.nuclei_frequency_sizer.Add(self.nuclei_frequency_txt)
@@ -372,29 +224,10 @@ class FormatParametersBruker:
             self.app, label="Label:                              "
         )
         self.nucleus_type_boxes = []
-        j = 0
         for i in range(len(self.params.size_indirect) + 1):
-            if i == 0:
-                self.nucleus_type_boxes.append(
-                    wx.TextCtrl(
-                        self.app,
-                        value=self.params.labels_correct_order[0],
-                        size=(200, 20),
-                    )
-                )
-            elif self.acqusition_combo_boxes[i].GetValue() == "Real":
-                self.nucleus_type_boxes.append(
-                    wx.TextCtrl(self.app, value="ID", size=(200, 20))
-                )
-                j += 1
-            else:
-                self.nucleus_type_boxes.append(
-                    wx.TextCtrl(
-                        self.app,
-                        value=self.params.labels_correct_order[i],
-                        size=(200, 20),
-                    )
-                )
+            self.nucleus_type_boxes.append(
+                wx.TextCtrl(self.app, value=self.defaults.labels[i], size=(200, 20))
+            )
 
         self.nucleus_type_sizer.AddSpacer(20)
         self.nucleus_type_sizer.Add(self.nucleus_type_txt)
@@ -423,76 +256,27 @@ class FormatParametersBruker:
         else:
             self.options_other_dimensions = self.params.references_other_labels
 
-        id_columns = 0
         for i in range(len(self.params.size_indirect) + 1):
             if i == 0:
-                if (
-                    self.params.labels_correct_order[i] == "1H"
-                    or self.params.labels_correct_order[i] == "H1"
-                    or self.params.labels_correct_order[i] == "H"
-                ):
-                    self.carrier_frequency_boxes.append(
-                        wx.TextCtrl(
-                            self.app, value=str(self.params.water_ppm), size=(200, 20)
-                        )
-                    )
-                    self.carrier_combo_boxes.append(
-                        wx.ComboBox(
-                            self.app,
-                            value=self.params.references_proton_labels[0],
-                            choices=self.params.references_proton_labels,
-                            size=(200, 20),
-                            style=wx.CB_READONLY,
-                        )
-                    )
-                else:
-                    self.carrier_frequency_boxes.append(
-                        wx.TextCtrl(
-                            self.app,
-                            value=str(self.params.references_proton[i]),
-                            size=(200, 20),
-                        )
-                    )
-                    self.carrier_combo_boxes.append(
-                        wx.ComboBox(
-                            self.app,
-                            value=self.params.references_proton_labels[0],
-                            choices=self.params.references_proton_labels,
-                            size=(200, 20),
-                            style=wx.CB_READONLY,
-                        )
-                    )
-            elif self.params.labels_correct_order[i] == "ID":
-                self.carrier_frequency_boxes.append(
-                    wx.TextCtrl(self.app, value="0.00", size=(200, 20))
-                )
-                self.carrier_combo_boxes.append(
-                    wx.ComboBox(
-                        self.app,
-                        value="N/A",
-                        choices=self.options_other_dimensions,
-                        size=(200, 20),
-                        style=wx.CB_READONLY,
-                    )
-                )
-                id_columns += 1
+                choices = self.params.references_proton_labels
             else:
-                self.carrier_frequency_boxes.append(
-                    wx.TextCtrl(
-                        self.app,
-                        value=str(self.params.references_other[i - 1]),
-                        size=(200, 20),
-                    )
+                choices = self.options_other_dimensions
+            self.carrier_frequency_boxes.append(
+                wx.TextCtrl(
+                    self.app,
+                    value=str(self.defaults.carrier_frequencies[i]),
+                    size=(200, 20),
                 )
-                self.carrier_combo_boxes.append(
-                    wx.ComboBox(
-                        self.app,
-                        value=self.params.references_other_labels[i - 1],
-                        choices=self.options_other_dimensions,
-                        size=(200, 20),
-                        style=wx.CB_READONLY,
-                    )
+            )
+            self.carrier_combo_boxes.append(
+                wx.ComboBox(
+                    self.app,
+                    value=self.defaults.referencing_modes[i],
+                    choices=choices,
+                    size=(200, 20),
+                    style=wx.CB_READONLY,
                 )
+            )
 
         self.carrier_frequency_sizer.AddSpacer(20)
         self.carrier_frequency_sizer.Add(self.carrier_frequency_txt)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import wx
+from typing import Callable, Union
+
+from SpinExplorer.SpinConverter.Conversion.jobs import Job, get_job_manager
+
+
+class JobMonitor(wx.Frame):
+    def __init__(
+        self,
+        parent,
+        command: str,
+        cwd: str = ".",
+        title: str = "nmrPipe",
+        on_finished: Union[Callable, None] = None,
+    ) -> None:
+        """
+        This window runs a command (e.g. csh fid.com) with the shared job
+        manager and shows its output as it runs, a progress bar from the
+        nmrPipe progress reports and a button to cancel it.
+        on_finished(job) is called in the GUI thread once the job has ended.
+        Closing the window while the job is running leaves it running in
+        the background.
+        """
+        wx.Frame.__init__(self, parent, title=title, size=(700, 400))
+        self.on_finished = on_finished
+
+        self.panel = wx.Panel(self)
+        self.sizer = wx.BoxSizer(wx.VERTICAL)
+        self.status_text = wx.StaticText(self.panel, label="Queued: " + command)
+        self.sizer.Add(self.status_text, 0, wx.ALL | wx.EXPAND, 5)
+        self.gauge = wx.Gauge(self.panel, range=1000)
+        self.sizer.Add(self.gauge, 0, wx.ALL | wx.EXPAND, 5)
+        self.log = wx.TextCtrl(
+            self.panel, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_DONTWRAP
+        )
+        self.log.SetFont(
+            wx.Font(
+                9, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL
+            )
+        )
+        self.sizer.Add(self.log, 1, wx.ALL | wx.EXPAND, 5)
+        self.button = wx.Button(self.panel, label="Cancel")
+        self.button.Bind(wx.EVT_BUTTON, self.on_button)
+        self.sizer.Add(self.button, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+        self.panel.SetSizer(self.sizer)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Show()
+
+        # The job calls back from its own thread, so pass everything on to
+        # the GUI thread
+        self.job = get_job_manager().submit(
+            command,
+            cwd,
+            name=title,
+            on_output=lambda job, stream, line: wx.CallAfter(
+                self.add_output, stream, line
+            ),
+            on_progress=lambda job, progress: wx.CallAfter(
+                self.set_progress, progress
+            ),
+            on_finished=lambda job: wx.CallAfter(self.job_finished, job),
+        )
+
+    def add_output(self, stream: str, line: str) -> None:
+        if self.status_text.GetLabel().startswith("Queued") == True:
+            self.status_text.SetLabel("Running: " + self.job.command)
+        if stream == "stderr":
+            self.log.SetDefaultStyle(wx.TextAttr(wx.RED))
+        else:
+            self.log.SetDefaultStyle(wx.TextAttr(wx.NullColour))
+        self.log.AppendText(line + "\n")
+        if self.job.progress is None:
+            self.gauge.Pulse()
+
+    def set_progress(self, progress: float) -> None:
+        self.status_text.SetLabel("Running: " + self.job.command)
+        self.gauge.SetValue(int(progress * 1000))
+
+    def job_finished(self, job: Job) -> None:
+        if job.status == "finished":
+            self.gauge.SetValue(1000)
+            self.status_text.SetLabel("Finished: " + job.command)
+        elif job.status == "cancelled":
+            self.gauge.SetValue(0)
+            self.status_text.SetLabel("Cancelled: " + job.command)
+        else:
+            self.status_text.SetLabel(
+                "Failed (exit status {}): {}".format(job.returncode, job.command)
+            )
+        self.button.SetLabel("Close")
+        if self.on_finished is not None:
+            self.on_finished(job)
+        if self.IsShown() == False:
+            self.Destroy()
+
+    def on_button(self, event) -> None:
+        if self.job.status in ["queued", "running"]:
+            self.job.cancel()
+        else:
+            self.Destroy()
+
+    def on_close(self, event) -> None:
+        if self.job.status in ["queued", "running"]:
+            self.Hide()
+        else:
+            self.Destroy()
@@ -27,6 +27,10 @@ import os
 import wx
 import warnings
 
+from SpinExplorer.SpinConverter.StoringParameters.conversion_parameters import (
+    default_scaling_number,
+)
+
 warnings.simplefilter("ignore", UserWarning)
 
 
@@ -216,12 +220,11 @@ class SharedFormatting:
             if self.nmrdata.spectrometer == "Bruker":
                 self.scaling_NC.SetValue(True)
         self.scaling_by_number.SetValue(True)
-        if self.nmrdata.spectrometer == "Bruker":
-            self.params.scaling_factor = (
-                (1 / self.params.NS) * (2**self.params.NC) * 1000
-            )
-        else:
-            self.params.scaling_factor = (1 / self.params.NS) * 1000
+        self.params.scaling_factor = default_scaling_number(
+            self.nmrdata.spectrometer,
+            getattr(self.params, "NS", 1),
+            getattr(self.params, "NC", 0),
+        )
         self.scaling_text = wx.StaticText(self.app, label="Scaling Factor:")
         if self.nmrdata.spectrometer == "Bruker":
             self.scaling_number = wx.TextCtrl(
@@ -39,234 +39,179 @@ print("")
 
 # Import relevant external modules
 import sys
-import wx
-import numpy as np
-import nmrglue as ng
-import subprocess
+import argparse
 import os
-import darkdetect
 import warnings
 
-# Importing internal classes
-from SpinExplorer.SpinConverter.FindingParameters.parameters import FindingParameters
-from SpinExplorer.SpinConverter.FormattingGUI.bruker_formatting import (
-    FormatParametersBruker,
+# Importing internal classes (the GUI is only imported when it is opened, so the
+# command line conversions run without wxPython installed)
+from SpinExplorer.SpinConverter.Conversion.headless import convert_headless
+from SpinExplorer.SpinConverter.Conversion.cache import list_cache, clear_cache
+from SpinExplorer.SpinConverter.Conversion.batch import (
+    convert_batch,
+    write_report,
+    summary,
 )
-from SpinExplorer.SpinConverter.FormattingGUI.varian_formatting import (
-    FormatParametersVarian,
-)
-from SpinExplorer.SpinConverter.FormattingGUI.shared_formatting import (
-    SharedFormatting,
-)
-from SpinExplorer.SpinConverter.StoringParameters.save_parameters import Save_json
-from SpinExplorer.SpinConverter.StoringParameters.read_parameters import Read_json
-from SpinExplorer.SpinConverter.Conversion.convert_pipe import Convert_pipe
-from SpinExplorer.SpinConverter.Conversion.convert_nmrglue import Convert_nmrglue
+from SpinExplorer.SpinConverter.FindingParameters.errors import ConversionError
 
 
 warnings.simplefilter("ignore", UserWarning)
 
 
-# Check to see if using mac, linux or windows
-if sys.platform == "darwin":
-    platform = "mac"
-elif sys.platform == "linux":
-    platform = "linux"
-else:
-    platform = "windows"
-
-# See if the nmrPipe command works, if not set the platform to windows
-if platform == "mac" or platform == "linux":
-    try:
-        p = subprocess.Popen(
-            "nmrPipe", stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
-        )
-        out, err = p.communicate()
-        if "NMRPipe System Version" in str(err):
-            platform = platform
-        else:
-            platform = "windows"
-
-    except:
-        platform = "windows"
-
-
 # James Eaton, 10/06/2025, University of Oxford
 # This program is designed to allow the user to convert NMR data from Bruker/Varian into NMRPipe format so it can be viewed using
 # SpinView.py. It is designed to be used with the SpinProcess.py program used to process the converted nmrPipe FID to produce
 # an NMR spectrum. These spectra can then be viewed using SpinView.py, a GUI for viewing NMR data.
 
 
-class MyApp(wx.Frame):
-    def __init__(self):
-        """
-        This class creates the GUI showing the found parameters with scope
-        for changing the parameters.
-        """
-
-        # Get the monitor size and set the window size to 85% of the monitor size
-        self.monitorWidth, self.monitorHeight = wx.GetDisplaySize()
-        self.width = 0.6 * self.monitorWidth
-        self.height = 0.6 * self.monitorHeight
-        self.app_frame = wx.Frame.__init__(
-            self,
-            None,
-            wx.ID_ANY,
-            "SpinConverter",
-            wx.DefaultPosition,
-            size=(int(self.width), int(self.height)),
-        )
-
-        self.file_parser = False
-
-        # Initialise the NMR data and parameter class
-        self.nmrdata = FindingParameters()
-
-        # Creating a canvas and formatting the app on it
-        self.create_canvas()
-        self.format_app()
-
-        # Reading previously saved parameters if present
-        read = Read_json(self.nmrdata.params, self.nmrdata, self)
-
-        self.Bind(wx.EVT_CLOSE, self.OnClose)
-        self.Show()
-        self.Centre()
-
-    def OnClose(self, event):
-        """
-        Ensuring the application is closed after pressing close
-        """
-        self.Destroy()
-        sys.exit()
-
-    def create_canvas(self) -> None:
-        """
-        Creating a canvas for the application
-        """
-        # Create the main sizer
-        self.main_sizer = wx.BoxSizer(wx.VERTICAL)
-
-        if darkdetect.isDark() == True and platform != "windows":
-            self.SetBackgroundColour((53, 53, 53, 255))
+def parse_arguments(arguments=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="SpinConverter",
+        description="Convert Bruker/Varian NMR data to nmrPipe format",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="convert with nmrglue without opening the GUI",
+    )
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default=".",
+        help="directory containing the NMR data (headless mode only)",
+    )
+    parser.add_argument(
+        "--parameters",
+        default=None,
+        help="parameters.json file to convert with (default: parameters.json in "
+        "the data directory if present, otherwise the parameters found in the "
+        "spectrometer files)",
+    )
+    parser.add_argument(
+        "--output",
+        default="test.fid",
+        help="name of the converted FID, relative to the data directory",
+    )
+    parser.add_argument(
+        "--save-parameters",
+        action="store_true",
+        help="write the parameters used for the conversion to parameters.json",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="ROOT",
+        default=None,
+        help="convert every experiment directory below ROOT with nmrglue",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of datasets to convert in parallel in batch mode",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        help="batch report file (default: ROOT/conversion_report.txt)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="convert again even if the conversion cache shows the output is "
+        "up to date",
+    )
+    return parser.parse_args(arguments)
+
+
+def parse_cache_arguments(arguments=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="SpinConverter cache",
+        description="Inspect or clear the conversion caches (conversion_cache.json) "
+        "recording which datasets have already been converted",
+    )
+    parser.add_argument(
+        "action",
+        choices=["ls", "clear"],
+        help="list the cached conversions or remove the caches",
+    )
+    parser.add_argument(
+        "root",
+        nargs="?",
+        default=".",
+        help="directory to search for conversion caches",
+    )
+    return parser.parse_args(arguments)
+
+
+def run_cache(arguments: argparse.Namespace) -> None:
+    if arguments.action == "clear":
+        removed = clear_cache(arguments.root)
+        print("Removed {} conversion caches below {}".format(removed, arguments.root))
+        return
+    entries = list_cache(arguments.root)
+    for directory, output_file, entry, current in entries:
+        if current == True:
+            status = "current"
         else:
-            self.SetBackgroundColour("White")
-
-    def create_sizers(self) -> None:
-        self.parameters_sizer = wx.BoxSizer(wx.HORIZONTAL)
-        self.menu_bar = wx.BoxSizer(wx.VERTICAL)
-        self.extra_sizers = wx.BoxSizer(wx.VERTICAL)
-        self.parameters_sizer.Add(self.menu_bar)
-        self.extra_boxes_total = wx.BoxSizer(wx.VERTICAL)
-        self.extra_boxes_0 = wx.BoxSizer(wx.HORIZONTAL)
-        self.extra_boxes_0_total = wx.BoxSizer(wx.HORIZONTAL)
-        self.extra_boxes = wx.BoxSizer(wx.HORIZONTAL)
-        self.extra_boxes_total_1 = wx.BoxSizer(wx.HORIZONTAL)
-        self.extra_boxes.AddSpacer(10)
-        self.extra_boxes_0.AddSpacer(20)
-        self.extra_boxes_0_total.Add(self.extra_boxes_0, 0, wx.CENTER)
-        self.extra_boxes_total.Add(self.extra_boxes_0_total, 0, wx.CENTER)
-        self.extra_boxes_total.AddSpacer(20)
-        self.extra_boxes_total_1.Add(self.extra_boxes, 0, wx.CENTER)
-        self.extra_boxes_total.Add(self.extra_boxes_total_1, 0, wx.CENTER)
-
-    def format_app(self) -> None:
-        """
-        Adding the TextControl sizers and buttons to the app and
-        populating them with parameters.
-        """
-
-        self.create_sizers()
-
-        if self.nmrdata.spectrometer == "Bruker":
-            self.format = FormatParametersBruker(
-                self, self.nmrdata.params, self.nmrdata
-            )
-            self.shared_format = SharedFormatting(
-                self, self.nmrdata.params, self.nmrdata
-            )
-            self.format.input_sizes_bruker()
-            self.format.input_acquisition_modes_bruker()
-            self.format.input_sweep_widths_bruker()
-            self.format.get_nuclei_frequency_bruker()
-            self.format.get_nuclei_labels_bruker()
-            self.format.get_carrier_frequencies_bruker()
-            if len(self.format.N_complex_boxes) > 1:
-                self.shared_format.acquisition_2D_mode_combo_box()
-            self.shared_format.create_temperature_box()
-            self.format.create_bruker_digital_filter_box()
-            self.shared_format.create_conversion_box()
-            self.format.create_other_options_box()
-            self.shared_format.create_intensity_scaling_box()
-            if self.nmrdata.params.size_indirect != []:
-                self.shared_format.find_nus_file()
-                self.shared_format.input_NUS_list_box()
-            else:
-                self.shared_format.include_NUS = False
-        elif self.nmrdata.spectrometer == "Varian":
-            self.format = FormatParametersVarian(self)
-            self.shared_format = SharedFormatting(
-                self, self.nmrdata.params, self.nmrdata
+            status = "stale"
+        print(
+            "{:<8} {:<8} {} {}".format(
+                status,
+                entry.get("method", ""),
+                entry.get("time", ""),
+                os.path.join(directory, output_file),
             )
-            self.format.input_sizes_varian()
-            self.format.input_acquisition_modes_varian()
-            self.format.input_sweep_widths_varian()
-            self.format.get_nuclei_frequency_varian()
-            self.format.get_nuclei_labels_varian()
-            self.format.get_carrier_frequencies_varian()
-            if len(self.shared_format.N_complex_boxes) > 1:
-                self.shared_format.acquisition_2D_mode_combo_box()
-            self.shared_format.create_temperature_box()
-            self.shared_format.create_conversion_box()
-            self.shared_format.create_intensity_scaling_box()
-            if self.nmrdata.phase != False or self.nmrdata.phase2 != False:
-                self.shared_format.find_nus_file()
-                self.shared_format.input_NUS_list_box()
-            else:
-                self.shared_format.include_NUS = False
-
-        self.main_sizer.Add(self.parameters_sizer, 0, wx.CENTER)
-        self.main_sizer.Add(self.extra_sizers, 0, wx.CENTER)
-
-        self.SetSizerAndFit(self.main_sizer)
-
-        # Get the width and height of the main_sizer
-        self.width, self.height = self.main_sizer.GetSize()
-        self.SetSize((int(self.width * 1.25), int(self.height * 1.25)))
-        self.Centre()
+        )
+    print("{} cached conversions below {}".format(len(entries), arguments.root))
+
+
+def run_batch(arguments: argparse.Namespace) -> None:
+    reports = convert_batch(
+        arguments.batch,
+        workers=arguments.workers,
+        output_file=arguments.output,
+        force=arguments.force,
+    )
+    report_file = arguments.report
+    if report_file is None:
+        report_file = os.path.join(arguments.batch, "conversion_report.txt")
+    write_report(reports, report_file)
+    print(summary(reports))
+    print("Report saved to " + report_file)
+    for report in reports:
+        if report["status"] == "failed":
+            sys.exit(1)
 
-    def on_save_parameters(self, event) -> None:
-        """
-        Saving the current SpinConverter parameters to parameters.json
-        """
-        save = Save_json(self.nmrdata.params, self.nmrdata, self)
 
-    def on_convert_pipe(self, event) -> None:
-        """
-        Checking to see that nmrPipe is installed and then performing
-        nmrPipe conversion.
-        """
-        if platform == "windows":
-            # Outputting a message saying that nmrPipe conversion is not possible on windows
-            dlg = wx.MessageDialog(
-                self,
-                "It seems like nmrPipe is not installed. Please use the nmrglue convert button instead.",
-                "Warning",
-                wx.OK | wx.ICON_WARNING,
+def main():
+    if sys.argv[1:2] == ["cache"]:
+        run_cache(parse_cache_arguments(sys.argv[2:]))
+        return
+    arguments = parse_arguments()
+    if arguments.batch is not None:
+        run_batch(arguments)
+        return
+    if arguments.headless == True:
+        try:
+            output_file, converted = convert_headless(
+                arguments.directory,
+                parameter_file=arguments.parameters,
+                output_file=arguments.output,
+                save_parameters=arguments.save_parameters,
+                force=arguments.force,
             )
-            self.Raise()
-            self.SetFocus()
-            dlg.ShowModal()
-            dlg.Destroy()
+        except ConversionError as error:
+            print("Error: " + str(error), file=sys.stderr)
+            sys.exit(1)
+        if converted == False:
+            print(output_file + " is up to date (use --force to convert again)")
             return
-        else:
-            pipe_conversion = Convert_pipe(self, self.nmrdata.params, self.nmrdata)
+        print("Converted data saved to " + output_file)
+        return
 
-    def on_convert_glue(self, event) -> None:
-        glue_conversion = Convert_nmrglue(self, self.nmrdata.params, self.nmrdata)
+    import wx
+    from SpinExplorer.SpinConverter.FormattingGUI.converter_app import MyApp
 
-
-def main():
     app = wx.App()
     frame = MyApp()
     app.MainLoop()
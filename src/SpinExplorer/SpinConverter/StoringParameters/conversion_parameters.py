@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import json
+import pathlib
+from dataclasses import dataclass, field
+from typing import Dict, Any, List
+
+
+# Acquisition mode options (in the order of the SpinConverter comboboxes)
+acquisition_mode_options_direct = {
+    "Bruker": ["DQD", "Complex", "Sequential", "Real"],
+    "Varian": ["Complex", "Sequential", "Real", "DQD"],
+}
+acquisition_mode_options_indirect = {
+    "Bruker": ["Complex", "States-TPPI", "Echo-AntiEcho", "TPPI", "States", "Real"],
+    "Varian": [
+        "Complex",
+        "States-TPPI",
+        "Rance-Kay",
+        "Echo-AntiEcho",
+        "TPPI",
+        "States",
+        "Real",
+    ],
+}
+
+
+def default_scaling_number(spectrometer: str, NS: int, NC: int = 0) -> float:
+    """
+    The intensity scaling factor SpinConverter starts with: 1/NS (and 2^NC
+    for Bruker data) x1000
+    """
+    scaling_number = 1000
+    if NS != 0:
+        scaling_number = scaling_number / NS
+    if spectrometer == "Bruker":
+        scaling_number = scaling_number * (2**NC)
+    return scaling_number
+
+
+@dataclass
+class ConversionParameters:
+    """
+    All the settings needed to convert a Bruker/Varian dataset to nmrPipe
+    format with nmrglue. Per-dimension lists are ordered as in the
+    SpinConverter GUI (direct dimension first). Carrier frequencies are
+    in ppm.
+    """
+
+    spectrometer: str
+    complex_sizes: List[int]
+    real_sizes: List[int]
+    acquisition_modes: List[str]
+    sweep_widths: List[float]
+    nuclei_frequencies: List[float]
+    labels: List[str]
+    carrier_frequencies: List[float]
+    referencing_modes: List[str] = field(default_factory=list)
+    referencing_mode_indexes: List[int] = field(default_factory=list)
+    temperature: float = 298.15
+    number_of_scans: int = 1
+    scale_by_ns: bool = False
+    scale_by_nc: bool = False
+    scale_by_1000: bool = True
+    scaling_number: float = 1.0
+    remove_digital_filter: bool = False
+    remove_before_ft: bool = False
+    decim: float = 0.0
+    dspfvs: int = 0
+    grpdly: float = 0.0
+    remove_acquisition_padding: bool = True
+    bad_point_threshold: float = 0.0
+    nus: bool = False
+    nus_sample_count: int = 0
+    nus_offset: int = 0
+    nus_file: str = ""
+    reverse_nus_schedule: bool = False
+
+    @property
+    def ndim(self) -> int:
+        return len(self.complex_sizes)
+
+    @classmethod
+    def from_nmrdata(cls, nmrdata) -> "ConversionParameters":
+        """
+        Create the default conversion parameters for a dataset from the
+        parameters found by FindingParameters. These are the values the
+        SpinConverter GUI shows before the user changes anything.
+        """
+        if nmrdata.spectrometer == "Bruker":
+            parameters = cls.from_bruker(nmrdata)
+        else:
+            parameters = cls.from_varian(nmrdata)
+        if parameters.ndim > 1:
+            parameters.find_nus_file()
+        return parameters
+
+    @classmethod
+    def from_bruker(cls, nmrdata) -> "ConversionParameters":
+        """
+        Default conversion parameters for Bruker data (also used to fill in
+        the FormatParametersBruker GUI boxes)
+        """
+        params = nmrdata.params
+        labels_found = list(params.labels_correct_order)
+        number_of_dimensions = len(params.size_indirect) + 1
+
+        def indirect_size(i, default, halve):
+            try:
+                if labels_found[i] == "ID":
+                    return int(params.indirect_sizes_dict["off"])
+                size = params.indirect_sizes_dict[labels_found[i]]
+                if halve == True:
+                    size = size / 2
+                return int(size)
+            except:
+                return int(default)
+
+        complex_sizes = [int(params.size_direct_complex)]
+        for i in range(1, number_of_dimensions):
+            complex_sizes.append(indirect_size(i, params.size_indirect[i - 1], False))
+
+        if params.pseudo_flag == 0:
+            real_sizes = [int(params.size_direct / 2)]
+            for i in range(1, number_of_dimensions):
+                real_sizes.append(
+                    indirect_size(i, params.size_indirect[i - 1] / 2, True)
+                )
+        else:
+            real_sizes = [int(params.size_direct)]
+            for i in range(1, nmrdata.data_dimensions):
+                if i in params.pseudo_flag:
+                    real_sizes.append(
+                        indirect_size(i, params.size_indirect[i - 1], False)
+                    )
+                else:
+                    real_sizes.append(
+                        int(nmrdata.nmr_data.shape[nmrdata.data_dimensions - 1 - i] / 2)
+                    )
+
+        acquisition_modes = [acquisition_mode_options_direct["Bruker"][0]]
+        sweep_widths = [float(params.sw_direct)]
+        for i in range(1, number_of_dimensions):
+            mode = params.acqusition_modes[i - 1]
+            sweep_widths.append(float(params.sw_indirect[i - 1]))
+            if mode == "QF":
+                acquisition_modes.append("Real")
+                if i < len(real_sizes):
+                    real_sizes[i] = complex_sizes[i]
+                sweep_widths[i] = 0.0
+                continue
+            detected_mode = acquisition_mode_options_indirect["Bruker"][0]
+            for option in acquisition_mode_options_indirect["Bruker"]:
+                if option.upper() == mode.upper():
+                    detected_mode = option
+                    break
+            acquisition_modes.append(detected_mode)
+
+        nuclei_frequencies = [float(params.nucleus_frequencies[0])]
+        labels = [labels_found[0]]
+        for i in range(1, number_of_dimensions):
+            if acquisition_modes[i] == "Real":
+                nuclei_frequencies.append(1.0)
+                labels.append("ID")
+            else:
+                nuclei_frequencies.append(float(params.nucleus_frequencies[i]))
+                labels.append(labels_found[i])
+
+        carrier_frequencies = []
+        referencing_modes = []
+        referencing_mode_indexes = []
+        for i in range(number_of_dimensions):
+            if i == 0:
+                if labels[0] == "1H" or labels[0] == "H1" or labels[0] == "H":
+                    carrier_frequencies.append(float(params.water_ppm))
+                else:
+                    carrier_frequencies.append(float(params.references_proton[0]))
+                referencing_modes.append(params.references_proton_labels[0])
+                referencing_mode_indexes.append(0)
+            elif labels[i] == "ID":
+                carrier_frequencies.append(0.0)
+                referencing_modes.append("N/A")
+                referencing_mode_indexes.append(-1)
+            else:
+                carrier_frequencies.append(float(params.references_other[i - 1]))
+                referencing_modes.append(params.references_other_labels[i - 1])
+                referencing_mode_indexes.append(i - 1)
+
+        scaling_number = default_scaling_number("Bruker", params.NS, params.NC)
+
+        return cls(
+            spectrometer="Bruker",
+            complex_sizes=complex_sizes,
+            real_sizes=real_sizes,
+            acquisition_modes=acquisition_modes,
+            sweep_widths=sweep_widths,
+            nuclei_frequencies=nuclei_frequencies,
+            labels=labels,
+            carrier_frequencies=carrier_frequencies,
+            referencing_modes=referencing_modes,
+            referencing_mode_indexes=referencing_mode_indexes,
+            temperature=float(params.temperature),
+            number_of_scans=int(params.NS),
+            scale_by_ns=params.include_scaling,
+            scale_by_nc=params.include_scaling,
+            scale_by_1000=True,
+            # The GUI converts using the value shown in the scaling textbox
+            scaling_number=float("{:.2E}".format(scaling_number)),
+            remove_digital_filter=params.include_digital_filter,
+            remove_before_ft=False,
+            decim=float(params.decim),
+            dspfvs=int(params.dspfvs),
+            grpdly=float(params.grpdly),
+        )
+
+    @classmethod
+    def from_varian(cls, nmrdata) -> "ConversionParameters":
+        """
+        Default conversion parameters for Varian data (see
+        FormatParametersVarian for the equivalent GUI boxes). Indirect
+        dimensions come from the phase/phase2 arrays, any other arrayed
+        parameter is added as a final real (pseudo) dimension.
+        """
+        params = nmrdata.params
+        if params.label_direct == "1H" or params.label_direct == "H1":
+            proton_reference = "H2O"
+        else:
+            proton_reference = "Manual"
+
+        complex_sizes = [int(params.size_direct)]
+        real_sizes = [int(params.size_direct / 2)]
+        acquisition_modes = [acquisition_mode_options_direct["Varian"][0]]
+        sweep_widths = [float(params.sw_direct)]
+        nuclei_frequencies = [float(params.nucleus_frequency_direct)]
+        labels = [params.label_direct]
+        carrier_frequencies = [float(params.references_proton[0])]
+        referencing_modes = [proton_reference]
+        referencing_mode_indexes = [0]
+
+        indirect_sweep_widths = []
+        if params.phase == True:
+            indirect_sweep_widths.append("sw1")
+        if params.phase2 == True:
+            indirect_sweep_widths.append("sw2")
+        for k, sweep_width in enumerate(indirect_sweep_widths):
+            complex_sizes.append(int(params.size_indirect[k]) * 2)
+            real_sizes.append(int(params.size_indirect[k]))
+            acquisition_modes.append(acquisition_mode_options_indirect["Varian"][0])
+            sweep_widths.append(float(params.sw_indirect[sweep_width]))
+            nuclei_frequencies.append(float(params.nucleus_frequencies_indirect[k]))
+            labels.append(params.labels_indirect[k])
+            try:
+                carrier_frequencies.append(float(params.references_other[k]))
+                referencing_modes.append(params.references_other_labels[k])
+                referencing_mode_indexes.append(k)
+            except IndexError:
+                carrier_frequencies.append(0.0)
+                referencing_modes.append("Other")
+                referencing_mode_indexes.append(-1)
+
+        if params.other_params == True:
+            complex_sizes.append(int(params.number_of_arrayed_parameters))
+            real_sizes.append(int(params.number_of_arrayed_parameters))
+            acquisition_modes.append("Real")
+            sweep_widths.append(0.0)
+            nuclei_frequencies.append(1.0)
+            labels.append("ID")
+            carrier_frequencies.append(0.0)
+            referencing_modes.append("N/A")
+            referencing_mode_indexes.append(-1)
+
+        scaling_number = default_scaling_number("Varian", getattr(params, "NS", 1))
+
+        return cls(
+            spectrometer="Varian",
+            complex_sizes=complex_sizes,
+            real_sizes=real_sizes,
+            acquisition_modes=acquisition_modes,
+            sweep_widths=sweep_widths,
+            nuclei_frequencies=nuclei_frequencies,
+            labels=labels,
+            carrier_frequencies=carrier_frequencies,
+            referencing_modes=referencing_modes,
+            referencing_mode_indexes=referencing_mode_indexes,
+            temperature=float(params.temperature),
+            number_of_scans=int(getattr(params, "NS", 1)),
+            scale_by_ns=params.include_scaling,
+            scale_by_1000=True,
+            scaling_number=float("{:.2E}".format(scaling_number)),
+        )
+
+    def find_nus_file(self, directory: str = ".") -> None:
+        """
+        Turn on NUS reconstruction if a nuslist file is present (as
+        SharedFormatting does in the GUI).
+        """
+        nus_file = os.path.join(directory, "nuslist")
+        if os.path.exists(nus_file) == False:
+            return
+        with open(nus_file, "r") as file:
+            lines = [line for line in file.readlines() if line.strip() != ""]
+        if lines == []:
+            return
+        self.nus = True
+        self.nus_file = "nuslist"
+        self.nus_sample_count = len(lines)
+        if lines[0].split()[0] == "0":
+            self.nus_offset = 0
+        else:
+            self.nus_offset = 1
+
+    @classmethod
+    def from_app(cls, app) -> "ConversionParameters":
+        """
+        Read the current conversion parameters from the SpinConverter GUI
+        """
+        # Imported here as save_parameters needs wx, which headless
+        # conversions run without
+        from SpinExplorer.SpinConverter.StoringParameters.save_parameters import (
+            Populate_dictionary_global,
+        )
+
+        dictionary = Populate_dictionary_global(
+            app.nmrdata.params, app.nmrdata, app
+        ).parameter_dictionary
+        return cls.from_dictionary(dictionary["conversion"])
+
+    @classmethod
+    def from_json(cls, file_name: str = "parameters.json") -> "ConversionParameters":
+        """
+        Read the conversion parameters from a parameters.json file as
+        written by Save_json
+        """
+        with open(file_name, "r") as file:
+            dictionary = json.load(file)
+        return cls.from_dictionary(dictionary["conversion"])
+
+    @classmethod
+    def from_dictionary(cls, dictionary: Dict[str, Any]) -> "ConversionParameters":
+        """
+        Create the conversion parameters from the "conversion" section of
+        a parameters.json dictionary
+        """
+        spectrometer = dictionary["general"]["spectrometer"]
+        spectral = dictionary["spectral parameters"]
+        modes = spectral["acqusition modes"]
+        acquisition_modes = [modes["direct"]["mode"]]
+        if modes["indirect"] != {}:
+            acquisition_modes = acquisition_modes + list(modes["indirect"]["mode"])
+        carriers = spectral["carrier frequencies"]
+
+        parameters = cls(
+            spectrometer=spectrometer,
+            complex_sizes=[int(size) for size in spectral["sizes"]["complex"]],
+            real_sizes=[int(size) for size in spectral["sizes"]["real"]],
+            acquisition_modes=acquisition_modes,
+            sweep_widths=[float(sw) for sw in spectral["sweep widths"]["values"]],
+            nuclei_frequencies=[
+                float(frequency) for frequency in spectral["nuclei frequencies"]
+            ],
+            labels=[str(label).strip() for label in spectral["labels"]],
+            carrier_frequencies=[float(ppm) for ppm in carriers["frequency"]],
+            referencing_modes=list(carriers.get("combobox", [])),
+            referencing_mode_indexes=[
+                int(index) for index in carriers.get("combobox index", [])
+            ],
+            temperature=float(dictionary["general"].get("temperature", 298.15)),
+            number_of_scans=int(
+                float(dictionary["general"].get("number of scans (NS)", 1))
+            ),
+        )
+
+        scaling = dictionary.get("intensity scaling", {})
+        parameters.scale_by_ns = bool(
+            scaling.get("Scale by number of scans (NS)", False)
+        )
+        parameters.scale_by_nc = bool(
+            scaling.get("Scale by Bruker normalisation constant (NC)", False)
+        )
+        parameters.scale_by_1000 = bool(scaling.get("Scale by 1000", True))
+        try:
+            parameters.scaling_number = float(scaling["Scaling number"])
+        except:
+            parameters.scaling_number = 1.0
+
+        if "digital filter parameters" in dictionary:
+            digital_filter = dictionary["digital filter parameters"]
+            parameters.remove_digital_filter = bool(
+                digital_filter["Remove Digital Filter"]
+            )
+            parameters.remove_before_ft = (
+                digital_filter["Remove Before/After Fourier Transform"] == "Before"
+            )
+            parameters.decim = float(digital_filter["Decimation Rate (decim)"])
+            parameters.dspfvs = int(digital_filter["DSP Firmware Version (dspfvs)"])
+            parameters.grpdly = float(digital_filter["Group Delay (grpdly)"])
+
+        if "other parameters" in dictionary:
+            other = dictionary["other parameters"]
+            parameters.remove_acquisition_padding = bool(
+                other["remove acqusition padding"]
+            )
+            parameters.bad_point_threshold = float(other["bad point threshold"])
+
+        nus = dictionary.get("NUS information", "N/A")
+        if nus != "N/A":
+            parameters.nus = bool(nus["Checkbox"])
+            parameters.nus_sample_count = int(nus["NUS sample count"])
+            parameters.nus_offset = int(nus["NUS offset"])
+            parameters.nus_file = str(nus["NUS file"])
+            parameters.reverse_nus_schedule = bool(nus["Reverse NUS schedule"])
+
+        return parameters
+
+    def to_dictionary(self) -> Dict[str, Any]:
+        """
+        Return the parameters in the parameters.json layout used by
+        Save_json and Read_json
+        """
+        direct_options = acquisition_mode_options_direct[self.spectrometer]
+        indirect_options = acquisition_mode_options_indirect[self.spectrometer]
+
+        def option_index(options, mode):
+            if mode in options:
+                return options.index(mode)
+            return -1
+
+        indirect_modes = {}
+        if self.ndim > 1:
+            indirect_modes = {
+                "mode": self.acquisition_modes[1:],
+                "index": [
+                    option_index(indirect_options, mode)
+                    for mode in self.acquisition_modes[1:]
+                ],
+            }
+
+        referencing_modes = self.referencing_modes
+        if len(referencing_modes) != self.ndim:
+            referencing_modes = ["Other"] * self.ndim
+        referencing_mode_indexes = self.referencing_mode_indexes
+        if len(referencing_mode_indexes) != self.ndim:
+            referencing_mode_indexes = [-1] * self.ndim
+
+        conversion = {
+            "general": {
+                "spectrometer": self.spectrometer,
+                "temperature": str(self.temperature),
+                "number of scans (NS)": str(self.number_of_scans),
+            },
+            "spectral parameters": {
+                "sizes": {
+                    "complex": [str(size) for size in self.complex_sizes],
+                    "real": [str(size) for size in self.real_sizes],
+                },
+                "acqusition modes": {
+                    "direct": {
+                        "mode": self.acquisition_modes[0],
+                        "index": option_index(
+                            direct_options, self.acquisition_modes[0]
+                        ),
+                    },
+                    "indirect": indirect_modes,
+                },
+                "sweep widths": {
+                    "values": [str(sw) for sw in self.sweep_widths],
+                    "indexes": [str(i) for i in range(self.ndim)],
+                },
+                "nuclei frequencies": [str(obs) for obs in self.nuclei_frequencies],
+                "labels": [str(label) for label in self.labels],
+                "carrier frequencies": {
+                    "frequency": [str(ppm) for ppm in self.carrier_frequencies],
+                    "combobox": [str(mode) for mode in referencing_modes],
+                    "combobox index": [str(i) for i in referencing_mode_indexes],
+                },
+            },
+            "intensity scaling": {
+                "Scale by number of scans (NS)": self.scale_by_ns,
+                "Scale by Bruker normalisation constant (NC)": self.scale_by_nc,
+                "Scale by 1000": self.scale_by_1000,
+                "Scaling number": "{:.2E}".format(self.scaling_number),
+            },
+        }
+
+        if self.spectrometer == "Bruker":
+            if self.remove_before_ft == True:
+                remove = "Before"
+            else:
+                remove = "After"
+            conversion["digital filter parameters"] = {
+                "Remove Digital Filter": self.remove_digital_filter,
+                "Remove Before/After Fourier Transform": remove,
+                "Decimation Rate (decim)": str(self.decim),
+                "DSP Firmware Version (dspfvs)": str(self.dspfvs),
+                "Group Delay (grpdly)": str(self.grpdly),
+            }
+            conversion["other parameters"] = {
+                "remove acqusition padding": self.remove_acquisition_padding,
+                "bad point threshold": str(self.bad_point_threshold),
+            }
+
+        if self.ndim > 1 and self.nus == True:
+            conversion["NUS information"] = {
+                "Checkbox": True,
+                "NUS sample count": str(self.nus_sample_count),
+                "NUS offset": str(self.nus_offset),
+                "NUS file": str(self.nus_file),
+                "Reverse NUS schedule": self.reverse_nus_schedule,
+            }
+        else:
+            conversion["NUS information"] = "N/A"
+
+        return {"conversion": conversion}
+
+    def write_json(self, file_name: str = "parameters.json") -> None:
+        """
+        Save the parameters to a parameters.json file, keeping any
+        processing parameters already saved in the file
+        """
+        dictionary = self.to_dictionary()
+        if pathlib.Path(file_name).exists() == True:
+            try:
+                with open(file_name, "r") as file:
+                    saved = json.load(file)
+                if "processing" in saved.keys():
+                    dictionary["processing"] = saved["processing"]
+            except:
+                pass
+        with open(file_name, "w") as file:
+            json.dump(dictionary, file, indent=4)
@@ -345,6 +345,7 @@ class Populate_dictionary_global:
         Adding the spectrum scaling information to the dictionary
         """
         scale_by_ns_flag = self.app.shared_format.scaling_NS_checkbox.GetValue()
+        scale_by_nc_flag = False
         if dictionary["general"]["spectrometer"] == "Bruker":
             scale_by_nc_flag = self.app.shared_format.scaling_NC.GetValue()
         scale_by_1000_flag = self.app.shared_format.scaling_by_number.GetValue()
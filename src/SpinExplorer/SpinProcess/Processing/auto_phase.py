@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+from scipy.optimize import minimize
+
+# The peak minima only measure the phase around the largest peak, so with the
+# minima method p1 is always found with acme and the minima refine p0 alone
+methods = ["acme", "minima"]
+
+
+class AutoPhase:
+    def __init__(self, data, pivot=0, method="acme", batch_size=2**22) -> None:
+        """
+        This class finds the zero (p0) and first (p1) order phase correction
+        of a 1D spectrum. Candidate phases are scored in vectorised batches
+        against the cached complex spectrum (ACME entropy minimisation or
+        the peak minima criterion), then the best candidate is refined with
+        a local optimiser. Phases are in degrees using the nmrPipe PS
+        convention, with p1 applied about the pivot point.
+        """
+        data = np.asarray(data)
+        if np.iscomplexobj(data) == False:
+            # Reconstruct the imaginary part of a real spectrum
+            data = ng.process.proc_base.ht(data, data.shape[-1])
+        self.data = data / np.max(np.abs(data))
+        self.size = len(self.data)
+        self.ramp = np.arange(-pivot, -pivot + self.size) / self.size
+        self.method = method
+        self.batch_size = batch_size
+
+        # Noise level from the point to point differences of the spectrum
+        self.noise = np.median(np.abs(np.diff(self.data.real))) / 0.6745 / np.sqrt(2)
+
+        # Only points with signal (and their neighbours) are scored so that
+        # the noise does not dominate the score, the magnitude of the
+        # spectrum does not depend on the phase
+        signal = np.abs(self.data) > 20 * self.noise
+        if np.count_nonzero(signal) < 16:
+            signal[:] = True
+        signal = np.convolve(signal, np.ones(3), mode="same") > 0
+        self.points = np.nonzero(signal)[0]
+        # Points (in self.points) with both neighbours for the derivative
+        self.centres = np.nonzero(self.points[2:] - self.points[:-2] == 2)[0] + 1
+
+        # Region around the largest peak for the peak minima criterion
+        self.peak = int(np.argmax(np.abs(self.data)))
+        width = max(self.size // 100, 2)
+        self.window = np.arange(
+            max(self.peak - width, 0), min(self.peak + width + 1, self.size)
+        )
+
+    @classmethod
+    def from_plane(cls, plane, rows=8, **kwargs):
+        """
+        Phase the direct dimension of a 2D plane (or a stack of 1D spectra)
+        using the sum of the rows with the most intense peaks, which share
+        the same phase error.
+        """
+        plane = np.asarray(plane)
+        plane = plane.reshape(-1, plane.shape[-1])
+        if np.iscomplexobj(plane) == False:
+            plane = ng.process.proc_base.ht(plane, plane.shape[-1])
+        maxima = np.max(np.abs(plane), axis=1)
+        strongest = np.argsort(maxima)[-rows:]
+        return cls(np.sum(plane[strongest], axis=0), **kwargs)
+
+    def phased(self, p0, p1, points) -> np.ndarray:
+        # Real part of the spectrum at points for each pair of candidate phases
+        angles = np.radians(
+            np.atleast_1d(p0)[:, None] + np.atleast_1d(p1)[:, None] * self.ramp[points]
+        )
+        data = self.data[points]
+        return data.real * np.cos(angles) - data.imag * np.sin(angles)
+
+    def acme(self, p0, p1) -> np.ndarray:
+        # Entropy of the first derivative plus a penalty on negative intensities
+        spectra = self.phased(p0, p1, self.points)
+        derivative = np.abs(spectra[:, self.centres + 1] - spectra[:, self.centres - 1])
+        derivative /= np.sum(derivative, axis=1, keepdims=True)
+        entropy = -np.sum(
+            derivative * np.log(np.where(derivative > 0, derivative, 1)), axis=1
+        )
+        penalty = 1000 * np.sum(np.minimum(spectra + 3 * self.noise, 0) ** 2, axis=1)
+        return entropy + penalty
+
+    def minima(self, p0, p1) -> np.ndarray:
+        # The minima either side of the largest peak should be equal and the peak positive
+        spectra = self.phased(p0, p1, self.window)
+        centre = self.peak - self.window[0]
+        below = spectra[:, : centre + 1].min(axis=1)
+        above = spectra[:, centre:].min(axis=1)
+        return np.abs(below - above) + 10 * (spectra[:, centre] < 0)
+
+    def scores(self, p0, p1, method=None) -> np.ndarray:
+        if method is None:
+            method = self.method
+        p0 = np.atleast_1d(p0)
+        p1 = np.broadcast_to(np.atleast_1d(p1), p0.shape)
+        score = getattr(self, method)
+        # Number of candidates scored at once
+        batch = max(self.batch_size // len(self.points), 1)
+        return np.concatenate(
+            [
+                score(p0[i : i + batch], p1[i : i + batch])
+                for i in range(0, len(p0), batch)
+            ]
+        )
+
+    def search(self, p1_range=(-180, 180), p0_step=5, p1_step=10) -> tuple:
+        # Score a grid of candidate phases and return the best pair
+        p0, p1 = np.meshgrid(
+            np.arange(-180, 180, p0_step),
+            np.arange(p1_range[0], p1_range[1] + p1_step / 2, p1_step),
+        )
+        p0, p1 = p0.ravel(), p1.ravel()
+        best = np.argmin(self.scores(p0, p1, "acme"))
+        return p0[best], p1[best]
+
+    def refine_p0(self, p0, p1) -> float:
+        # Refine p0 alone with the peak minima criterion, keeping p1 fixed
+        candidates = p0 + np.arange(-180, 180, 1.0)
+        start = candidates[np.argmin(self.scores(candidates, p1, "minima"))]
+        result = minimize(
+            lambda phase: self.scores(phase[0], p1, "minima")[0],
+            np.array([start], dtype=float),
+            method="Nelder-Mead",
+            options={"xatol": 0.01, "fatol": 1e-12},
+        )
+        return result.x[0]
+
+    def run(self, p1_range=(-180, 180)) -> tuple:
+        """
+        Returns the (p0, p1) phase correction of the spectrum, p0 is wrapped
+        to between -180 and 180 degrees and p1 is kept within p1_range. Both
+        are found with acme; with the minima method p0 is then refined using
+        the minima either side of the largest peak.
+        """
+        start = self.search(p1_range)
+        result = minimize(
+            lambda phases: self.scores(phases[0], phases[1], "acme")[0],
+            np.array(start, dtype=float),
+            method="Nelder-Mead",
+            bounds=[(None, None), p1_range],
+            options={"xatol": 0.01, "fatol": 1e-12},
+        )
+        p0, p1 = result.x
+        if self.method == "minima":
+            p0 = self.refine_p0(p0, p1)
+        p0 = (p0 + 180) % 360 - 180
+        p1 = min(max(p1, p1_range[0]), p1_range[1])
+        return float(p0), float(p1)
+
+
+def coarse_fine(phase, limit=180) -> tuple:
+    # Split a phase into the values of the coarse (whole degrees) and fine phasing sliders
+    coarse = max(min(round(phase), limit), -limit)
+    return coarse, phase - coarse
+
+
+def auto_phase(data, pivot=0, method="acme", p1_range=(-180, 180)) -> tuple:
+    """
+    Find the (p0, p1) phase correction of a 1D spectrum, or of the direct
+    dimension of a 2D plane / pseudo 2D stack.
+    """
+    data = np.asarray(data)
+    if data.ndim > 1:
+        phasing = AutoPhase.from_plane(data, pivot=pivot, method=method)
+    else:
+        phasing = AutoPhase(data, pivot=pivot, method=method)
+    return phasing.run(p1_range)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+from typing import Any, Dict, List, Union
+
+
+# The nmrPipe header is 512 float32 values at the start of every file
+header_size = 2048
+
+
+class PipeHeader:
+    def __init__(self, dic: Dict[str, Any]) -> None:
+        """
+        This class gives the dimensions, axis labels, sizes, quadrature
+        flags, spectral widths and pseudo axis of nmrPipe data from its
+        header (a nmrglue pipe dictionary), in the same order as showhdr:
+        X (the direct dimension) first, then Y, Z and A.
+        """
+        self.dic = dic
+        self.ndim = int(dic["FDDIMCOUNT"])
+        # The nmrPipe dimension (FDF1-FDF4) holding each of the X, Y, Z, A axes
+        self.dimensions = [int(dic["FDDIMORDER"][i]) for i in range(self.ndim)]
+
+        self.labels = [self.value(i, "LABEL") for i in range(self.ndim)]
+        self.sw = [float(self.value(i, "SW")) for i in range(self.ndim)]
+        # 1 for real and 0 for complex (quadrature) data
+        self.quad_flags = [int(self.value(i, "QUADFLAG")) for i in range(self.ndim)]
+        self.complex = [flag == 0 for flag in self.quad_flags]
+        self.time_domain = [int(self.value(i, "FTFLAG")) == 0 for i in range(self.ndim)]
+        self.sizes = self.find_sizes()
+        self.pseudo_axis = self.find_pseudo_axis()
+
+    @classmethod
+    def from_file(cls, file_name: str) -> "PipeHeader":
+        """
+        Read only the header of a nmrPipe file (for a 3D plane series, any
+        one of the planes)
+        """
+        with open(file_name, "rb") as file:
+            header = file.read(header_size)
+        return cls(header_dictionary(header))
+
+    def value(self, axis: int, parameter: str) -> Any:
+        return self.dic["FDF{}{}".format(self.dimensions[axis], parameter)]
+
+    def label(self, dimension: int) -> str:
+        """
+        The label of nmrPipe dimension FDF1-FDF4 (rather than the X-A axes)
+        """
+        return self.dic["FDF{}LABEL".format(dimension)]
+
+    def find_sizes(self) -> List[int]:
+        """
+        The number of points along each axis, counting the real and
+        imaginary points of complex data separately (as the -xN, -yN
+        values in fid.com). These match nmrglue's ng.pipe.find_shape
+        """
+        sizes = [int(self.dic["FDSIZE"]) * (2 - self.quad_flags[0])]
+        if self.ndim > 1:
+            y_size = int(self.dic["FDSPECNUM"])
+            # FDSPECNUM is halved when a real direct dimension has a complex
+            # indirect dimension
+            if self.dic["FDQUADFLAG"] == 0 and self.quad_flags[0] == 1:
+                y_size = y_size * 2
+            sizes.append(y_size)
+        for i in range(2, self.ndim):
+            sizes.append(int(self.value(i, "SIZE")))
+        return sizes
+
+    def find_pseudo_axis(self) -> Union[int, None]:
+        """
+        The index (X=0, Y=1, ...) of an indirect axis that holds real,
+        untransformed data that is not TPPI encoded, i.e. a pseudo axis
+        (e.g. relaxation delays or gradient strengths). None if there is no
+        pseudo axis
+        """
+        if self.dic["FD2DPHASE"] == 1:
+            return None
+        for i in range(1, self.ndim):
+            if self.complex[i] == False and self.time_domain[i] == True:
+                return i
+        return None
+
+
+def header_dictionary(header: bytes) -> Dict[str, Any]:
+    """
+    Convert the 2048 byte header of a nmrPipe file to a nmrglue pipe
+    dictionary, swapping the byte order if the file was written on a
+    machine with the other endianness
+    """
+    if len(header) < header_size:
+        raise ValueError("The file is too short to be a nmrPipe file")
+    fdata = np.frombuffer(header, dtype=np.float32, count=512)
+    # FDFLTORDER (the third value) is always 2.345
+    if abs(fdata[2] - 2.345) > 1e-6:
+        fdata = fdata.byteswap()
+        if abs(fdata[2] - 2.345) > 1e-6:
+            raise ValueError("The file does not have a nmrPipe header")
+    return ng.pipe.fdata2dic(fdata)
@@ -58,6 +58,19 @@ import nmrglue as ng
 import subprocess
 import os
 
+# Importing internal classes
+from SpinExplorer.SpinConverter.FindingParameters.parameter_index import (
+    get_parameter_index,
+)
+from SpinExplorer.SpinConverter.FormattingGUI.job_monitor import JobMonitor
+from SpinExplorer.SpinConverter.Conversion.jobs import get_job_manager
+from SpinExplorer.SpinProcess.ReadingData.pipe_header import PipeHeader
+from SpinExplorer.SpinProcess.Processing.auto_phase import (
+    AutoPhase,
+    auto_phase,
+    coarse_fine,
+)
+
 matplotlib.rcParams["font.sans-serif"] = "Arial"
 matplotlib.rcParams["font.family"] = "sans-serif"
 
@@ -144,124 +157,38 @@ class ReadFID:
             self.dic, self.data = ng.pipe.read(self.fid_file)
 
     def get_dimensions(self):
+        # Read the dimensions, axis labels, sizes and spectral widths from the
+        # nmrPipe header rather than running showhdr or reading fid.com
         try:
-            if platform != "windows":
-                # Try the command showhdr to get the axis labels
-                command = "showhdr " + self.fid_file
-                # output = subprocess.check_output(command)
-                p = subprocess.Popen(command, stdout=subprocess.PIPE, shell=True)
-
-                ## Wait for command to terminate. Get return returncode ##
-                p_status = p.wait()
-
-                (output, err) = p.communicate()
-
-                output = output.decode()
-                output = output.split("\n")
-                if output != [""]:
-                    self.dim = []
-                    for line in output:
-                        if "NAME:" in line:
-                            line = line.split()[1:]
-                            self.dim = len(line)
-                            self.axis_labels = line
-                            break
-                else:
-                    fidcom = open("fid.com", "r")
-                    lines = fidcom.readlines()
-                    fidcom.close()
-                    # Find the line of fid.com with -xLAB in it
-                    for line in lines:
-                        if "-xLAB" in line:
-                            line = line.split("\n")[0].split()
-                            if len(line) == 3:
-                                self.dim = 1
-                                self.axis_labels = [line[1]]
-                            elif len(line) == 5:
-                                self.dim = 2
-                                self.axis_labels = [line[1], line[3]]
-                            else:
-                                self.dim = 3
-                                self.axis_labels = [line[1], line[3], line[5]]
-                            break
-
+            if self.fid_file == "fids":
+                self.header = PipeHeader.from_file("./fids/test%03d.fid" % 1)
             else:
-                fidcom = open("fid.com", "r")
-                lines = fidcom.readlines()
-                fidcom.close()
-                # Find the line of fid.com with -xLAB in it
-                for line in lines:
-                    if "-xLAB" in line:
-                        line = line.split("\n")[0].split()
-                        if len(line) == 3:
-                            self.dim = 1
-                            self.axis_labels = [line[1]]
-                        elif len(line) == 5:
-                            self.dim = 2
-                            self.axis_labels = [line[1], line[3]]
-                        else:
-                            self.dim = 3
-                            self.axis_labels = [line[1], line[3], line[5]]
-                        break
-
-        except:
-            # If showhdr fails, use the dimension of the data
-            self.dim = len(self.fid.shape) - 1
+                self.header = PipeHeader(self.dic)
+        except (OSError, ValueError, KeyError):
+            if self.fid_file == "fids":
+                self.dim = 3
+            else:
+                self.dim = self.data.ndim
             self.axis_labels = ["X", "Y", "Z"]
-
-        # Read fid.com file, if any axes are real, flag that as a pseudo axis
-        try:
-            fidcom = open("fid.com", "r")
-            lines = fidcom.readlines()
-            fidcom.close()
-            for line in lines:
-                if "-xN" in line:
-                    line = line.split("\n")[0].split()
-                    if len(line) == 3:
-                        self.number_of_points = [int(line[1])]
-                    elif len(line) == 5:
-                        self.number_of_points = [int(line[1]), int(line[3])]
-                    else:
-                        self.number_of_points = [
-                            int(line[1]),
-                            int(line[3]),
-                            int(line[5]),
-                        ]
-                elif "-xSW" in line:
-                    line = line.split("\n")[0].split()
-                    if len(line) == 3:
-                        self.spectral_width = [float(line[1])]
-                    elif len(line) == 5:
-                        self.spectral_width = [float(line[1]), float(line[3])]
-                    else:
-                        self.spectral_width = [
-                            float(line[1]),
-                            float(line[3]),
-                            float(line[5]),
-                        ]
-
-                elif "-xMODE" in line:
-                    if "Real" in line:
-                        self.pseudo_axis = True
-                        if self.dim == 2:
-                            self.index = 0
-                        elif self.dim == 3:
-                            line = line.split("\n")[0].split()
-                            # Find the index of the real axis in the fid.com file
-                            if line[1] == "Real":
-                                self.index = 0
-                            elif line[3] == "Real":
-                                self.index = 1
-                            else:
-                                self.index = 2
-                    else:
-                        self.pseudo_axis = False
-                    continue
-
-        except:
             self.pseudo_axis = False
             self.number_of_points = [1]
             self.spectral_width = [1]
+            return
+
+        self.dim = self.header.ndim
+        self.axis_labels = self.header.labels
+        self.number_of_points = self.header.sizes
+        self.spectral_width = self.header.sw
+
+        # A real, untransformed indirect axis is a pseudo axis
+        if self.header.pseudo_axis is None:
+            self.pseudo_axis = False
+        else:
+            self.pseudo_axis = True
+            if self.dim == 2:
+                self.index = 0
+            else:
+                self.index = self.header.pseudo_axis
 
 
 class ChooseFile(wx.Dialog):
@@ -411,6 +338,10 @@ class NotebookProcess(wx.Notebook):
         self.parent.main_sizer.AddSpacer(10)
 
     def on_make_nmrproc_com(self, event):
+        # Find the direct dimension phase correction first if automatic phasing is selected
+        if self.tabDim1.auto_phase_checkbox.GetValue() == True:
+            self.tabDim1.on_phase_correction_automatic(event)
+
         # Change path if using unidecFile parser
         self.change_to_path()
 
@@ -2980,9 +2911,12 @@ class NotebookProcess(wx.Notebook):
             elif self.tabDim1.ft_method_selection == 3:
                 dic, data = ng.pipe_proc.ft(dic, data, alt=True)
 
-        dic_bruker, dat_bruker = ng.bruker.read("./")
+        dic_bruker = {"acqus": get_parameter_index().acqus()}
         data = self.remove_digital_filter(dic_bruker, data)
 
+        if self.tabDim1.auto_phase_checkbox.GetValue() == True:
+            self.tabDim1.apply_automatic_phasing(data, show_dialog=False)
+
         if self.tabDim1.phase_correction_checkbox.GetValue() == True:
             dic, data = ng.pipe_proc.ps(
                 dic,
@@ -3533,6 +3467,21 @@ class NotebookProcess(wx.Notebook):
         # Disable spinview while reprocessing the data
         self.change_to_path_run()
 
+        # Only process the data in a directory once at a time
+        if get_job_manager().active_jobs(cwd=os.getcwd()) != []:
+            dlg = wx.MessageDialog(
+                self,
+                "The data in this directory is already being processed. Wait for the processing to finish (or cancel it) before running it again.",
+                "Warning",
+                wx.OK | wx.ICON_WARNING,
+            )
+            self.Raise()
+            self.SetFocus()
+            dlg.ShowModal()
+            dlg.Destroy()
+            self.change_to_cwd()
+            return
+
         # Check to see if the nmrproc.com file exists
         if os.path.exists("nmrproc.com") == False:
             dlg = wx.MessageDialog(
@@ -3574,12 +3523,50 @@ class NotebookProcess(wx.Notebook):
                         os.chdir(self.parent.original_frame.parent.cwd)
                 return
 
-        # Run the nmrproc.com file
-        command = "csh nmrproc.com"
+        # Run the nmrproc.com file in the background, showing its progress
+        self.processing_monitor = JobMonitor(
+            self,
+            "csh nmrproc.com",
+            cwd=os.getcwd(),
+            title="nmrPipe processing",
+            on_finished=self.on_nmrproc_finished,
+        )
+        self.run_processing_button.Disable()
+
+    def on_nmrproc_finished(self, job):
+        self.run_processing_button.Enable()
+
+        # Return to the directory the processing was run in
+        os.chdir(job.cwd)
 
-        # Check to see if the output file is not empty
-        p = subprocess.Popen(command, stdout=subprocess.PIPE, shell=True)
-        p.wait()
+        if job.status in ["cancelled", "failed"]:
+            if self.parent.original_frame != None:
+                try:
+                    self.parent.original_frame.Enable()
+                except:
+                    pass
+                if self.parent.original_frame.parent.cwd != "":
+                    os.chdir(self.parent.original_frame.parent.cwd)
+            if self.parent.file_parser == True:
+                os.chdir(self.parent.cwd)
+            if job.status == "failed":
+                # Show the end of the error output of nmrproc.com
+                lines = job.stderr()
+                if lines == []:
+                    lines = job.stdout()
+                message = "Processing unsuccessful, nmrproc.com could not be run."
+                if job.returncode is not None:
+                    message = "Processing unsuccessful, nmrproc.com exited with status {}.".format(
+                        job.returncode
+                    )
+                if lines != []:
+                    message += "\n\n" + "\n".join(lines[-10:])
+                dlg = wx.MessageDialog(
+                    self, message, "Warning", wx.OK | wx.ICON_WARNING
+                )
+                dlg.ShowModal()
+                dlg.Destroy()
+            return
 
         if self.parent.original_frame != None:
             if self.parent.original_frame.parent.cwd != "":
@@ -3922,6 +3909,7 @@ class OneDFrame(wx.Panel):
         self.p0_total = 0.0
         self.p1_total = 0.0
         self.magnitude_mode_toggle = False
+        self.auto_phase_checkbox_value = False
 
     def set_initial_extraction_variables(self):
         self.extraction_checkbox_value = False
@@ -4723,6 +4711,25 @@ class OneDFrame(wx.Panel):
         )
         self.phase_correction_sizer.AddSpacer(10)
 
+        # Have a button to find the phase correction automatically
+        self.phase_correction_automatic_button = wx.Button(parent, -1, "Auto Phase")
+        self.phase_correction_automatic_button.Bind(
+            wx.EVT_BUTTON, self.on_phase_correction_automatic
+        )
+        self.phase_correction_sizer.Add(
+            self.phase_correction_automatic_button, 0, wx.ALIGN_CENTER_VERTICAL
+        )
+        self.phase_correction_sizer.AddSpacer(5)
+
+        # If checked, the phase correction is found automatically every time the data is processed
+        self.auto_phase_checkbox = wx.CheckBox(parent, -1, "Auto phase on processing")
+        self.auto_phase_checkbox.SetValue(self.auto_phase_checkbox_value)
+        self.auto_phase_checkbox.Bind(wx.EVT_CHECKBOX, self.on_auto_phase_checkbox)
+        self.phase_correction_sizer.Add(
+            self.auto_phase_checkbox, 0, wx.ALIGN_CENTER_VERTICAL
+        )
+        self.phase_correction_sizer.AddSpacer(10)
+
         # Have a button showing information on phase correction
         self.phase_correction_info = wx.Button(parent, -1, "\u24d8", size=(25, 32))
         self.phase_correction_info.Bind(wx.EVT_BUTTON, self.on_phase_correction_info)
@@ -4973,7 +4980,7 @@ class OneDFrame(wx.Panel):
                 dic, data = ng.pipe.read("test.fid")
             # Perform at fourier transform in the direct dimension
             dic, data = ng.pipe_proc.ft(dic, data, auto=True)
-            dic_bruker, dat_bruker = ng.bruker.read("./")
+            dic_bruker = {"acqus": get_parameter_index().acqus()}
             data = self.parent.remove_digital_filter(dic_bruker, data)
             self.nmr_d, self.nmr_spectrum = dic, data
 
@@ -4992,6 +4999,47 @@ class OneDFrame(wx.Panel):
         # Get the ppm scale
         self.ppm_scale = self.uc.ppm_scale()
 
+    def on_auto_phase_checkbox(self, event):
+        self.auto_phase_checkbox_value = self.auto_phase_checkbox.GetValue()
+
+    def on_phase_correction_automatic(self, event):
+        v = self.find_nmr_data_for_phasing()
+        if v == False:
+            return
+        self.apply_automatic_phasing(self.nmr_spectrum)
+
+    def apply_automatic_phasing(self, data, show_dialog=True) -> bool:
+        """
+        Find the phase correction of the direct dimension of data (after the
+        Fourier transform) and put it in the p0/p1 textcontrols. If it fails
+        the values are left unchanged and a warning is shown, or only printed
+        if show_dialog is False (so processing is not interrupted).
+        """
+        try:
+            p0, p1 = auto_phase(data)
+        except Exception as error:
+            if show_dialog == False:
+                print(
+                    "Automatic phase correction failed ({}), the phase correction values have not been changed.".format(
+                        error
+                    )
+                )
+                return False
+            dlg = wx.MessageDialog(
+                self,
+                "Automatic phase correction failed, the phase correction values have not been changed.",
+                "Warning",
+                wx.OK | wx.ICON_WARNING,
+            )
+            dlg.ShowModal()
+            dlg.Destroy()
+            return False
+        self.phase_correction_p0_textcontrol.SetValue("{:.2f}".format(p0))
+        self.phase_correction_p1_textcontrol.SetValue("{:.2f}".format(p1))
+        self.phase_correction_checkbox.SetValue(True)
+        self.phase_correction_checkbox_value = True
+        return True
+
     def on_phase_correction_interactive(self, event):
 
         v = self.find_nmr_data_for_phasing()
@@ -12760,6 +12808,12 @@ class InteractivePhasingFrame(wx.Frame):
         self.zoom_sizer.AddSpacer(5)
         self.zoom_sizer.Add(self.intensity_slider)
 
+        # Have a button to find the phasing automatically
+        self.auto_phase_button = wx.Button(self, label="Auto Phase")
+        self.auto_phase_button.Bind(wx.EVT_BUTTON, self.OnAutoPhase)
+        self.pivot_sizer.AddSpacer(20)
+        self.pivot_sizer.Add(self.auto_phase_button)
+
         # Have a save and close button
         self.save_button = wx.Button(self, label="Save and Close")
         self.save_button.Bind(wx.EVT_BUTTON, self.OnSavePhasing)
@@ -12781,6 +12835,28 @@ class InteractivePhasingFrame(wx.Frame):
         self.canvas.Refresh()
         self.canvas.Update()
 
+    def OnAutoPhase(self, event):
+        # Find the phasing automatically (in the same convention as the sliders) and move the sliders to it
+        try:
+            p0, p1 = AutoPhase(np.real(self.nmr_spectrum), pivot=self.pivot_x).run()
+        except Exception:
+            dlg = wx.MessageDialog(
+                self,
+                "Automatic phase correction failed, the phase correction values have not been changed.",
+                "Warning",
+                wx.OK | wx.ICON_WARNING,
+            )
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+        p0_coarse, p0_fine = coarse_fine(p0)
+        p1_coarse, p1_fine = coarse_fine(p1)
+        self.P0_slider.SetValue(p0_coarse)
+        self.P0_slider_fine.SetValue(p0_fine)
+        self.P1_slider.SetValue(p1_coarse)
+        self.P1_slider_fine.SetValue(p1_fine)
+        self.OnSliderScroll1D(event)
+
     def OnSavePhasing(self, event):
         # Function to save the phasing values and close the window
         self.main_frame.phase_correction_p0_textcontrol.SetValue(str(self.total_P0))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+import numpy as np
+
+
+class CESTProfiles:
+    def __init__(self, data, CESTArrayOrder=0) -> None:
+        """
+        This class holds interleaved on/off resonance pseudo2D CEST data as
+        (offset x point) views of the original data. The normalised CEST
+        profile of every point is calculated once in a single division and
+        stored so that changing the selected point is a simple lookup.
+        """
+        # Data is arrayed along the first axis of the transposed data
+        self.CEST_data = np.asarray(data).T
+
+        # Strided slices are views so no copy of the data is made
+        if CESTArrayOrder == 0:
+            self.cest_on_data = self.CEST_data[0::2]
+            self.cest_off_data = self.CEST_data[1::2]
+        else:
+            self.cest_on_data = self.CEST_data[1::2]
+            self.cest_off_data = self.CEST_data[0::2]
+
+        # Ignore a trailing unpaired spectrum if present
+        self.number_of_offsets = min(len(self.cest_on_data), len(self.cest_off_data))
+        self.cest_on_data = self.cest_on_data[: self.number_of_offsets]
+        self.cest_off_data = self.cest_off_data[: self.number_of_offsets]
+
+        self.normalized_cest_data = None
+
+    def normalise_all(self) -> np.ndarray:
+        """
+        Calculating the normalised (on/off) CEST profiles for all points at
+        once. The result is cached so this is only done once.
+        """
+        if self.normalized_cest_data is None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.normalized_cest_data = np.divide(
+                    self.cest_on_data, self.cest_off_data, dtype=np.float64
+                )
+        return self.normalized_cest_data
+
+    def profile(self, index: int) -> np.ndarray:
+        """
+        Returning the normalised CEST profile (one value per offset) for the
+        point at the given index.
+        """
+        return self.normalise_all()[:, index]
+
+    def raw_profile(self, index: int) -> np.ndarray:
+        """
+        Returning the non-normalised on resonance intensities for the point
+        at the given index.
+        """
+        return self.cest_on_data[:, index]
+
+    def export_profiles(self, file_name, ppms, offsets_ppm) -> None:
+        """
+        Saving the normalised CEST profiles of all points to a tab separated
+        text file. Each row is a point (chemical shift) and each column is a
+        CEST offset.
+        """
+        normalised = self.normalise_all()
+        table = np.column_stack((np.asarray(ppms, dtype=np.float64), normalised.T))
+        header = "ppm\t" + "\t".join(str(offset) for offset in offsets_ppm)
+        np.savetxt(
+            file_name, table, delimiter="\t", header=header, comments="", fmt="%.6g"
+        )
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+
+
+class Integrals:
+    def __init__(self, ppms) -> None:
+        """
+        This class holds integral regions of a 1D spectrum. The cumulative sum
+        of the spectrum is calculated once whenever the spectrum changes
+        (phasing, baseline), after which the integral of every region is the
+        difference of two values of the cumulative sum.
+        """
+        self.ppms = np.asarray(ppms)
+        self.regions = np.zeros((0, 2), dtype=int)
+        self.cumulative = np.zeros(len(self.ppms) + 1)
+        self.reference = None
+        self.reference_value = 1.0
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def index(self, ppm) -> np.ndarray:
+        # Point index of a ppm value on the (linear) ppm scale of the spectrum
+        step = (self.ppms[-1] - self.ppms[0]) / (len(self.ppms) - 1)
+        index = np.rint((np.asarray(ppm) - self.ppms[0]) / step).astype(int)
+        return np.clip(index, 0, len(self.ppms) - 1)
+
+    def update(self, data) -> None:
+        # Only the real part of the phased spectrum is integrated
+        self.cumulative = np.zeros(len(data) + 1)
+        np.cumsum(np.real(data), out=self.cumulative[1:])
+
+    def add(self, ppm_start, ppm_end) -> None:
+        indices = np.sort(self.index([ppm_start, ppm_end]))
+        self.regions = np.vstack([self.regions, indices])
+
+    def remove(self, i=-1) -> None:
+        if len(self.regions) == 0:
+            return
+        i = i % len(self.regions)
+        self.regions = np.delete(self.regions, i, axis=0)
+        if self.reference == i:
+            self.reference = None
+        elif self.reference is not None and self.reference > i:
+            self.reference -= 1
+
+    def clear(self) -> None:
+        self.regions = np.zeros((0, 2), dtype=int)
+        self.reference = None
+
+    def values(self) -> np.ndarray:
+        # Sum of the points in each region (the end point is included)
+        starts, ends = self.regions[:, 0], self.regions[:, 1]
+        return self.cumulative[ends + 1] - self.cumulative[starts]
+
+    def normalised(self) -> np.ndarray:
+        # Integrals relative to the reference region, which is set to reference_value
+        values = self.values()
+        if self.reference is None or values[self.reference] == 0:
+            return values / np.max(np.abs(values), initial=1e-300)
+        return values / values[self.reference] * self.reference_value
+
+    def bounds(self, ppms=None) -> np.ndarray:
+        # ppm values of the start and end of each region (ppms includes any referencing)
+        if ppms is None:
+            ppms = self.ppms
+        return np.asarray(ppms)[self.regions]
+
+    def write(self, file_name, ppms=None, spectrum="") -> None:
+        """
+        Write the integrals as a tab separated table. The file name of the
+        spectrum is in the first column so tables of several spectra can be
+        concatenated for batch quantification.
+        """
+        bounds = self.bounds(ppms)
+        values = self.values()
+        normalised = self.normalised()
+        with open(file_name, "w") as file:
+            header = ["Spectrum", "Region", "Start (ppm)", "End (ppm)"]
+            header += ["Integral", "Normalised"]
+            file.write("\t".join(header) + "\n")
+            for i in range(len(self.regions)):
+                row = [spectrum, str(i + 1)]
+                row += ["{:.4f}".format(ppm) for ppm in bounds[i]]
+                row += ["{:.6g}".format(values[i]), "{:.4f}".format(normalised[i])]
+                file.write("\t".join(row) + "\n")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+from functools import reduce
+from concurrent.futures import ProcessPoolExecutor
+from scipy.optimize import least_squares
+from scipy.sparse.csgraph import connected_components
+
+# Area of a lineshape with a height of 1 and a full width at half maximum of 1
+LORENTZIAN_AREA = np.pi / 2
+GAUSSIAN_AREA = np.sqrt(np.pi / (4 * np.log(2)))
+
+lineshapes = ["lorentzian", "gaussian", "voigt"]
+
+
+def lineshape_1D(x, centre, width, lineshape="lorentzian", eta=0.5):
+    """
+    Height normalised lineshape along one axis (width is the full width at
+    half maximum, voigt is a pseudo-Voigt with Lorentzian fraction eta)
+    and its derivatives with respect to the centre, width and eta.
+    """
+    u = 2 * (x - centre) / width
+    lorentzian = 1 / (1 + u**2)
+    gaussian = np.exp(-np.log(2) * u**2)
+    # Derivatives with respect to u, then du/dcentre = -2/width and du/dwidth = -u/width
+    lorentzian_du = -2 * u * lorentzian**2
+    gaussian_du = -2 * np.log(2) * u * gaussian
+    if lineshape == "lorentzian":
+        shape, shape_du, shape_deta = lorentzian, lorentzian_du, np.zeros_like(u)
+    elif lineshape == "gaussian":
+        shape, shape_du, shape_deta = gaussian, gaussian_du, np.zeros_like(u)
+    else:
+        shape = eta * lorentzian + (1 - eta) * gaussian
+        shape_du = eta * lorentzian_du + (1 - eta) * gaussian_du
+        shape_deta = lorentzian - gaussian
+    return shape, -2 * shape_du / width, -u * shape_du / width, shape_deta
+
+
+def lineshape_area(width, lineshape="lorentzian", eta=0.5):
+    # Area under a height normalised lineshape, and its derivative with respect to eta
+    if lineshape == "lorentzian":
+        return LORENTZIAN_AREA * width, 0 * width
+    if lineshape == "gaussian":
+        return GAUSSIAN_AREA * width, 0 * width
+    area = (eta * LORENTZIAN_AREA + (1 - eta) * GAUSSIAN_AREA) * width
+    return area, (LORENTZIAN_AREA - GAUSSIAN_AREA) * width
+
+
+def outer(vectors):
+    # N-D outer product of one vector per axis
+    return reduce(np.multiply.outer, vectors)
+
+
+class ClusterModel:
+    def __init__(self, axes, number_of_peaks, lineshape="lorentzian") -> None:
+        """
+        This class is the sum of N-D peaks (the product of a 1D lineshape
+        along each axis) over a region, with its analytic Jacobian. The
+        parameters of each peak are its height, centre and width along each
+        axis and, for pseudo-Voigt lineshapes, the Lorentzian fraction.
+        """
+        self.axes = axes
+        self.ndim = len(axes)
+        self.number_of_peaks = number_of_peaks
+        self.lineshape = lineshape
+        self.parameters_per_peak = 1 + 2 * self.ndim + (lineshape == "voigt")
+
+    def split(self, parameters):
+        peaks = parameters.reshape(self.number_of_peaks, self.parameters_per_peak)
+        heights = peaks[:, 0]
+        centres = peaks[:, 1 : 1 + self.ndim]
+        widths = peaks[:, 1 + self.ndim : 1 + 2 * self.ndim]
+        if self.lineshape == "voigt":
+            etas = peaks[:, -1]
+        else:
+            etas = np.full(self.number_of_peaks, 0.5)
+        return heights, centres, widths, etas
+
+    def evaluate(self, parameters, jacobian=False):
+        heights, centres, widths, etas = self.split(parameters)
+        model = 0
+        columns = []
+        for p in range(self.number_of_peaks):
+            shapes = [
+                lineshape_1D(
+                    self.axes[d], centres[p, d], widths[p, d], self.lineshape, etas[p]
+                )
+                for d in range(self.ndim)
+            ]
+            values = [shape[0] for shape in shapes]
+            peak_shape = outer(values)
+            model = model + heights[p] * peak_shape
+            if jacobian == False:
+                continue
+            columns.append(peak_shape)
+            for derivative in [1, 2]:
+                for d in range(self.ndim):
+                    vectors = list(values)
+                    vectors[d] = shapes[d][derivative]
+                    columns.append(heights[p] * outer(vectors))
+            if self.lineshape == "voigt":
+                column = 0
+                for d in range(self.ndim):
+                    vectors = list(values)
+                    vectors[d] = shapes[d][3]
+                    column = column + outer(vectors)
+                columns.append(heights[p] * column)
+        if jacobian == False:
+            return model
+        return np.stack([column.ravel() for column in columns], axis=1)
+
+
+def fit_cluster(region, lower, positions, widths, lineshape="lorentzian") -> dict:
+    """
+    Fit the overlapping peaks in region jointly. lower is the index of the
+    first point of the region in the full spectrum and positions/widths are
+    the starting peak positions and widths in points of the full spectrum.
+    Returns the fitted positions, widths, heights and volumes with their
+    standard errors (in points of the full spectrum).
+    """
+    region = np.asarray(region, dtype=float)
+    lower = np.asarray(lower)
+    number_of_peaks, ndim = positions.shape
+    axes = [np.arange(size, dtype=float) for size in region.shape]
+    model = ClusterModel(axes, number_of_peaks, lineshape)
+
+    # Starting parameters and bounds for each peak
+    centres = positions - lower
+    index = tuple(
+        np.clip(np.rint(centres[:, d]).astype(int), 0, region.shape[d] - 1)
+        for d in range(ndim)
+    )
+    initial = [region[index][:, None], centres, widths]
+    low = [
+        np.full((number_of_peaks, 1), -np.inf),
+        centres - 2,
+        np.full_like(widths, 0.3),
+    ]
+    high = [
+        np.full((number_of_peaks, 1), np.inf),
+        centres + 2,
+        np.full_like(widths, 4 * np.max(region.shape)),
+    ]
+    if lineshape == "voigt":
+        initial.append(np.full((number_of_peaks, 1), 0.5))
+        low.append(np.zeros((number_of_peaks, 1)))
+        high.append(np.ones((number_of_peaks, 1)))
+    initial = np.hstack(initial).ravel()
+    low = np.hstack(low).ravel()
+    high = np.hstack(high).ravel()
+    initial = np.clip(initial, low + 1e-9, high - 1e-9)
+
+    data = region.ravel()
+    result = least_squares(
+        lambda parameters: model.evaluate(parameters).ravel() - data,
+        initial,
+        jac=lambda parameters: model.evaluate(parameters, jacobian=True),
+        bounds=(low, high),
+    )
+
+    # Covariance of the parameters from the Jacobian and the residual variance
+    degrees_of_freedom = max(len(data) - len(result.x), 1)
+    variance = 2 * result.cost / degrees_of_freedom
+    try:
+        covariance = np.linalg.pinv(result.jac.T @ result.jac) * variance
+    except np.linalg.LinAlgError:
+        covariance = np.full((len(result.x), len(result.x)), np.nan)
+    errors = np.sqrt(np.abs(np.diag(covariance))).reshape(
+        number_of_peaks, model.parameters_per_peak
+    )
+
+    heights, centres, widths, etas = model.split(result.x)
+    volumes = np.zeros(number_of_peaks)
+    volume_errors = np.zeros(number_of_peaks)
+    for p in range(number_of_peaks):
+        areas, areas_deta = lineshape_area(widths[p], lineshape, etas[p])
+        volumes[p] = heights[p] * np.prod(areas)
+        # Gradient of the volume with respect to the parameters of this peak
+        gradient = [np.prod(areas), np.zeros(ndim)]
+        gradient.append(
+            [
+                volumes[p] / widths[p, d] if widths[p, d] != 0 else 0
+                for d in range(ndim)
+            ]
+        )
+        if lineshape == "voigt":
+            gradient.append(
+                [
+                    heights[p]
+                    * sum(
+                        areas_deta[d] * np.prod(np.delete(areas, d))
+                        for d in range(ndim)
+                    )
+                ]
+            )
+        gradient = np.hstack(gradient)
+        start = p * model.parameters_per_peak
+        block = covariance[
+            start : start + model.parameters_per_peak,
+            start : start + model.parameters_per_peak,
+        ]
+        volume_errors[p] = np.sqrt(np.abs(gradient @ block @ gradient))
+
+    return {
+        "positions": centres + lower,
+        "position_errors": errors[:, 1 : 1 + ndim],
+        "widths": widths,
+        "heights": heights,
+        "height_errors": errors[:, 0],
+        "etas": etas,
+        "volumes": volumes,
+        "volume_errors": volume_errors,
+    }
+
+
+def find_clusters(positions, widths, region_factor=2.0) -> list:
+    """
+    Group peaks whose fitting regions (region_factor widths either side of
+    the peak) overlap along every axis. Returns a list of arrays of peak
+    indices, one per cluster.
+    """
+    margins = region_factor * widths
+    separation = np.abs(positions[:, None, :] - positions[None, :, :])
+    reach = margins[:, None, :] + margins[None, :, :]
+    overlapping = np.all(separation <= reach, axis=2)
+    number_of_clusters, labels = connected_components(overlapping, directed=False)
+    return [np.nonzero(labels == i)[0] for i in range(number_of_clusters)]
+
+
+def fit_peaks(
+    data, positions, widths=None, lineshape="lorentzian", region_factor=2.0, workers=1
+) -> dict:
+    """
+    Fit the peaks at positions (peaks x dimensions, in points) of 1D or 2D
+    data. Overlapping peaks are fitted together in clusters, and with more
+    than one worker the clusters are fitted in parallel on a process pool
+    (only the small region around each cluster is sent to a worker).
+    Returns the fitted values of every peak, in the order of positions.
+    """
+    data = np.asarray(data)
+    positions = np.atleast_2d(np.asarray(positions, dtype=float))
+    if widths is None:
+        widths = np.full(positions.shape, 3.0)
+    widths = np.broadcast_to(np.asarray(widths, dtype=float), positions.shape)
+    margins = np.ceil(region_factor * widths).astype(int)
+
+    clusters = find_clusters(positions, widths, region_factor)
+    jobs = []
+    for cluster in clusters:
+        lower = np.maximum(
+            np.floor(positions[cluster] - margins[cluster]).min(axis=0).astype(int), 0
+        )
+        upper = np.minimum(
+            np.ceil(positions[cluster] + margins[cluster]).max(axis=0).astype(int) + 1,
+            data.shape,
+        )
+        region = data[tuple(slice(l, u) for l, u in zip(lower, upper))]
+        jobs.append(
+            (np.array(region), lower, positions[cluster], widths[cluster], lineshape)
+        )
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            fits = list(executor.map(fit_cluster, *zip(*jobs)))
+    else:
+        fits = [fit_cluster(*job) for job in jobs]
+
+    # Put the results of each cluster back in the order of the peaks
+    results = {}
+    for cluster, fit in zip(clusters, fits):
+        for key, value in fit.items():
+            if key not in results:
+                results[key] = np.zeros((len(positions),) + np.shape(value)[1:])
+            results[key][cluster] = value
+    results["clusters"] = np.zeros(len(positions), dtype=int)
+    for i, cluster in enumerate(clusters):
+        results["clusters"][cluster] = i
+    return results
+
+
+def write_fit_table(file_name, fit, axes, labels, names=None) -> None:
+    """
+    Write the fitted peaks as a tab separated table. axes holds the ppm
+    scale of each dimension, used to convert the fitted positions and widths
+    from points to ppm.
+    """
+    points = [np.arange(len(axis)) for axis in axes]
+    positions = np.stack(
+        [
+            np.interp(fit["positions"][:, d], points[d], axes[d])
+            for d in range(len(axes))
+        ],
+        axis=1,
+    )
+    steps = [np.abs(np.mean(np.diff(axis))) for axis in axes]
+    if names is None:
+        names = ["?-?"] * len(positions)
+    with open(file_name, "w") as file:
+        header = ["Assignment"]
+        header += ["w{} ({})".format(i + 1, label) for i, label in enumerate(labels)]
+        header += ["lw{} (ppm)".format(i + 1) for i in range(len(labels))]
+        header += ["Height", "Height_error", "Volume", "Volume_error", "Cluster"]
+        file.write("\t".join(header) + "\n")
+        for i, name in enumerate(names):
+            row = [name] + ["{:.3f}".format(ppm) for ppm in positions[i]]
+            row += [
+                "{:.4f}".format(fit["widths"][i, d] * steps[d])
+                for d in range(len(axes))
+            ]
+            row += [
+                "{:.4g}".format(fit[key][i])
+                for key in ["heights", "height_errors", "volumes", "volume_errors"]
+            ]
+            row += [str(fit["clusters"][i])]
+            file.write("\t".join(row) + "\n")
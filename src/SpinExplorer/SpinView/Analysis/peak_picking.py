@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+from scipy.ndimage import maximum_filter
+
+
+def estimate_noise(data, sample_size=200000) -> float:
+    """
+    Robust estimate of the noise standard deviation, 1.4826 times the
+    median absolute deviation of an evenly spaced sample of the points.
+    Peaks only occupy a small fraction of a spectrum so they do not affect
+    the median. Only the sampled points are read from memory mapped data.
+    """
+    step = max(int(data.size // sample_size), 1)
+    index = np.unravel_index(np.arange(0, data.size, step), data.shape)
+    sample = np.asarray(data[index], dtype=float)
+    deviation = np.abs(sample - np.median(sample))
+    return 1.4826 * float(np.median(deviation))
+
+
+def parabolic_shift(below, centre, above) -> np.ndarray:
+    # Offset (in points) of the vertex of the parabola through three neighbouring points
+    denominator = below - 2 * centre + above
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = 0.5 * (below - above) / denominator
+    return np.where(np.abs(shift) <= 0.5, shift, 0.0)
+
+
+def pick_peaks(data, threshold, size=3, chunk_size=64, negative=False):
+    """
+    Find the local maxima of 1D, 2D or 3D data above threshold. A point is
+    a peak if it is the largest in the size^N box around it (an N-D
+    maximum filter). The data is worked through chunk_size planes of the
+    first axis at a time, with enough overlap that chunks give the same
+    result as the whole array, so memory mapped spectra are never read in
+    full. Positions are refined to a fraction of a point with a parabola
+    along each axis. With negative=True the minima below -threshold are
+    found instead. Returns the (peaks x dimensions) positions in points and
+    the peak heights.
+    """
+    sign = -1 if negative == True else 1
+    halo = max(size // 2, 1)
+    length = data.shape[0]
+    positions = []
+    heights = []
+    for start in range(0, length, chunk_size):
+        lower = max(start - halo, 0)
+        upper = min(start + chunk_size + halo, length)
+        chunk = sign * np.asarray(data[lower:upper], dtype=float)
+        peaks = chunk == maximum_filter(chunk, size=size, mode="nearest")
+        peaks &= chunk > threshold
+
+        # Only keep peaks in this chunk's own planes, the overlap belongs to its neighbours
+        peaks[: start - lower] = False
+        peaks[start - lower + chunk_size :] = False
+        index = np.nonzero(peaks)
+        if len(index[0]) == 0:
+            continue
+        centre = chunk[index]
+
+        refined = []
+        for axis in range(chunk.ndim):
+            below = list(index)
+            above = list(index)
+            below[axis] = np.maximum(index[axis] - 1, 0)
+            above[axis] = np.minimum(index[axis] + 1, chunk.shape[axis] - 1)
+            shift = parabolic_shift(chunk[tuple(below)], centre, chunk[tuple(above)])
+            # Points on the edge of the data have no neighbour to fit a parabola to
+            edge = (index[axis] == 0) | (index[axis] == chunk.shape[axis] - 1)
+            shift = np.where(edge, 0.0, shift)
+            refined.append(index[axis] + shift)
+        refined[0] = refined[0] + lower
+        positions.append(np.stack(refined, axis=1))
+        heights.append(sign * centre)
+
+    if len(positions) == 0:
+        return np.zeros((0, data.ndim)), np.zeros(0)
+    return np.concatenate(positions), np.concatenate(heights)
+
+
+def write_peak_list(file_name, positions, heights, labels, names=None) -> None:
+    """
+    Write picked peaks as a Sparky style peak list (Assignment, w1, w2, ...
+    in ppm, then the height) that can be read back in as a peak list.
+    Unassigned peaks are named ?-?.
+    """
+    positions = np.atleast_2d(positions)
+    if names is None:
+        names = ["?-?"] * len(positions)
+    with open(file_name, "w") as file:
+        header = ["Assignment"]
+        header += ["w{} ({})".format(i + 1, label) for i, label in enumerate(labels)]
+        header += ["Height"]
+        file.write("\t".join(header) + "\n")
+        for name, position, height in zip(names, positions, heights):
+            row = [name] + ["{:.3f}".format(ppm) for ppm in position]
+            row += ["{:.4g}".format(height)]
+            file.write("\t".join(row) + "\n")
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import glob
+import numpy as np
+import nmrglue as ng
+from scipy.ndimage import map_coordinates
+from scipy.optimize import least_squares
+from scipy.sparse import block_diag, hstack
+
+from SpinExplorer.SpinView.ReadingData.ppm_axis import PPMAxis
+
+
+class TitrationSeries:
+    def __init__(self, files, cache_size=4) -> None:
+        """
+        This class holds a titration series of 2D spectra (e.g. HSQCs). The
+        spectra are only read when they are needed, and any spectrum with
+        different axes to the first one is interpolated onto the ppm grid of
+        the first spectrum, so peaks can be tracked on one shared grid.
+        """
+        self.files = list(files)
+        self.cache_size = cache_size
+        self.spectra = {}
+        self.axes = None
+        self.names = []
+        self.w1 = None
+        self.w2 = None
+        self.heights = None
+
+    @classmethod
+    def from_pattern(cls, pattern, extension=".ft2"):
+        # A directory (all the spectra with the extension inside it) or a glob pattern, in sorted order
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*" + extension)
+        return cls(sorted(glob.glob(pattern)))
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    @staticmethod
+    def read_spectrum(file_name):
+        dic, data = ng.pipe.read(file_name)
+        axes = [
+            PPMAxis.from_uc(ng.pipe.make_uc(dic, data, dim=dim)) for dim in range(2)
+        ]
+        return np.asarray(data), axes
+
+    def spectrum(self, index) -> np.ndarray:
+        # Data of spectrum index on the shared grid, keeping the most recently used spectra
+        if index in self.spectra:
+            return self.spectra[index]
+        if self.axes is None:
+            self.axes = self.read_spectrum(self.files[0])[1]
+        data, axes = self.read_spectrum(self.files[index])
+        if self.same_grid(axes) == False:
+            data = self.regrid(data, axes)
+        if len(self.spectra) >= self.cache_size:
+            self.spectra.pop(next(iter(self.spectra)))
+        self.spectra[index] = data
+        return data
+
+    def same_grid(self, axes) -> bool:
+        for axis, shared in zip(axes, self.axes):
+            if axis.size != shared.size:
+                return False
+            if np.isclose(axis.first_ppm, shared.first_ppm) == False:
+                return False
+            if np.isclose(axis.ppm_step, shared.ppm_step) == False:
+                return False
+        return True
+
+    def regrid(self, data, axes) -> np.ndarray:
+        # Linearly interpolate data onto the shared grid (zero outside the spectrum)
+        rows = (self.axes[0].ppm_scale() - axes[0].first_ppm) / axes[0].ppm_step
+        cols = (self.axes[1].ppm_scale() - axes[1].first_ppm) / axes[1].ppm_step
+        rows, cols = np.meshgrid(rows, cols, indexing="ij")
+        return map_coordinates(data, [rows, cols], order=1, cval=0.0)
+
+    @staticmethod
+    def refine(data, rows, cols, radius=(2, 2)):
+        """
+        Move each peak to the highest point in a (2*radius+1) window around
+        (rows, cols), for all the peaks at once, then refine the position to
+        a fraction of a point with a parabola through the maximum and its
+        neighbours along each axis. Returns the fractional rows and columns
+        and the peak heights.
+        """
+        rows = np.clip(np.rint(rows).astype(int), 0, data.shape[0] - 1)
+        cols = np.clip(np.rint(cols).astype(int), 0, data.shape[1] - 1)
+        row_offsets = np.arange(-radius[0], radius[0] + 1)
+        col_offsets = np.arange(-radius[1], radius[1] + 1)
+        window_rows = np.clip(rows[:, None] + row_offsets, 0, data.shape[0] - 1)
+        window_cols = np.clip(cols[:, None] + col_offsets, 0, data.shape[1] - 1)
+        windows = data[window_rows[:, :, None], window_cols[:, None, :]]
+
+        flat = np.argmax(windows.reshape(len(rows), -1), axis=1)
+        max_row, max_col = np.unravel_index(flat, windows.shape[1:])
+        rows = window_rows[np.arange(len(rows)), max_row]
+        cols = window_cols[np.arange(len(cols)), max_col]
+        heights = data[rows, cols]
+
+        def parabola(below, above):
+            denominator = below - 2 * heights + above
+            with np.errstate(divide="ignore", invalid="ignore"):
+                shift = 0.5 * (below - above) / denominator
+            return np.where(np.abs(shift) <= 0.5, shift, 0.0)
+
+        up = np.minimum(rows + 1, data.shape[0] - 1)
+        down = np.maximum(rows - 1, 0)
+        right = np.minimum(cols + 1, data.shape[1] - 1)
+        left = np.maximum(cols - 1, 0)
+        row_shift = parabola(data[down, cols], data[up, cols])
+        col_shift = parabola(data[rows, left], data[rows, right])
+        return rows + row_shift, cols + col_shift, heights
+
+    def track(self, names, w1, w2, radius=(2, 2)) -> None:
+        """
+        Follow the peaks of a reference peak list (w1 rows, w2 columns in
+        ppm) through the series. Each spectrum starts from the positions
+        found in the previous one, so peaks that move gradually are followed
+        over the whole titration.
+        """
+        self.spectrum(0)
+        self.names = list(names)
+        rows = self.axes[0].index(w1).astype(float)
+        cols = self.axes[1].index(w2).astype(float)
+        self.w1 = np.zeros((len(self), len(self.names)))
+        self.w2 = np.zeros((len(self), len(self.names)))
+        self.heights = np.zeros((len(self), len(self.names)))
+        for i in range(len(self)):
+            rows, cols, self.heights[i] = self.refine(
+                self.spectrum(i), rows, cols, radius
+            )
+            self.w1[i] = self.axes[0].ppm(rows)
+            self.w2[i] = self.axes[1].ppm(cols)
+
+    def csp(self, scaling=0.14) -> np.ndarray:
+        """
+        Combined chemical shift perturbation of every peak in every spectrum
+        relative to the first, sqrt((dw2^2 + (scaling*dw1)^2)/2), where w2 is
+        the direct (1H) dimension and w1 the indirect (e.g. 15N) dimension.
+        """
+        dw1 = self.w1 - self.w1[0]
+        dw2 = self.w2 - self.w2[0]
+        return np.sqrt(0.5 * (dw2**2 + (scaling * dw1) ** 2))
+
+    def write_table(self, file_name, csp, kd=None, kd_error=None) -> None:
+        # Tab separated table with the reference shifts, CSP in every spectrum and the fitted Kd
+        with open(file_name, "w") as file:
+            header = ["Assignment", "w1", "w2"]
+            header += ["CSP_" + os.path.basename(name) for name in self.files]
+            if kd is not None:
+                header += ["Kd", "Kd_error"]
+            file.write("\t".join(header) + "\n")
+            for j, name in enumerate(self.names):
+                row = [name, "{:.3f}".format(self.w1[0, j]), "{:.3f}".format(self.w2[0, j])]
+                row += ["{:.4f}".format(value) for value in csp[:, j]]
+                if kd is not None:
+                    row += ["{:.4g}".format(kd[j]), "{:.4g}".format(kd_error[j])]
+                file.write("\t".join(row) + "\n")
+
+
+def single_site_binding(ligand, protein, kd, csp_max) -> np.ndarray:
+    # Fast exchange single site binding including ligand depletion
+    total = protein + ligand + kd
+    bound = (total - np.sqrt(np.maximum(total**2 - 4 * protein * ligand, 0))) / (
+        2 * protein
+    )
+    return csp_max * bound
+
+
+def fit_kd(ligand, csp, protein):
+    """
+    Fit a Kd and maximum CSP to the binding curve of every peak in one
+    least squares problem. csp is (points x peaks); each peak only depends
+    on its own two parameters, so the Jacobian is block diagonal and the
+    fits of all peaks are solved together. Returns the Kd, maximum CSP and
+    the standard errors of the Kd for every peak. Raises a ValueError if the
+    protein concentration is not positive or a ligand concentration is
+    negative.
+    """
+    ligand = np.asarray(ligand, dtype=float)
+    protein = np.broadcast_to(np.asarray(protein, dtype=float), ligand.shape)
+    if np.any(protein <= 0):
+        raise ValueError("The protein concentration must be greater than zero")
+    if np.any(ligand < 0):
+        raise ValueError("The ligand concentrations cannot be negative")
+    csp = np.asarray(csp, dtype=float)
+    number_of_peaks = csp.shape[1]
+
+    def residuals(parameters):
+        kd = parameters[:number_of_peaks]
+        csp_max = parameters[number_of_peaks:]
+        model = single_site_binding(
+            ligand[:, None], protein[:, None], kd[None, :], csp_max[None, :]
+        )
+        return (model - csp).T.ravel()
+
+    # Parameters are ordered (all Kd, all maximum CSP), residuals peak by peak
+    peak_block = block_diag([np.ones((len(ligand), 1))] * number_of_peaks)
+    sparsity = hstack([peak_block, peak_block])
+    positive = ligand[ligand > 0]
+    kd_guess = np.full(number_of_peaks, np.median(positive) if len(positive) else 1.0)
+    csp_max_guess = np.maximum(np.max(csp, axis=0), 1e-6)
+    result = least_squares(
+        residuals,
+        np.concatenate([kd_guess, csp_max_guess]),
+        jac_sparsity=sparsity,
+        bounds=(0, np.inf),
+    )
+    kd = result.x[:number_of_peaks]
+    csp_max = result.x[number_of_peaks:]
+
+    # Standard errors from the 2x2 block of J^T J for each peak (each residual has one Kd and one maximum derivative)
+    jacobian = result.jac.tocsr()
+    kd_jacobian = np.asarray(jacobian[:, :number_of_peaks].sum(axis=1))
+    max_jacobian = np.asarray(jacobian[:, number_of_peaks:].sum(axis=1))
+    kd_jacobian = kd_jacobian.reshape(number_of_peaks, len(ligand))
+    max_jacobian = max_jacobian.reshape(number_of_peaks, len(ligand))
+    blocks = np.empty((number_of_peaks, 2, 2))
+    blocks[:, 0, 0] = np.sum(kd_jacobian**2, axis=1)
+    blocks[:, 0, 1] = blocks[:, 1, 0] = np.sum(kd_jacobian * max_jacobian, axis=1)
+    blocks[:, 1, 1] = np.sum(max_jacobian**2, axis=1)
+    variance = np.sum(
+        result.fun.reshape(number_of_peaks, len(ligand)) ** 2, axis=1
+    ) / max(len(ligand) - 2, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        determinant = blocks[:, 0, 0] * blocks[:, 1, 1] - blocks[:, 0, 1] ** 2
+        kd_error = np.sqrt(np.abs(blocks[:, 1, 1] / determinant) * variance)
+    return kd, csp_max, kd_error
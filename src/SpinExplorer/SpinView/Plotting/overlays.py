@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+
+from SpinExplorer.SpinView.ReadingData.ppm_axis import ppm_index
+
+
+class Overlay:
+    # Attribute holding each of the values that used to be kept in a dictionary per overlay
+    fields = {
+        "title": "title",
+        "path": "path",
+        "dictionary": "dictionary",
+        "transposed": "transposed",
+        "color index": "color_index",
+        "linewidth": "linewidth",
+        "linewidth 1D": "linewidth_1d",
+        "contour linewidth": "contour_linewidth",
+        "contour levels": "contour_levels",
+        "original_data": "original_data",
+        "original_ppms": "original_ppms",
+        "original_x_ppms": "original_x_ppms",
+        "original_y_ppms": "original_y_ppms",
+        "z_data": "z_data",
+        "z_data_old": "z_data_old",
+        "new_x_ppms": "new_x_ppms",
+        "new_y_ppms": "new_y_ppms",
+        "new_x_ppms_old": "new_x_ppms_old",
+        "new_y_ppms_old": "new_y_ppms_old",
+        "uc0": "uc0",
+        "uc1": "uc1",
+        "move up/down": "move_up_down",
+        "move up/down range index": "move_up_down_range_index",
+        "move left/right": "move_left_right",
+        "move left/right range index": "move_left_right_range_index",
+        "move x": "move_x",
+        "move y": "move_y",
+        "move x range index": "move_x_range_index",
+        "move y range index": "move_y_range_index",
+        "multiply value": "multiply_value",
+        "multiply value index": "multiply_value_index",
+        "multiply range index": "multiply_range_index",
+        "multiply factor": "multiply_factor",
+        "p0 Coarse": "p0_coarse",
+        "p0 Fine": "p0_fine",
+        "p1 Coarse": "p1_coarse",
+        "p1 Fine": "p1_fine",
+    }
+    __slots__ = tuple(fields.values()) + (
+        "grid_key",
+        "grid",
+        "levels_key",
+        "levels",
+        "scaled_key",
+        "scaled",
+    )
+
+    def __init__(self, values=None) -> None:
+        """
+        This class is the record for one spectrum in multiplot mode. Values
+        can still be read and set with the keys of the old per-overlay
+        dictionaries (overlay["move x"]), but are stored in slots, and the
+        meshgrid, contour levels and scaled data used for each redraw are
+        cached until the values they depend on change.
+        """
+        self.grid_key = None
+        self.grid = None
+        self.levels_key = None
+        self.levels = None
+        self.scaled_key = None
+        self.scaled = None
+        if values is not None:
+            for key, value in values.items():
+                self[key] = value
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self.fields[key])
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value) -> None:
+        setattr(self, self.fields[key], value)
+
+    def __contains__(self, key) -> bool:
+        return key in self.fields and hasattr(self, self.fields[key])
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def keys(self) -> list:
+        return [key for key in self.fields if key in self]
+
+    def meshgrid(self):
+        # (x, y) meshgrid of the shifted ppm scales, remade only when either scale is replaced
+        if (
+            self.grid_key is None
+            or self.grid_key[0] is not self.new_y_ppms
+            or self.grid_key[1] is not self.new_x_ppms
+        ):
+            self.grid = np.meshgrid(self.new_y_ppms, self.new_x_ppms)
+            self.grid_key = (self.new_y_ppms, self.new_x_ppms)
+        return self.grid
+
+    def contour_levels_from(self, contour_start, contour_factor) -> np.ndarray:
+        key = (contour_start, contour_factor, self.contour_levels)
+        if self.levels_key != key:
+            self.levels = contour_start * contour_factor ** np.arange(
+                self.contour_levels
+            )
+            self.levels_key = key
+        return self.levels
+
+    def scaled_data(self) -> np.ndarray:
+        # z_data multiplied by the multiply factor of this overlay
+        if (
+            self.scaled_key is None
+            or self.scaled_key[0] is not self.z_data
+            or self.scaled_key[1] != self.multiply_factor
+        ):
+            self.scaled = self.z_data * self.multiply_factor
+            self.scaled_key = (self.z_data, self.multiply_factor)
+        return self.scaled
+
+
+class OverlayManager(dict):
+    def __init__(self) -> None:
+        """
+        This class holds the overlays of multiplot mode by index, as the
+        values_dictionary did. The data of each overlay stays in its own
+        array (no stacked copy of all the overlays is kept), and the slices
+        at the cursor are taken from each overlay's own data.
+        """
+        super().__init__()
+
+    def __setitem__(self, index, overlay) -> None:
+        if not isinstance(overlay, Overlay):
+            overlay = Overlay(overlay)
+        super().__setitem__(index, overlay)
+
+    def overlays(self) -> list:
+        return [self[i] for i in range(len(self))]
+
+    def slices(self, ppm, axis, transposed=False) -> list:
+        """
+        Return the slice of every overlay through ppm, shifted by the
+        overlay's own move x/move y. axis=1 gives the horizontal slices
+        (z_data[:, index]) and axis=0 the vertical ones (z_data[index, :]).
+        Overlays where ppm lies outside the spectrum give None.
+        """
+        overlays = self.overlays()
+        if (axis == 1) != (transposed == True):
+            uc_key = "uc1"
+        else:
+            uc_key = "uc0"
+        if axis == 1:
+            move_key = "move y"
+        else:
+            move_key = "move x"
+
+        slices = []
+        for overlay in overlays:
+            index = ppm_index(overlay[uc_key], ppm - overlay[move_key])
+            if index < 0 or index >= np.shape(overlay.z_data)[axis]:
+                slices.append(None)
+            elif axis == 1:
+                slices.append(overlay.z_data[:, index] * overlay.multiply_factor)
+            else:
+                slices.append(overlay.z_data[index, :] * overlay.multiply_factor)
+        return slices
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+from collections import OrderedDict
+
+
+class Overview3D:
+    def __init__(
+        self,
+        data,
+        ppms_z,
+        ppms_rows,
+        ppms_cols,
+        max_planes=64,
+        max_size=128,
+        max_points=200000,
+        cache_size=8,
+    ) -> None:
+        """
+        This class makes a 3D overview of a cube as a cloud of the voxels
+        above the lowest contour level. The cube is first reduced to at most
+        max_planes planes of max_size x max_size points by taking the maximum
+        of each block (so peaks are never lost), then the points above each
+        set of contour levels are found once and cached, ready to be drawn as
+        a single scatter collection.
+        """
+        self.data = data
+        self.ppms = [np.asarray(ppms_z), np.asarray(ppms_rows), np.asarray(ppms_cols)]
+        self.max_sizes = [max_planes, max_size, max_size]
+        self.max_points = max_points
+        self.cache_size = cache_size
+        self.cube = None
+        self.cube_ppms = None
+        self.point_sets = OrderedDict()
+
+    @staticmethod
+    def block_starts(size, max_size) -> np.ndarray:
+        # Start index of each block when an axis of length size is reduced to at most max_size points
+        return np.arange(0, size, int(np.ceil(size / max_size)))
+
+    @staticmethod
+    def block_ppms(ppms, starts) -> np.ndarray:
+        # Mean ppm value of each block
+        counts = np.diff(np.append(starts, len(ppms)))
+        return np.add.reduceat(ppms, starts) / counts
+
+    def reduce(self) -> np.ndarray:
+        # Block maximum of the cube, calculated a block of planes at a time
+        if self.cube is not None:
+            return self.cube
+        starts = [
+            self.block_starts(self.data.shape[axis], self.max_sizes[axis])
+            for axis in range(3)
+        ]
+        ends = np.append(starts[0][1:], self.data.shape[0])
+        cube = np.empty((len(starts[0]), len(starts[1]), len(starts[2])))
+        for i, (start, end) in enumerate(zip(starts[0], ends)):
+            block = np.max(np.asarray(self.data[start:end]), axis=0)
+            block = np.maximum.reduceat(block, starts[1], axis=0)
+            cube[i] = np.maximum.reduceat(block, starts[2], axis=1)
+        self.cube = cube
+        self.cube_ppms = [
+            self.block_ppms(self.ppms[axis], starts[axis]) for axis in range(3)
+        ]
+        return cube
+
+    def maximum(self) -> float:
+        return float(np.max(self.reduce()))
+
+    def points(self, levels):
+        """
+        Return the (x, y, z) ppm coordinates of the reduced voxels above the
+        lowest contour level, and the index of the contour level each one
+        reaches. Only the max_points most intense voxels are kept.
+        """
+        key = (float(levels[0]), float(levels[-1]), len(levels))
+        if key in self.point_sets:
+            self.point_sets.move_to_end(key)
+            return self.point_sets[key]
+
+        cube = self.reduce()
+        z, rows, cols = np.nonzero(cube >= levels[0])
+        values = cube[z, rows, cols]
+        if len(values) > self.max_points:
+            keep = np.argpartition(values, -self.max_points)[-self.max_points :]
+            z, rows, cols, values = z[keep], rows[keep], cols[keep], values[keep]
+        level_index = np.searchsorted(levels, values, side="right") - 1
+
+        point_set = (
+            self.cube_ppms[2][cols],
+            self.cube_ppms[1][rows],
+            self.cube_ppms[0][z],
+            level_index,
+        )
+        self.point_sets[key] = point_set
+        if len(self.point_sets) > self.cache_size:
+            self.point_sets.popitem(last=False)
+        return point_set
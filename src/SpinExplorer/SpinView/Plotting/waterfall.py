@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+from matplotlib.collections import LineCollection
+
+
+class WaterfallPlot:
+    def __init__(self, ax, cmap="viridis", linewidth=0.5) -> None:
+        """
+        This class draws every plane of a pseudo-3D slice as a single
+        LineCollection, with each trace shifted up by a constant offset.
+        The collection is only created once; moving the slice or changing
+        the offset just replaces its line segments.
+        """
+        self.ax = ax
+        self.cmap = cmap
+        self.linewidth = linewidth
+        self.offset = 0
+        self.lines = None
+        self.ppms = None
+        self.traces = None
+
+    @staticmethod
+    def gather(data, index, axis) -> np.ndarray:
+        """
+        Return the traces of every plane through one slice of the 3D data
+        (planes, rows, columns) as a (planes, points) array. axis=1 takes the
+        row at index (data[:, index, :]), axis=2 the column (data[:, :, index]).
+        """
+        if axis == 1:
+            return np.asarray(data[:, index, :])
+        return np.asarray(data[:, :, index])
+
+    def make_segments(self) -> np.ndarray:
+        segments = np.empty((len(self.traces), len(self.ppms), 2))
+        segments[:, :, 0] = self.ppms
+        segments[:, :, 1] = self.traces + (
+            np.arange(len(self.traces)) * self.offset
+        )[:, None]
+        return segments
+
+    def plot(self, ppms, traces) -> None:
+        # Draw the traces, reusing the existing collection if there is one
+        self.ppms = np.asarray(ppms)
+        self.traces = traces
+        if self.lines is None:
+            self.lines = LineCollection(
+                self.make_segments(),
+                array=np.arange(1, len(traces) + 1),
+                cmap=self.cmap,
+                linewidths=self.linewidth,
+            )
+            self.ax.add_collection(self.lines)
+        else:
+            self.lines.set_segments(self.make_segments())
+        self.ax.set_xlim(np.max(self.ppms), np.min(self.ppms))
+
+    def set_offset(self, offset) -> None:
+        self.offset = offset
+        if self.lines is not None:
+            self.lines.set_segments(self.make_segments())
+
+    def y_limits(self, zoom=1):
+        # y axis range covering all the offset traces, divided by the zoom factor
+        lower = np.min(self.traces)
+        upper = np.max(self.traces) + self.offset * (len(self.traces) - 1)
+        return lower / zoom, upper / zoom
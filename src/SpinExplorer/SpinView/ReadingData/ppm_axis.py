@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import weakref
+import numpy as np
+
+
+class PPMAxis:
+    def __init__(self, first_ppm, ppm_step, size) -> None:
+        """
+        This class is a numeric version of a nmrglue unit conversion object
+        for a single axis. ppm values are converted to point indices (and
+        back) with plain arithmetic, on scalars or whole arrays, instead of
+        formatting each value as a string for nmrglue to parse.
+        """
+        self.first_ppm = first_ppm
+        self.ppm_step = ppm_step
+        self.size = size
+
+    @classmethod
+    def from_uc(cls, uc):
+        # ppm scales of nmrglue unit conversion objects are linear in the point index
+        first_ppm = uc.ppm(0)
+        size = uc._size
+        if size > 1:
+            ppm_step = (uc.ppm(size - 1) - first_ppm) / (size - 1)
+        else:
+            ppm_step = 1.0
+        return cls(first_ppm, ppm_step, size)
+
+    def index(self, ppm):
+        """
+        Index of the point nearest to ppm, the same as uc(str(ppm) + "ppm").
+        Arrays of ppm values give an array of indices.
+        """
+        points = np.rint((np.asarray(ppm, dtype=float) - self.first_ppm) / self.ppm_step)
+        if points.ndim == 0:
+            return int(points)
+        return points.astype(int)
+
+    def ppm(self, index):
+        return self.first_ppm + np.asarray(index) * self.ppm_step
+
+    def ppm_scale(self) -> np.ndarray:
+        return self.ppm(np.arange(self.size))
+
+
+# One numeric axis per nmrglue unit conversion object, dropped when the uc object is
+ppm_axes = weakref.WeakKeyDictionary()
+
+
+def ppm_axis(uc) -> PPMAxis:
+    if uc not in ppm_axes:
+        ppm_axes[uc] = PPMAxis.from_uc(uc)
+    return ppm_axes[uc]
+
+
+def ppm_index(uc, ppm):
+    # Drop-in numeric replacement for uc(str(ppm) + "ppm")
+    return ppm_axis(uc).index(ppm)
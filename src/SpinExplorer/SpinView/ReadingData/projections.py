@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import numpy as np
+import nmrglue as ng
+from concurrent.futures import ThreadPoolExecutor
+
+
+def max_abs(data, axis) -> np.ndarray:
+    # Skyline projection keeping the sign of the point with the largest absolute intensity
+    index = np.argmax(np.abs(data), axis=axis)
+    return np.take_along_axis(data, np.expand_dims(index, axis), axis).squeeze(axis)
+
+
+def combine_max_abs(first, second) -> np.ndarray:
+    return np.where(np.abs(second) > np.abs(first), second, first)
+
+
+class Projections3D:
+    kinds = ["skyline", "sum"]
+
+    def __init__(
+        self, file, data, dic, axislabels, pipe=True, directory=None, chunk_size=16
+    ) -> None:
+        """
+        This class calculates the skyline (maximum absolute intensity) and sum
+        projections of a 3D spectrum along all three axes in a single chunked
+        pass over the data, so SpinBore and the projection viewer do not need
+        projections made beforehand by nmrPipe. The projections are written
+        as nmrPipe files in a directory next to the spectrum and are only
+        recalculated when the spectrum is newer than them.
+        """
+        self.file = file
+        self.data = data
+        self.dic = dic
+        self.axislabels = axislabels
+        self.pipe = pipe
+        self.chunk_size = chunk_size
+        if directory is None:
+            directory = os.getcwd()
+        if file == ".":
+            name = "pdata"
+        else:
+            name = os.path.basename(file)
+        self.directory = os.path.join(directory, name + ".projections")
+        self.source = os.path.join(directory, file)
+        self.projections = {}
+
+    def kept_axes(self, axis):
+        # The two axes remaining after projecting along axis
+        return [i for i in range(3) if i != axis]
+
+    def projection_name(self, axis) -> str:
+        # nmrPipe naming, x.y.dat where x is the last axis of the 2D projection
+        rows, cols = self.kept_axes(axis)
+        return self.axislabels[cols] + "." + self.axislabels[rows] + ".dat"
+
+    def projection_file(self, axis, kind="skyline") -> str:
+        return os.path.join(self.directory, kind, self.projection_name(axis))
+
+    def projection_files(self, kind="skyline", workers=1) -> list:
+        # Paths of the three projections, calculating them if they are missing or out of date
+        if self.is_cached() == False:
+            self.calculate(workers=workers)
+            self.write()
+        return [self.projection_file(axis, kind) for axis in range(3)]
+
+    def find_projection(self, name, kind="skyline", workers=1) -> str:
+        """
+        Return the path of the projection with the same axis labels as name
+        (in either order), or name itself if no projection matches.
+        """
+        labels = set(os.path.basename(name).split(".dat")[0].split("."))
+        for axis, file in enumerate(self.projection_files(kind, workers)):
+            kept = set(self.axislabels[i] for i in self.kept_axes(axis))
+            if kept == labels:
+                return file
+        return name
+
+    def is_cached(self) -> bool:
+        try:
+            modified = os.path.getmtime(self.source)
+        except OSError:
+            modified = 0
+        for kind in self.kinds:
+            for axis in range(3):
+                file = self.projection_file(axis, kind)
+                if os.path.exists(file) == False or os.path.getmtime(file) < modified:
+                    return False
+        return True
+
+    def project_chunk(self, start) -> dict:
+        # Partial projections from planes start:start+chunk_size of the first axis
+        chunk = np.asarray(self.data[start : start + self.chunk_size])
+        return {
+            "start": start,
+            "skyline": [max_abs(chunk, 0), max_abs(chunk, 1), max_abs(chunk, 2)],
+            "sum": [chunk.sum(axis=0), chunk.sum(axis=1), chunk.sum(axis=2)],
+        }
+
+    def calculate(self, workers=1) -> None:
+        """
+        Calculate all six projections in one pass over the first axis of the
+        data. Projections along the first axis are combined chunk by chunk,
+        the other two are filled in a block of rows per chunk. With more than
+        one worker the chunks are projected on a thread pool (numpy releases
+        the GIL for the reductions).
+        """
+        size = self.data.shape
+        skyline = [
+            np.zeros((size[1], size[2]), dtype=np.float32),
+            np.zeros((size[0], size[2]), dtype=np.float32),
+            np.zeros((size[0], size[1]), dtype=np.float32),
+        ]
+        summed = [np.zeros_like(projection) for projection in skyline]
+
+        starts = range(0, size[0], self.chunk_size)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(self.project_chunk, starts))
+        else:
+            chunks = map(self.project_chunk, starts)
+
+        for chunk in chunks:
+            start = chunk["start"]
+            end = start + len(chunk["skyline"][1])
+            skyline[0] = combine_max_abs(skyline[0], chunk["skyline"][0])
+            summed[0] += chunk["sum"][0]
+            for axis in [1, 2]:
+                skyline[axis][start:end] = chunk["skyline"][axis]
+                summed[axis][start:end] = chunk["sum"][axis]
+
+        self.projections = {"skyline": skyline, "sum": summed}
+
+    def make_dic(self, axis) -> dict:
+        # nmrPipe header for the 2D projection, made from the axes of the 3D spectrum that are kept
+        if self.pipe == True:
+            udic = ng.pipe.guess_udic(self.dic, self.data)
+        else:
+            udic = ng.bruker.guess_udic(self.dic, self.data)
+        rows, cols = self.kept_axes(axis)
+        projection_udic = {"ndim": 2, 0: dict(udic[rows]), 1: dict(udic[cols])}
+        projection_udic[0]["label"] = self.axislabels[rows]
+        projection_udic[1]["label"] = self.axislabels[cols]
+        return ng.pipe.create_dic(projection_udic)
+
+    def projection(self, axis, kind="skyline") -> tuple:
+        # nmrPipe header and data of a calculated projection, for use without the files
+        return self.make_dic(axis), self.projections[kind][axis].astype(np.float32)
+
+    def write(self) -> None:
+        for kind in self.kinds:
+            os.makedirs(os.path.join(self.directory, kind), exist_ok=True)
+            for axis in range(3):
+                ng.pipe.write(
+                    self.projection_file(axis, kind),
+                    self.make_dic(axis),
+                    self.projections[kind][axis].astype(np.float32),
+                    overwrite=True,
+                )
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+from collections import OrderedDict
+
+
+class StripCache:
+    def __init__(self, data, cache_size=64) -> None:
+        """
+        This class extracts bores (data[:, row, col]) and strips
+        (data[:, row, c0:c1]) from a 3D spectrum ordered (z, rows, columns).
+        Each extraction is a single strided slice, so memory-mapped cubes only
+        read the values needed. The most recently visited strips are kept so
+        that walking back and forth between spin systems does not touch the
+        data again.
+        """
+        self.data = data
+        self.cache_size = cache_size
+        self.strips = OrderedDict()
+
+    def bore(self, row, col) -> np.ndarray:
+        # 1D vector through every z plane at a single (row, col) position
+        return np.array(self.data[:, row, col])
+
+    def strip(self, row, col_start=0, col_end=None) -> np.ndarray:
+        # 2D (z, column) strip for a single row, limited to columns col_start:col_end
+        if col_end is None:
+            col_end = self.data.shape[2]
+        key = (row, col_start, col_end)
+        if key in self.strips:
+            self.strips.move_to_end(key)
+            return self.strips[key]
+        strip = np.array(self.data[:, row, col_start:col_end])
+        self.strips[key] = strip
+        if len(self.strips) > self.cache_size:
+            self.strips.popitem(last=False)
+        return strip
+
+    def gather(self, rows, cols, width) -> np.ndarray:
+        """
+        Return the strips centred on each (rows[i], cols[i]) position as one
+        (n_strips, z, width) array using a single gather from the 3D data.
+        Columns falling outside the spectrum are returned as zeros so that
+        every strip stays centred on its peak.
+        """
+        rows = np.asarray(rows, dtype=int)
+        columns = (
+            np.asarray(cols, dtype=int)[:, None] - width // 2 + np.arange(width)
+        )
+        outside = (columns < 0) | (columns >= self.data.shape[2])
+        columns = np.clip(columns, 0, self.data.shape[2] - 1)
+        strips = np.array(self.data[:, rows[:, None], columns])
+        strips[:, outside] = 0
+        return np.moveaxis(strips, 0, 1)
+
+    def clear(self) -> None:
+        self.strips.clear()
+
+    @staticmethod
+    def strip_window(ppms, centre, width):
+        """
+        Return the (start, end) column indexes covering centre +/- width/2 ppm.
+        At least two columns are returned so that the strip can be contoured.
+        If width is zero the whole axis is returned.
+        """
+        ppms = np.asarray(ppms)
+        if width <= 0 or len(ppms) < 2:
+            return 0, len(ppms)
+        inside = np.nonzero(np.abs(ppms - centre) <= width / 2)[0]
+        if len(inside) < 2:
+            index = int(np.argmin(np.abs(ppms - centre)))
+            start = min(max(index - 1, 0), len(ppms) - 2)
+            return start, start + 2
+        return int(inside[0]), int(inside[-1]) + 1
+
+
+def read_peak_list(file_name):
+    """
+    Read a Sparky style peak list (Assignment, w1, w2 columns). Any lines
+    that do not contain a name followed by two ppm values (e.g. the header)
+    are skipped. Returns the peak names and the w1 and w2 ppm values.
+    """
+    names = []
+    w1 = []
+    w2 = []
+    with open(file_name, "r") as file:
+        for line in file:
+            columns = line.split()
+            if len(columns) < 3:
+                continue
+            try:
+                ppms = float(columns[1]), float(columns[2])
+            except ValueError:
+                continue
+            names.append(columns[0])
+            w1.append(ppms[0])
+            w2.append(ppms[1])
+    return names, np.array(w1), np.array(w2)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+from collections import OrderedDict
+
+
+class Volume3D:
+    # Axis order (z, rows, columns) of the original data for each orientation in the 3D viewer
+    orientations = [
+        (0, 1, 2),
+        (0, 2, 1),
+        (2, 1, 0),
+        (2, 0, 1),
+        (1, 2, 0),
+        (1, 0, 2),
+    ]
+
+    def __init__(self, data, dic, pipe=True, cache_size=16) -> None:
+        """
+        This class gives access to a 3D spectrum in any of the six
+        orientations of the 3D viewer. Reoriented data is only ever a strided
+        view of the original array, planes that are displayed are copied to
+        contiguous arrays and cached, and the per-plane intensities and unit
+        conversion objects are computed once for each axis.
+        """
+        self.data = data
+        self.dic = dic
+        self.pipe = pipe
+        self.cache_size = cache_size
+        self.planes = OrderedDict()
+        self.plane_intensities = None
+        self.maximum_intensity = None
+        self.unit_conversions = {}
+
+    def order(self, orientation):
+        return self.orientations[orientation]
+
+    def view(self, orientation) -> np.ndarray:
+        # Strided view of the data in the chosen orientation (no data is copied)
+        return np.transpose(self.data, self.order(orientation))
+
+    def plane(self, orientation, index) -> np.ndarray:
+        """
+        Return plane index of the chosen orientation as a contiguous array,
+        keeping the most recently used planes.
+        """
+        key = (orientation, int(index))
+        if key in self.planes:
+            self.planes.move_to_end(key)
+            return self.planes[key]
+        plane = np.ascontiguousarray(self.view(orientation)[int(index)])
+        self.planes[key] = plane
+        if len(self.planes) > self.cache_size:
+            self.planes.popitem(last=False)
+        return plane
+
+    def total_intensity(self, orientation) -> np.ndarray:
+        # Sum of the absolute intensity of every plane along the z axis of the chosen orientation
+        if self.plane_intensities is None:
+            self.calculate_plane_intensities()
+        return self.plane_intensities[self.order(orientation)[0]]
+
+    def max_abs(self) -> float:
+        # Maximum absolute intensity of the whole cube
+        if self.maximum_intensity is None:
+            self.calculate_plane_intensities()
+        return self.maximum_intensity
+
+    def calculate_plane_intensities(self, chunk_size=16) -> None:
+        """
+        Calculate the summed absolute intensity of the planes along all three
+        axes (and the maximum absolute intensity) in a single pass over the
+        data, working on a few planes at a time so that no full size
+        temporary array is made.
+        """
+        sums = [np.zeros(self.data.shape[axis]) for axis in range(3)]
+        maximum = 0
+        for start in range(0, self.data.shape[0], chunk_size):
+            chunk = np.abs(self.data[start : start + chunk_size])
+            sums[0][start : start + len(chunk)] = chunk.sum(axis=(1, 2))
+            sums[1] += chunk.sum(axis=(0, 2))
+            sums[2] += chunk.sum(axis=(0, 1))
+            maximum = max(maximum, float(np.max(chunk)))
+        self.plane_intensities = sums
+        self.maximum_intensity = maximum
+
+    def unit_conversion(self, dim):
+        # Unit conversion object for an axis of the original data, made once per axis
+        if dim not in self.unit_conversions:
+            if self.pipe == True:
+                uc = ng.pipe.make_uc(self.dic, self.data, dim=dim)
+            else:
+                udic = ng.bruker.guess_udic(self.dic, self.data)
+                uc = ng.fileiobase.uc_from_udic(udic, dim=dim)
+            self.unit_conversions[dim] = uc
+        return self.unit_conversions[dim]
+
+    def unit_conversions_for(self, orientation):
+        # (rows, columns, z) unit conversion objects for the chosen orientation
+        z, rows, cols = self.order(orientation)
+        return (
+            self.unit_conversion(rows),
+            self.unit_conversion(cols),
+            self.unit_conversion(z),
+        )
+
+    def clear(self) -> None:
+        self.planes.clear()
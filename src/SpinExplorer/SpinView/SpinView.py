@@ -60,6 +60,37 @@ import subprocess
 import os
 from scipy.interpolate import make_interp_spline
 
+# Importing internal classes
+from SpinExplorer.SpinView.Analysis.cest import CESTProfiles
+from SpinExplorer.SpinView.Analysis.integration import Integrals
+from SpinExplorer.SpinView.Analysis.peak_picking import (
+    estimate_noise,
+    pick_peaks,
+    write_peak_list,
+)
+from SpinExplorer.SpinView.Analysis.lineshape_fitting import (
+    fit_peaks,
+    lineshapes,
+    write_fit_table,
+)
+from SpinExplorer.SpinView.Analysis.titration import (
+    TitrationSeries,
+    fit_kd,
+    single_site_binding,
+)
+from SpinExplorer.SpinView.ReadingData.strips import StripCache, read_peak_list
+from SpinExplorer.SpinView.ReadingData.volume import Volume3D
+from SpinExplorer.SpinView.ReadingData.projections import Projections3D
+from SpinExplorer.SpinView.ReadingData.ppm_axis import ppm_index
+from SpinExplorer.SpinView.Plotting.waterfall import WaterfallPlot
+from SpinExplorer.SpinView.Plotting.overview3d import Overview3D
+from SpinExplorer.SpinView.Plotting.overlays import OverlayManager
+from SpinExplorer.SpinConverter.FindingParameters.parameter_index import (
+    get_parameter_index,
+)
+from SpinExplorer.SpinProcess.Processing.auto_phase import AutoPhase, coarse_fine
+from SpinExplorer.SpinProcess.ReadingData.pipe_header import PipeHeader
+
 matplotlib.rcParams["font.sans-serif"] = "Arial"
 matplotlib.rcParams["font.family"] = "sans-serif"
 
@@ -303,20 +334,21 @@ class GetData:
         labels associated with the data.
         """
 
+        self.header = PipeHeader(self.dic)
         self.axislabels = []
 
         if(self.dim == 1):
-            # If 1D take FDF1LABEL
-            self.axislabels.append(self.dic["FDF1LABEL"])
+            # If 1D take the label of the direct dimension (X axis)
+            self.axislabels.append(self.header.labels[0])
         elif(self.dim == 2):
             # If 2D take FDF2LABEL as direct and FDF1LABEL as indirect
-            self.axislabels.append(self.dic['FDF1LABEL'])
-            self.axislabels.append(self.dic['FDF2LABEL'])
+            self.axislabels.append(self.header.label(1))
+            self.axislabels.append(self.header.label(2))
         else:
             # If 3D take FDF3LABEL as direct, FDF2LABEL as indirect1 and FDF3LABEL as indirect3
-            self.axislabels.append(self.dic['FDF1LABEL'])
-            self.axislabels.append(self.dic['FDF2LABEL'])
-            self.axislabels.append(self.dic['FDF3LABEL'])
+            self.axislabels.append(self.header.label(1))
+            self.axislabels.append(self.header.label(2))
+            self.axislabels.append(self.header.label(3))
 
 
 
@@ -807,8 +839,8 @@ class MyApp(wx.Frame):
         # Multiplot mode is initially set to off
         self.multiplot_mode = False
 
-        # Dictionary to store the values of the sliders for each spectrum in multiplot mode
-        self.values_dictionary = {}
+        # Overlay records storing the values of the sliders for each spectrum in multiplot mode
+        self.values_dictionary = OverlayManager()
 
         # Initial multiply factor is 1
         self.multiply_factor = 1
@@ -1030,8 +1062,8 @@ class OneDViewer(wx.Panel):
         # Multiplot mode is initially set to off
         self.multiplot_mode = False
 
-        # Dictionary to store the values of the sliders for each spectrum in multiplot mode
-        self.values_dictionary = {}
+        # Overlay records storing the values of the sliders for each spectrum in multiplot mode
+        self.values_dictionary = OverlayManager()
 
         # Initial multiply factor is 1
         self.multiply_factor = 1
@@ -1154,6 +1186,12 @@ class OneDViewer(wx.Panel):
         self.pivot_sizer.AddSpacer(10)
         self.pivot_sizer.Add(self.remove_pivot_button)
 
+        # Adding a button to phase the spectrum automatically
+        self.auto_phase_button = wx.Button(self, label="Auto Phase")
+        self.auto_phase_button.Bind(wx.EVT_BUTTON, self.OnAutoPhase1D)
+        self.pivot_sizer.AddSpacer(10)
+        self.pivot_sizer.Add(self.auto_phase_button)
+
         self.p0_sizer_labels = wx.BoxSizer(wx.VERTICAL)
         self.p0_sizer_labels.Add(self.P0_label)
         self.p0_sizer_labels.AddSpacer(10)
@@ -1420,6 +1458,14 @@ class OneDViewer(wx.Panel):
         self.baseline = wx.Button(self, label="Baseline", size=(130, 30))
         self.baseline.Bind(wx.EVT_BUTTON, self.OnBaseline)
 
+        # Making button to pick the peaks of the 1D spectrum
+        self.pick_peaks_button = wx.Button(self, label="Pick Peaks", size=(130, 30))
+        self.pick_peaks_button.Bind(wx.EVT_BUTTON, self.OnPickPeaks1D)
+
+        # Making button to integrate regions of the 1D spectrum
+        self.integrate_button = wx.Button(self, label="Integrate", size=(130, 30))
+        self.integrate_button.Bind(wx.EVT_BUTTON, self.OnIntegrateButton)
+
         # Making button to subtract one spectrum from another
         self.subtract_button = wx.Button(self, label="Subtract Spectra", size=(130, 30))
         self.subtract_button.Bind(wx.EVT_BUTTON, self.OnSubtractButton)
@@ -1449,6 +1495,10 @@ class OneDViewer(wx.Panel):
         self.button_sizers.AddSpacer(5)
         self.button_sizers.Add(self.baseline)
         self.button_sizers.AddSpacer(5)
+        self.button_sizers.Add(self.pick_peaks_button)
+        self.button_sizers.AddSpacer(5)
+        self.button_sizers.Add(self.integrate_button)
+        self.button_sizers.AddSpacer(5)
         self.button_sizers.Add(self.reset_button)
         self.button_sizers.AddSpacer(5)
         self.button_sizers.Add(self.subtract_button)
@@ -2260,7 +2310,159 @@ class OneDViewer(wx.Panel):
             else:
                 return
 
+    def OnPickPeaks1D(self, event):
+        # Pick the peaks of the phased spectrum and mark them on the plot
+        data = np.real(self.data) - float(self.vertical_slider.GetValue())
+        picker = PeakPicker(self, data, [self.nmrdata.axislabels[0]])
+        if picker.pick() == False:
+            return
+        points = np.arange(len(self.ppms))
+        ppms = np.interp(picker.positions[:, 0], points, self.ppms)
+        try:
+            self.picked_peaks_plot[0].remove()
+        except:
+            pass
+        self.picked_peaks_plot = self.ax.plot(
+            ppms,
+            np.interp(picker.positions[:, 0], points, self.line1.get_ydata()),
+            "v",
+            color="tab:red",
+            markersize=5,
+        )
+        self.UpdateFrame()
+        picker.save(ppms[:, None])
+        picker.fit([self.ppms])
+
+    def OnIntegrateButton(self, event):
+        # Integration is only available when viewing a single plot
+        if self.multiplot_mode == True:
+            message = "Currently in multiplot mode - integration is only available when viewing a single spectrum."
+            dlg = wx.MessageDialog(self, message, "Warning", wx.OK)
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        # Integration uses the same click and drag region as Max Intensity
+        if self.max_mode == True:
+            message = "Currently selecting a region to find the maximum intensity - finish the selection before integrating."
+            dlg = wx.MessageDialog(self, message, "Warning", wx.OK)
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        message = "Integration: click and drag to add integral regions. Press r to set the last region as the reference, d to delete the last region, e to export the integrals and q to finish."
+        dlg = wx.MessageDialog(self, message, "Integrate", wx.OK)
+        dlg.ShowModal()
+        dlg.Destroy()
+
+        self.disconnect_integrals()
+        self.press = False
+        self.move = False
+        self.integral_connections = [
+            self.canvas.mpl_connect("button_press_event", self.OnPress),
+            self.canvas.mpl_connect("motion_notify_event", self.OnMove),
+            self.canvas.mpl_connect("button_release_event", self.OnReleaseIntegral),
+            self.canvas.mpl_connect("key_press_event", self.on_key_integral),
+        ]
+
+    def disconnect_integrals(self):
+        for connection in self.integral_connections:
+            self.canvas.mpl_disconnect(connection)
+        self.integral_connections = []
+
+    def OnReleaseIntegral(self, event):
+        if self.press and event.inaxes == self.ax and event.xdata != self.x0:
+            # Regions are stored as points so they follow any referencing of the spectrum
+            reference_value = self.ppms[0] - self.ppm_original[0]
+            self.integrals.add(self.x0 - reference_value, event.xdata - reference_value)
+            self.update_integrals()
+        self.press = False
+        self.move = False
+        self.intensity_region.set_visible(False)
+        self.UpdateFrame()
+
+    def on_key_integral(self, event):
+        if event.key == "r" and len(self.integrals) > 0:
+            dlg = wx.TextEntryDialog(
+                self,
+                "Value of the reference integral (e.g. number of protons):",
+                "Reference Integral",
+                "1",
+            )
+            if dlg.ShowModal() == wx.ID_OK:
+                try:
+                    self.integrals.reference_value = float(dlg.GetValue())
+                    self.integrals.reference = len(self.integrals) - 1
+                except:
+                    pass
+            dlg.Destroy()
+        if event.key == "d":
+            self.integrals.remove()
+        if event.key == "e":
+            self.save_integrals()
+        if event.key == "q":
+            self.disconnect_integrals()
+        self.update_integrals()
+        self.UpdateFrame()
+
+    def update_integrals(self):
+        # Recalculate the cumulative sum of the current spectrum and redraw the integral regions
+        for plot in self.integral_plots:
+            try:
+                plot.remove()
+            except:
+                pass
+        self.integral_plots = []
+        if len(self.integrals) == 0:
+            return
+        self.integrals.update(
+            np.real(self.data) - float(self.vertical_slider.GetValue())
+        )
+        for i, ((start, end), value) in enumerate(
+            zip(self.integrals.bounds(self.ppms), self.integrals.normalised())
+        ):
+            if i == self.integrals.reference:
+                colour = "tab:red"
+            else:
+                colour = "tab:green"
+            self.integral_plots.append(
+                self.ax.axvspan(start, end, alpha=0.15, color=colour)
+            )
+            self.integral_plots.append(
+                self.ax.text(
+                    (start + end) / 2,
+                    0.95,
+                    "{:.3f}".format(value),
+                    transform=self.ax.get_xaxis_transform(),
+                    horizontalalignment="center",
+                    fontsize=8,
+                    color=colour,
+                )
+            )
+
+    def save_integrals(self):
+        if len(self.integrals) == 0:
+            return
+        dlg = wx.FileDialog(
+            self,
+            "Save integrals",
+            wildcard="*.txt",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        )
+        dlg.SetDirectory(os.getcwd())
+        if dlg.ShowModal() == wx.ID_OK:
+            self.integrals.write(
+                dlg.GetPath(), self.ppms, os.path.basename(self.nmrdata.file)
+            )
+        dlg.Destroy()
+
     def OnMaxButton(self, event):
+        if len(self.integral_connections) > 0:
+            message = "Currently integrating - press q to finish integrating before finding the maximum intensity."
+            dlg = wx.MessageDialog(self, message, "Warning", wx.OK)
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
 
         # Asking the user to select a region of the spectrum where they want to find the intensity
         dlg = wx.MessageBox(
@@ -2275,6 +2477,7 @@ class OneDViewer(wx.Panel):
 
         self.press = False
         self.move = False
+        self.max_mode = True
         self.noise_select_press = self.canvas.mpl_connect(
             "button_press_event", self.OnPress
         )
@@ -2330,6 +2533,7 @@ class OneDViewer(wx.Panel):
             self.UpdateFrame()
         self.press = False
         self.move = False
+        self.max_mode = False
         self.canvas.mpl_disconnect(self.noise_select_press)
         self.canvas.mpl_disconnect(self.noise_select_move)
         self.canvas.mpl_disconnect(self.noise_select_release)
@@ -2729,21 +2933,13 @@ class OneDViewer(wx.Panel):
 
                 # If on Varian, try to find the frequency in Hz too
                 try:
-                    dic_v, data_v = ng.varian.read("./")
+                    parameter_index = get_parameter_index()
                     # getting ppm values for the offsets used
-                    self.tof = float(dic_v["procpar"]["tof"]["values"][0])
+                    self.tof = parameter_index.varian_parameter("tof")
                     # getting the sfrq
-                    self.sfrq = float(dic_v["procpar"]["sfrq"]["values"][0])
+                    self.sfrq = parameter_index.varian_parameter("sfrq")
                     # From the fid.com file finding the carrier
-                    file = open("fid.com", "r")
-                    fid_com = file.readlines()
-                    for line in fid_com:
-                        if "CAR" in line:
-                            line = line.split("\n")[0].split()
-                            del line[0]
-                            # deleting the last element of the list which is the '\' character
-                            del line[-1]
-                            self.carrier = float(line[0])
+                    self.carrier = parameter_index.carrier("x")
 
                     def find_Hz(ppm):
                         Hz = (ppm - self.carrier) * self.sfrq + self.tof
@@ -2793,6 +2989,36 @@ class OneDViewer(wx.Panel):
         if event.inaxes == self.ax:
             self.release_intensity(event)
 
+    def OnAutoPhase1D(self, event):
+        if self.multiplot_mode == True:
+            message = "Currently in multiplot mode - automatic phasing is only available when viewing a single spectrum."
+            dlg = wx.MessageDialog(self, message, "Warning", wx.OK)
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+        try:
+            p0, p1 = AutoPhase(np.real(self.nmrdata.data), pivot=self.pivot_x).run()
+        except Exception:
+            dlg = wx.MessageDialog(
+                self,
+                "Automatic phase correction failed, the phase correction values have not been changed.",
+                "Warning",
+                wx.OK | wx.ICON_WARNING,
+            )
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+        self.set_phasing_sliders(p0, p1)
+        self.OnSliderScroll1D(event)
+
+    def set_phasing_sliders(self, p0, p1):
+        p0_coarse, p0_fine = coarse_fine(p0)
+        p1_coarse, p1_fine = coarse_fine(p1)
+        self.P0_slider.SetValue(p0_coarse)
+        self.P0_slider_fine.SetValue(p0_fine)
+        self.P1_slider.SetValue(p1_coarse)
+        self.P1_slider_fine.SetValue(p1_fine)
+
     def OnPivotButton(self, event):
         # Getting the user to select a pivot point for phasing by clicking on the spectrum
         wx.MessageBox(
@@ -2967,6 +3193,7 @@ class OneDViewer(wx.Panel):
                 self.ppm_original + np.ones(len(self.ppm_original)) * reference_value
             )
             self.line1.set_xdata(self.ppms)
+            self.update_integrals()
         else:
             if self.select_all_checkbox.GetValue() == False:
                 self.values_dictionary[self.active_plot_index][
@@ -3567,6 +3794,12 @@ class OneDViewer(wx.Panel):
         )
         self.intensity_region.set_visible(False)
 
+        # Integral regions of the spectrum (drawn when regions are added)
+        self.integrals = Integrals(self.ppm_original)
+        self.integral_plots = []
+        self.integral_connections = []
+        self.max_mode = False
+
         self.UpdateFrame()
 
         self.active_plot = self.line1
@@ -3613,6 +3846,7 @@ class OneDViewer(wx.Panel):
                 self.data * self.multiply_value
                 + np.ones(len(self.data)) * float(self.vertical_slider.GetValue())
             )
+            self.update_integrals()
         else:
             if self.select_all_checkbox.GetValue() == False:
                 self.values_dictionary[self.active_plot_index][
@@ -3885,8 +4119,8 @@ class TwoDViewer(wx.Panel):
         # Multiplot mode is initially set to off
         self.multiplot_mode = False
 
-        # Dictionary to store the values of the sliders for each spectrum in multiplot mode
-        self.values_dictionary = {}
+        # Overlay records storing the values of the sliders for each spectrum in multiplot mode
+        self.values_dictionary = OverlayManager()
 
         # Initial multiply factor is 1
         self.multiply_factor = 1
@@ -4009,6 +4243,16 @@ class TwoDViewer(wx.Panel):
         self.CEST_button = wx.Button(self, label="CEST Analysis", size=(width, height))
         self.CEST_button.Bind(wx.EVT_BUTTON, self.OnCESTButton)
 
+        # Create a button to pick the peaks of the 2D spectrum
+        self.pick_peaks_button = wx.Button(
+            self, label="Pick Peaks", size=(width, height)
+        )
+        self.pick_peaks_button.Bind(wx.EVT_BUTTON, self.OnPickPeaks2D)
+
+        # Create a button which will open a window to follow peaks through a titration series
+        self.titration_button = wx.Button(self, label="Titration", size=(width, height))
+        self.titration_button.Bind(wx.EVT_BUTTON, self.OnTitrationButton)
+
         # Create a button which will make the correct files in order to perform uSTA analysis
         self.uSTA_button = wx.Button(self, label="uSTA", size=(width, height))
         self.uSTA_button.Bind(wx.EVT_BUTTON, self.OnuSTAButton)
@@ -4038,6 +4282,8 @@ class TwoDViewer(wx.Panel):
             self.fit_sizer.Add(self.fit_diffusion_button)
             self.fit_sizer.AddSpacer(5)
             self.fit_sizer.Add(self.fit_relax_button)
+            self.fit_sizer.AddSpacer(5)
+            self.fit_sizer.Add(self.pick_peaks_button)
 
             self.hide_sizer = wx.BoxSizer(wx.HORIZONTAL)
             self.hide_sizer.Add(self.toggle_button)
@@ -4045,6 +4291,8 @@ class TwoDViewer(wx.Panel):
             self.hide_sizer.Add(self.CEST_button)
             self.hide_sizer.AddSpacer(5)
             self.hide_sizer.Add(self.uSTA_button)
+            self.hide_sizer.AddSpacer(5)
+            self.hide_sizer.Add(self.titration_button)
 
         else:
             self.general_options_sizer.Add(
@@ -4159,6 +4407,12 @@ class TwoDViewer(wx.Panel):
         self.pivot_sizer.AddSpacer(20)
         self.pivot_sizer.Add(self.remove_pivot_button)
 
+        # Add a button to phase the selected slice direction automatically
+        self.auto_phase_button = wx.Button(self, label="Auto Phase")
+        self.auto_phase_button.Bind(wx.EVT_BUTTON, self.OnAutoPhase2D)
+        self.pivot_sizer.AddSpacer(20)
+        self.pivot_sizer.Add(self.auto_phase_button)
+
         self.P1_slider_sizer.AddSpacer(5)
         self.P1_slider_sizer.Add(self.pivot_sizer, wx.ALIGN_CENTER_HORIZONTAL, 1)
 
@@ -4923,24 +5177,16 @@ class TwoDViewer(wx.Panel):
 
             # Try to read the acqus file to get D20 and PL10 value
 
-            self.mixing_time = 0
-            self.power_level = 0
+            self.mixing_time = "0"
+            self.power_level = "0"
             try:
-                dvals_next_line = False
-                plvals_next_line = False
-                with open("acqus", "r") as file:
-                    file_lines = file.readlines()
-                    for line in file_lines:
-                        if dvals_next_line == True:
-                            self.mixing_time = line.split()[20]
-                            dvals_next_line = False
-                        if plvals_next_line == True:
-                            self.power_level = line.split()[10]
-                            plvals_next_line = False
-                        if "##$D=" in line:
-                            dvals_next_line = True
-                        if "##$PL=" in line:
-                            plvals_next_line = True
+                parameter_index = get_parameter_index()
+                self.mixing_time = str(
+                    parameter_index.bruker_parameter("D", index=20)
+                )
+                self.power_level = str(
+                    parameter_index.bruker_parameter("PL", index=10)
+                )
             except:
                 pass
 
@@ -5047,6 +5293,43 @@ class TwoDViewer(wx.Panel):
 
         self.UpdateFrame()
 
+    def OnAutoPhase2D(self, event):
+        # All slices along the selected direction share a phase error, so the whole plane is used
+        if self.slice_mode == None:
+            wx.MessageBox(
+                "Automatic phasing requires that a user has already selected their desired horizontal or vertical slice. Please select slice and repeat.",
+                "Auto Phase",
+                wx.OK | wx.ICON_INFORMATION,
+            )
+            return
+        data = np.real(self.nmrdata.data)
+        try:
+            if self.line1.get_visible() == True:
+                phasing = AutoPhase.from_plane(data.T, pivot=self.pivot_x)
+            else:
+                phasing = AutoPhase.from_plane(data, pivot=self.pivot_y)
+            p0, p1 = phasing.run()
+        except Exception:
+            dlg = wx.MessageDialog(
+                self,
+                "Automatic phase correction failed, the phase correction values have not been changed.",
+                "Warning",
+                wx.OK | wx.ICON_WARNING,
+            )
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+        self.set_phasing_sliders(p0, p1)
+        self.OnSliderScroll2D(event)
+
+    def set_phasing_sliders(self, p0, p1):
+        p0_coarse, p0_fine = coarse_fine(p0)
+        p1_coarse, p1_fine = coarse_fine(p1)
+        self.P0_slider.SetValue(p0_coarse)
+        self.P0_slider_fine.SetValue(p0_fine)
+        self.P1_slider.SetValue(p1_coarse)
+        self.P1_slider_fine.SetValue(p1_fine)
+
     def OnPivotButton2D(self, event):
         # If the user has not selected a horizontal or vertical slice, give a message box to tell them to do so
         if self.slice_mode == None:
@@ -5600,6 +5883,54 @@ class TwoDViewer(wx.Panel):
             title="CEST", parent=self, CESTArrayOrder=self.CESTArrayOrder
         )
 
+    def OnPickPeaks2D(self, event):
+        # Pick the peaks of the main spectrum and mark them on the contour plot
+        data = np.real(np.asarray(self.nmrdata.data))
+        picker = PeakPicker(
+            self, data, [self.nmrdata.axislabels[0], self.nmrdata.axislabels[1]]
+        )
+        if picker.pick() == False:
+            return
+        self.picked_peaks = np.stack(
+            [
+                np.interp(
+                    picker.positions[:, 0],
+                    np.arange(len(self.ppms_0)),
+                    self.ppms_0 + self.x_movement,
+                ),
+                np.interp(
+                    picker.positions[:, 1],
+                    np.arange(len(self.ppms_1)),
+                    self.ppms_1 + self.y_movement,
+                ),
+            ],
+            axis=1,
+        )
+        self.draw_picked_peaks_2D()
+        self.UpdateFrame()
+        picker.save(self.picked_peaks)
+        picker.fit([self.ppms_0 + self.x_movement, self.ppms_1 + self.y_movement])
+
+    def draw_picked_peaks_2D(self):
+        # Picked peaks are drawn again whenever the contour plot is redrawn
+        try:
+            self.picked_peaks_plot[0].remove()
+        except:
+            pass
+        try:
+            self.picked_peaks_plot = self.ax.plot(
+                self.picked_peaks[:, 0],
+                self.picked_peaks[:, 1],
+                "x",
+                color="k",
+                markersize=5,
+            )
+        except:
+            pass
+
+    def OnTitrationButton(self, event):
+        self.titration_window = TitrationFrame(title="Titration", parent=self)
+
     def OnFitRelaxButton(self, event):
         if self.multiplot_mode == False:
             # If the number of slices is greater than 30, pop up a window to ask the user if they want to continue
@@ -5668,6 +5999,8 @@ class TwoDViewer(wx.Panel):
             if self.line3.get_visible() == True:
                 self.line4 = self.ax.axvline(self.x1, color="k")
 
+            self.draw_picked_peaks_2D()
+
             self.ax.set_xlim(xlim)
             self.ax.set_ylim(ylim)
             self.ax.set_xlabel(self.nmrdata.axislabels[1])
@@ -5677,24 +6010,21 @@ class TwoDViewer(wx.Panel):
             xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
             xlabel, ylabel = self.ax.get_xlabel(), self.ax.get_ylabel()
             self.ax.clear()
-            for i in range(len(self.values_dictionary.keys())):
-                self.cl = self.contour_start * self.contour_factor ** np.arange(
-                    self.values_dictionary[i]["contour levels"]
-                )
-                multiply_factor = self.values_dictionary[i]["multiply factor"]
-                x, y = np.meshgrid(
-                    self.values_dictionary[i]["new_y_ppms"],
-                    self.values_dictionary[i]["new_x_ppms"],
+            # Meshgrids, contour levels and scaled data are cached by each overlay
+            for i, overlay in enumerate(self.values_dictionary.overlays()):
+                self.cl = overlay.contour_levels_from(
+                    self.contour_start, self.contour_factor
                 )
+                x, y = overlay.meshgrid()
                 self.ax.contour(
                     y,
                     x,
-                    self.values_dictionary[i]["z_data"] * multiply_factor,
+                    overlay.scaled_data(),
                     self.cl,
                     colors=self.twoD_colours[i],
-                    linewidths=self.values_dictionary[i]["contour linewidth"],
+                    linewidths=overlay["contour linewidth"],
                 )
-                self.ax.legend(self.files.custom_lines, self.files.custom_labels)
+            self.ax.legend(self.files.custom_lines, self.files.custom_labels)
 
             if self.twoD_slices_horizontal[0][0].get_visible() == True:
                 # for i in range(len(self.twoD_slices_horizontal)):
@@ -6013,7 +6343,7 @@ class TwoDViewer(wx.Panel):
                         (self.line1,) = self.axes1D.plot(
                             self.new_x_ppms,
                             self.nmrdata.data[
-                                :, self.uc1(str(self.new_y_ppms[1]) + "ppm")
+                                :, ppm_index(self.uc1, self.new_y_ppms[1])
                             ]
                             * self.multiply_factor,
                             color=self.slice_colour,
@@ -6041,7 +6371,7 @@ class TwoDViewer(wx.Panel):
                         self.line4.set_visible = True
                         (self.line3,) = self.axes1D_2.plot(
                             self.nmrdata.data[
-                                self.uc0(str(self.new_x_ppms[1]) + "ppm"), :
+                                ppm_index(self.uc0, self.new_x_ppms[1]), :
                             ]
                             * self.multiply_factor,
                             self.new_y_ppms,
@@ -6078,8 +6408,9 @@ class TwoDViewer(wx.Panel):
                                     self.values_dictionary[i]["new_x_ppms"],
                                     self.values_dictionary[i]["z_data"][
                                         :,
-                                        self.values_dictionary[i]["uc1"](
-                                            str(self.new_y_ppms[1]) + "ppm"
+                                        ppm_index(
+                                            self.values_dictionary[i]["uc1"],
+                                            self.new_y_ppms[1],
                                         ),
                                     ]
                                     * multiply_factor,
@@ -6091,8 +6422,9 @@ class TwoDViewer(wx.Panel):
                                     self.values_dictionary[i]["new_x_ppms"],
                                     self.values_dictionary[i]["z_data"][
                                         :,
-                                        self.values_dictionary[i]["uc0"](
-                                            str(self.new_y_ppms[1]) + "ppm"
+                                        ppm_index(
+                                            self.values_dictionary[i]["uc0"],
+                                            self.new_y_ppms[1],
                                         ),
                                     ]
                                     * multiply_factor,
@@ -6125,8 +6457,9 @@ class TwoDViewer(wx.Panel):
                             try:
                                 self.twoD_slices_vertical[i] = self.axes1D_2.plot(
                                     self.values_dictionary[i]["z_data"][
-                                        self.values_dictionary[i]["uc0"](
-                                            str(self.new_x_ppms[1]) + "ppm"
+                                        ppm_index(
+                                            self.values_dictionary[i]["uc0"],
+                                            self.new_x_ppms[1],
                                         ),
                                         :,
                                     ]
@@ -6138,8 +6471,9 @@ class TwoDViewer(wx.Panel):
                             except:
                                 self.twoD_slices_vertical[i] = self.axes1D_2.plot(
                                     self.values_dictionary[i]["z_data"][
-                                        self.values_dictionary[i]["uc1"](
-                                            str(self.new_x_ppms[1]) + "ppm"
+                                        ppm_index(
+                                            self.values_dictionary[i]["uc1"],
+                                            self.new_x_ppms[1],
                                         ),
                                         :,
                                     ]
@@ -6164,7 +6498,7 @@ class TwoDViewer(wx.Panel):
                 if self.line1.get_visible() == True:
                     self.line1.set_ydata(
                         self.nmrdata.data[
-                            :, self.uc1(str(self.y1 - self.y_movement) + "ppm")
+                            :, ppm_index(self.uc1, self.y1 - self.y_movement)
                         ]
                         * self.multiply_factor
                     )
@@ -6175,7 +6509,7 @@ class TwoDViewer(wx.Panel):
                 if self.line3.get_visible() == True:
                     self.line3.set_xdata(
                         self.nmrdata.data[
-                            self.uc0(str(self.x1 - self.x_movement) + "ppm"), :
+                            ppm_index(self.uc0, self.x1 - self.x_movement), :
                         ]
                         * self.multiply_factor
                     )
@@ -6183,101 +6517,48 @@ class TwoDViewer(wx.Panel):
                     self.line3.set_ydata(self.ppms_1 + self.y_movement)
                     self.OnSliderScroll2D(wx.EVT_SCROLL)
                     self.UpdateFrame()
+                    # Update the CEST profile if the CEST window is open
+                    try:
+                        self.CEST.update_selected_shift(self.x1)
+                    except:
+                        pass
 
             else:
+                # Slices of every overlay at the cursor, each shifted by its own move x/move y
                 if self.twoD_slices_horizontal[0][0].get_visible() == True:
+                    slices = self.values_dictionary.slices(
+                        self.y1, axis=1, transposed=self.transposed2D
+                    )
                     for i in range(len(self.twoD_slices_horizontal)):
-                        multiply_factor = self.values_dictionary[i]["multiply factor"]
                         self.y_difference = self.values_dictionary[i]["move y"]
-                        try:
-                            if self.transposed2D == False:
-                                self.twoD_slices_horizontal[i][0].set_ydata(
-                                    self.values_dictionary[i]["z_data"][
-                                        :,
-                                        self.values_dictionary[i]["uc1"](
-                                            str(self.y1 - self.y_difference) + "ppm"
-                                        ),
-                                    ]
-                                    * multiply_factor
-                                )
-                                self.twoD_slices_horizontal[i][0].set_xdata(
-                                    self.values_dictionary[i]["new_x_ppms"]
-                                )
-                            else:
-                                self.twoD_slices_horizontal[i][0].set_ydata(
-                                    self.values_dictionary[i]["z_data"][
-                                        :,
-                                        self.values_dictionary[i]["uc0"](
-                                            str(self.y1 - self.y_difference) + "ppm"
-                                        ),
-                                    ]
-                                    * multiply_factor
-                                )
-                                self.twoD_slices_horizontal[i][0].set_xdata(
-                                    self.values_dictionary[i]["new_x_ppms"]
-                                )
-                        except:
-                            self.twoD_slices_vertical[i][0].set_xdata(
-                                0
-                                * np.ones(
-                                    len(
-                                        self.values_dictionary[i]["z_data"][:, 0]
-                                        * multiply_factor
-                                    )
-                                )
-                            )
-                            self.twoD_slices_vertical[i][0].set_ydata(
-                                0
-                                * np.ones(len(self.values_dictionary[i]["new_x_ppms"]))
+                        data = slices[i]
+                        if data is None:
+                            # Outside this spectrum so show a flat line
+                            data = np.zeros(
+                                len(self.values_dictionary[i]["new_x_ppms"])
                             )
+                        self.twoD_slices_horizontal[i][0].set_ydata(data)
+                        self.twoD_slices_horizontal[i][0].set_xdata(
+                            self.values_dictionary[i]["new_x_ppms"]
+                        )
                     self.line_h.set_ydata([self.y1])
                     self.OnSliderScroll2D(wx.EVT_SCROLL)
                     self.UpdateFrame()
                 if self.twoD_slices_vertical[0][0].get_visible() == True:
+                    slices = self.values_dictionary.slices(
+                        self.x1, axis=0, transposed=self.transposed2D
+                    )
                     for i in range(len(self.twoD_slices_vertical)):
-                        multiply_factor = self.values_dictionary[i]["multiply factor"]
                         self.x_difference = self.values_dictionary[i]["move x"]
-                        try:
-                            if self.transposed2D == False:
-                                self.twoD_slices_vertical[i][0].set_xdata(
-                                    self.values_dictionary[i]["z_data"][
-                                        self.values_dictionary[i]["uc0"](
-                                            str(self.x1 - self.x_difference) + "ppm"
-                                        ),
-                                        :,
-                                    ]
-                                    * multiply_factor
-                                )
-                                self.twoD_slices_vertical[i][0].set_ydata(
-                                    self.values_dictionary[i]["new_y_ppms"]
-                                )
-                            else:
-                                self.twoD_slices_vertical[i][0].set_xdata(
-                                    self.values_dictionary[i]["z_data"][
-                                        self.values_dictionary[i]["uc1"](
-                                            str(self.x1 - self.x_difference) + "ppm"
-                                        ),
-                                        :,
-                                    ]
-                                    * multiply_factor
-                                )
-                                self.twoD_slices_vertical[i][0].set_ydata(
-                                    self.values_dictionary[i]["new_y_ppms"]
-                                )
-                        except:
-                            self.twoD_slices_vertical[i][0].set_xdata(
-                                0
-                                * np.ones(
-                                    len(
-                                        self.values_dictionary[i]["z_data"][0, :]
-                                        * multiply_factor
-                                    )
-                                )
-                            )
-                            self.twoD_slices_vertical[i][0].set_ydata(
-                                0
-                                * np.ones(len(self.values_dictionary[i]["new_y_ppms"]))
+                        data = slices[i]
+                        if data is None:
+                            data = np.zeros(
+                                len(self.values_dictionary[i]["new_y_ppms"])
                             )
+                        self.twoD_slices_vertical[i][0].set_xdata(data)
+                        self.twoD_slices_vertical[i][0].set_ydata(
+                            self.values_dictionary[i]["new_y_ppms"]
+                        )
                     self.line_v.set_xdata([self.x1])
                     self.OnSliderScroll2D(wx.EVT_SCROLL)
                     self.UpdateFrame()
@@ -6297,7 +6578,7 @@ class TwoDViewer(wx.Panel):
                 if self.line1.get_visible() == True:
                     data = (
                         self.nmrdata.data[
-                            :, self.uc1(str(self.y1 - self.y_movement) + "ppm")
+                            :, ppm_index(self.uc1, self.y1 - self.y_movement)
                         ]
                         * self.multiply_factor
                     )
@@ -6328,7 +6609,7 @@ class TwoDViewer(wx.Panel):
                 if self.line3.get_visible() == True:
                     data = (
                         self.nmrdata.data[
-                            self.uc0(str(self.x1 - self.x_movement) + "ppm"), :
+                            ppm_index(self.uc0, self.x1 - self.x_movement), :
                         ]
                         * self.multiply_factor
                     )
@@ -6391,8 +6672,9 @@ class TwoDViewer(wx.Panel):
                         data = (
                             self.values_dictionary[self.active_plot_index]["z_data"][
                                 :,
-                                self.values_dictionary[self.active_plot_index]["uc1"](
-                                    str(self.y1 - self.y_difference) + "ppm"
+                                ppm_index(
+                                    self.values_dictionary[self.active_plot_index]["uc1"],
+                                    self.y1 - self.y_difference,
                                 ),
                             ]
                             * multiply_factor
@@ -6401,8 +6683,9 @@ class TwoDViewer(wx.Panel):
                         data = (
                             self.values_dictionary[self.active_plot_index]["z_data"][
                                 :,
-                                self.values_dictionary[self.active_plot_index]["uc0"](
-                                    str(self.y1 - self.y_difference) + "ppm"
+                                ppm_index(
+                                    self.values_dictionary[self.active_plot_index]["uc0"],
+                                    self.y1 - self.y_difference,
                                 ),
                             ]
                             * multiply_factor
@@ -6447,8 +6730,9 @@ class TwoDViewer(wx.Panel):
                             data = (
                                 self.values_dictionary[i]["z_data"][
                                     :,
-                                    self.values_dictionary[i]["uc1"](
-                                        str(self.y1 - self.y_difference) + "ppm"
+                                    ppm_index(
+                                        self.values_dictionary[i]["uc1"],
+                                        self.y1 - self.y_difference,
                                     ),
                                 ]
                                 * multiply_factor
@@ -6457,8 +6741,9 @@ class TwoDViewer(wx.Panel):
                             data = (
                                 self.values_dictionary[i]["z_data"][
                                     :,
-                                    self.values_dictionary[i]["uc0"](
-                                        str(self.y1 - self.y_difference) + "ppm"
+                                    ppm_index(
+                                        self.values_dictionary[i]["uc0"],
+                                        self.y1 - self.y_difference,
                                     ),
                                 ]
                                 * multiply_factor
@@ -6489,8 +6774,9 @@ class TwoDViewer(wx.Panel):
                     if self.transposed2D == False:
                         data = (
                             self.values_dictionary[self.active_plot_index]["z_data"][
-                                self.values_dictionary[self.active_plot_index]["uc0"](
-                                    str(self.x1 - self.x_difference) + "ppm"
+                                ppm_index(
+                                    self.values_dictionary[self.active_plot_index]["uc0"],
+                                    self.x1 - self.x_difference,
                                 ),
                                 :,
                             ]
@@ -6499,8 +6785,9 @@ class TwoDViewer(wx.Panel):
                     else:
                         data = (
                             self.values_dictionary[self.active_plot_index]["z_data"][
-                                self.values_dictionary[self.active_plot_index]["uc1"](
-                                    str(self.x1 - self.x_difference) + "ppm"
+                                ppm_index(
+                                    self.values_dictionary[self.active_plot_index]["uc1"],
+                                    self.x1 - self.x_difference,
                                 ),
                                 :,
                             ]
@@ -6543,8 +6830,9 @@ class TwoDViewer(wx.Panel):
                         if self.transposed2D == False:
                             data = (
                                 self.values_dictionary[i]["z_data"][
-                                    self.values_dictionary[i]["uc0"](
-                                        str(self.x1 - self.x_difference) + "ppm"
+                                    ppm_index(
+                                        self.values_dictionary[i]["uc0"],
+                                        self.x1 - self.x_difference,
                                     ),
                                     :,
                                 ]
@@ -6553,8 +6841,9 @@ class TwoDViewer(wx.Panel):
                         else:
                             data = (
                                 self.values_dictionary[i]["z_data"][
-                                    self.values_dictionary[i]["uc1"](
-                                        str(self.x1 - self.x_difference) + "ppm"
+                                    ppm_index(
+                                        self.values_dictionary[i]["uc1"],
+                                        self.x1 - self.x_difference,
                                     ),
                                     :,
                                 ]
@@ -6620,6 +6909,9 @@ class ThreeDViewer(wx.Panel):
         self.parent = parent
         wx.Panel.__init__(self, parent, id=wx.ID_ANY, size=(self.width, self.height))
         self.nmrdata = nmrdata
+        self.volume = None
+        self.projections = None
+        self.orientation = 0
 
         self.set_initial_variables_3D()
         self.create_button_panel_3D()
@@ -6741,8 +7033,8 @@ class ThreeDViewer(wx.Panel):
         # Multiplot mode is initially set to off
         self.multiplot_mode = False
 
-        # Dictionary to store the values of the sliders for each spectrum in multiplot mode
-        self.values_dictionary = {}
+        # Overlay records storing the values of the sliders for each spectrum in multiplot mode
+        self.values_dictionary = OverlayManager()
 
         # Initial multiply factor is 1
         self.multiply_factor = 1
@@ -7051,6 +7343,10 @@ class ThreeDViewer(wx.Panel):
         self.show_bore_button = wx.Button(self, label="Show Bore", size=(120, 30))
         self.show_bore_button.Bind(wx.EVT_BUTTON, self.OnShowBoreButton)
 
+        # Button to pick the peaks of the whole 3D spectrum
+        self.pick_peaks_button = wx.Button(self, label="Pick Peaks", size=(120, 30))
+        self.pick_peaks_button.Bind(wx.EVT_BUTTON, self.OnPickPeaks3D)
+
         # Create a button to show/hide options
         self.show_hide_button = wx.Button(self, label="Hide Options", size=(120, 30))
         self.show_hide_button.Bind(wx.EVT_BUTTON, self.OnHideButton)
@@ -7082,6 +7378,8 @@ class ThreeDViewer(wx.Panel):
         self.button_sizer.AddSpacer(5)
         self.button_sizer.Add(self.show_bore_button)
         self.button_sizer.AddSpacer(5)
+        self.button_sizer.Add(self.pick_peaks_button)
+        self.button_sizer.AddSpacer(5)
         self.button_sizer.Add(self.show_hide_button)
         right_right_sizer.Add(self.button_sizer)
         self.bottom_sizer.Add(rightbox)
@@ -7154,6 +7452,13 @@ class ThreeDViewer(wx.Panel):
             name = projection.split(".dat")[0].split(".")
             projection = name[1] + "." + name[0] + ".dat"
 
+        # If nmrPipe has not made the projection, use one calculated from the 3D data
+        if os.path.exists(projection) == False:
+            try:
+                projection = self.get_projections().find_projection(projection)
+            except:
+                pass
+
         # Check to see if the projection file exists
         if os.path.exists(projection) == False:
             # Give a warning that the projection file does not exist
@@ -7170,9 +7475,71 @@ class ThreeDViewer(wx.Panel):
         frame = SpinBore(title="SpinBore", projection=projection, parent=self)
         frame.Show()
 
+    def OnPickPeaks3D(self, event):
+        # Pick the peaks of the whole cube (a few planes at a time), then mark those in the displayed plane
+        picker = PeakPicker(self, self.data_original, self.nmrdata.axislabels)
+        if picker.pick() == False:
+            return
+        self.picked_peaks = picker.positions
+        ppms = np.stack(
+            [
+                np.interp(
+                    picker.positions[:, dim],
+                    np.arange(self.data_original.shape[dim]),
+                    self.volume.unit_conversion(dim).ppm_scale(),
+                )
+                for dim in range(3)
+            ],
+            axis=1,
+        )
+        self.draw_picked_peaks_3D()
+        self.UpdateFrame()
+        picker.save(ppms)
+
+    def draw_picked_peaks_3D(self):
+        # Mark the picked peaks that lie in the plane currently shown
+        try:
+            self.picked_peaks_plot[0].remove()
+        except:
+            pass
+        try:
+            z, rows, cols = self.volume.order(self.orientation)
+            in_plane = np.rint(self.picked_peaks[:, z]) == int(self.z_slider.GetValue())
+            self.picked_peaks_plot = self.ax.plot(
+                np.interp(
+                    self.picked_peaks[in_plane, rows],
+                    np.arange(len(self.ppms_0)),
+                    self.ppms_0,
+                ),
+                np.interp(
+                    self.picked_peaks[in_plane, cols],
+                    np.arange(len(self.ppms_1)),
+                    self.ppms_1,
+                ),
+                "x",
+                color="k",
+                markersize=5,
+            )
+        except:
+            pass
+
+    def get_projections(self):
+        # Skyline and sum projections of the 3D data, cached next to the spectrum
+        if self.projections is None or self.projections.data is not self.data_original:
+            self.projections = Projections3D(
+                self.nmrdata.file,
+                self.data_original,
+                self.nmrdata.dic,
+                self.nmrdata.axislabels,
+                pipe=self.nmrdata.file != ".",
+                directory=self.nmrdata.path,
+            )
+        return self.projections
+
     def OnOrientationCombo(self, event):
         self.nmrdata.data = self.data_original
-        if self.orientation_chooser.GetSelection() == 0:
+        self.orientation = self.orientation_chooser.GetSelection()
+        if self.orientation == 0:
             self.z_label.SetLabel("Z Value (" + str(self.nmrdata.axislabels[0]) + "):")
             self.ax.clear()
             self.axes1D.clear()
@@ -7181,24 +7548,24 @@ class ThreeDViewer(wx.Panel):
             self.draw_figure_3D()
             self.ax.set_xlabel(self.nmrdata.axislabels[1])
             self.ax.set_ylabel(self.nmrdata.axislabels[2])
-        elif self.orientation_chooser.GetSelection() == 1:
-            self.z_label.SetLabel("Z Value (" + str(self.nmrdata.axislabels[0]) + "):")
+        else:
+            # Axes of the original data used for z, x (rows) and y (columns) in this orientation
+            z, rows, cols = self.volume.order(self.orientation)
+            self.z_label.SetLabel("Z Value (" + str(self.nmrdata.axislabels[z]) + "):")
             self.ax.clear()
             # Get ppm values for x and y axis
-            self.uc0 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=2)
-            self.uc1 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=1)
-            self.uc2 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=0)
+            self.uc0, self.uc1, self.uc2 = self.volume.unit_conversions_for(
+                self.orientation
+            )
             self.ppms_0 = self.uc0.ppm_scale()
             self.ppms_1 = self.uc1.ppm_scale()
             self.ppms_2 = self.uc2.ppm_scale()
 
-            # Transpose the data to the right format
-            self.nmrdata.data = np.transpose(self.data_original, (0, 2, 1))
+            # Strided view of the data in the new orientation (no copy is made)
+            self.nmrdata.data = self.volume.view(self.orientation)
 
             # Find the plane of the 3D data that has the highest total intensity
-            self.total_intensity = []
-            for i in range(len(self.nmrdata.data)):
-                self.total_intensity.append(np.sum(np.abs(self.nmrdata.data[i])))
+            self.total_intensity = self.volume.total_intensity(self.orientation)
 
             self.max_intensity_index = np.argmax(self.total_intensity)
             # Set the z slider to the index of the plane with the highest total intensity
@@ -7208,129 +7575,19 @@ class ThreeDViewer(wx.Panel):
             # Replot the data
             self.replot_3D()
 
-            self.ax.set_xlabel(self.nmrdata.axislabels[2])
-            self.ax.set_ylabel(self.nmrdata.axislabels[1])
-            self.UpdateFrame()
-
-        elif self.orientation_chooser.GetSelection() == 2:
-            self.z_label.SetLabel("Z Value (" + str(self.nmrdata.axislabels[2]) + "):")
-            self.ax.clear()
-            # Get ppm values for x and y axis
-            self.uc0 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=1)
-            self.uc1 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=0)
-            self.uc2 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=2)
-            self.ppms_0 = self.uc0.ppm_scale()
-            self.ppms_1 = self.uc1.ppm_scale()
-            self.ppms_2 = self.uc2.ppm_scale()
-
-            # Transpose the data to the right format
-            self.nmrdata.data = np.transpose(self.data_original, (2, 1, 0))
-            # Find the plane of the 3D data that has the highest total intensity
-            self.total_intensity = []
-            for i in range(len(self.nmrdata.data)):
-                self.total_intensity.append(np.sum(np.abs(self.nmrdata.data[i])))
-
-            self.max_intensity_index = np.argmax(self.total_intensity)
-            # Set the z slider to the index of the plane with the highest total intensity
-            self.z_slider.SetMax(len(self.ppms_2) - 1)
-            self.z_slider.SetValue(self.max_intensity_index)
-
-            self.replot_3D()
-            self.ax.set_xlabel(self.nmrdata.axislabels[1])
-            self.ax.set_ylabel(self.nmrdata.axislabels[0])
-            self.UpdateFrame()
-
-        elif self.orientation_chooser.GetSelection() == 3:
-            self.z_label.SetLabel("Z Value (" + str(self.nmrdata.axislabels[2]) + "):")
-            self.ax.clear()
-            # Get ppm values for x and y axis
-            self.uc0 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=0)
-            self.uc1 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=1)
-            self.uc2 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=2)
-            self.ppms_0 = self.uc0.ppm_scale()
-            self.ppms_1 = self.uc1.ppm_scale()
-            self.ppms_2 = self.uc2.ppm_scale()
-
-            # Transpose the data to the right format
-            self.nmrdata.data = np.transpose(self.data_original, (2, 0, 1))
-            # Find the plane of the 3D data that has the highest total intensity
-            self.total_intensity = []
-            for i in range(len(self.nmrdata.data)):
-                self.total_intensity.append(np.sum(np.abs(self.nmrdata.data[i])))
-
-            self.max_intensity_index = np.argmax(self.total_intensity)
-            # Set the z slider to the index of the plane with the highest total intensity
-            self.z_slider.SetMax(len(self.ppms_2) - 1)
-            self.z_slider.SetValue(self.max_intensity_index)
-
-            self.replot_3D()
-            self.ax.set_xlabel(self.nmrdata.axislabels[0])
-            self.ax.set_ylabel(self.nmrdata.axislabels[1])
-            self.UpdateFrame()
-
-        elif self.orientation_chooser.GetSelection() == 4:
-            self.z_label.SetLabel("Z Value (" + str(self.nmrdata.axislabels[1]) + "):")
-            self.ax.clear()
-            # Get ppm values for x and y axis
-            self.uc0 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=2)
-            self.uc1 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=0)
-            self.uc2 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=1)
-            self.ppms_0 = self.uc0.ppm_scale()
-            self.ppms_1 = self.uc1.ppm_scale()
-            self.ppms_2 = self.uc2.ppm_scale()
-
-            # Transpose the data to the right format
-            self.nmrdata.data = np.transpose(self.data_original, (1, 2, 0))
-            # Find the plane of the 3D data that has the highest total intensity
-            self.total_intensity = []
-            for i in range(len(self.nmrdata.data)):
-                self.total_intensity.append(np.sum(np.abs(self.nmrdata.data[i])))
-
-            self.max_intensity_index = np.argmax(self.total_intensity)
-            # Set the z slider to the index of the plane with the highest total intensity
-            self.z_slider.SetMax(len(self.ppms_2) - 1)
-            self.z_slider.SetValue(self.max_intensity_index)
-
-            self.replot_3D()
-            self.ax.set_xlabel(self.nmrdata.axislabels[2])
-            self.ax.set_ylabel(self.nmrdata.axislabels[0])
-            self.UpdateFrame()
-        elif self.orientation_chooser.GetSelection() == 5:
-            self.z_label.SetLabel("Z Value (" + str(self.nmrdata.axislabels[1]) + "):")
-            self.ax.clear()
-            # Get ppm values for x and y axis
-            self.uc0 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=0)
-            self.uc1 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=2)
-            self.uc2 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=1)
-            self.ppms_0 = self.uc0.ppm_scale()
-            self.ppms_1 = self.uc1.ppm_scale()
-            self.ppms_2 = self.uc2.ppm_scale()
-
-            # Transpose the data to the right format
-            self.nmrdata.data = np.transpose(self.data_original, (1, 0, 2))
-            # Find the plane of the 3D data that has the highest total intensity
-            self.total_intensity = []
-            for i in range(len(self.nmrdata.data)):
-                self.total_intensity.append(np.sum(np.abs(self.nmrdata.data[i])))
-
-            self.max_intensity_index = np.argmax(self.total_intensity)
-            # Set the z slider to the index of the plane with the highest total intensity
-            self.z_slider.SetMax(len(self.ppms_2) - 1)
-            self.z_slider.SetValue(self.max_intensity_index)
-
-            self.replot_3D()
-            self.ax.set_xlabel(self.nmrdata.axislabels[0])
-            self.ax.set_ylabel(self.nmrdata.axislabels[2])
+            self.ax.set_xlabel(self.nmrdata.axislabels[rows])
+            self.ax.set_ylabel(self.nmrdata.axislabels[cols])
             self.UpdateFrame()
 
     def replot_3D(self):
+        plane = self.volume.plane(self.orientation, self.max_intensity_index)
         self.new_x_ppms = self.ppms_0
         self.new_y_ppms = self.ppms_1
         self.X, self.Y = np.meshgrid(self.ppms_1, self.ppms_0)
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[self.max_intensity_index],
+            plane,
             self.cl,
             colors=self.cmap,
             linewidths=self.contour_linewidth,
@@ -7338,7 +7595,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[self.max_intensity_index],
+            plane,
             self.cl_neg,
             colors=self.cmap_neg,
             linewidths=self.contour_linewidth,
@@ -7347,27 +7604,27 @@ class ThreeDViewer(wx.Panel):
         self.ax.set_ylim(max(self.ppms_1), min(self.ppms_1))
         (self.line1,) = self.axes1D.plot(
             self.ppms_0,
-            self.nmrdata.data[self.max_intensity_index][:, 1],
+            plane[:, 1],
             color=self.slice_colour,
         )
         self.line2 = self.ax.axhline(self.ppms_1[1], color="k")
         self.axes1D.set_ylim(
-            -np.max(self.nmrdata.data[self.max_intensity_index] / 10),
-            np.max(self.nmrdata.data[self.max_intensity_index]),
+            -np.max(plane / 10),
+            np.max(plane),
         )
         self.axes1D.set_yticks([])
         self.axes1D.set_xticks([])
         self.line1.set_visible(False)
         self.line2.set_visible(False)
         (self.line3,) = self.axes1D_2.plot(
-            self.nmrdata.data[self.max_intensity_index][1, :],
+            plane[1, :],
             self.ppms_1,
             color=self.slice_colour,
         )
         self.line4 = self.ax.axvline(self.ppms_0[1], color="k")
         self.axes1D_2.set_xlim(
-            -np.max(self.nmrdata.data[self.max_intensity_index] / 10),
-            np.max(self.nmrdata.data[self.max_intensity_index]),
+            -np.max(plane / 10),
+            np.max(plane),
         )
         self.axes1D_2.set_xticks([])
         self.axes1D_2.set_yticks([])
@@ -7574,10 +7831,16 @@ class ThreeDViewer(wx.Panel):
         self.fig.canvas.mpl_connect("key_press_event", self.on_key_3d)
         self.fig.canvas.mpl_connect("button_press_event", self.on_click_3d)
 
+        # The volume gives access to the data in every orientation, with plane statistics calculated once
+        self.data_original = self.nmrdata.data
+        self.orientation = 0
+        if self.volume is None or self.volume.data is not self.data_original:
+            self.volume = Volume3D(
+                self.data_original, self.nmrdata.dic, pipe=self.nmrdata.file != "."
+            )
+
         # plot parameters
-        contour_start = (
-            np.max(np.abs(self.nmrdata.data)) / 10
-        )  # contour level start value
+        contour_start = self.volume.max_abs() / 10  # contour level start value
         self.contour_num = 20  # number of contour levels
         self.contour_factor = 1.2  # scaling factor between contour levels
         # calculate contour levels
@@ -7587,26 +7850,16 @@ class ThreeDViewer(wx.Panel):
         )
 
         # Find the plane of the 3D data that has the highest total intensity
-        self.total_intensity = []
-        for i in range(len(self.nmrdata.data)):
-            self.total_intensity.append(np.sum(np.abs(self.nmrdata.data[i])))
+        self.total_intensity = self.volume.total_intensity(self.orientation)
 
         self.max_intensity_index = np.argmax(self.total_intensity)
         # Set the z slider to the index of the plane with the highest total intensity
         self.z_slider.SetValue(self.max_intensity_index)
 
         # Get ppm values for x and y axis
-        self.data_original = self.nmrdata.data
-
-        if self.nmrdata.file != ".":
-            self.uc0 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=1)
-            self.uc1 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=2)
-            self.uc2 = ng.pipe.make_uc(self.nmrdata.dic, self.nmrdata.data, dim=0)
-        else:
-            udic = ng.bruker.guess_udic(self.nmrdata.dic, self.nmrdata.data)
-            self.uc0 = ng.fileiobase.uc_from_udic(udic, dim=1)
-            self.uc1 = ng.fileiobase.uc_from_udic(udic, dim=2)
-            self.uc2 = ng.fileiobase.uc_from_udic(udic, dim=0)
+        self.uc0, self.uc1, self.uc2 = self.volume.unit_conversions_for(
+            self.orientation
+        )
 
         self.ppms_0 = self.uc0.ppm_scale()
         self.ppms_1 = self.uc1.ppm_scale()
@@ -7614,10 +7867,11 @@ class ThreeDViewer(wx.Panel):
         self.new_x_ppms = self.ppms_0
         self.new_y_ppms = self.ppms_1
         self.X, self.Y = np.meshgrid(self.ppms_1, self.ppms_0)
+        plane = self.volume.plane(self.orientation, self.max_intensity_index)
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[self.max_intensity_index],
+            plane,
             self.cl,
             colors=self.cmap,
             linewidths=self.contour_linewidth,
@@ -7625,7 +7879,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[self.max_intensity_index],
+            plane,
             self.cl_neg,
             colors=self.cmap_neg,
             linewidths=self.contour_linewidth,
@@ -7637,27 +7891,27 @@ class ThreeDViewer(wx.Panel):
 
         (self.line1,) = self.axes1D.plot(
             self.ppms_0,
-            self.nmrdata.data[self.max_intensity_index][:, 1],
+            plane[:, 1],
             color=self.slice_colour,
         )
         self.line2 = self.ax.axhline(self.ppms_1[1], color="k")
         self.axes1D.set_ylim(
-            -np.max(self.nmrdata.data[self.max_intensity_index] / 10),
-            np.max(self.nmrdata.data[self.max_intensity_index]),
+            -np.max(plane / 10),
+            np.max(plane),
         )
         self.axes1D.set_yticks([])
         self.axes1D.set_xticks([])
         self.line1.set_visible(False)
         self.line2.set_visible(False)
         (self.line3,) = self.axes1D_2.plot(
-            self.nmrdata.data[self.max_intensity_index][1, :],
+            plane[1, :],
             self.ppms_1,
             color=self.slice_colour,
         )
         self.line4 = self.ax.axvline(self.ppms_0[1], color="k")
         self.axes1D_2.set_xlim(
-            -np.max(self.nmrdata.data[self.max_intensity_index] / 10),
-            np.max(self.nmrdata.data[self.max_intensity_index]),
+            -np.max(plane / 10),
+            np.max(plane),
         )
         self.axes1D_2.set_xticks([])
         self.axes1D_2.set_yticks([])
@@ -7675,19 +7929,7 @@ class ThreeDViewer(wx.Panel):
 
     def OnPlot3DButton(self, event):
         # Make a 3D plot window
-        self.threeD_warning = wx.MessageDialog(
-            self,
-            "3D plotting can take a while, do you want to continue?",
-            "Warning",
-            wx.YES_NO | wx.ICON_WARNING,
-        )
-        self.threeD_warning.ShowModal()
-        if self.threeD_warning.ShowModal() == wx.ID_YES:
-            self.plot3D_window = Plot3DFrame(parent=self, title="3D Plot")
-            self.threeD_warning.Destroy()
-        else:
-            self.threeD_warning.Destroy()
-            return
+        self.plot3D_window = Plot3DFrame(parent=self, title="3D Plot")
 
     def OnWaterfallButton(self, event):
         # See if the user has selected a slice
@@ -7731,6 +7973,7 @@ class ThreeDViewer(wx.Panel):
     def OnMoveX_3D(self, event):
         # update x-axis
         z_index = int(self.z_slider.GetValue())
+        plane = self.volume.plane(self.orientation, z_index)
         self.x_movement = float(self.move_x_slider.GetValue())
         self.move_val_x.SetLabel(str(round(self.x_movement, 4)))
         self.new_x_ppms = self.ppms_0 + np.ones(len(self.ppms_0)) * self.x_movement
@@ -7740,7 +7983,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[z_index],
+            plane,
             self.cl,
             colors=self.cmap,
             linewidths=self.contour_linewidth,
@@ -7748,7 +7991,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[z_index],
+            plane,
             self.cl_neg,
             colors=self.cmap_neg,
             linewidths=self.contour_linewidth,
@@ -7759,29 +8002,30 @@ class ThreeDViewer(wx.Panel):
         self.ax.set_ylim(ylim)
         if self.line1.get_visible() == True:
             self.line1.set_ydata(
-                self.nmrdata.data[z_index][:, self.uc1(str(self.y1) + "ppm")]
+                plane[:, ppm_index(self.uc1, self.y1)]
             )
             self.line1.set_xdata(self.new_x_ppms)
             self.line2 = self.ax.axhline(self.y1 + self.y_movement, color="k")
             self.axes1D.set_ylim(
-                -np.max(self.nmrdata.data[z_index] / 10),
-                np.max(self.nmrdata.data[z_index]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
         if self.line3.get_visible() == True:
             self.line3.set_xdata(
-                self.nmrdata.data[z_index][self.uc0(str(self.x1) + "ppm"), :]
+                plane[ppm_index(self.uc0, self.x1), :]
             )
             self.line3.set_ydata(self.new_y_ppms)
             self.line4 = self.ax.axvline(self.x1 + self.x_movement, color="k")
             self.axes1D_2.set_xlim(
-                -np.max(self.nmrdata.data[z_index] / 10),
-                np.max(self.nmrdata.data[z_index]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
         self.UpdateFrame()
 
     def OnMoveY_3D(self, event):
         # update y-axis
         z_index = int(self.z_slider.GetValue())
+        plane = self.volume.plane(self.orientation, z_index)
         self.y_movement = float(self.move_y_slider.GetValue())
         self.move_val_y.SetLabel(str(round(self.y_movement, 4)))
         self.new_y_ppms = self.ppms_1 + np.ones(len(self.ppms_1)) * self.y_movement
@@ -7791,7 +8035,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[z_index],
+            plane,
             self.cl,
             colors=self.cmap,
             linestyles="solid",
@@ -7800,7 +8044,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[z_index],
+            plane,
             self.cl_neg,
             colors=self.cmap_neg,
             linestyles="solid",
@@ -7812,23 +8056,23 @@ class ThreeDViewer(wx.Panel):
         self.ax.set_ylim(ylim)
         if self.line1.get_visible() == True:
             self.line1.set_ydata(
-                self.nmrdata.data[z_index][:, self.uc1(str(self.y1) + "ppm")]
+                plane[:, ppm_index(self.uc1, self.y1)]
             )
             self.line1.set_xdata(self.new_x_ppms)
             self.line2 = self.ax.axhline(self.y1, color="k")
             self.axes1D.set_ylim(
-                -np.max(self.nmrdata.data[z_index] / 10),
-                np.max(self.nmrdata.data[z_index]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
         if self.line3.get_visible() == True:
             self.line3.set_xdata(
-                self.nmrdata.data[z_index][self.uc0(str(self.x1) + "ppm"), :]
+                plane[ppm_index(self.uc0, self.x1), :]
             )
             self.line3.set_ydata(self.new_y_ppms)
             self.line4 = self.ax.axvline(self.x1 + self.x_movement, color="k")
             self.axes1D_2.set_xlim(
-                -np.max(self.nmrdata.data[z_index] / 10),
-                np.max(self.nmrdata.data[z_index]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
         self.UpdateFrame()
 
@@ -7854,9 +8098,10 @@ class ThreeDViewer(wx.Panel):
         # Plot horizontal/vertical slices of the data
         if event.key == "h":
             z_index = int(self.z_slider.GetValue())
+            plane = self.volume.plane(self.orientation, z_index)
             self.axes1D.set_ylim(
-                -np.max(self.nmrdata.data[z_index] / 8),
-                np.max(self.nmrdata.data[z_index]),
+                -np.max(plane / 8),
+                np.max(plane),
             )
             # plot a horizontal slice of the data
             if self.line1.get_visible() == True:
@@ -7871,8 +8116,8 @@ class ThreeDViewer(wx.Panel):
                 else:
                     (self.line1,) = self.axes1D.plot(
                         self.ppms_0,
-                        self.nmrdata.data[z_index][
-                            :, self.uc1(str(self.ppms_1[1]) + "ppm")
+                        plane[
+                            :, ppm_index(self.uc1, self.ppms_1[1])
                         ],
                         color=self.slice_colour,
                     )
@@ -7881,9 +8126,10 @@ class ThreeDViewer(wx.Panel):
 
         if event.key == "v":
             z_index = int(self.z_slider.GetValue())
+            plane = self.volume.plane(self.orientation, z_index)
             self.axes1D_2.set_xlim(
-                -np.max(self.nmrdata.data[z_index] / 8),
-                np.max(self.nmrdata.data[z_index]),
+                -np.max(plane / 8),
+                np.max(plane),
             )
             if self.line3.get_visible() == True:
                 self.line3.set_visible(False)
@@ -7898,8 +8144,8 @@ class ThreeDViewer(wx.Panel):
                     self.line3.set_visible = True
                     self.line4.set_visible = True
                     (self.line3,) = self.axes1D_2.plot(
-                        self.nmrdata.data[z_index][
-                            self.uc0(str(self.ppms_0[1]) + "ppm"), :
+                        plane[
+                            ppm_index(self.uc0, self.ppms_0[1]), :
                         ],
                         self.ppms_1,
                         color=self.slice_colour,
@@ -7910,12 +8156,13 @@ class ThreeDViewer(wx.Panel):
     def on_click_3d(self, event):
         # Get the x and y values of the click and plot the horizontal/vertical slices at that point
         z_index = int(self.z_slider.GetValue())
+        plane = self.volume.plane(self.orientation, z_index)
         self.x1, self.y1 = self.ax.transData.inverted().transform((event.x, event.y))
         if self.x1 != None and self.y1 != None:
             if self.line1.get_visible() == True:
                 self.line1.set_ydata(
-                    self.nmrdata.data[z_index][
-                        :, self.uc1(str(self.y1 - self.y_movement) + "ppm")
+                    plane[
+                        :, ppm_index(self.uc1, self.y1 - self.y_movement)
                     ]
                 )
                 self.line2.set_ydata([self.y1])
@@ -7923,13 +8170,18 @@ class ThreeDViewer(wx.Panel):
                 self.OnSliderScroll3D(None)
             if self.line3.get_visible() == True:
                 self.line3.set_xdata(
-                    self.nmrdata.data[z_index][
-                        self.uc0(str(self.x1 - self.x_movement) + "ppm"), :
+                    plane[
+                        ppm_index(self.uc0, self.x1 - self.x_movement), :
                     ]
                 )
                 self.line4.set_xdata([self.x1])
                 self.line3.set_ydata(self.new_y_ppms)
                 self.OnSliderScroll3D(None)
+            # Update the waterfall plot (if open) to the newly selected slice
+            try:
+                self.waterfall_window.update_waterfall()
+            except:
+                pass
 
     def OnSliderScroll3D(self, event):
         # Get all the slider values for P0 and P1 (coarse and fine), put the combined coarse and fine values on the screen
@@ -7941,15 +8193,16 @@ class ThreeDViewer(wx.Panel):
 
     def phase3D(self):
         z_index = int(self.z_slider.GetValue())
+        plane = self.volume.plane(self.orientation, z_index)
         if self.line1.get_visible() == True:
-            data = self.nmrdata.data[z_index][:, self.uc1(str(self.y1) + "ppm")]
+            data = plane[:, ppm_index(self.uc1, self.y1)]
             complex_data = ng.process.proc_base.ht(data, self.nmrdata.data.shape[1])
             self.phased_data = ng.process.proc_base.ps(
                 complex_data, p0=self.total_P0, p1=self.total_P1
             )
             self.line1.set_ydata(self.phased_data)
         if self.line3.get_visible() == True:
-            data = self.nmrdata.data[z_index][self.uc0(str(self.x1) + "ppm"), :]
+            data = plane[ppm_index(self.uc0, self.x1), :]
             complex_data = ng.process.proc_base.ht(data, self.nmrdata.data.shape[2])
             self.phased_data2 = ng.process.proc_base.ps(
                 complex_data, p0=self.total_P0, p1=self.total_P1
@@ -7960,10 +8213,11 @@ class ThreeDViewer(wx.Panel):
     def OnMinContour3D(self, event):
         # Get the new contour limits and redraw the plot
         z_index = int(self.z_slider.GetValue())
+        plane = self.volume.plane(self.orientation, z_index)
         contour_val = 10 ** float(self.contour_slider.GetValue())
         self.contour_val.SetLabel(str(int(contour_val)))
         self.contour_start = (
-            np.max(np.abs(self.nmrdata.data[int(z_index)])) / contour_val
+            np.max(np.abs(plane)) / contour_val
         )
         self.cl = self.contour_start * self.contour_factor ** np.arange(
             self.contour_num
@@ -7978,7 +8232,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[int(z_index)],
+            plane,
             self.cl,
             colors=self.cmap,
             linewidths=self.contour_linewidth,
@@ -7987,7 +8241,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[int(z_index)],
+            plane,
             self.cl_neg,
             colors=self.cmap_neg,
             linewidths=self.contour_linewidth,
@@ -7995,21 +8249,21 @@ class ThreeDViewer(wx.Panel):
         )
         if self.line1.get_visible() == True:
             self.line1.set_ydata(
-                self.nmrdata.data[int(z_index)][:, self.uc1(str(self.y1) + "ppm")]
+                plane[:, ppm_index(self.uc1, self.y1)]
             )
             self.line2 = self.ax.axhline(self.y1 + self.y_movement, color="k")
             self.axes1D.set_ylim(
-                -np.max(self.nmrdata.data[int(z_index)] / 10),
-                np.max(self.nmrdata.data[int(z_index)]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
         if self.line3.get_visible() == True:
             self.line3.set_xdata(
-                self.nmrdata.data[int(z_index)][self.uc0(str(self.x1) + "ppm"), :]
+                plane[ppm_index(self.uc0, self.x1), :]
             )
             self.line4 = self.ax.axvline(self.x1 + self.x_movement, color="k")
             self.axes1D_2.set_xlim(
-                -np.max(self.nmrdata.data[int(z_index)] / 10),
-                np.max(self.nmrdata.data[int(z_index)]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
         self.ax.set_xlim(xlim)
         self.ax.set_ylim(ylim)
@@ -8020,6 +8274,7 @@ class ThreeDViewer(wx.Panel):
     def OnZScroll3D(self, event):
         # Get the new z value and redraw the plot
         z_index = int(self.z_slider.GetValue())
+        plane = self.volume.plane(self.orientation, z_index)
         self.z_val.SetLabel(
             "Index: "
             + str(z_index)
@@ -8036,7 +8291,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[int(z_index)],
+            plane,
             self.cl,
             colors=self.cmap,
             linewidths=self.contour_linewidth,
@@ -8045,7 +8300,7 @@ class ThreeDViewer(wx.Panel):
         self.ax.contour(
             self.Y,
             self.X,
-            self.nmrdata.data[int(z_index)],
+            plane,
             self.cl_neg,
             colors=self.cmap_neg,
             linewidths=self.contour_linewidth,
@@ -8053,53 +8308,160 @@ class ThreeDViewer(wx.Panel):
         )
         if self.line1.get_visible() == True:
             self.line1.set_ydata(
-                self.nmrdata.data[int(z_index)][:, self.uc1(str(self.y1) + "ppm")]
+                plane[:, ppm_index(self.uc1, self.y1)]
             )
             self.line1.set_xdata(self.new_x_ppms)
             self.line2 = self.ax.axhline(self.y1 + self.y_movement, color="k")
             self.axes1D.set_ylim(
-                -np.max(self.nmrdata.data[int(z_index)] / 10),
-                np.max(self.nmrdata.data[int(z_index)]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
         if self.line3.get_visible() == True:
             self.line3.set_xdata(
-                self.nmrdata.data[int(z_index)][self.uc0(str(self.x1) + "ppm"), :]
+                plane[ppm_index(self.uc0, self.x1), :]
             )
             self.line3.set_ydata(self.new_y_ppms)
             self.line4 = self.ax.axvline(self.x1 + self.x_movement, color="k")
             self.axes1D_2.set_xlim(
-                -np.max(self.nmrdata.data[int(z_index)] / 10),
-                np.max(self.nmrdata.data[int(z_index)]),
+                -np.max(plane / 10),
+                np.max(plane),
             )
 
-        # self.axes1D.set_ylim(-np.max(self.nmrdata.data[int(z_index)]/10), np.max(self.nmrdata.data[int(z_index)]))
-        # self.axes1D_2.set_xlim(-np.max(self.nmrdata.data[int(z_index)]/10), np.max(self.nmrdata.data[int(z_index)]))
+        # self.axes1D.set_ylim(-np.max(plane/10), np.max(plane))
+        # self.axes1D_2.set_xlim(-np.max(plane/10), np.max(plane))
         self.axes1D.set_ylim(ylim_1)
         self.axes1D_2.set_xlim(xlim_2)
         self.ax.set_xlim(xlim)
         self.ax.set_ylim(ylim)
         self.ax.set_xlabel(xlabel)
         self.ax.set_ylabel(ylabel)
+        self.draw_picked_peaks_3D()
         self.OnSliderScroll3D(event)
 
     def OnIntensityScroll3D(self, event):
         # Get the new y axis limits of the 1D slice and redraw the plot
         intensity_percent = 10 ** float(self.intensity_slider.GetValue())
         z_index = int(self.z_slider.GetValue())
+        plane = self.volume.plane(self.orientation, z_index)
         if self.line1.get_visible() == True:
             self.axes1D.set_ylim(
-                -(np.max(self.nmrdata.data[z_index]) / 8) / (intensity_percent / 100),
-                np.max(self.nmrdata.data[z_index]) / (intensity_percent / 100),
+                -(np.max(plane) / 8) / (intensity_percent / 100),
+                np.max(plane) / (intensity_percent / 100),
             )
             self.UpdateFrame()
         if self.line3.get_visible() == True:
             self.axes1D_2.set_xlim(
-                -(np.max(self.nmrdata.data[z_index]) / 8) / (intensity_percent / 100),
-                np.max(self.nmrdata.data[z_index]) / (intensity_percent / 100),
+                -(np.max(plane) / 8) / (intensity_percent / 100),
+                np.max(plane) / (intensity_percent / 100),
             )
             self.UpdateFrame()
 
 
+class PeakPicker:
+    def __init__(self, parent, data, labels):
+        """
+        This class asks for a threshold (as a multiple of the estimated
+        noise level), picks the peaks of 1D/2D/3D data and offers to save
+        them as a peak list.
+        """
+        self.parent = parent
+        self.data = data
+        self.labels = labels
+        self.positions = np.zeros((0, data.ndim))
+        self.heights = np.zeros(0)
+
+    def pick(self) -> bool:
+        dlg = wx.TextEntryDialog(
+            self.parent,
+            "Pick peaks above this multiple of the noise level:",
+            "Pick Peaks",
+            "5",
+        )
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy()
+            return False
+        try:
+            factor = float(dlg.GetValue())
+        except:
+            factor = 5
+        dlg.Destroy()
+
+        self.noise = estimate_noise(self.data)
+        self.positions, self.heights = pick_peaks(self.data, factor * self.noise)
+        return True
+
+    def save(self, ppms) -> None:
+        # ppms holds the ppm position of every picked peak (peaks x dimensions)
+        message = "Found " + str(len(self.heights)) + " peaks. Save them as a peak list?"
+        dlg = wx.MessageDialog(
+            self.parent, message, "Pick Peaks", wx.YES_NO | wx.ICON_QUESTION
+        )
+        answer = dlg.ShowModal()
+        dlg.Destroy()
+        if answer != wx.ID_YES:
+            return
+        dlg = wx.FileDialog(
+            self.parent,
+            "Save peak list",
+            wildcard="*.list",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        )
+        dlg.SetDirectory(os.getcwd())
+        if dlg.ShowModal() == wx.ID_OK:
+            write_peak_list(dlg.GetPath(), ppms, self.heights, self.labels)
+        dlg.Destroy()
+
+    def fit(self, axes) -> None:
+        """
+        Offer to fit the lineshapes of the picked 1D/2D peaks (overlapping
+        peaks are fitted together) and save their heights and volumes.
+        axes holds the ppm scale of each dimension.
+        """
+        if len(self.heights) == 0 or self.data.ndim > 2:
+            return
+        dlg = wx.SingleChoiceDialog(
+            self.parent,
+            "Fit the lineshapes of the picked peaks using:",
+            "Fit Peaks",
+            lineshapes,
+        )
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy()
+            return
+        lineshape = lineshapes[dlg.GetSelection()]
+        dlg.Destroy()
+        wx.BeginBusyCursor()
+        try:
+            self.fitted = fit_peaks(
+                self.data,
+                self.positions,
+                lineshape=lineshape,
+                workers=os.cpu_count() or 1,
+            )
+        except:
+            wx.EndBusyCursor()
+            dlg = wx.MessageDialog(
+                self.parent,
+                "Unable to fit the picked peaks",
+                "Error",
+                wx.OK | wx.ICON_ERROR,
+            )
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+        wx.EndBusyCursor()
+        dlg = wx.FileDialog(
+            self.parent,
+            "Save fitted peaks",
+            wildcard="*.txt",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        )
+        dlg.SetDirectory(os.getcwd())
+        if dlg.ShowModal() == wx.ID_OK:
+            write_fit_table(dlg.GetPath(), self.fitted, axes, self.labels)
+        dlg.Destroy()
+
+
 # A class which will overlay pseudo2D stacks on a OneDPlot
 class StackOverlay:
     def __init__(self, parent, nmrdata, axis):
@@ -9315,23 +9677,28 @@ class Projection3DNotebook(wx.Notebook):
             size=(self.width, self.height),
         )
 
-        if self.parent.parent.parent.path != "":
-            os.chdir(self.parent.parent.parent.path)
-        # Search for the projections in the current directory (.dat files)
-        self.projection_files = []
-        for file in os.listdir():
-            if file.endswith(".dat"):
-                self.projection_files.append(file)
-        for file in self.projection_files:
-            if "prof" in file:
-                self.projection_files.remove(file)
-
-        self.nmrdata = []
-        for file in self.projection_files:
-            self.nmrdata.append(ReadProjection(file))
-
-        if self.parent.parent.parent.cwd != "":
-            os.chdir(self.parent.parent.parent.cwd)
+        cwd = os.getcwd()
+        try:
+            if self.parent.parent.parent.path != "":
+                os.chdir(self.parent.parent.parent.path)
+            # Search for the projections in the current directory (.dat files)
+            self.projection_files = []
+            for file in os.listdir():
+                if file.endswith(".dat"):
+                    self.projection_files.append(file)
+            for file in self.projection_files:
+                if "prof" in file:
+                    self.projection_files.remove(file)
+
+            # If nmrPipe has not made the projections, calculate them from the 3D data
+            if len(self.projection_files) < 3:
+                self.nmrdata = self.calculated_projections()
+            else:
+                self.nmrdata = []
+                for file in self.projection_files:
+                    self.nmrdata.append(ReadProjection(file))
+        finally:
+            os.chdir(cwd)
 
         self.projection_selection_index = 0
         self.projection_selection_index_old = 0
@@ -9353,22 +9720,78 @@ class Projection3DNotebook(wx.Notebook):
             self, self.nmrdata[2], threeDprojection=True
         )
 
-        self.AddPage(self.projection_panel1, self.nmrdata[0].filename.split(".dat")[0])
-        self.AddPage(self.projection_panel2, self.nmrdata[1].filename.split(".dat")[0])
-        self.AddPage(self.projection_panel3, self.nmrdata[2].filename.split(".dat")[0])
+        self.AddPage(
+            self.projection_panel1,
+            os.path.basename(self.nmrdata[0].filename).split(".dat")[0],
+        )
+        self.AddPage(
+            self.projection_panel2,
+            os.path.basename(self.nmrdata[1].filename).split(".dat")[0],
+        )
+        self.AddPage(
+            self.projection_panel3,
+            os.path.basename(self.nmrdata[2].filename).split(".dat")[0],
+        )
 
         self.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self.OnPageChanged)
 
+    def calculated_projections(self) -> list:
+        """
+        Skyline or sum projections (chosen by the user) calculated from the
+        3D data. They are saved next to the spectrum, but if they cannot be
+        saved (e.g. a read-only directory) they are only kept in memory.
+        """
+        projections = self.parent.parent.get_projections()
+        kind = "skyline"
+        dlg = wx.SingleChoiceDialog(
+            self.parent,
+            "Show the projections of the 3D spectrum as:",
+            "Projections",
+            ["Skyline", "Sum"],
+        )
+        if dlg.ShowModal() == wx.ID_OK:
+            kind = projections.kinds[dlg.GetSelection()]
+        dlg.Destroy()
+
+        wx.BeginBusyCursor()
+        try:
+            if projections.is_cached() == False:
+                projections.calculate(workers=os.cpu_count() or 1)
+                try:
+                    projections.write()
+                except OSError as error:
+                    print(
+                        "Unable to save the projections ({}), they are only kept in memory.".format(
+                            error
+                        )
+                    )
+        finally:
+            wx.EndBusyCursor()
+
+        self.projection_files = [
+            projections.projection_file(axis, kind) for axis in range(3)
+        ]
+        if projections.projections == {}:
+            return [ReadProjection(file) for file in self.projection_files]
+        return [
+            ReadProjection(file, *projections.projection(axis, kind))
+            for axis, file in enumerate(self.projection_files)
+        ]
+
     def OnPageChanged(self, event):
         self.projection_selection_index = self.GetSelection()
 
 
 class ReadProjection:
-    def __init__(self, filename):
+    def __init__(self, filename, dic=None, data=None):
         self.filename = filename
         self.file = filename
 
-        self.read_data()
+        # A projection calculated in memory is used directly, otherwise it is read from the file
+        if data is None:
+            self.read_data()
+        else:
+            self.dic, self.data = dic, data
         self.dim = self.get_dimensions()
         self.get_axislabels()
 
@@ -9387,7 +9810,7 @@ class ReadProjection:
 
     def get_axislabels(self):
         self.axislabels = []
-        file_split = self.filename.split(".dat")[0].split(".")
+        file_split = os.path.basename(self.filename).split(".dat")[0].split(".")
         for i in range(len(file_split)):
             self.axislabels.append(file_split[i])
 
@@ -9645,6 +10068,17 @@ class WaterfallFrame(wx.Frame):
         self.y_range_slider.Bind(wx.EVT_SLIDER, self.OnYRangeSlider)
         self.y_range_sizer.Add(self.y_range_slider)
         self.sizer.Add(self.y_range_sizer)
+
+        # Have a slider for the vertical offset between planes (% of the maximum intensity)
+        self.offset_label = wx.StaticBox(self, -1, "Offset between planes (%)")
+        self.offset_sizer = wx.StaticBoxSizer(self.offset_label, wx.VERTICAL)
+        self.offset_slider = FloatSlider(
+            self, id=-1, value=10, minval=0, maxval=100, res=1, style=wx.SL_HORIZONTAL
+        )
+        self.offset_slider.Bind(wx.EVT_SLIDER, self.OnOffsetSlider)
+        self.offset_sizer.Add(self.offset_slider)
+        self.sizer.AddSpacer(10)
+        self.sizer.Add(self.offset_sizer)
         self.main_waterfall_sizer.Add(self.sizer)
         # # Make a slider to change the contour levels
         # self.contour_label = wx.StaticBox(self, -1, "Contour levels")
@@ -9658,42 +10092,51 @@ class WaterfallFrame(wx.Frame):
     def plot_waterfall(self):
         self.ax = self.fig_waterfall.add_subplot(111)
 
+        # All the planes along the pseudo3D are drawn as a single line collection
+        self.waterfall = WaterfallPlot(self.ax)
+        self.gather_traces()
+        self.waterfall.plot(self.ppms, self.traces)
+        self.waterfall.set_offset(self.get_offset())
+        self.ax.set_ylim(self.waterfall.y_limits(self.get_zoom()))
+        self.fig_waterfall.colorbar(self.waterfall.lines, ax=self.ax, label="Plane")
+        self.ax.set_xlabel("ppm")
+        self.ax.set_ylabel("Intensity")
+
+        self.UpdateWaterfallFrame()
+
+    def gather_traces(self):
         # Get all the slices along the pseudo3D for the currently selected slice
         if self.visible == "line1":
-            vals = []
-            for i in range(len(self.main_frame.nmrdata.data)):
-                vals.append(
-                    self.main_frame.nmrdata.data[i][
-                        :, self.main_frame.uc1(str(self.main_frame.y1) + "ppm")
-                    ]
-                )
-            for i in range(len(vals)):
-                self.ax.plot(
-                    self.main_frame.line1.get_xdata(), vals[i], label=str(i + 1)
-                )
-            self.ax.set_xlabel("ppm")
-            self.ax.set_ylabel("Intensity")
-            self.ax.legend()
-        elif self.visible == "line3":
-            vals = []
-            for i in range(len(self.main_frame.nmrdata.data)):
-                vals.append(
-                    self.main_frame.nmrdata.data[i][
-                        self.main_frame.uc0(str(self.main_frame.x1) + "ppm"), :
-                    ]
-                )
-            for i in range(len(vals)):
-                self.ax.plot(
-                    self.main_frame.line3.get_ydata(), vals[i], label=str(i + 1)
-                )
-            self.ax.set_xlabel("ppm")
-            self.ax.set_ylabel("Intensity")
-            self.ax.legend()
-
+            index = ppm_index(self.main_frame.uc1, self.main_frame.y1)
+            self.traces = WaterfallPlot.gather(self.main_frame.nmrdata.data, index, 2)
+            self.ppms = self.main_frame.line1.get_xdata()
+        else:
+            index = ppm_index(self.main_frame.uc0, self.main_frame.x1)
+            self.traces = WaterfallPlot.gather(self.main_frame.nmrdata.data, index, 1)
+            self.ppms = self.main_frame.line3.get_ydata()
+
+    def update_waterfall(self):
+        # Called when the selected slice is moved in the main frame, only the line data is replaced
+        self.gather_traces()
+        self.waterfall.set_offset(self.get_offset())
+        self.waterfall.plot(self.ppms, self.traces)
+        self.ax.set_ylim(self.waterfall.y_limits(self.get_zoom()))
         self.UpdateWaterfallFrame()
 
+    def get_offset(self):
+        return np.max(np.abs(self.traces)) * float(self.offset_slider.GetValue()) / 100
+
+    def get_zoom(self):
+        return 10 ** float(self.y_range_slider.GetValue()) / 10
+
     def OnYRangeSlider(self, event):
-        pass
+        self.ax.set_ylim(self.waterfall.y_limits(self.get_zoom()))
+        self.UpdateWaterfallFrame()
+
+    def OnOffsetSlider(self, event):
+        self.waterfall.set_offset(self.get_offset())
+        self.ax.set_ylim(self.waterfall.y_limits(self.get_zoom()))
+        self.UpdateWaterfallFrame()
 
     def UpdateWaterfallFrame(self):
         self.canvas_waterfall.draw()
@@ -9798,32 +10241,18 @@ class Plot3DFrame(wx.Frame):
 
         self.ax = self.fig_3d.add_subplot(111, projection="3d")
 
-        contour_start = (
-            np.max(self.main_frame.nmrdata.data) / 10
-        )  # contour level start value
-        self.contour_num = 20  # number of contour levels
-        self.contour_factor = 1.2  # scaling factor between contour levels
-        # calculate contour levels
-        self.cl = contour_start * self.contour_factor ** np.arange(self.contour_num)
-        self.cl_neg = -contour_start * self.contour_factor ** np.flip(
-            np.arange(self.contour_num)
+        # Reduced copy of the cube in the current orientation, points above each set of levels are cached
+        self.overview = Overview3D(
+            self.main_frame.nmrdata.data,
+            self.main_frame.ppms_2,
+            self.main_frame.ppms_0,
+            self.main_frame.ppms_1,
         )
+        self.points = None
 
-        for i in range(self.main_frame.nmrdata.data.shape[0]):
-            x = self.main_frame.ppms_1
-            y = self.main_frame.ppms_0
-            z = self.main_frame.nmrdata.data[i]
-            x, y = np.meshgrid(x, y)
-            self.ax.contour(
-                x,
-                y,
-                z,
-                zdir="z",
-                offset=self.main_frame.ppms_2[i],
-                levels=self.cl,
-                colors="tab:orange",
-                linewidths=0.5,
-            )
+        self.contour_num = 20  # number of contour levels
+        self.contour_factor = 1.2  # scaling factor between contour levels
+        self.draw_points(10)
 
         self.ax.set_zlim3d(
             np.min(self.main_frame.ppms_2), np.max(self.main_frame.ppms_2)
@@ -9849,53 +10278,36 @@ class Plot3DFrame(wx.Frame):
         # Remove grid lines
         self.ax.grid(False)
 
-    def OnContourSlider(self, event):
-        contour_val = 10 ** float(self.contour_slider.GetValue())
+    def draw_points(self, contour_val) -> None:
+        # Draw every voxel above the lowest contour level as a single scatter collection
         contour_start = (
-            np.max(self.main_frame.nmrdata.data) / contour_val
+            self.overview.maximum() / contour_val
         )  # contour level start value
-        self.contour_num = 20  # number of contour levels
-        self.contour_factor = 1.2  # scaling factor between contour levels
         # calculate contour levels
         self.cl = contour_start * self.contour_factor ** np.arange(self.contour_num)
         self.cl_neg = -contour_start * self.contour_factor ** np.flip(
             np.arange(self.contour_num)
         )
 
-        xlim = self.ax.get_xlim3d()
-        ylim = self.ax.get_ylim3d()
-        zlim = self.ax.get_zlim3d()
-        xlabel = self.ax.get_xlabel()
-        ylabel = self.ax.get_ylabel()
-        zlabel = self.ax.get_zlabel()
-        view = self.ax.azim
-
-        self.ax.clear()
-
-        for i in range(self.main_frame.nmrdata.data.shape[0]):
-            x = self.main_frame.ppms_1
-            y = self.main_frame.ppms_0
-            z = self.main_frame.nmrdata.data[i]
-            x, y = np.meshgrid(x, y)
-            self.ax.contour(
-                x,
-                y,
-                z,
-                zdir="z",
-                offset=self.main_frame.ppms_2[i],
-                levels=self.cl,
-                colors="red",
-                linewidths=0.5,
-            )
-
-        self.ax.set_zlim3d(zlim[0], zlim[1])
-        self.ax.set_xlim3d(xlim[0], xlim[1])
-        self.ax.set_ylim3d(ylim[0], ylim[1])
-        self.ax.set_xlabel(xlabel)
-        self.ax.set_ylabel(ylabel)
-        self.ax.set_zlabel(zlabel)
-        self.ax.view_init(azim=view)
+        x, y, z, level_index = self.overview.points(self.cl)
+        if self.points is not None:
+            self.points.remove()
+        self.points = self.ax.scatter(
+            x,
+            y,
+            z,
+            c=level_index,
+            cmap="autumn_r",
+            vmin=0,
+            vmax=self.contour_num - 1,
+            s=1,
+            depthshade=False,
+        )
 
+    def OnContourSlider(self, event):
+        contour_val = 10 ** float(self.contour_slider.GetValue())
+        # Only the point collection is replaced so the limits, labels and view are kept
+        self.draw_points(contour_val)
         self.Update3DFrame()
 
 
@@ -9913,9 +10325,15 @@ class Stack2D(wx.Frame):
         else:
             projection_files = self.main_frame.parent.projection_files
             # Get current projection file
-            file = projection_files[self.main_frame.parent.projection_selection_index]
+            index = self.main_frame.parent.projection_selection_index
+            file = projection_files[index]
 
-            nmr_data_0 = ReadProjection(filename=file)
+            if os.path.exists(file) == True:
+                nmr_data_0 = ReadProjection(filename=file)
+            else:
+                # The projection could not be saved, so use the one in memory
+                projection = self.main_frame.parent.nmrdata[index]
+                nmr_data_0 = ReadProjection(file, projection.dic, projection.data)
         self.nmr_data_old = nmr_data_0.data
         nmr_data_0.dim = 1
 
@@ -10268,6 +10686,14 @@ class SpinBore(wx.Frame):
             self.bore_stripswap_button, 0, wx.ALIGN_CENTER_VERTICAL
         )
 
+        # Button to open a panel of strips at the positions in a peak list
+        self.bore_strip_panel_button = wx.Button(self, -1, "Strip Panel")
+        self.bore_strip_panel_button.Bind(wx.EVT_BUTTON, self.OnStripPanelButton)
+        self.bore_sizer_strip.AddSpacer(10)
+        self.bore_sizer_strip.Add(
+            self.bore_strip_panel_button, 0, wx.ALIGN_CENTER_VERTICAL
+        )
+
         self.bore_sizer.Add(self.bore_sizer_2D)
         self.bore_sizer.AddSpacer(10)
         self.bore_sizer.Add(self.bore_sizer_1D)
@@ -10281,8 +10707,82 @@ class SpinBore(wx.Frame):
     def OnStripSwapButtonBore(self, event):
         pass
 
+    def OnStripPanelButton(self, event):
+        self.strip_panel = StripPanel(title="Strip Panel", parent=self)
+
     def OnStripWidthEnter(self, event):
-        pass
+        # Change the width of the strip plot and redraw the current strip
+        try:
+            self.strip_width = float(self.bore_strip_width_text.GetValue())
+        except:
+            self.bore_strip_width_text.SetValue(str(self.strip_width))
+            return
+        self.strip_key = None
+        self.draw_strip(self.strip_row, self.strip_centre, self.ax_bore_3.get_xlabel())
+        self.UpdateBoreFrame()
+
+    def get_strip_cache(self):
+        # Bores/strips are sliced straight out of the 3D data in the main frame, rebuild the cache if that data has changed (e.g. after reorientation)
+        if (
+            self.strip_cache is None
+            or self.strip_cache.data is not self.main_frame.nmrdata.data
+        ):
+            self.strip_cache = StripCache(self.main_frame.nmrdata.data)
+            self.strip_key = None
+        return self.strip_cache
+
+    def draw_strip(self, row, centre, xlabel):
+        # Only recontour the strip plot if a different strip has been selected, otherwise just move the position line
+        col_start, col_end = StripCache.strip_window(
+            self.main_frame.ppms_1, centre, self.strip_width
+        )
+        strip_cache = self.get_strip_cache()
+        self.strip_row, self.strip_centre = row, centre
+        if self.strip_key == (row, col_start, col_end, xlabel):
+            self.line3.set_xdata([centre])
+            return
+        self.strip_key = (row, col_start, col_end, xlabel)
+
+        self.bore_data_strip1 = strip_cache.strip(row, col_start, col_end)
+
+        # Get the ppm values for the strip plot
+        self.ppms_2 = self.main_frame.ppms_2
+        self.Xstrip, self.Ystrip = np.meshgrid(
+            self.main_frame.ppms_1[col_start:col_end], self.ppms_2
+        )
+
+        title = self.ax_bore_3.get_title()
+        ylim3 = self.ax_bore_3.get_ylim()
+        self.ax_bore_3.clear()
+        self.contour_strip()
+        self.ax_bore_3.set_xlabel(xlabel)
+        self.ax_bore_3.set_xlim(
+            self.main_frame.ppms_1[col_start], self.main_frame.ppms_1[col_end - 1]
+        )
+        self.ax_bore_3.set_ylim(ylim3)
+        self.ax_bore_3.set_title(title)
+
+    def contour_strip(self):
+        # Contour the current strip using the strip contour levels
+        self.contour1_strip = self.ax_bore_3.contour(
+            self.Xstrip,
+            self.Ystrip,
+            self.bore_data_strip1,
+            self.cl_strip,
+            colors=self.cmap,
+            linewidths=0.5,
+        )
+        self.contour1_neg_strip = self.ax_bore_3.contour(
+            self.Xstrip,
+            self.Ystrip,
+            self.bore_data_strip1,
+            self.cl_neg_strip,
+            colors=self.cmap_neg,
+            linewidths=0.5,
+        )
+        self.line3 = self.ax_bore_3.axvline(
+            x=self.strip_centre, color="black", linewidth=0.5
+        )
 
     def plot_bore_data(self):
         # Make a figure containing 2 plots, one large 2D contour plot and a vertical smaller plot showing the bore down a selected 2D coordinate
@@ -10333,14 +10833,12 @@ class SpinBore(wx.Frame):
 
         self.bore_initial = self.ppms_0[0], self.ppms_1[0]
         bore_initial_index = 0, 0
-        # For each value in the bore data, find the intensity of the bore position
-        self.bore_data = []
-        for i in range(len(self.main_frame.ppms_2)):
-            self.bore_data.append(
-                self.main_frame.nmrdata.data[i][bore_initial_index[1]][
-                    bore_initial_index[0]
-                ]
-            )
+        # Find the intensity of the bore position in every z plane
+        self.strip_cache = None
+        self.strip_key = None
+        self.bore_data = self.get_strip_cache().bore(
+            bore_initial_index[1], bore_initial_index[0]
+        )
 
         # Plot the bore data
         self.ax_bore_2.plot(
@@ -10386,54 +10884,18 @@ class SpinBore(wx.Frame):
             np.arange(self.contour_num_strip)
         )
 
-        # # Get the bore data for the strip plot
-        # self.bore_data_strip = []
-        # # Get the x axis ppm values for the strip plot (bore_initial[0]+/-strip_width)
-        # self.bore_initial0_indexes = np.where(np.abs(self.ppms_0 - self.bore_initial[0]) < self.strip_width)
-        # self.bore_initial1_indexes = np.where(np.abs(self.ppms_1 - self.bore_initial[1]) < self.strip_width)
-
-        self.bore_data_strip1 = []
-        self.bore_data_strip2 = []
-        for i in range(len(self.main_frame.ppms_2)):
-            # Get the contour data for the strip plot
-            self.bore_data_strip1.append(
-                self.main_frame.nmrdata.data[i][bore_initial_index[1]]
-            )
-            # self.bore_data_strip2.append(self.main_frame.nmrdata.data[i][bore_initial_index[1]][self.bore_initial1_indexes[0][0]:self.bore_initial1_indexes[0][-1]])
-
-        self.bore_data_strip1 = np.array(self.bore_data_strip1)
+        self.ax_bore_3.set_ylim(
+            max(self.main_frame.ppms_2), min(self.main_frame.ppms_2)
+        )
+        self.draw_strip(
+            bore_initial_index[1],
+            self.main_frame.ppms_1[bore_initial_index[0]],
+            self.nmrdata.axislabels[1],
+        )
 
-        # Get the ppm values for the strip plot
-        self.ppms_2 = self.main_frame.ppms_2
+        self.ax_bore_3.set_title("Strip Plot")
 
-        self.Xstrip, self.Ystrip = np.meshgrid(self.ppms_0, self.ppms_2)
-
-        self.ax_bore_3.contour(
-            self.Xstrip,
-            self.Ystrip,
-            self.bore_data_strip1,
-            self.cl_strip,
-            colors=self.cmap,
-            linewidths=0.5,
-        )
-        self.ax_bore_3.contour(
-            self.Xstrip,
-            self.Ystrip,
-            self.bore_data_strip1,
-            self.cl_neg_strip,
-            colors=self.cmap_neg,
-            linewidths=0.5,
-        )
-        self.line3 = self.ax_bore_3.axvline(
-            x=self.bore_initial[0], color="black", linewidth=0.5
-        )
-        self.ax_bore_3.set_xlabel(self.nmrdata.axislabels[1])
-        self.ax_bore_3.set_xlim(max(self.ppms_0), min(self.ppms_0))
-        self.ax_bore_3.set_ylim(max(self.ppms_2), min(self.ppms_2))
-
-        self.ax_bore_3.set_title("Strip Plot")
-
-        self.UpdateBoreFrame()
+        self.UpdateBoreFrame()
 
     def OnIntensitySlider(self, event):
         # Function to change the y axis limits
@@ -10456,160 +10918,45 @@ class SpinBore(wx.Frame):
             self.cross.set_ydata([event.ydata])
 
             # Change the bore slice shown on the plot on the right
+            self.bore_initial = event.xdata, event.ydata
             if len(self.new_x_ppms) != len(self.main_frame.ppms_0):
-                self.bore_initial = event.xdata, event.ydata
                 self.bore_initial_index = np.argmin(
                     np.abs(self.main_frame.ppms_1 - self.bore_initial[0])
                 ), np.argmin(np.abs(self.main_frame.ppms_0 - self.bore_initial[1]))
-                self.bore_data = []
-                for i in range(len(self.main_frame.ppms_2)):
-                    self.bore_data.append(
-                        self.main_frame.nmrdata.data[i][self.bore_initial_index[1]][
-                            self.bore_initial_index[0]
-                        ]
-                    )
-                self.bore_data = np.array(self.bore_data)
-                ylabel = self.ax_bore_2.get_ylabel()
-                self.ax_bore_2.clear()
-                self.ax_bore_2.set_title(title)
-                self.ax_bore_2.plot(
-                    self.bore_data, self.main_frame.ppms_2, color="red", linewidth=0.5
-                )
-                self.ax_bore_2.set_ylim(
-                    max(self.main_frame.ppms_2), min(self.main_frame.ppms_2)
-                )
-                self.ax_bore_2.set_xlim(
-                    -(np.max(self.nmrdata.data) / 8) / (intensity_percent / 100),
-                    np.max(self.nmrdata.data) / (intensity_percent / 100),
-                )
-                self.ax_bore_2.set_ylabel(ylabel)
-
-                self.line1 = self.ax_bore_2.axhline(
-                    y=event.xdata, color="black", linewidth=0.5
-                )
-                self.line2 = self.ax_bore_2.axhline(
-                    y=event.ydata, color="black", linewidth=0.5
-                )
-
-                self.bore_data_strip1 = []
-                for i in range(len(self.main_frame.ppms_2)):
-                    # Get the contour data for the strip plot
-                    self.bore_data_strip1.append(
-                        self.main_frame.nmrdata.data[i][self.bore_initial_index[1]]
-                    )
-
-                self.bore_data_strip1 = np.array(self.bore_data_strip1)
-
-                # Get the ppm values for the strip plot
-                self.ppms_2 = self.main_frame.ppms_2
-
-                self.Xstrip, self.Ystrip = np.meshgrid(self.ppms_0, self.ppms_2)
-
-                title = self.ax_bore_3.get_title()
-                xlim3, ylim3 = self.ax_bore_3.get_xlim(), self.ax_bore_3.get_ylim()
-                self.ax_bore_3.clear()
-
-                self.ax_bore_3.contour(
-                    self.Xstrip,
-                    self.Ystrip,
-                    self.bore_data_strip1,
-                    self.cl_strip,
-                    colors=self.cmap,
-                    linewidths=0.5,
-                )
-                self.ax_bore_3.contour(
-                    self.Xstrip,
-                    self.Ystrip,
-                    self.bore_data_strip1,
-                    self.cl_neg_strip,
-                    colors=self.cmap_neg,
-                    linewidths=0.5,
-                )
-
-                self.line3 = self.ax_bore_3.axvline(
-                    x=self.bore_initial[0], color="black", linewidth=0.5
-                )
-                self.ax_bore_3.set_xlabel(self.nmrdata.axislabels[1])
-                self.ax_bore_3.set_xlim(xlim3)
-                self.ax_bore_3.set_title(title)
-                self.ax_bore_3.set_ylim(ylim3)
-
+                row, col = self.bore_initial_index[1], self.bore_initial_index[0]
+                strip_centre = self.bore_initial[0]
+                strip_xlabel = self.nmrdata.axislabels[1]
             else:
-                self.bore_initial = event.xdata, event.ydata
                 self.bore_initial_index = np.argmin(
                     np.abs(self.main_frame.ppms_0 - self.bore_initial[0])
                 ), np.argmin(np.abs(self.main_frame.ppms_1 - self.bore_initial[1]))
-                self.bore_data = []
-                for i in range(len(self.main_frame.ppms_2)):
-                    self.bore_data.append(
-                        self.main_frame.nmrdata.data[i][self.bore_initial_index[0]][
-                            self.bore_initial_index[1]
-                        ]
-                    )
-                self.bore_data = np.array(self.bore_data)
-                ylabel = self.ax_bore_2.get_ylabel()
-                self.ax_bore_2.clear()
-                self.ax_bore_2.set_title(title)
-                self.ax_bore_2.plot(
-                    self.bore_data, self.main_frame.ppms_2, color="red", linewidth=0.5
-                )
-                self.ax_bore_2.set_ylim(
-                    max(self.main_frame.ppms_2), min(self.main_frame.ppms_2)
-                )
-                self.ax_bore_2.set_xlim(
-                    -(np.max(self.nmrdata.data) / 8) / (intensity_percent / 100),
-                    np.max(self.nmrdata.data) / (intensity_percent / 100),
-                )
-                self.ax_bore_2.set_ylabel(ylabel)
-                self.line1 = self.ax_bore_2.axhline(
-                    y=event.xdata, color="black", linewidth=0.5
-                )
-                self.line2 = self.ax_bore_2.axhline(
-                    y=event.ydata, color="black", linewidth=0.5
-                )
-
-                self.bore_data_strip1 = []
-                for i in range(len(self.main_frame.ppms_2)):
-                    # Get the contour data for the strip plot
-                    self.bore_data_strip1.append(
-                        self.main_frame.nmrdata.data[i][self.bore_initial_index[0]]
-                    )
+                row, col = self.bore_initial_index[0], self.bore_initial_index[1]
+                strip_centre = self.bore_initial[1]
+                strip_xlabel = self.nmrdata.axislabels[0]
 
-                self.bore_data_strip1 = np.array(self.bore_data_strip1)
-
-                # Get the ppm values for the strip plot
-                self.ppms_2 = self.main_frame.ppms_2
-
-                self.Xstrip, self.Ystrip = np.meshgrid(self.ppms_0, self.ppms_2)
-
-                title = self.ax_bore_3.get_title()
-                xlim3, ylim3 = self.ax_bore_3.get_xlim(), self.ax_bore_3.get_ylim()
-                self.ax_bore_3.clear()
-
-                self.ax_bore_3.contour(
-                    self.Xstrip,
-                    self.Ystrip,
-                    self.bore_data_strip1,
-                    self.cl_strip,
-                    colors=self.cmap,
-                    linewidths=0.5,
-                )
-                self.ax_bore_3.contour(
-                    self.Xstrip,
-                    self.Ystrip,
-                    self.bore_data_strip1,
-                    self.cl_neg_strip,
-                    colors=self.cmap_neg,
-                    linewidths=0.5,
-                )
+            self.bore_data = self.get_strip_cache().bore(row, col)
+            ylabel = self.ax_bore_2.get_ylabel()
+            self.ax_bore_2.clear()
+            self.ax_bore_2.set_title(title)
+            self.ax_bore_2.plot(
+                self.bore_data, self.main_frame.ppms_2, color="red", linewidth=0.5
+            )
+            self.ax_bore_2.set_ylim(
+                max(self.main_frame.ppms_2), min(self.main_frame.ppms_2)
+            )
+            self.ax_bore_2.set_xlim(
+                -(np.max(self.nmrdata.data) / 8) / (intensity_percent / 100),
+                np.max(self.nmrdata.data) / (intensity_percent / 100),
+            )
+            self.ax_bore_2.set_ylabel(ylabel)
+            self.line1 = self.ax_bore_2.axhline(
+                y=event.xdata, color="black", linewidth=0.5
+            )
+            self.line2 = self.ax_bore_2.axhline(
+                y=event.ydata, color="black", linewidth=0.5
+            )
 
-                self.line3 = self.ax_bore_3.axvline(
-                    x=self.bore_initial[1], color="black", linewidth=0.5
-                )
-                self.ax_bore_3.set_xlabel(self.nmrdata.axislabels[0])
-                self.ax_bore_3.set_xlim(xlim3)
-                self.ax_bore_3.set_title(title)
-                self.ax_bore_3.set_ylim(ylim3)
+            self.draw_strip(row, strip_centre, strip_xlabel)
 
             self.OverlayBore()
 
@@ -10673,28 +11020,10 @@ class SpinBore(wx.Frame):
         xlabel = self.ax_bore_3.get_xlabel()
         title = self.ax_bore_3.get_title()
         self.ax_bore_3.clear()
-        self.contour1 = self.ax_bore_3.contour(
-            self.Xstrip,
-            self.Ystrip,
-            self.bore_data_strip1,
-            self.cl_strip,
-            colors=self.cmap,
-            linewidths=0.5,
-        )
-        self.contour1_neg = self.ax_bore_3.contour(
-            self.Xstrip,
-            self.Ystrip,
-            self.bore_data_strip1,
-            self.cl_neg_strip,
-            colors=self.cmap_neg,
-            linewidths=0.5,
-        )
-        self.line3 = self.ax_bore_3.axvline(
-            x=self.bore_initial[1], color="black", linewidth=0.5
-        )
+        self.contour_strip()
         self.ax_bore_3.set_xlim(xlim3)
         self.ax_bore_3.set_ylim(ylim3)
-        self.ax_bore_3.set_xlabel(self.nmrdata.axislabels[1])
+        self.ax_bore_3.set_xlabel(xlabel)
         self.ax_bore_3.set_title(title)
         self.UpdateBoreFrame()
 
@@ -11068,6 +11397,517 @@ VAL HG2 0.981"""
             self.bmrb_free[key]["C"] = [C_values, C_labels]
 
 
+class StripPanel(wx.Frame):
+    def __init__(self, title, parent=None):
+        """
+        This class shows strips from the 3D data side by side at the peak
+        positions of a 2D peak list for sequential (backbone) assignment.
+        All strips are gathered from the 3D data in one go when the peak
+        list is loaded, so paging through the spin systems only redraws
+        the contours.
+        """
+        self.bore = parent
+        self.main_frame = parent.main_frame
+        # Get the monitor size and set the window size to 85% of the monitor size
+        displays = (wx.Display(i) for i in range(wx.Display.GetCount()))
+        sizes = [display.GetGeometry().GetSize() for display in displays]
+        self.display_index = wx.Display.GetFromWindow(parent)
+        self.width = int(1.0 * sizes[self.display_index][0])
+        self.height = int(0.875 * sizes[self.display_index][1])
+        wx.Frame.__init__(
+            self, parent=parent, title=title, size=(self.width, self.height)
+        )
+        self.panel_strips = wx.Panel(self, -1)
+        self.main_strips_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.SetSizer(self.main_strips_sizer)
+
+        self.fig_strips = Figure()
+        self.canvas_strips = FigCanvas(self, -1, self.fig_strips)
+        self.main_strips_sizer.Add(self.canvas_strips, 10, flag=wx.GROW)
+        self.toolbar_strips = NavigationToolbar(self.canvas_strips)
+        self.main_strips_sizer.Add(self.toolbar_strips, 0, wx.EXPAND)
+
+        self.cmap = "#e41a1c"
+        self.cmap_neg = "#377eb8"
+        self.contour_num = 20  # number of contour levels
+        self.contour_factor = 1.20  # scaling factor between contour levels
+        self.strips_per_page = 10
+        self.page = 0
+        self.peak_names = []
+        self.strips = None
+        self.gathered_data = None
+
+        self.make_strip_panel_sizer()
+        self.Show()
+        self.Centre()
+
+    def make_strip_panel_sizer(self):
+        self.strip_panel_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        # Button to load the peak list
+        self.load_peaklist_button = wx.Button(self, -1, "Load Peak List")
+        self.load_peaklist_button.Bind(wx.EVT_BUTTON, self.OnLoadPeakList)
+        self.strip_panel_sizer.Add(
+            self.load_peaklist_button, 0, wx.ALIGN_CENTER_VERTICAL
+        )
+        self.strip_panel_sizer.AddSpacer(10)
+
+        # Slider to change the contour levels (shared by all strips)
+        self.strips_contour_label = wx.StaticBox(self, -1, "Contour Max")
+        self.strips_contour_sizer = wx.StaticBoxSizer(
+            self.strips_contour_label, wx.VERTICAL
+        )
+        self.strips_slider = FloatSlider(
+            self, id=-1, value=1, minval=0, maxval=3, res=0.01, style=wx.SL_HORIZONTAL
+        )
+        self.strips_slider.Bind(wx.EVT_SLIDER, self.OnStripsSlider)
+        self.strips_contour_sizer.Add(self.strips_slider)
+        self.strip_panel_sizer.Add(self.strips_contour_sizer)
+        self.strip_panel_sizer.AddSpacer(10)
+
+        # Number of strips shown on each page
+        self.strips_per_page_label = wx.StaticBox(self, -1, "Strips per Page")
+        self.strips_per_page_sizer = wx.StaticBoxSizer(
+            self.strips_per_page_label, wx.VERTICAL
+        )
+        self.strips_per_page_text = wx.TextCtrl(
+            self, -1, str(self.strips_per_page), style=wx.TE_PROCESS_ENTER
+        )
+        self.strips_per_page_text.Bind(wx.EVT_TEXT_ENTER, self.OnStripsPerPage)
+        self.strips_per_page_sizer.Add(self.strips_per_page_text)
+        self.strip_panel_sizer.Add(self.strips_per_page_sizer)
+        self.strip_panel_sizer.AddSpacer(10)
+
+        # Buttons to page through the strips
+        self.previous_page_button = wx.Button(self, -1, "Previous")
+        self.previous_page_button.Bind(wx.EVT_BUTTON, self.OnPreviousPage)
+        self.next_page_button = wx.Button(self, -1, "Next")
+        self.next_page_button.Bind(wx.EVT_BUTTON, self.OnNextPage)
+        self.page_label = wx.StaticText(self, -1, "Page 0/0")
+        self.strip_panel_sizer.Add(
+            self.previous_page_button, 0, wx.ALIGN_CENTER_VERTICAL
+        )
+        self.strip_panel_sizer.AddSpacer(5)
+        self.strip_panel_sizer.Add(self.page_label, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.strip_panel_sizer.AddSpacer(5)
+        self.strip_panel_sizer.Add(self.next_page_button, 0, wx.ALIGN_CENTER_VERTICAL)
+
+        self.main_strips_sizer.Add(
+            self.strip_panel_sizer, 0, wx.ALIGN_CENTER_HORIZONTAL
+        )
+
+    def OnLoadPeakList(self, event):
+        # Opening up a file window asking the user to select a Sparky style peak list (Assignment, w1, w2)
+        dlg = wx.FileDialog(self, "Select the peak list", wildcard="", style=wx.FD_OPEN)
+        dlg.SetDirectory(os.getcwd())
+        if dlg.ShowModal() == wx.ID_OK:
+            self.peaklist_file = dlg.GetPath()
+            dlg.Destroy()
+        else:
+            dlg.Destroy()
+            return
+
+        try:
+            self.peak_names, self.peaks_w1, self.peaks_w2 = read_peak_list(
+                self.peaklist_file
+            )
+        except:
+            self.peak_names = []
+        if len(self.peak_names) == 0:
+            message = "Unable to open and read peak list. Please ensure the peak list has Assignment, w1 and w2 columns."
+            dlg = wx.MessageDialog(self, message, "Warning", wx.OK)
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        self.gather_strips()
+        self.page = 0
+        self.plot_page()
+
+    def gather_strips(self):
+        # Find the row (w1) and column (w2) index of every peak, then extract all the strips at once
+        strip_cache = self.bore.get_strip_cache()
+        self.gathered_data = strip_cache.data
+        ppms_rows = np.asarray(self.main_frame.ppms_0)
+        ppms_cols = np.asarray(self.main_frame.ppms_1)
+        rows = np.argmin(np.abs(ppms_rows[None, :] - self.peaks_w1[:, None]), axis=1)
+        cols = np.argmin(np.abs(ppms_cols[None, :] - self.peaks_w2[:, None]), axis=1)
+
+        # Every strip has the same width in points, so they all share one ppm offset axis
+        ppm_per_point = np.abs(ppms_cols[1] - ppms_cols[0])
+        width = max(int(round(self.bore.strip_width / ppm_per_point)), 2)
+        self.strips = strip_cache.gather(rows, cols, width)
+        self.strip_offsets = (width // 2 - np.arange(width)) * ppm_per_point
+        self.strip_centres = ppms_cols[cols]
+        self.update_contour_levels()
+
+    def update_contour_levels(self):
+        # The same contour levels are used for every strip so intensities can be compared
+        x_val = 10 ** float(self.strips_slider.GetValue())
+        contour_start = np.max(np.abs(self.strips)) / x_val
+        self.cl = contour_start * self.contour_factor ** np.arange(self.contour_num)
+        self.cl_neg = -contour_start * self.contour_factor ** np.flip(
+            np.arange(self.contour_num)
+        )
+
+    def plot_page(self):
+        if self.strips is None:
+            return
+        # If the 3D data has changed (e.g. been reoriented) gather the strips again
+        if self.bore.get_strip_cache().data is not self.gathered_data:
+            self.gather_strips()
+
+        number_of_pages = int(np.ceil(len(self.peak_names) / self.strips_per_page))
+        self.page = min(max(self.page, 0), number_of_pages - 1)
+        first = self.page * self.strips_per_page
+        last = min(first + self.strips_per_page, len(self.peak_names))
+        self.page_label.SetLabel("Page {}/{}".format(self.page + 1, number_of_pages))
+
+        self.fig_strips.clear()
+        axes = self.fig_strips.subplots(
+            1, self.strips_per_page, sharex=True, sharey=True, squeeze=False
+        )[0]
+        for i, ax in enumerate(axes):
+            if first + i >= last:
+                ax.set_visible(False)
+                continue
+            strip = self.strips[first + i]
+            ax.contour(
+                self.strip_offsets,
+                self.main_frame.ppms_2,
+                strip,
+                self.cl,
+                colors=self.cmap,
+                linewidths=0.5,
+            )
+            ax.contour(
+                self.strip_offsets,
+                self.main_frame.ppms_2,
+                strip,
+                self.cl_neg,
+                colors=self.cmap_neg,
+                linewidths=0.5,
+            )
+            ax.set_title(
+                "{}\n{:.2f}".format(
+                    self.peak_names[first + i], self.strip_centres[first + i]
+                ),
+                fontsize=8,
+            )
+            ax.tick_params(axis="x", labelsize=6)
+        axes[0].set_xlim(max(self.strip_offsets), min(self.strip_offsets))
+        axes[0].set_ylim(max(self.main_frame.ppms_2), min(self.main_frame.ppms_2))
+        # Strips run along z and are cut across the columns of the current orientation
+        z, rows, cols = self.main_frame.volume.order(self.main_frame.orientation)
+        labels = self.main_frame.nmrdata.axislabels
+        axes[0].set_ylabel(labels[z])
+        self.fig_strips.supxlabel(labels[cols] + " offset (ppm)", fontsize=8)
+        self.UpdateStripPanel()
+
+    def UpdateStripPanel(self):
+        # Updates the plots in the frame
+        self.canvas_strips.draw()
+        self.canvas_strips.Refresh()
+        self.canvas_strips.Update()
+        self.panel_strips.Refresh()
+        self.panel_strips.Update()
+
+    def OnStripsSlider(self, event):
+        if self.strips is None:
+            return
+        self.update_contour_levels()
+        self.plot_page()
+
+    def OnStripsPerPage(self, event):
+        try:
+            self.strips_per_page = max(int(self.strips_per_page_text.GetValue()), 1)
+        except:
+            pass
+        self.strips_per_page_text.SetValue(str(self.strips_per_page))
+        self.plot_page()
+
+    def OnPreviousPage(self, event):
+        self.page -= 1
+        self.plot_page()
+
+    def OnNextPage(self, event):
+        self.page += 1
+        self.plot_page()
+
+
+class TitrationFrame(wx.Frame):
+    def __init__(self, title, parent=None):
+        """
+        This class follows the peaks of a reference peak list through a
+        titration series of 2D spectra, shows the chemical shift
+        perturbations (CSPs) and fits a Kd to the binding curve of every
+        peak. Spectra are only read from disk as they are needed.
+        """
+        self.main_frame = parent
+        # Get the monitor size and set the window size to 85% of the monitor size
+        displays = (wx.Display(i) for i in range(wx.Display.GetCount()))
+        sizes = [display.GetGeometry().GetSize() for display in displays]
+        self.display_index = wx.Display.GetFromWindow(parent)
+        self.width = int(1.0 * sizes[self.display_index][0])
+        self.height = int(0.875 * sizes[self.display_index][1])
+        wx.Frame.__init__(
+            self, parent=parent, title=title, size=(self.width, self.height)
+        )
+        self.panel_titration = wx.Panel(self, -1)
+        self.main_titration_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.SetSizer(self.main_titration_sizer)
+
+        self.fig_titration = Figure()
+        self.canvas_titration = FigCanvas(self, -1, self.fig_titration)
+        self.main_titration_sizer.Add(self.canvas_titration, 10, flag=wx.GROW)
+        self.toolbar_titration = NavigationToolbar(self.canvas_titration)
+        self.main_titration_sizer.Add(self.toolbar_titration, 0, wx.EXPAND)
+        self.ax_csp = self.fig_titration.add_subplot(121)
+        self.ax_binding = self.fig_titration.add_subplot(122)
+
+        self.series = None
+        self.peak_names = []
+        self.csp = None
+        self.kd = None
+
+        self.make_titration_sizer()
+        self.Show()
+        self.Centre()
+
+    def make_titration_sizer(self):
+        self.titration_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        # Directory or glob pattern of the spectra in the titration (in titration order when sorted)
+        self.spectra_label = wx.StaticBox(self, -1, "Spectra (directory or pattern)")
+        self.spectra_sizer = wx.StaticBoxSizer(self.spectra_label, wx.HORIZONTAL)
+        self.spectra_text = wx.TextCtrl(self, -1, "*.ft2", size=(200, -1))
+        self.spectra_sizer.Add(self.spectra_text)
+        self.load_spectra_button = wx.Button(self, -1, "Load Spectra")
+        self.load_spectra_button.Bind(wx.EVT_BUTTON, self.OnLoadSpectra)
+        self.spectra_sizer.AddSpacer(5)
+        self.spectra_sizer.Add(self.load_spectra_button)
+        self.titration_sizer.Add(self.spectra_sizer)
+        self.titration_sizer.AddSpacer(10)
+
+        # Button to load the reference peak list
+        self.load_peaklist_button = wx.Button(self, -1, "Load Peak List")
+        self.load_peaklist_button.Bind(wx.EVT_BUTTON, self.OnLoadPeakList)
+        self.titration_sizer.Add(self.load_peaklist_button, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.titration_sizer.AddSpacer(10)
+
+        # Ligand concentration of each spectrum and the protein concentration
+        self.concentrations_label = wx.StaticBox(self, -1, "Concentrations")
+        self.concentrations_sizer = wx.StaticBoxSizer(
+            self.concentrations_label, wx.HORIZONTAL
+        )
+        self.concentrations_sizer.Add(
+            wx.StaticText(self, -1, "Ligand:"), 0, wx.ALIGN_CENTER_VERTICAL
+        )
+        self.ligand_text = wx.TextCtrl(self, -1, "", size=(200, -1))
+        self.concentrations_sizer.Add(self.ligand_text)
+        self.concentrations_sizer.AddSpacer(5)
+        self.concentrations_sizer.Add(
+            wx.StaticText(self, -1, "Protein:"), 0, wx.ALIGN_CENTER_VERTICAL
+        )
+        self.protein_text = wx.TextCtrl(self, -1, "", size=(80, -1))
+        self.concentrations_sizer.Add(self.protein_text)
+        self.titration_sizer.Add(self.concentrations_sizer)
+        self.titration_sizer.AddSpacer(10)
+
+        # Track the peaks, fit the binding curves and save the results
+        self.track_button = wx.Button(self, -1, "Track Peaks")
+        self.track_button.Bind(wx.EVT_BUTTON, self.OnTrackPeaks)
+        self.titration_sizer.Add(self.track_button, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.titration_sizer.AddSpacer(5)
+        self.fit_kd_button = wx.Button(self, -1, "Fit Kd")
+        self.fit_kd_button.Bind(wx.EVT_BUTTON, self.OnFitKd)
+        self.titration_sizer.Add(self.fit_kd_button, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.titration_sizer.AddSpacer(5)
+        self.peak_combobox = wx.ComboBox(self, choices=[], style=wx.CB_READONLY)
+        self.peak_combobox.Bind(wx.EVT_COMBOBOX, self.OnSelectPeak)
+        self.titration_sizer.Add(self.peak_combobox, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.titration_sizer.AddSpacer(5)
+        self.save_table_button = wx.Button(self, -1, "Save CSP Table")
+        self.save_table_button.Bind(wx.EVT_BUTTON, self.OnSaveTable)
+        self.titration_sizer.Add(self.save_table_button, 0, wx.ALIGN_CENTER_VERTICAL)
+
+        self.main_titration_sizer.Add(
+            self.titration_sizer, 0, wx.ALIGN_CENTER_HORIZONTAL
+        )
+
+    def show_message(self, message):
+        dlg = wx.MessageDialog(self, message, "Warning", wx.OK | wx.ICON_WARNING)
+        dlg.ShowModal()
+        dlg.Destroy()
+
+    def OnLoadSpectra(self, event):
+        self.series = TitrationSeries.from_pattern(self.spectra_text.GetValue())
+        if len(self.series) < 2:
+            self.series = None
+            self.show_message(
+                "Unable to find at least two spectra matching "
+                + self.spectra_text.GetValue()
+            )
+            return
+        # Default to the spectrum index if no concentrations have been given
+        if self.ligand_text.GetValue() == "":
+            self.ligand_text.SetValue(
+                ", ".join(str(i) for i in range(len(self.series)))
+            )
+        self.SetTitle("Titration (" + str(len(self.series)) + " spectra)")
+
+    def OnLoadPeakList(self, event):
+        # Opening up a file window asking the user to select a Sparky style peak list (Assignment, w1, w2)
+        dlg = wx.FileDialog(self, "Select the peak list", wildcard="", style=wx.FD_OPEN)
+        dlg.SetDirectory(os.getcwd())
+        if dlg.ShowModal() == wx.ID_OK:
+            self.peaklist_file = dlg.GetPath()
+            dlg.Destroy()
+        else:
+            dlg.Destroy()
+            return
+
+        try:
+            self.peak_names, self.peaks_w1, self.peaks_w2 = read_peak_list(
+                self.peaklist_file
+            )
+        except:
+            self.peak_names = []
+        if len(self.peak_names) == 0:
+            self.show_message(
+                "Unable to open and read peak list. Please ensure the peak list has Assignment, w1 and w2 columns."
+            )
+            return
+        self.peak_combobox.SetItems(self.peak_names)
+        self.peak_combobox.SetSelection(0)
+
+    def OnTrackPeaks(self, event):
+        if self.series is None or len(self.peak_names) == 0:
+            self.show_message("Please load the spectra and a peak list first.")
+            return
+        try:
+            self.series.track(self.peak_names, self.peaks_w1, self.peaks_w2)
+        except:
+            self.show_message("Unable to read the titration spectra.")
+            return
+        self.csp = self.series.csp()
+        self.kd = None
+        self.plot_titration()
+
+    def get_concentrations(self):
+        """
+        Read the ligand and protein concentrations, raising a ValueError with
+        a message for the user if they are missing or invalid
+        """
+        try:
+            ligand = np.array(
+                [float(value) for value in self.ligand_text.GetValue().split(",")]
+            )
+            protein = float(self.protein_text.GetValue())
+        except ValueError:
+            ligand = None
+        if ligand is None or len(ligand) != len(self.series):
+            raise ValueError(
+                "Please give a ligand concentration for each spectrum (comma separated) and the protein concentration."
+            )
+        if protein <= 0:
+            raise ValueError("The protein concentration must be greater than zero.")
+        if np.any(ligand < 0):
+            raise ValueError("The ligand concentrations cannot be negative.")
+        return ligand, protein
+
+    def OnFitKd(self, event):
+        if self.csp is None:
+            self.show_message("Please track the peaks before fitting.")
+            return
+        try:
+            self.ligand, self.protein = self.get_concentrations()
+        except ValueError as error:
+            self.show_message(str(error))
+            return
+        try:
+            self.kd, self.csp_max, self.kd_error = fit_kd(
+                self.ligand, self.csp, self.protein
+            )
+        except Exception as error:
+            self.kd = None
+            self.show_message("Unable to fit the Kd: " + str(error))
+            return
+        self.plot_titration()
+
+    def OnSelectPeak(self, event):
+        self.plot_titration()
+
+    def plot_titration(self):
+        if self.csp is None:
+            return
+        peak = max(self.peak_combobox.GetSelection(), 0)
+
+        # CSP of every peak in the final spectrum, with the selected peak highlighted
+        self.ax_csp.clear()
+        colours = np.full(len(self.peak_names), "tab:blue", dtype=object)
+        colours[peak] = "tab:red"
+        self.ax_csp.bar(np.arange(len(self.peak_names)), self.csp[-1], color=colours)
+        self.ax_csp.set_xlabel("Peak")
+        self.ax_csp.set_ylabel("CSP (ppm)")
+
+        # Binding curve of the selected peak
+        self.ax_binding.clear()
+        if self.kd is None:
+            x_values = np.arange(len(self.series))
+            self.ax_binding.set_xlabel("Spectrum")
+        else:
+            x_values = self.ligand
+            self.ax_binding.set_xlabel("Ligand concentration")
+        self.ax_binding.plot(x_values, self.csp[:, peak], "o", color="tab:blue")
+        if self.kd is not None:
+            ligand = np.linspace(0, np.max(self.ligand), 200)
+            self.ax_binding.plot(
+                ligand,
+                single_site_binding(
+                    ligand, self.protein, self.kd[peak], self.csp_max[peak]
+                ),
+                color="tab:red",
+                label="Kd = {:.3g} ± {:.2g}".format(
+                    self.kd[peak], self.kd_error[peak]
+                ),
+            )
+            self.ax_binding.legend()
+        self.ax_binding.set_ylabel("CSP (ppm)")
+        self.ax_binding.set_title(self.peak_names[peak])
+        self.UpdateTitrationFrame()
+
+    def UpdateTitrationFrame(self):
+        # Updates the plots in the frame
+        self.canvas_titration.draw()
+        self.canvas_titration.Refresh()
+        self.canvas_titration.Update()
+        self.panel_titration.Refresh()
+        self.panel_titration.Update()
+
+    def OnSaveTable(self, event):
+        if self.csp is None:
+            self.show_message("Please track the peaks before saving the CSP table.")
+            return
+        dlg = wx.FileDialog(
+            self,
+            "Save CSP table",
+            wildcard="*.txt",
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        )
+        dlg.SetDirectory(os.getcwd())
+        if dlg.ShowModal() == wx.ID_OK:
+            file_name = dlg.GetPath()
+            dlg.Destroy()
+        else:
+            dlg.Destroy()
+            return
+        if self.kd is None:
+            self.series.write_table(file_name, self.csp)
+        else:
+            self.series.write_table(file_name, self.csp, self.kd, self.kd_error)
+
+
 class uSTA_Dialog(wx.Dialog):
     def __init__(self, title, parent):
         self.main_frame = parent
@@ -11255,53 +12095,35 @@ class CESTFrame(wx.Frame):
         # Try to find procpar file in current directory, if can find it, work out frequencies based on tof_sel
         # If cannot find it will just have to the frequency indexes of 0 to n
         try:
-            dic_v, data_v = ng.varian.read("./")
+            parameter_index = get_parameter_index()
 
             # find the CEST offset values used
-            offsets = dic_v["procpar"]["tof_sel"]["values"]
-            self.offsets_Hz = []
-            for i in range(len(offsets)):
-                self.offsets_Hz.append(float(offsets[i]))
+            self.offsets_Hz = np.array(
+                parameter_index.varian_values("tof_sel"), dtype=float
+            )
 
             # get ppm values for the offsets used
-            self.tof = float(dic_v["procpar"]["tof"]["values"][0])
+            self.tof = parameter_index.varian_parameter("tof")
 
             # get the sfrq
-            self.sfrq = float(dic_v["procpar"]["sfrq"]["values"][0])
-
-            # open fid.com to find the carrier frequency
-            with open("fid.com", "r") as file:
-                lines = file.readlines()
-                for line in lines:
-                    if "-xCAR" in line:
-                        self.carrier = float(line.split()[1])
-
-            self.offsets_ppm = []
-            for tof_sel in self.offsets_Hz:
-                offset_ppm = (
-                    tof_sel - self.tof
-                ) / self.sfrq + self.carrier  # get actual ppm values
-                self.offsets_ppm.append(offset_ppm)
+            self.sfrq = parameter_index.varian_parameter("sfrq")
+
+            # find the carrier frequency from fid.com
+            self.carrier = parameter_index.carrier("x")
+
+            # get actual ppm values
+            self.offsets_ppm = (self.offsets_Hz - self.tof) / self.sfrq + self.carrier
 
         except:
             self.offsets_ppm = np.arange(0, len(self.main_frame.ppms_0), 1)
 
     def organise_CEST_data(self):
-        # Get the CEST data from the main frame
-        self.CEST_data = self.main_frame.nmrdata.data.T
-        self.cest_on_data = []
-        self.cest_off_data = []
-        for i in range(len(self.CEST_data)):
-            if i % 2 == 0:
-                if self.CESTArrayOrder == 0:
-                    self.cest_on_data.append(self.CEST_data[i])
-                else:
-                    self.cest_off_data.append(self.CEST_data[i])
-            else:
-                if self.CESTArrayOrder == 0:
-                    self.cest_off_data.append(self.CEST_data[i])
-                else:
-                    self.cest_on_data.append(self.CEST_data[i])
+        # Get the CEST data from the main frame as (offset x point) on/off resonance views
+        self.CEST_profiles = CESTProfiles(
+            self.main_frame.nmrdata.data, CESTArrayOrder=self.CESTArrayOrder
+        )
+        self.cest_on_data = self.CEST_profiles.cest_on_data
+        self.cest_off_data = self.CEST_profiles.cest_off_data
 
         # Find the selected 1H chemical shift range in the main frame
         self.selected_shift = self.main_frame.line4.get_xdata()[0]
@@ -11309,16 +12131,54 @@ class CESTFrame(wx.Frame):
             np.abs(self.main_frame.ppms_1 - self.selected_shift)
         )
 
-        self.non_normalized_cest_data = []
-        self.normalized_cest_data = []
-        for i in range(len(self.cest_on_data)):
-            self.non_normalized_cest_data.append(
-                self.cest_on_data[i][self.selected_shift_index]
-            )
-            self.normalized_cest_data.append(
-                self.cest_on_data[i][self.selected_shift_index]
-                / self.cest_off_data[i][self.selected_shift_index]
-            )
+        # Normalised profiles of all points are calculated once and then looked up
+        self.non_normalized_cest_data = self.CEST_profiles.raw_profile(
+            self.selected_shift_index
+        )
+        self.normalized_cest_data = self.CEST_profiles.profile(
+            self.selected_shift_index
+        )
+
+    def update_selected_shift(self, selected_shift):
+        """
+        Updating the plotted CEST profile when the selected vertical slice
+        is moved in the main window.
+        """
+        self.selected_shift = selected_shift
+        self.selected_shift_index = np.argmin(
+            np.abs(self.main_frame.ppms_1 - self.selected_shift)
+        )
+        self.non_normalized_cest_data = self.CEST_profiles.raw_profile(
+            self.selected_shift_index
+        )
+        self.normalized_cest_data = self.CEST_profiles.profile(
+            self.selected_shift_index
+        )
+
+        self.normalized_cest_line.set_ydata(self.normalized_cest_data)
+        self.selected_points.remove()
+        self.selected_points = self.ax.scatter(
+            np.full(
+                len(self.offsets_ppm),
+                self.main_frame.ppms_1[self.selected_shift_index],
+            ),
+            self.offsets_ppm,
+            self.non_normalized_cest_data,
+            color="red",
+            s=10,
+        )
+        self.apply_CEST_ppm_range()
+        self.UpdateCESTFrame()
+
+    def apply_CEST_ppm_range(self):
+        # Limit the CEST data plot to the ppm range chosen in the min/max boxes
+        min_index, max_index = self.CEST_ppm_range
+        ppms = self.main_frame.ppms_1[min_index:max_index]
+        self.ax.set_xlim([max(ppms), min(ppms)])
+        self.ax.set_ylim([max(self.offsets_ppm), min(self.offsets_ppm)])
+        self.selected_points.set_visible(
+            min_index <= self.selected_shift_index <= max_index
+        )
 
     def OnMoveFrame(self, event):
         # Get the new default display if the frame is moved
@@ -11411,6 +12271,12 @@ class CESTFrame(wx.Frame):
         self.CEST_sizer.AddSpacer(10)
         self.CEST_sizer.Add(self.save_CEST_button, wx.ALIGN_CENTER_HORIZONTAL)
 
+        # Make a button which will save the normalised CEST profiles of all points
+        self.save_all_CEST_button = wx.Button(self, -1, "Save all CEST profiles")
+        self.save_all_CEST_button.Bind(wx.EVT_BUTTON, self.OnSaveAllCESTProfiles)
+        self.CEST_sizer.AddSpacer(10)
+        self.CEST_sizer.Add(self.save_all_CEST_button, wx.ALIGN_CENTER_HORIZONTAL)
+
         self.main_CEST_sizer.AddSpacer(10)
         self.main_CEST_sizer.Add(self.CEST_sizer, 0, wx.ALIGN_CENTER_HORIZONTAL)
         self.main_CEST_sizer.AddSpacer(10)
@@ -11487,9 +12353,44 @@ class CESTFrame(wx.Frame):
             dlg.ShowModal()
             dlg.Destroy()
 
+    def OnSaveAllCESTProfiles(self, event):
+        # Save the normalised CEST profiles of every point as a tab separated text file
+        file_name = ""
+        message = "Input the file name to save all CEST profiles as"
+        dlg = wx.TextEntryDialog(
+            None, message, "Save all CEST profiles", "CEST_profiles.txt"
+        )
+        if dlg.ShowModal() == wx.ID_OK:
+            file_name = dlg.GetValue()
+        dlg.Destroy()
+
+        if file_name == "":
+            message = "Error: No file name given"
+            dlg = wx.MessageDialog(None, message, "Error", wx.OK | wx.ICON_ERROR)
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        try:
+            self.CEST_profiles.export_profiles(
+                file_name, self.main_frame.ppms_1, self.offsets_ppm
+            )
+            message = "CEST profiles saved as '" + file_name + "'"
+            dlg = wx.MessageDialog(
+                None, message, "Save successful", wx.OK | wx.ICON_INFORMATION
+            )
+            dlg.ShowModal()
+            dlg.Destroy()
+        except:
+            message = "Error saving CEST profiles"
+            dlg = wx.MessageDialog(None, message, "Error", wx.OK | wx.ICON_ERROR)
+            dlg.ShowModal()
+            dlg.Destroy()
+
     def plot_CEST_data(self):
 
         self.ax = self.fig_CEST.add_subplot(121, projection="3d")
+        self.CEST_ppm_range = (0, len(self.main_frame.ppms_1))
 
         for i, y in enumerate(self.offsets_ppm):
             self.ax.plot(
@@ -11500,24 +12401,25 @@ class CESTFrame(wx.Frame):
                 linewidth=1.5,
                 alpha=0.5,
             )
-            self.ax.scatter(
-                self.main_frame.ppms_1[self.selected_shift_index],
-                y,
-                self.non_normalized_cest_data[i],
-                color="red",
-                s=10,
-            )
+        self.selected_points = self.ax.scatter(
+            np.full(
+                len(self.offsets_ppm), self.main_frame.ppms_1[self.selected_shift_index]
+            ),
+            self.offsets_ppm,
+            self.non_normalized_cest_data,
+            color="red",
+            s=10,
+        )
 
         self.ax.set_title("CEST data")
         self.ax.set_xlabel(self.main_frame.nmrdata.axislabels[1])
         self.ax.set_ylabel(self.main_frame.nmrdata.axislabels[0])
 
-        self.ax.set_xlim([max(self.main_frame.ppms_1), min(self.main_frame.ppms_1)])
-        self.ax.set_ylim([max(self.offsets_ppm), min(self.offsets_ppm)])
+        self.apply_CEST_ppm_range()
         self.ax.view_init(elev=10.0, azim=-45)
 
         self.ax2 = self.fig_CEST.add_subplot(122)
-        self.ax2.plot(
+        (self.normalized_cest_line,) = self.ax2.plot(
             self.offsets_ppm, self.normalized_cest_data, color="tab:red", linewidth=1.5
         )
         self.ax2.set_title("Normalized CEST data")
@@ -11538,15 +12440,11 @@ class CESTFrame(wx.Frame):
 
         if min_index > max_index:
             min_index, max_index = max_index, min_index
+        self.CEST_ppm_range = (min_index, max_index)
 
-        # Get the data between the min and max values
-        self.cest_on_data_new = []
-        self.cest_off_data_new = []
-        for i in range(len(self.cest_on_data)):
-            self.cest_on_data_new.append(
-                self.cest_on_data[i].tolist()[min_index:max_index]
-            )
-            self.cest_off_data_new.append(self.cest_off_data[i][min_index:max_index])
+        # Get the data between the min and max values (views of the original data)
+        self.cest_on_data_new = self.cest_on_data[:, min_index:max_index]
+        self.cest_off_data_new = self.cest_off_data[:, min_index:max_index]
 
         self.ax.clear()
         for i, y in enumerate(self.offsets_ppm):
@@ -11558,26 +12456,21 @@ class CESTFrame(wx.Frame):
                 linewidth=1.5,
                 alpha=0.5,
             )
-            if min_index <= self.selected_shift_index <= max_index:
-                self.ax.scatter(
-                    self.main_frame.ppms_1[self.selected_shift_index],
-                    y,
-                    self.non_normalized_cest_data[i],
-                    color="red",
-                    s=10,
-                )
+        self.selected_points = self.ax.scatter(
+            np.full(
+                len(self.offsets_ppm), self.main_frame.ppms_1[self.selected_shift_index]
+            ),
+            self.offsets_ppm,
+            self.non_normalized_cest_data,
+            color="red",
+            s=10,
+        )
 
         self.ax.set_title("CEST data")
         self.ax.set_xlabel(self.main_frame.nmrdata.axislabels[1])
         self.ax.set_ylabel(self.main_frame.nmrdata.axislabels[0])
 
-        self.ax.set_xlim(
-            [
-                max(self.main_frame.ppms_1[min_index:max_index]),
-                min(self.main_frame.ppms_1[min_index:max_index]),
-            ]
-        )
-        self.ax.set_ylim([max(self.offsets_ppm), min(self.offsets_ppm)])
+        self.apply_CEST_ppm_range()
 
         self.UpdateCESTFrame()
 
@@ -12045,7 +12938,8 @@ class DiffusionFit(wx.Frame):
         if self.spectrometer == "Bruker":
             # Search through acqus file to get the little delta (p30) and big delta (d20) values used
             try:
-                file = open("acqus", "r")
+                parameter_index = get_parameter_index()
+                acqus = parameter_index.acqus()
             except:
                 # Give an error message saying unable to find acqus file
                 msg = wx.MessageDialog(
@@ -12059,37 +12953,11 @@ class DiffusionFit(wx.Frame):
                 return
 
             try:
-                delays_total = []
-                durations_total = []
-                add_delays = False
-                add_durations = False
-                for line in file:
-                    if add_delays == True:
-                        if "##" in line:
-                            add_delays = False
-                            continue
-                        else:
-                            delays = line.split("\n")[0].split()
-                            for delay in delays:
-                                delays_total.append(float(delay))
-                    if "##$D=" in line:
-                        add_delays = True
-
-                    if add_durations == True:
-                        if "##" in line:
-                            add_durations = False
-                            continue
-                        else:
-                            durations = line.split("\n")[0].split()
-                            for duration in durations:
-                                durations_total.append(float(duration))
-                    if "##$P=" in line:
-                        add_durations = True
-                self.big_delta = delays_total[20]
+                self.big_delta = float(acqus["D"][20])
                 if self.bipolar_gradients == True:
-                    self.small_delta = durations_total[30] * 2
+                    self.small_delta = float(acqus["P"][30]) * 2
                 else:
-                    self.small_delta = durations_total[30]
+                    self.small_delta = float(acqus["P"][30])
             except:
                 # Give an error message saying unable to find delays in the acqus file (./acqus)
                 msg = wx.MessageDialog(
@@ -12102,12 +12970,11 @@ class DiffusionFit(wx.Frame):
                 msg.Destroy()
                 return
 
-            file.close()
-
         else:
             # Search through Varian procpar file to find out the little delta and big delta values used
             try:
-                self.dic, self.data = ng.varian.read("./")
+                parameter_index = get_parameter_index()
+                parameter_index.procpar()
             except:
                 # Give an error message saying unable to find procpar file
                 msg = wx.MessageDialog(
@@ -12122,8 +12989,8 @@ class DiffusionFit(wx.Frame):
 
             try:
                 # Find big delta and small delta
-                self.big_delta = float(self.dic["procpar"]["BigT"]["values"][0])
-                self.small_delta = float(self.dic["procpar"]["gt1"]["values"][0]) * 1e6
+                self.big_delta = parameter_index.varian_parameter("BigT")
+                self.small_delta = parameter_index.varian_parameter("gt1") * 1e6
                 if self.bipolar_gradients == True:
                     self.small_delta = self.small_delta * 2
             except:
@@ -12145,22 +13012,11 @@ class DiffusionFit(wx.Frame):
     def find_gradient_percentages(self, event):
         if self.spectrometer == "Bruker":
             self.max_gradient = float(self.max_gradient_box.GetValue())
-            # Search through the difframp file to get the gradient percentages used
+            # Search through the difframp file (./lists/gp/Difframp, or ./Difframp for older versions of topspin) to get the gradient percentages used
             try:
-                with open("./lists/gp/Difframp", "r") as file:
-                    self.gradients_percent = []
-                    skip_line = True
-                    for line in file:
-                        if skip_line == True:
-                            if "##XYDATA= (X++(Y..Y))" not in line:
-                                pass
-                            else:
-                                skip_line = False
-                        else:
-                            if "##END=" not in line:
-                                self.gradients_percent.append(
-                                    float(line.split()[0]) * 100
-                                )
+                self.gradients_percent = [
+                    gradient * 100 for gradient in get_parameter_index().difframp()
+                ]
 
                 self.gradients = (
                     np.array(self.gradients_percent) / 100
@@ -12219,99 +13075,24 @@ class DiffusionFit(wx.Frame):
                     msg.Destroy()
 
             except:
-                try:
-                    # Try to read in gradients from (./Difframp) file, older versions of topspin save the file here
-                    with open("./Difframp", "r") as file:
-                        self.gradients_percent = []
-                        skip_line = True
-                        for line in file:
-                            if skip_line == True:
-                                if "##XYDATA= (X++(Y..Y))" not in line:
-                                    pass
-                                else:
-                                    skip_line = False
-                            else:
-                                if "##END=" not in line:
-                                    self.gradients_percent.append(
-                                        float(line.split()[0]) * 100
-                                    )
-
-                    self.gradients = (
-                        np.array(self.gradients_percent) / 100
-                    ) * self.max_gradient
-
-                    if len(self.y_data) != len(self.gradients):
-                        for i, deleted_slice in enumerate(self.deleted_slices):
-                            self.gradients = np.delete(self.gradients, deleted_slice, 0)
-                            self.gradients_percent = np.delete(
-                                self.gradients_percent, deleted_slice, 0
-                            )
-
-                    if len(self.y_data) != len(self.gradients):
-                        # Give an error message saying unable to find gradient percentages in the difframp file (./lists/gp/Difframp)
-                        msg = wx.MessageDialog(
-                            self,
-                            "Number of gradients in difframp is not equal to the data size",
-                            "Error",
-                            wx.OK | wx.ICON_ERROR,
-                        )
-                        msg.ShowModal()
-                        msg.Destroy()
-                        # Bring up a window where the user can enter the gradient percentages manually (TextCtrl for min/max gradient percentages and then a radiobox for linear, squared, exponential distribution)
-                        # Can then press okay and will produce gradient percentages and gradients manually
-                        self.gradients_percent = []
-                        self.gradients = []
-                        self.gradients_input_manual = DiffusionGradientManualInput(
-                            title="Manual Gradient Input",
-                            parent=self,
-                            spectrometer=self.spectrometer,
-                        )
-
-                    else:
-                        # Give a pop out window showing the gradient percentages and values used
-                        gradient_percent_string = "Gradient Percentages (%): "
-                        gradient_string = "Gradients (G/cm): "
-                        for i, gradient_percent in enumerate(self.gradients_percent):
-                            gradient_percent_string = (
-                                gradient_percent_string
-                                + "{:.2f}, ".format(gradient_percent)
-                            )
-                            gradient_string = gradient_string + "{:.2f}, ".format(
-                                self.gradients[i]
-                            )
-
-                        gradient_percent_string = gradient_percent_string[:-2]
-                        gradient_string = gradient_string[:-2]
-
-                        msg = wx.MessageDialog(
-                            self,
-                            gradient_percent_string + "\n" + gradient_string,
-                            "Gradient Percentages and Values",
-                            wx.OK | wx.ICON_INFORMATION,
-                        )
-                        msg.ShowModal()
-                        msg.Destroy()
-
-                except:
-
-                    # Give an error message saying unable to find gradient percentages in the difframp file (./lists/gp/Difframp)
-                    msg = wx.MessageDialog(
-                        self,
-                        "Unable to find gradient percentages in the difframp file (./lists/gp/Difframp or ./Difframp). Please input gradients manually",
-                        "Error",
-                        wx.OK | wx.ICON_ERROR,
-                    )
-                    msg.ShowModal()
-                    msg.Destroy()
-                    # Bring up a window where the user can enter the gradient percentages manually (TextCtrl for min/max gradient percentages and then a radiobox for linear, squared, exponential distribution)
-                    # Can then press okay and will produce gradient percentages and gradients manually
-                    self.gradients_percent = []
-                    self.gradients = []
-                    self.gradients_input_manual = DiffusionGradientManualInput(
-                        title="Manual Gradient Input",
-                        parent=self,
-                        spectrometer=self.spectrometer,
-                    )
+                # Give an error message saying unable to find gradient percentages in the difframp file (./lists/gp/Difframp)
+                msg = wx.MessageDialog(
+                    self,
+                    "Unable to find gradient percentages in the difframp file (./lists/gp/Difframp or ./Difframp). Please input gradients manually",
+                    "Error",
+                    wx.OK | wx.ICON_ERROR,
+                )
+                msg.ShowModal()
+                msg.Destroy()
+                # Bring up a window where the user can enter the gradient percentages manually (TextCtrl for min/max gradient percentages and then a radiobox for linear, squared, exponential distribution)
+                # Can then press okay and will produce gradient percentages and gradients manually
+                self.gradients_percent = []
+                self.gradients = []
+                self.gradients_input_manual = DiffusionGradientManualInput(
+                    title="Manual Gradient Input",
+                    parent=self,
+                    spectrometer=self.spectrometer,
+                )
 
         else:
             self.DAC_conversion = float(self.dac_conversion_box.GetValue())
@@ -12320,14 +13101,14 @@ class DiffusionFit(wx.Frame):
 
             # Search through the procpar file to get the gradient percentages used
             try:
-                self.dic, self.data = ng.varian.read("./")
+                parameter_index = get_parameter_index()
 
                 # Get the gradient strength parameters
-                gradient_name = self.dic["procpar"]["array"]["values"][0]
+                gradient_name = parameter_index.varian_values("array")[0]
 
                 # separate the data for each gradient strength
                 for i, gradient in enumerate(
-                    self.dic["procpar"][gradient_name]["values"]
+                    parameter_index.varian_values(gradient_name)
                 ):
                     self.gradient_list.append(float(gradient))
                 self.gradients = np.array(self.gradient_list) * self.DAC_conversion
@@ -16988,7 +17769,7 @@ class ReadSession:
                     # Search thrugh values dictionary and remove empty entries
                     keys = list(self.main_frame.viewer.values_dictionary.keys())
                     for key in keys:
-                        if self.main_frame.viewer.values_dictionary[key] == {}:
+                        if len(self.main_frame.viewer.values_dictionary[key]) == 0:
                             del self.main_frame.viewer.values_dictionary[key]
 
                     self.plot_overlaid_2D()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+
+import numpy as np
+import nmrglue as ng
+import pytest
+
+
+# Spectrometer frequencies (MHz), offsets (Hz), nuclei and sweep widths (Hz) of
+# the 1H, 15N and 13C dimensions of the synthetic datasets
+channels = [
+    dict(BF1=600.0, SFO1=600.13, O1=2820.0, NUC1="1H", SW_h=8000.0),
+    dict(BF1=60.8, SFO1=60.81, O1=7113.0, NUC1="15N", SW_h=2000.0),
+    dict(BF1=150.9, SFO1=150.9, O1=100.0, NUC1="13C", SW_h=3000.0),
+]
+
+
+def write_bruker(directory, shape, byte_order=0, seed=1) -> np.ndarray:
+    """
+    Write a synthetic 1D/2D/3D (1H, 15N, 13C) Bruker fid/ser file with its
+    acquisition parameter files. shape is the number of complex points of
+    each FID and the number of FIDs along each indirect dimension (as read
+    by ng.bruker.read). Returns the complex data written.
+    """
+    common = dict(
+        TE=298.0,
+        DECIM=16,
+        DSPFVS=20,
+        GRPDLY=67.98,
+        NS=8,
+        NC=0,
+        BYTORDA=byte_order,
+        DTYPA=0,
+        AQ_mod=3,
+        PULPROG="hsqc",
+        _comments=[],
+        _coreheader=[],
+    )
+    for i, channel in enumerate(channels):
+        for name in ["BF", "SFO", "O", "NUC"]:
+            common[name + str(i + 1)] = channel[name + "1"]
+    common.update(BF4=600.0, SFO4=600.0, O4=0.0, NUC4="off")
+
+    files = {"acqus": dict(common, TD=2 * shape[-1], SW_h=channels[0]["SW_h"])}
+    for i, size in enumerate(reversed(shape[:-1])):
+        files["acqu{}s".format(i + 2)] = dict(
+            common, **channels[i + 1], TD=size, FnMODE=6
+        )
+
+    rng = np.random.default_rng(seed)
+    data = (rng.normal(size=shape) + 1j * rng.normal(size=shape)) * 1e4
+    ng.bruker.write(
+        str(directory),
+        files,
+        data,
+        overwrite=True,
+        write_prog=False,
+        write_acqus=True,
+        write_procs=False,
+        pdata_folder=False,
+    )
+    with open(os.path.join(str(directory), "pulseprogram"), "w") as file:
+        file.write("1 ze\n")
+    return data
+
+
+@pytest.fixture
+def make_bruker(tmp_path):
+    """
+    Factory writing a synthetic Bruker dataset to tmp_path (see write_bruker)
+    """
+
+    def make(shape=(8, 16, 256), byte_order=0):
+        return write_bruker(tmp_path, shape, byte_order)
+
+    return make
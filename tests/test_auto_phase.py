@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+import pytest
+
+from SpinExplorer.SpinProcess.Processing.auto_phase import AutoPhase, auto_phase
+
+
+def phased_spectrum(p0, p1, seed=3, size=1024):
+    """
+    Spectrum of a synthetic FID (12 decaying peaks plus noise) with a p0/p1
+    phase error that is corrected by phasing with (p0, p1)
+    """
+    rng = np.random.default_rng(seed)
+    time = np.arange(size)
+    fid = np.zeros(size, dtype=complex)
+    for frequency, amplitude in zip(
+        rng.uniform(-0.45, 0.45, 12), rng.uniform(0.3, 1.0, 12)
+    ):
+        fid += amplitude * np.exp(2j * np.pi * frequency * time - time / 200)
+    fid[0] *= 0.5
+    fid += rng.normal(scale=5e-4, size=size) + 1j * rng.normal(scale=5e-4, size=size)
+    spectrum = ng.proc_base.fft(ng.proc_base.zf_size(fid, 4 * size))
+    return ng.proc_base.ps(spectrum, p0=-p0, p1=-p1)
+
+
+def phase_difference(a, b):
+    return (a - b + 180) % 360 - 180
+
+
+@pytest.mark.parametrize("p0, p1", [(30, -40), (-120, 90), (170, 0), (0, 150)])
+def test_1d_phase_is_recovered(p0, p1):
+    found_p0, found_p1 = auto_phase(phased_spectrum(p0, p1))
+
+    assert abs(phase_difference(found_p0, p0)) < 5
+    assert abs(found_p1 - p1) < 5
+
+
+@pytest.mark.parametrize("p0, p1", [(30, -40), (170, 0)])
+def test_plane_phase_is_recovered(p0, p1):
+    plane = np.array([phased_spectrum(p0, p1, seed=seed) for seed in range(4)])
+
+    found_p0, found_p1 = auto_phase(plane)
+
+    assert abs(phase_difference(found_p0, p0)) < 5
+    assert abs(found_p1 - p1) < 5
+
+
+def test_minima_only_refines_p0():
+    spectrum = phased_spectrum(-120, 90)
+
+    acme_p0, acme_p1 = AutoPhase(spectrum, method="acme").run()
+    minima_p0, minima_p1 = AutoPhase(spectrum, method="minima").run()
+
+    assert minima_p1 == acme_p1
+    assert abs(phase_difference(minima_p0, -120)) < 5
+
+
+def test_p1_is_kept_within_range():
+    p0, p1 = auto_phase(phased_spectrum(20, 185))
+
+    assert -180 <= p1 <= 180
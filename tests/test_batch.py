@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+
+from SpinExplorer.SpinConverter.Conversion.batch import (
+    convert_dataset,
+    find_datasets,
+)
+
+
+def make_experiment(directory, *files) -> str:
+    os.makedirs(directory)
+    for file in files:
+        with open(os.path.join(directory, file), "w") as f:
+            f.write("")
+    return str(directory)
+
+
+def test_directories_without_single_data_file_are_reported(tmp_path):
+    no_data = make_experiment(tmp_path / "1", "acqus")
+    both = make_experiment(tmp_path / "2", "acqus", "fid", "ser")
+    varian = make_experiment(tmp_path / "3", "procpar")
+    make_experiment(tmp_path / "4", "notes.txt")
+
+    assert find_datasets(str(tmp_path)) == [no_data, both, varian]
+
+    report = convert_dataset(no_data)
+    assert report["status"] == "failed"
+    assert report["message"] == "No Bruker data file (fid or ser) found"
+
+    report = convert_dataset(both)
+    assert report["status"] == "failed"
+    assert "fid, ser" in report["message"]
+
+    report = convert_dataset(varian)
+    assert report["spectrometer"] == "Varian"
+    assert report["status"] == "failed"
+    assert report["message"] == "No Varian data file (fid) found"
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+from SpinExplorer.SpinConverter.StoringParameters.conversion_parameters import (
+    ConversionParameters,
+)
+from SpinExplorer.SpinConverter.Conversion.cache import (
+    is_cached,
+    record_conversion,
+)
+
+
+def nus_parameters(nus_file) -> ConversionParameters:
+    return ConversionParameters(
+        spectrometer="Bruker",
+        complex_sizes=[512, 64],
+        real_sizes=[256, 32],
+        acquisition_modes=["DQD", "Complex"],
+        sweep_widths=[8000.0, 2000.0],
+        nuclei_frequencies=[600.13, 60.81],
+        labels=["1H", "15N"],
+        carrier_frequencies=[4.7, 118.0],
+        nus=True,
+        nus_sample_count=2,
+        nus_file=nus_file,
+    )
+
+
+def test_named_nus_schedule_is_fingerprinted(tmp_path):
+    for name, contents in [("acqus", "##TITLE="), ("ser", "data"), ("test.fid", "")]:
+        (tmp_path / name).write_text(contents)
+    (tmp_path / "schedule.txt").write_text("0\n5\n")
+    parameters = nus_parameters("schedule.txt")
+
+    record_conversion("test.fid", parameters, directory=str(tmp_path))
+    assert is_cached("test.fid", parameters, directory=str(tmp_path)) == True
+
+    (tmp_path / "schedule.txt").write_text("0\n6\n")
+    assert is_cached("test.fid", parameters, directory=str(tmp_path)) == False
+
+
+def test_new_raw_data_file_invalidates_the_cache(tmp_path):
+    for name, contents in [("acqus", "##TITLE="), ("ser", "data"), ("test.fid", "")]:
+        (tmp_path / name).write_text(contents)
+    parameters = nus_parameters("")
+
+    record_conversion("test.fid", parameters, directory=str(tmp_path))
+    (tmp_path / "nuslist").write_text("0\n5\n")
+
+    assert is_cached("test.fid", parameters, directory=str(tmp_path)) == False
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+
+import numpy as np
+import nmrglue as ng
+import pytest
+from nmrglue.process.nmrtxt.rance_kay import bruk_ranceY
+
+from SpinExplorer.SpinConverter.Conversion import convert_nmrglue
+from SpinExplorer.SpinConverter.Conversion.headless import (
+    convert_headless,
+    find_conversion_parameters,
+)
+
+
+def echo_antiecho_parameters(directory, **values):
+    """
+    Save parameters.json for a 3D dataset with echo/antiecho (Rance-Kay)
+    acquisition in both indirect dimensions, returning the parameters
+    """
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        parameters = find_conversion_parameters()
+    finally:
+        os.chdir(cwd)
+    parameters.acquisition_modes = ["DQD", "Echo-AntiEcho", "Echo-AntiEcho"]
+    for name, value in values.items():
+        setattr(parameters, name, value)
+    parameters.write_json(os.path.join(str(directory), "parameters.json"))
+    return parameters
+
+
+def nmrglue_conversion(directory, parameters, data):
+    # nmrglue reference: Rance-Kay along both indirect axes, then ng.convert
+    dic = ng.bruker.read(str(directory))[0]
+    data = bruk_ranceY({}, data, rotate_phase=True)[1]
+    for plane in range(data.shape[0]):
+        data[plane] = bruk_ranceY({}, data[plane], rotate_phase=True)[1]
+    converter = ng.convert.converter()
+    converter.from_bruker(dic, data, ng.bruker.guess_udic(dic, data))
+    return converter.to_pipe()[1] * float(parameters.scaling_number)
+
+
+def test_plane_series_matches_single_file(tmp_path, make_bruker):
+    make_bruker()
+    convert_headless(str(tmp_path), output_file="test.fid")
+    convert_headless(str(tmp_path), output_file="fids/test%03d.fid")
+
+    single_dic, single_data = ng.pipe.read(str(tmp_path / "test.fid"))
+    series_dic, series_data = ng.pipe.read(str(tmp_path / "fids" / "test%03d.fid"))
+
+    assert series_dic["FDPIPEFLAG"] == 0
+    assert series_dic["FDFILECOUNT"] == single_data.shape[0]
+    assert series_data.shape == single_data.shape
+    assert np.array_equal(series_data, single_data)
+
+
+def test_plane_is_readable_on_its_own(tmp_path, make_bruker):
+    make_bruker()
+    convert_headless(str(tmp_path), output_file="test.fid")
+    convert_headless(str(tmp_path), output_file="fids/test%03d.fid")
+
+    single_data = ng.pipe.read(str(tmp_path / "test.fid"))[1]
+    plane_dic, plane_data = ng.pipe.read(str(tmp_path / "fids" / "test002.fid"))
+
+    assert plane_dic["FDDIMCOUNT"] == 3
+    assert np.array_equal(plane_data, single_data[1])
+
+
+def test_conversion_in_blocks_matches_nmrglue(tmp_path, make_bruker, monkeypatch):
+    make_bruker()
+    parameters = echo_antiecho_parameters(tmp_path)
+    # Two steps of the outer dimension per block, so 4 blocks
+    monkeypatch.setattr(convert_nmrglue, "block_memory", 1)
+    convert_headless(str(tmp_path), output_file="test.fid")
+
+    data = ng.pipe.read(str(tmp_path / "test.fid"))[1]
+    expected = nmrglue_conversion(
+        tmp_path, parameters, ng.bruker.read(str(tmp_path))[1]
+    )
+    assert data.shape == (8, 16, 256)
+    assert np.array_equal(data, expected)
+
+
+def test_nus_conversion_in_blocks_matches_nmrglue(tmp_path, make_bruker, monkeypatch):
+    # 12 of the 4 x 8 complex points, each with 4 FIDs for the quadrature components
+    grid = [(i, j) for j in range(4) for i in range(8)]
+    chosen = np.random.default_rng(5).choice(len(grid), 12, replace=False)
+    schedule = [grid[k] for k in sorted(chosen)]
+    make_bruker(shape=(12, 4, 256))
+    (tmp_path / "nuslist").write_text(
+        "".join("{} {}\n".format(*point) for point in schedule)
+    )
+    parameters = echo_antiecho_parameters(tmp_path, complex_sizes=[512, 16, 8])
+    assert parameters.nus == True
+    monkeypatch.setattr(convert_nmrglue, "block_memory", 1)
+    convert_headless(str(tmp_path), output_file="test.fid")
+
+    data = ng.pipe.read(str(tmp_path / "test.fid"))[1]
+    sampled = ng.bruker.read(str(tmp_path))[1].reshape(-1, 256)
+    full = ng.proc_base.expand_nus(sampled, (8, 16, 256), schedule)
+    assert np.array_equal(data, nmrglue_conversion(tmp_path, parameters, full))
+
+
+@pytest.mark.parametrize("output_file", ["test.fid", "fids/test%03d.fid"])
+def test_failed_conversion_removes_the_output(
+    tmp_path, make_bruker, monkeypatch, output_file
+):
+    make_bruker()
+    monkeypatch.setattr(convert_nmrglue, "block_memory", 1)
+    convert_block = convert_nmrglue.Convert_nmrglue.convert_block
+    blocks = []
+
+    def fail_on_third_block(self, u, data):
+        blocks.append(data)
+        if len(blocks) == 3:
+            raise MemoryError
+        return convert_block(self, u, data)
+
+    monkeypatch.setattr(
+        convert_nmrglue.Convert_nmrglue, "convert_block", fail_on_third_block
+    )
+    with pytest.raises(Exception):
+        convert_headless(str(tmp_path), output_file=output_file)
+
+    assert len(blocks) == 3
+    assert (tmp_path / "test.fid").exists() == False
+    if os.path.isdir(tmp_path / "fids"):
+        assert os.listdir(tmp_path / "fids") == []
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+
+from SpinExplorer.SpinView.Analysis.integration import Integrals
+
+
+def make_integrals():
+    # ppm scale running downwards as in a spectrum, 0.1 ppm per point
+    ppms = np.linspace(10, 0, 101)
+    integrals = Integrals(ppms)
+    data = np.zeros(101)
+    data[20:31] = 1.0
+    data[60:81] = 2.0
+    integrals.update(data)
+    return integrals, data
+
+
+def test_add_regions_in_either_direction():
+    integrals, data = make_integrals()
+    integrals.add(8.0, 7.0)
+    integrals.add(2.0, 4.0)
+
+    assert len(integrals) == 2
+    assert np.array_equal(integrals.regions, [[20, 30], [60, 80]])
+    assert np.allclose(integrals.values(), [data[20:31].sum(), data[60:81].sum()])
+    assert np.allclose(integrals.bounds(), [[8.0, 7.0], [4.0, 2.0]])
+
+
+def test_remove_keeps_the_reference_region():
+    integrals, data = make_integrals()
+    integrals.add(9.5, 9.0)
+    integrals.add(8.0, 7.0)
+    integrals.add(4.0, 2.0)
+    integrals.reference = 2
+
+    integrals.remove(0)
+    assert len(integrals) == 2
+    assert integrals.reference == 1
+
+    integrals.remove()
+    assert len(integrals) == 1
+    assert integrals.reference is None
+
+    integrals.remove()
+    integrals.remove()
+    assert len(integrals) == 0
+
+
+def test_normalised_to_the_reference():
+    integrals, data = make_integrals()
+    integrals.add(8.0, 7.0)
+    integrals.add(4.0, 2.0)
+
+    assert np.allclose(integrals.normalised(), [11 / 42, 1.0])
+
+    integrals.reference = 0
+    integrals.reference_value = 2.0
+    assert np.allclose(integrals.normalised(), [2.0, 2.0 * 42 / 11])
+
+
+def test_normalised_after_the_spectrum_changes():
+    integrals, data = make_integrals()
+    integrals.add(8.0, 7.0)
+    integrals.add(4.0, 2.0)
+    integrals.reference = 0
+
+    # e.g. a baseline offset or scaling after phasing
+    integrals.update(3 * data + 0.5)
+
+    values = [3 * 11 + 0.5 * 11, 3 * 42 + 0.5 * 21]
+    assert np.allclose(integrals.values(), values)
+    assert np.allclose(integrals.normalised(), [1.0, values[1] / values[0]])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import time
+import pytest
+
+from SpinExplorer.SpinConverter.Conversion.jobs import Job, JobManager, parse_progress
+
+
+def wait_for(condition, timeout=10):
+    end = time.time() + timeout
+    while condition() == False:
+        if time.time() > end:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize(
+    "line, progress",
+    [
+        ("XYZ2Pipe Partition: Plane 12 of 128", 12 / 128),
+        ("NMRPipe Processing 4 of 4", 1.0),
+        ("nmrPipe -fn FT -auto", None),
+        ("Plane 3 of 0", None),
+        ("Plane 7 of 3", None),
+    ],
+)
+def test_parse_progress(line, progress):
+    assert parse_progress(line) == progress
+
+
+def test_output_and_progress_are_streamed(tmp_path):
+    output = []
+    progress = []
+    job = Job(
+        "printf 'first\\nPlane 1 of 4\\rPlane 2 of 4\\r'; echo problem >&2; echo last",
+        cwd=str(tmp_path),
+        on_output=lambda job, stream, line: output.append((stream, line)),
+        on_progress=lambda job, value: progress.append(value),
+    )
+    job.run()
+
+    assert job.status == "finished"
+    assert job.returncode == 0
+    assert job.stdout() == ["first", "Plane 1 of 4", "Plane 2 of 4", "last"]
+    assert job.stderr() == ["problem"]
+    assert progress == [0.25, 0.5]
+    assert job.progress == 0.5
+    assert sorted(output) == [
+        ("stderr", "problem"),
+        ("stdout", "first"),
+        ("stdout", "last"),
+    ]
+
+
+def test_failed_job(tmp_path):
+    finished = []
+    job = Job("echo bad >&2; exit 3", cwd=str(tmp_path), on_finished=finished.append)
+    job.run()
+
+    assert job.status == "failed"
+    assert job.returncode == 3
+    assert job.stderr() == ["bad"]
+    assert finished == [job]
+
+
+def test_cancel_running_job(tmp_path):
+    manager = JobManager(max_jobs=1)
+    job = manager.submit("sleep 30", cwd=str(tmp_path))
+    wait_for(lambda: job.status == "running" and job.process is not None)
+
+    start = time.time()
+    job.cancel()
+    assert job.wait(10) == True
+    assert job.status == "cancelled"
+    assert time.time() - start < 5
+    assert manager.active_jobs() == []
+
+
+def test_cancel_queued_job(tmp_path):
+    manager = JobManager(max_jobs=1)
+    first = manager.submit("sleep 30", cwd=str(tmp_path))
+    second = manager.submit("echo started > started.txt", cwd=str(tmp_path))
+    wait_for(lambda: first.status == "running")
+    assert second.status == "queued"
+    assert manager.active_jobs(cwd=str(tmp_path)) == [first, second]
+
+    second.cancel()
+    first.cancel()
+    assert first.wait(10) == True
+    assert second.wait(10) == True
+    assert second.status == "cancelled"
+    assert second.process is None
+    assert (tmp_path / "started.txt").exists() == False
+
+
+def test_max_jobs_limit(tmp_path):
+    manager = JobManager(max_jobs=2)
+    jobs = [manager.submit("sleep 0.3", cwd=str(tmp_path)) for i in range(5)]
+
+    most_running = 0
+    while manager.active_jobs() != []:
+        running = len([job for job in jobs if job.status == "running"])
+        most_running = max(most_running, running)
+        assert manager.running <= 2
+        time.sleep(0.01)
+
+    assert most_running == 2
+    assert [job.status for job in jobs] == ["finished"] * 5
+
+
+def test_active_jobs_in_a_directory(tmp_path):
+    manager = JobManager(max_jobs=2)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    job = manager.submit("sleep 30", cwd=str(tmp_path / "a"))
+
+    assert manager.active_jobs(cwd=str(tmp_path / "a")) == [job]
+    assert manager.active_jobs(cwd=str(tmp_path / "b")) == []
+
+    manager.cancel_all()
+    assert job.wait(10) == True
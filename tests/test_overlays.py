@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+
+from SpinExplorer.SpinView.Plotting.overlays import OverlayManager
+
+
+def make_overlay(shape, seed, factor=1.0):
+    # 2D spectrum 10-0 ppm (columns, 1H) by 130-100 ppm (rows, 15N)
+    udic = ng.fileio.fileiobase.create_blank_udic(2)
+    axes = [(3000.0, 11500.0, 100.0), (5000.0, 2500.0, 500.0)]
+    for dim, (sw, car, obs) in enumerate(axes):
+        udic[dim].update(size=shape[dim], complex=False, sw=sw, car=car, obs=obs)
+        udic[dim].update(time=False, freq=True)
+    data = np.random.default_rng(seed).normal(size=shape)
+    dic = ng.pipe.create_dic(udic)
+    return {
+        "z_data": data,
+        "uc0": ng.pipe.make_uc(dic, data, dim=0),
+        "uc1": ng.pipe.make_uc(dic, data, dim=1),
+        "move x": 0.0,
+        "move y": 0.0,
+        "multiply factor": factor,
+    }
+
+
+def test_slices_of_overlays_with_different_shapes():
+    manager = OverlayManager()
+    manager[0] = make_overlay((32, 64), seed=1)
+    manager[1] = make_overlay((16, 128), seed=2, factor=2.0)
+
+    horizontal = manager.slices(5.0, axis=1)
+    vertical = manager.slices(115.0, axis=0)
+
+    for overlay, row, column in zip(manager.overlays(), vertical, horizontal):
+        index = overlay["uc1"]("5.0 ppm")
+        assert np.allclose(column, overlay.z_data[:, index] * overlay.multiply_factor)
+        index = overlay["uc0"]("115.0 ppm")
+        assert np.allclose(row, overlay.z_data[index, :] * overlay.multiply_factor)
+
+
+def test_slice_outside_an_overlay_is_none():
+    manager = OverlayManager()
+    manager[0] = make_overlay((32, 64), seed=1)
+    manager[1] = make_overlay((32, 64), seed=2)
+    manager[1]["move x"] = 50.0
+
+    slices = manager.slices(115.0, axis=0)
+
+    assert slices[0] is not None
+    assert slices[1] is None
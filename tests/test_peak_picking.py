@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+
+from SpinExplorer.SpinView.Analysis.peak_picking import pick_peaks
+
+
+def test_peaks_on_the_edge_are_not_shifted():
+    data = np.zeros((200, 300))
+    data[199, 299] = 10.0
+    data[198, 299] = 5.0
+    data[199, 298] = 5.0
+    data[0, 0] = 8.0
+    data[1, 0] = 4.0
+
+    positions, heights = pick_peaks(data, threshold=1.0)
+
+    order = np.argsort(heights)
+    assert np.array_equal(positions[order], [[0.0, 0.0], [199.0, 299.0]])
+
+
+def test_interior_peak_is_refined():
+    x = np.arange(50)
+    data = np.exp(-((x - 20.3) ** 2) / 8.0)
+
+    positions, heights = pick_peaks(data, threshold=0.5)
+
+    assert positions.shape == (1, 1)
+    assert abs(positions[0, 0] - 20.3) < 0.1
+
+
+def test_edge_of_3d_data_across_chunks():
+    data = np.zeros((10, 6, 8))
+    data[9, 5, 0] = 3.0
+    data[8, 5, 0] = 1.0
+
+    positions, heights = pick_peaks(data, threshold=1.5, chunk_size=4)
+
+    assert np.array_equal(positions, [[9.0, 5.0, 0.0]])
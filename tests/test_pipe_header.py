@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+import pytest
+
+from SpinExplorer.SpinProcess.ReadingData.pipe_header import (
+    PipeHeader,
+    header_dictionary,
+    header_size,
+)
+
+
+def write_pipe(file_name, complex_axes, labels, encodings, shape):
+    """
+    Write an nmrPipe FID (a single stream for 3D data) with the axes in
+    nmrglue order (the direct dimension last), returning its header
+    """
+    udic = ng.fileio.fileiobase.create_blank_udic(len(shape))
+    for dim in range(len(shape)):
+        udic[dim].update(size=shape[dim], complex=complex_axes[dim])
+        udic[dim].update(label=labels[dim], encoding=encodings[dim])
+        udic[dim].update(sw=1000.0 * (dim + 1), obs=100.0, car=50.0)
+    dic = ng.pipe.create_dic(udic)
+    dic["FDPIPEFLAG"] = 1.0
+    data = np.zeros(ng.pipe.find_shape(dic), dtype=np.float32)
+    if complex_axes[-1] == True:
+        data = data[..., ::2].astype(np.complex64)
+    ng.pipe.write(file_name, dic, data, overwrite=True)
+    return ng.pipe.read(file_name)
+
+
+cases = {
+    "1D": ([True], ["H1"], ["direct"], (512,), None),
+    "2D": ([True, True], ["N15", "H1"], ["states", "direct"], (64, 256), None),
+    "2D real direct": (
+        [True, False],
+        ["N15", "H1"],
+        ["states", "direct"],
+        (64, 256),
+        None,
+    ),
+    "pseudo 2D": ([False, True], ["T1", "H1"], ["real", "direct"], (10, 256), 1),
+    "3D": (
+        [True, True, True],
+        ["C13", "N15", "H1"],
+        ["states", "states", "direct"],
+        (32, 64, 128),
+        None,
+    ),
+    "pseudo 3D": (
+        [False, True, True],
+        ["delay", "N15", "H1"],
+        ["real", "states", "direct"],
+        (8, 32, 128),
+        2,
+    ),
+}
+
+
+@pytest.mark.parametrize("case", cases.values(), ids=list(cases))
+def test_header_matches_nmrglue(tmp_path, case):
+    complex_axes, labels, encodings, shape, pseudo_axis = case
+    file_name = str(tmp_path / "test.fid")
+    dic, data = write_pipe(file_name, complex_axes, labels, encodings, shape)
+    udic = ng.pipe.guess_udic(dic, data)
+    # nmrglue orders the axes direct dimension last, the header X (direct) first
+    axes = list(reversed(range(udic["ndim"])))
+
+    header = PipeHeader.from_file(file_name)
+
+    assert header.ndim == data.ndim
+    assert header.sizes == list(reversed(np.atleast_1d(ng.pipe.find_shape(dic))))
+    assert header.labels == [udic[axis]["label"] for axis in axes]
+    assert header.sw == [udic[axis]["sw"] for axis in axes]
+    assert header.complex == [complex_axes[axis] for axis in axes]
+    assert header.pseudo_axis == pseudo_axis
+    for dimension in range(1, header.ndim + 1):
+        assert header.label(dimension) == dic["FDF{}LABEL".format(dimension)]
+
+
+def test_plane_of_a_series(tmp_path):
+    dic, data = write_pipe(
+        str(tmp_path / "test.fid"),
+        [True, True, True],
+        ["C13", "N15", "H1"],
+        ["states", "states", "direct"],
+        (4, 8, 128),
+    )
+    dic["FDPIPEFLAG"] = 0.0
+    ng.pipe.write(str(tmp_path / "test%03d.fid"), dic, data, overwrite=True)
+
+    header = PipeHeader.from_file(str(tmp_path / "test002.fid"))
+
+    assert header.ndim == 3
+    assert header.sizes == [256, 8, 4]
+    assert header.labels == ["H1", "N15", "C13"]
+
+
+def test_byte_swapped_header():
+    fdata = ng.pipe.dic2fdata(
+        ng.pipe.create_dic(ng.fileio.fileiobase.create_blank_udic(2))
+    )
+
+    swapped = header_dictionary(fdata.byteswap().tobytes())
+
+    assert swapped == ng.pipe.fdata2dic(fdata)
+
+
+def test_not_a_pipe_file():
+    with pytest.raises(ValueError, match="too short"):
+        header_dictionary(bytes(100))
+    with pytest.raises(ValueError, match="nmrPipe header"):
+        header_dictionary(bytes(header_size))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+import pytest
+
+from SpinExplorer.SpinView.ReadingData.projections import Projections3D
+
+
+@pytest.fixture
+def cube(tmp_path):
+    data = np.random.default_rng(2).normal(size=(10, 6, 8)).astype(np.float32)
+    udic = ng.fileio.fileiobase.create_blank_udic(3)
+    for dim, label in enumerate(["N15", "C13", "HN"]):
+        udic[dim].update(size=data.shape[dim], complex=False, label=label)
+        udic[dim].update(sw=1000.0, obs=100.0, car=500.0)
+    dic = ng.pipe.create_dic(udic)
+    ng.pipe.write(str(tmp_path / "test.ft3"), dic, data)
+    return dic, data
+
+
+def test_projections_match_numpy(tmp_path, cube):
+    dic, data = cube
+    projections = Projections3D(
+        "test.ft3",
+        data,
+        dic,
+        ["N15", "C13", "HN"],
+        directory=str(tmp_path),
+        chunk_size=3,
+    )
+    projections.calculate(workers=2)
+
+    for axis in range(3):
+        index = np.expand_dims(np.argmax(np.abs(data), axis=axis), axis)
+        skyline = np.take_along_axis(data, index, axis).squeeze(axis)
+        assert np.allclose(projections.projections["skyline"][axis], skyline)
+        summed = projections.projections["sum"][axis]
+        assert np.allclose(summed, data.sum(axis=axis), atol=1e-5)
+
+
+def test_projection_in_memory_matches_written_file(tmp_path, cube):
+    dic, data = cube
+    projections = Projections3D(
+        "test.ft3", data, dic, ["N15", "C13", "HN"], directory=str(tmp_path)
+    )
+    projections.calculate()
+    projections.write()
+    assert projections.is_cached() == True
+
+    for kind in projections.kinds:
+        for axis in range(3):
+            projection_dic, projection = projections.projection(axis, kind)
+            file_dic, file_data = ng.pipe.read(projections.projection_file(axis, kind))
+            assert np.array_equal(projection, file_data)
+            assert ng.pipe.find_shape(projection_dic) == projection.shape
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import pytest
+from nmrglue.process.nmrtxt.rance_kay import bruk_ranceY
+
+from SpinExplorer.SpinConverter.Conversion.convert_nmrglue import (
+    rance_kay_recombination,
+)
+
+
+def random_fid(shape):
+    rng = np.random.default_rng(0)
+    return rng.normal(size=shape) + 1j * rng.normal(size=shape)
+
+
+def recombine_pairwise(data, axis, rotate_phase=True):
+    """
+    Reference recombination: nmrglue's bruk_ranceY (one echo/antiecho pair at
+    a time) applied along the given axis
+    """
+    moved = np.moveaxis(data, axis, 0)
+    recombined = bruk_ranceY({}, moved, rotate_phase=rotate_phase)[1]
+    return np.moveaxis(recombined, 0, axis)
+
+
+@pytest.mark.parametrize("rotate_phase", [True, False])
+def test_2d_matches_nmrglue(rotate_phase):
+    data = random_fid((16, 64))
+    expected = bruk_ranceY({}, data.copy(), rotate_phase=rotate_phase)[1]
+
+    result = rance_kay_recombination(data.copy(), 0, rotate_phase)
+
+    assert result.shape == data.shape
+    assert np.allclose(result, expected)
+
+
+@pytest.mark.parametrize("rotate_phase", [True, False])
+def test_3d_double_recombination(rotate_phase):
+    data = random_fid((8, 12, 32))
+    expected = recombine_pairwise(data, 0, rotate_phase)
+    for plane in range(expected.shape[0]):
+        expected[plane] = bruk_ranceY({}, expected[plane], rotate_phase)[1]
+
+    result = rance_kay_recombination(data.copy(), 0, rotate_phase)
+    result = rance_kay_recombination(result, 1, rotate_phase)
+
+    assert np.allclose(result, expected)
+
+
+def test_3d_single_indirect_axis():
+    data = random_fid((8, 12, 32))
+
+    result = rance_kay_recombination(data.copy(), 1)
+
+    assert np.allclose(result, recombine_pairwise(data, 1))
+
+
+def test_odd_length_dimension():
+    with pytest.raises(ValueError, match="odd number of points"):
+        rance_kay_recombination(random_fid((15, 64)), 0)
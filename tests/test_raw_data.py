@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import nmrglue as ng
+import pytest
+
+from SpinExplorer.SpinConverter.FindingParameters.raw_data import RawData
+
+
+@pytest.mark.parametrize("byte_order", [0, 1])
+@pytest.mark.parametrize("shape", [(512,), (16, 256), (4, 8, 128)])
+def test_read_fids_matches_nmrglue(tmp_path, make_bruker, byte_order, shape):
+    make_bruker(shape, byte_order)
+    bin_file = "fid" if len(shape) == 1 else "ser"
+
+    raw_data = RawData.from_bruker(str(tmp_path), bin_file)
+    expected = ng.bruker.read(str(tmp_path))[1]
+
+    assert raw_data.shape == expected.shape
+    assert raw_data.dtype.byteorder == (">" if byte_order == 1 else "<")
+    data = raw_data.read_fids()
+    assert np.array_equal(data.reshape(expected.shape), expected)
+
+
+@pytest.mark.parametrize("byte_order", [0, 1])
+def test_fids_padded_to_1024_bytes(tmp_path, make_bruker, byte_order):
+    # TD = 500 words is not a multiple of 256, so each FID is padded to 512 words
+    data = make_bruker((16, 250), byte_order)
+    words = np.zeros((16, 512))
+    words[:, 0:500:2] = data.real
+    words[:, 1:500:2] = data.imag
+    words.astype(">i4" if byte_order == 1 else "<i4").tofile(str(tmp_path / "ser"))
+
+    raw_data = RawData.from_bruker(str(tmp_path), "ser")
+    expected = ng.bruker.read(str(tmp_path))[1]
+
+    assert raw_data.shape == expected.shape == (16, 256)
+    assert np.array_equal(raw_data.read_fids(), expected)
+    written = np.trunc(data.real) + 1j * np.trunc(data.imag)
+    assert np.array_equal(raw_data.read_fids()[:, :250], written)
+
+
+def test_read_chosen_fids(tmp_path, make_bruker):
+    make_bruker((16, 256), byte_order=1)
+    raw_data = RawData.from_bruker(str(tmp_path), "ser")
+    expected = ng.bruker.read(str(tmp_path))[1]
+
+    fids = np.array([3, 0, 15, 7])
+    assert np.array_equal(raw_data.read_fids(fids), expected[fids])
+    assert np.array_equal(raw_data.read_fids(slice(2, 10, 3)), expected[2:10:3])
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import os
+import sys
+import subprocess
+
+import nmrglue as ng
+
+
+# Run the SpinConverter entry point with wx (and darkdetect) unimportable, as
+# in a worker without a display or wxPython installed
+run_without_wx = """
+import sys
+sys.modules["wx"] = None
+sys.modules["darkdetect"] = None
+from SpinExplorer.SpinConverter.SpinConverter import main
+sys.argv = ["SpinConverter"] + sys.argv[1:]
+main()
+"""
+
+
+def spin_converter(*arguments) -> subprocess.CompletedProcess:
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return subprocess.run(
+        [sys.executable, "-c", run_without_wx] + list(arguments),
+        capture_output=True,
+        text=True,
+        env=environment,
+    )
+
+
+def test_headless_conversion_without_wx(tmp_path, make_bruker):
+    data = make_bruker(shape=(16, 256))
+
+    result = spin_converter("--headless", str(tmp_path))
+
+    assert result.returncode == 0, result.stderr
+    assert "Converted data saved to" in result.stdout
+    dic, converted = ng.pipe.read(str(tmp_path / "test.fid"))
+    assert converted.shape == data.shape
+
+    result = spin_converter("--headless", str(tmp_path))
+    assert result.returncode == 0, result.stderr
+    assert "is up to date" in result.stdout
+
+
+def test_batch_and_cache_without_wx(tmp_path, make_bruker):
+    make_bruker(shape=(16, 256))
+
+    result = spin_converter("--batch", str(tmp_path), "--workers", "1")
+    assert result.returncode == 0, result.stderr
+    assert "1 converted" in result.stdout
+
+    result = spin_converter("cache", "ls", str(tmp_path))
+    assert result.returncode == 0, result.stderr
+    assert "1 cached conversions" in result.stdout
+
+    result = spin_converter("cache", "clear", str(tmp_path))
+    assert result.returncode == 0, result.stderr
+    assert os.path.exists(tmp_path / "conversion_cache.json") == False
+
+
+def test_headless_error_without_wx(tmp_path):
+    result = spin_converter("--headless", str(tmp_path))
+
+    assert result.returncode == 1
+    assert result.stderr.splitlines()[-1].startswith("Error: ")
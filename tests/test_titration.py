@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""MIT License
+
+Copyright (c) 2025 James Eaton, Andrew Baldwin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+
+
+import numpy as np
+import pytest
+
+from SpinExplorer.SpinView.Analysis.titration import fit_kd, single_site_binding
+
+
+def test_fit_recovers_known_kd():
+    ligand = np.array([0, 25, 50, 100, 200, 400, 800, 1600], dtype=float)
+    protein = 100.0
+    kd = np.array([20.0, 150.0, 600.0])
+    csp_max = np.array([0.3, 0.15, 0.5])
+    csp = single_site_binding(
+        ligand[:, None], protein, kd[None, :], csp_max[None, :]
+    )
+    rng = np.random.default_rng(0)
+    csp = csp + rng.normal(scale=1e-4, size=csp.shape)
+
+    fitted_kd, fitted_max, kd_error = fit_kd(ligand, csp, protein)
+
+    assert np.allclose(fitted_kd, kd, rtol=0.05)
+    assert np.allclose(fitted_max, csp_max, rtol=0.02)
+    assert np.all(np.isfinite(kd_error))
+    assert np.all(kd_error < 0.1 * kd)
+
+
+@pytest.mark.parametrize("ligand, protein", [([0, 10, 20], 0.0), ([0, -10, 20], 50.0)])
+def test_invalid_concentrations_are_rejected(ligand, protein):
+    csp = np.array([[0.0], [0.1], [0.15]])
+
+    with pytest.raises(ValueError):
+        fit_kd(ligand, csp, protein)